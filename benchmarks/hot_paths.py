@@ -0,0 +1,235 @@
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+# O caminho de desenho roda numa Surface fora da tela: sem janela de verdade
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from config import SCREEN_WIDTH, SCREEN_HEIGHT
+from core.clock import sim_clock
+from core.headless import build_simulator, STEP_MS
+from core.connection_system import LoadBalancer
+from views.simulator_view import SimulatorView
+
+CPU_COUNTS = (1, 6, 64, 512)
+QUEUE_SIZES = {"small": 2, "large": 32}  # processos por CPU (1 em atendimento + o resto na fila)
+BENCHMARKS = ("connection.update", "simulator.update", "timeout_scan",
+              "routing.round_robin", "routing.least_loaded", "draw")
+# Partida em processo novo (descontado o interpretador vazio): importação e construção até o menu
+STARTUP_TARGETS = {
+    "startup.headless": "import core.headless",
+    "startup.gui": "import main; main.GameManager()",
+}
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def build_loaded_simulator(cpus, per_cpu, seed=1):
+    """Simulador parado num estado de carga fixo: `per_cpu` processos em cada CPU, nada termina nem expira"""
+    random.seed(seed)
+    sim_clock.use_virtual_time(0)
+    simulator = build_simulator(cpus=cpus, capacity=cpus * per_cpu + 1, max_queue_time=1e9)
+    for computer in simulator.computers:
+        computer.set_processing_time(1e6)  # atendimentos que não terminam durante a medição
+    connection = simulator.connection
+    for computer in simulator.computers:
+        for _ in range(per_cpu):
+            process = simulator.generator.create_process()
+            connection.process_targets[process.id] = computer
+            simulator.processes.append(process)
+            if computer.is_idle:
+                computer.start_processing(process)
+            else:
+                computer.add_to_queue(process)
+    # Sem chegadas novas: o número de processos fica constante em todas as repetições
+    for generator in simulator.generators:
+        generator.is_stopped = True
+    return simulator
+
+
+def _operation(name, simulator, screen):
+    """Função sem argumentos que executa uma chamada do caminho medido, e quantos jobs ela cobre"""
+    jobs = len(simulator.processes)
+    if name == "connection.update":
+        def run():
+            sim_clock.advance(STEP_MS)
+            simulator.connection.update()
+        return run, jobs
+    if name == "simulator.update":
+        def run():
+            sim_clock.advance(STEP_MS)
+            simulator.update()
+        return run, jobs
+    if name == "timeout_scan":
+        return simulator._check_queue_timeouts, jobs
+    if name.startswith("routing."):
+        balancer = LoadBalancer(simulator.computers)
+        balancer.set_strategy(name.split(".", 1)[1])
+        processes = simulator.processes
+
+        def run():
+            for process in processes:
+                balancer.get_target_computer(process)
+        return run, jobs
+    if name == "draw":
+        view = SimulatorView(simulator)
+        return lambda: view.draw(screen), jobs
+    raise ValueError(f"Benchmark desconhecido: {name}")
+
+
+def measure(run, min_seconds=0.05, repeats=5):
+    """Tempo por chamada (s): calibra o número de chamadas por repetição e devolve mediana e mínimo"""
+    calls = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(calls):
+            run()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_seconds:
+            break
+        calls *= 2 if elapsed <= 0 else max(2, min(10, int(min_seconds / elapsed) + 1))
+    samples = [elapsed / calls]
+    for _ in range(repeats - 1):
+        started = time.perf_counter()
+        for _ in range(calls):
+            run()
+        samples.append((time.perf_counter() - started) / calls)
+    return statistics.median(samples), min(samples), calls
+
+
+def run_suite(cpu_counts=CPU_COUNTS, queue_sizes=QUEUE_SIZES, benchmarks=BENCHMARKS, min_seconds=0.05, repeats=5):
+    """Roda a matriz benchmark × CPUs × tamanho de fila e devolve a lista de resultados"""
+    pygame.init()
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    results = []
+    for cpus in cpu_counts:
+        for queue_name, per_cpu in queue_sizes.items():
+            for name in benchmarks:
+                # Estado novo a cada benchmark: um não herda filas ou relógio alterados pelo outro
+                simulator = build_loaded_simulator(cpus, per_cpu)
+                run, jobs = _operation(name, simulator, screen)
+                median_s, best_s, calls = measure(run, min_seconds, repeats)
+                results.append({
+                    'benchmark': name,
+                    'cpus': cpus,
+                    'queue': queue_name,
+                    'jobs': jobs,
+                    'ms_per_call': median_s * 1000,
+                    'best_ms_per_call': best_s * 1000,
+                    'calls_per_second': 1 / median_s,
+                    'jobs_per_second': jobs / median_s,
+                    'calls_per_repeat': calls,
+                })
+                print(f"{name:<22}{cpus:>5} CPUs {queue_name:<6}{jobs:>7} jobs "
+                      f"{median_s * 1000:>10.3f} ms/chamada {jobs / median_s:>14,.0f} jobs/s", flush=True)
+    return results
+
+
+def _run_python(statement) -> float:
+    """Tempo (s) de um interpretador novo executando `statement` na raiz do repositório"""
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", statement], cwd=REPO_DIR, check=True, capture_output=True,
+                   env={**os.environ, "SDL_VIDEODRIVER": "dummy", "SDL_AUDIODRIVER": "dummy"})
+    return time.perf_counter() - started
+
+
+def run_startup(targets=STARTUP_TARGETS, repeats=5):
+    """Mede o tempo de partida de cada alvo; a primeira execução (aquece disco e cache de fontes) é descartada"""
+    results = []
+    for name, statement in targets.items():
+        _run_python(statement)
+        samples = []
+        for _ in range(repeats):
+            baseline = _run_python("pass")
+            samples.append(max(1e-6, _run_python(statement) - baseline))
+        median_s = statistics.median(samples)
+        results.append({
+            'benchmark': name,
+            'cpus': 0,
+            'queue': "-",
+            'jobs': 1,
+            'ms_per_call': median_s * 1000,
+            'best_ms_per_call': min(samples) * 1000,
+            'calls_per_second': 1 / median_s,
+            'jobs_per_second': 1 / median_s,
+            'calls_per_repeat': 1,
+        })
+        print(f"{name:<22}{'':>27}{median_s * 1000:>10.1f} ms", flush=True)
+    return results
+
+
+def environment() -> dict:
+    """Máquina e versão do código em que os números foram medidos"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'commit': commit,
+        'python': platform.python_version(),
+        'pygame': getattr(pygame, "version", None) and pygame.version.ver,
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+    }
+
+
+def compare(results, baseline, threshold=0.15):
+    """Linhas comparando jobs/s com um arquivo anterior; regressões além de `threshold` são marcadas"""
+    previous = {(row['benchmark'], row['cpus'], row['queue']): row for row in baseline['results']}
+    lines, regressions = [], 0
+    for row in results:
+        old = previous.get((row['benchmark'], row['cpus'], row['queue']))
+        if old is None:
+            continue
+        change = row['jobs_per_second'] / old['jobs_per_second'] - 1
+        flag = ""
+        if change < -threshold:
+            flag = "  <-- REGRESSAO"
+            regressions += 1
+        lines.append(f"{row['benchmark']:<22}{row['cpus']:>5} CPUs {row['queue']:<6}{change * 100:>+8.1f}%{flag}")
+    return lines, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks dos caminhos quentes da simulação (jobs/s)")
+    parser.add_argument("--output", default="benchmark.json", help="arquivo JSON com os resultados")
+    parser.add_argument("--compare", help="JSON de uma execução anterior para detectar regressões")
+    parser.add_argument("--threshold", type=float, default=0.15, help="queda de jobs/s considerada regressão")
+    parser.add_argument("--cpus", type=int, nargs="+", default=list(CPU_COUNTS))
+    parser.add_argument("--queue", choices=list(QUEUE_SIZES), nargs="+", default=list(QUEUE_SIZES))
+    parser.add_argument("--benchmark", choices=BENCHMARKS, nargs="+", default=list(BENCHMARKS))
+    parser.add_argument("--min-seconds", type=float, default=0.05, help="duração mínima de cada repetição")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--skip-startup", action="store_true", help="não mede o tempo de partida")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.cpus, {name: QUEUE_SIZES[name] for name in args.queue}, args.benchmark,
+                        args.min_seconds, args.repeats)
+    if not args.skip_startup:
+        results += run_startup(repeats=args.repeats)
+    with open(args.output, "w", encoding="utf-8") as output_file:
+        json.dump({'environment': environment(), 'results': results}, output_file, indent=2)
+    print(f"Resultados em {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as baseline_file:
+            lines, regressions = compare(results, json.load(baseline_file), args.threshold)
+        print(f"=== COMPARACAO COM {args.compare} ===")
+        for line in lines:
+            print(line)
+        if regressions:
+            print(f"{regressions} regressao(oes) acima de {args.threshold * 100:.0f}%")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,15 @@
+import os
+
 SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
 FPS = 60
+# Passo fixo da simulação (ms): a interface roda quantos passos o tempo real de cada quadro pedir
+SIM_STEP_MS = 1000 / FPS
+# Limite de passos por quadro: o excesso é descartado em vez de cair numa espiral de quadros cada vez mais lentos
+MAX_STEPS_PER_FRAME = 8
+# Simulação numa thread própria: a interface só desenha os modelos de desenho publicados por ela
+SIMULATION_THREAD = True
+SIMULATION_SPEED = 1.0  # segundos simulados por segundo real; None = o mais rápido possível
 
 # Sistema de Grid
 GRID_COLUMNS = 12
@@ -44,18 +53,19 @@ class GridPositions:
     BACK_BUTTON = (9, 0) 
     
     GENERATOR = (1, 2)  
-    COMPUTER_1 = (5, 1)  # CPU 1
-    COMPUTER_2 = (5, 2)  # CPU 2
-    COMPUTER_3 = (5, 3)  # CPU 3
-    COMPUTER_4 = (7, 1)  # Nova CPU 4
-    COMPUTER_5 = (7, 2)  # Nova CPU 5  
-    COMPUTER_6 = (7, 3)  # Nova CPU 6
+    # Posições das fontes de chegada adicionais (a primeira é GENERATOR)
+    GENERATORS = [(1, 2), (1, 1), (1, 3), (3, 1), (3, 3), (3, 2)]
+    # Posições fixas das primeiras CPUs (layout clássico)
+    COMPUTERS = [(5, 1), (5, 2), (5, 3), (7, 1), (7, 2), (7, 3)]
+    # Área onde as CPUs são redistribuídas quando não cabem nas posições fixas
+    COMPUTER_AREA = (5, 1)
     INFO_PANEL = (0, 4)
     SHOP_PANEL = (10, 0)
 
 # Tamanhos dos Elementos
 class ElementSizes:
     COMPUTER = (1, 1)
+    COMPUTER_AREA = (4, 3)
     GENERATOR = (1, 1)
     INFO_PANEL = (10, 4)
     SHOP_PANEL = (2, 8)
@@ -64,8 +74,102 @@ class ElementSizes:
 # Configurações de Processamento
 PROCESSING_TIME_MS = 2000  # 2 segundos
 MAX_CONNECTION_CAPACITY = 15  # Aumentada para múltiplas CPUs
-TRANSPORT_SPEED = 3.0
+TRANSPORT_SPEED = 3.0  # pixels por passo de 1/FPS (escalado pelo dt real do passo)
+
+# Fontes de chegada (geradores). interval_seconds: intervalo médio entre chegadas;
+# distribution: "deterministic", "exponential" (Poisson) ou "uniform"; pool: None = todas as
+# CPUs, ou lista de ids de CPU atendidas apenas por essa fonte; trace (opcional):
+# arquivo de chegadas a reproduzir no lugar do intervalo (CSV tempo_s[,servico_ms[,classe]]
+# ou trace binário do simulador, filtrado pelo id do gerador em trace_source)
+GENERATOR_SOURCES = [
+    {"name": "Gerador", "interval_seconds": 1.0, "distribution": "deterministic", "pool": None},
+]
+EXTRA_GENERATOR_SOURCE = {"interval_seconds": 2.0, "distribution": "exponential", "pool": None}
+
+# Classes de processos (carga mista)
+# weight: fração das chegadas; service_ms: tempo médio de serviço numa CPU base
+# (PROCESSING_TIME_MS); distribution: "deterministic", "exponential" ou "uniform"
+JOB_CLASS_PRESETS = {
+    "uniforme": [
+        {"name": "padrao", "weight": 1.0, "service_ms": PROCESSING_TIME_MS, "distribution": "deterministic"},
+    ],
+    "misto": [
+        {"name": "pequeno", "weight": 0.6, "service_ms": 600, "distribution": "exponential"},
+        {"name": "medio", "weight": 0.3, "service_ms": 2000, "distribution": "exponential"},
+        {"name": "grande", "weight": 0.1, "service_ms": 6000, "distribution": "uniform"},
+    ],
+}
+JOB_CLASSES = JOB_CLASS_PRESETS["uniforme"]
+
+# Redes de filas: estágios de CPUs em sequência (tandem) ou com roteamento
+# probabilístico entre eles (rede de Jackson). cpus: CPUs do estágio;
+# service_ms/distribution: demanda de cada visita (None = demanda da classe do processo);
+# routing: próximo estágio -> probabilidade (o que faltar para 1.0 sai do sistema)
+NETWORK_PRESETS = {
+    "simples": [],
+    "tandem": [
+        {"name": "parse", "cpus": 1, "service_ms": 500, "distribution": "exponential", "routing": {"compute": 1.0}},
+        {"name": "compute", "cpus": 2, "service_ms": 1500, "distribution": "exponential", "routing": {"write": 1.0}},
+        {"name": "write", "cpus": 1, "service_ms": 700, "distribution": "exponential", "routing": {}},
+    ],
+    "jackson": [
+        {"name": "parse", "cpus": 1, "service_ms": 400, "distribution": "exponential", "routing": {"compute": 1.0}},
+        {"name": "compute", "cpus": 2, "service_ms": 1200, "distribution": "exponential", "routing": {"compute": 0.2, "write": 0.8}},
+        {"name": "write", "cpus": 1, "service_ms": 500, "distribution": "exponential", "routing": {"parse": 0.1}},
+    ],
+}
+NETWORK_STAGES = NETWORK_PRESETS["simples"]
+
+# Escalonamento preemptivo (round-robin) nas CPUs
+TIME_SLICE_MS = None  # None = executa cada processo até o fim (sem preempção)
+CONTEXT_SWITCH_MS = 50  # Custo de cada troca de contexto no modo preemptivo
+TIME_SLICE_PRESETS = [None, 250, 500, 1000]  # Ciclo da tecla T no sandbox
+
+# Cores para múltiplas CPUs (ciclam quando há mais CPUs que cores)
+CPU_COLORS = [Colors.RED, Colors.CYAN, Colors.PINK, Colors.GREEN, Colors.YELLOW, Colors.PURPLE]
+CPU_COLOR_NAMES = ["Vermelha", "Ciano", "Rosa", "Verde", "Amarela", "Roxa"]
+
+# Quantidade de CPUs
+INITIAL_CPU_COUNT = 1
+MAX_CPUS = 512
+CPU_BASE_PRICE = 5  # CPU n custa CPU_BASE_PRICE * (n - 1) pontos
+COMPACT_CPU_THRESHOLD = 16  # Acima disso conexões e listas são resumidas
+# Nível de detalhe dos processos na tela (filas de entrada e trânsito)
+LOD_LABEL_THRESHOLD = 40  # acima disso os processos viram só sprites, sem o número, desenhados num único blits
+LOD_QUEUE_VISIBLE = 5     # processos desenhados por fila de entrada; o resto vira uma barra com a contagem
+MAX_HEALTH_POINTS = 15
+# Logging: nível ("DEBUG" mostra cada evento de processo), amostragem dos registros DEBUG
+# (1 a cada N de cada tipo) e limite de mensagens por segundo de cada tipo; o relatório
+# completo de métricas (a cada conclusão) tem um limite próprio
+LOG_LEVEL = "INFO"
+LOG_SAMPLE_EVERY = 1
+LOG_MAX_PER_SECOND = 20
+LOG_METRICS_PER_SECOND = 0.2
+
+# Trace de eventos em colunas para análise offline (None = desligado)
+TRACE_FILE = None
+
+# Exportação de métricas no formato de texto do Prometheus: arquivo e/ou porta HTTP local
+# (None = desligado), republicadas a cada METRICS_EXPORT_INTERVAL segundos de relógio real
+METRICS_EXPORT_FILE = None
+METRICS_EXPORT_PORT = None
+METRICS_EXPORT_INTERVAL = 5.0
+
+# Serviço de simulação (python -m core.service): comandos e métricas em JSON por linha num socket
+# local (TCP só em 127.0.0.1, ou socket Unix com --socket); métricas para os assinantes a cada
+# SERVICE_PUBLISH_INTERVAL segundos de relógio real
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8765
+SERVICE_PUBLISH_INTERVAL = 1.0
+# Maior speed aceito (segundos simulados por segundo real); acima disso, use o modo mais rápido (speed null)
+SERVICE_MAX_SPEED = 1000.0
+
+# Arquivo de cenário (.toml/.json, ver core/scenario.py) carregado na interface; None = cenário
+# padrão montado com as constantes acima (também aceito como argumento: python main.py cenario.toml)
+SCENARIO_FILE = None
+
+# Snapshot da sessão na interface: F5 salva, F9 retoma (CPUs, filas, processos, loja, pontuação, vida)
+SNAPSHOT_FILE = "simulador.snapshot"
 
-# Cores para múltiplas CPUs
-CPU_COLORS = [Colors.RED, Colors.CYAN, Colors.PINK]  # Adicionada esta linha
-MAX_HEALTH_POINTS = 15
\ No newline at end of file
+# Cache da descoberta de fontes do sistema (a primeira busca do SysFont é lenta); None = sem cache
+FONT_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "queue-simulator", "fontes.json")
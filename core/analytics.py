@@ -0,0 +1,135 @@
+import math
+
+
+def mmc_metrics(Lambda, Mu, c):
+    """Calcula métricas do modelo M/M/c (None se o sistema for instável)"""
+    if c <= 0 or Mu <= 0 or Lambda >= Mu * c:
+        return None  # Sistema instável
+
+    alfa = Lambda / Mu
+    rho = alfa / c
+
+    # Erlang B pela recursão estável (evita alfa**c e c! para muitas CPUs)
+    erlang_b = 1.0
+    for k in range(1, c + 1):
+        erlang_b = alfa * erlang_b / (k + alfa * erlang_b)
+    customer_delay = erlang_b / (1 - rho * (1 - erlang_b))  # Erlang C
+
+    # P0 = 1 / (S * (1 - B + B / (1 - rho))), S = soma de alfa^r/r! para r <= c (em log)
+    log_terms = [r * math.log(alfa) - math.lgamma(r + 1) for r in range(0, c + 1)] if alfa > 0 else [0.0]
+    log_max = max(log_terms)
+    log_s = log_max + math.log(sum(math.exp(t - log_max) for t in log_terms))
+    p0 = math.exp(-log_s) / (1 - erlang_b + erlang_b / (1 - rho))
+
+    Lq = customer_delay * rho / (1 - rho)
+    L = Lq + alfa
+
+    Wq = Lq / Lambda if Lambda > 0 else 0.0
+    W = Wq + 1 / Mu
+
+    return {
+        'L': L,
+        'Lq': Lq,
+        'W': W,
+        'Wq': Wq,
+        'P0': p0,
+        'rho': rho,
+        'Customer_Delay': customer_delay
+    }
+
+
+def solve_traffic_equations(routing, entry_rates):
+    """Resolve λ = γ + Pᵀλ de uma rede aberta (None se a rede não tiver saída)"""
+    # routing[i][j]: probabilidade de ir do estágio i para o j; entry_rates[i]: γ_i
+    n = len(entry_rates)
+    # Monta (I - Pᵀ) λ = γ e resolve por eliminação de Gauss com pivoteamento parcial
+    matrix = [[(1.0 if i == j else 0.0) - routing[j][i] for j in range(n)] + [entry_rates[i]]
+              for i in range(n)]
+    for col in range(n):
+        pivot = max(range(col, n), key=lambda row: abs(matrix[row][col]))
+        if abs(matrix[pivot][col]) < 1e-12:
+            return None
+        matrix[col], matrix[pivot] = matrix[pivot], matrix[col]
+        for row in range(n):
+            if row != col and matrix[row][col] != 0.0:
+                factor = matrix[row][col] / matrix[col][col]
+                for k in range(col, n + 1):
+                    matrix[row][k] -= factor * matrix[col][k]
+    rates = [matrix[i][n] / matrix[i][i] for i in range(n)]
+    if any(rate < -1e-9 for rate in rates):
+        return None
+    return [max(0.0, rate) for rate in rates]
+
+
+def _birth_death_probabilities(Lambda, Mu, c, K=None, theta=0.0, tolerance=1e-12, max_states=100000):
+    """Distribuição estacionária do número de processos num nascimento-e-morte M/M/c/K+M"""
+    # Pesos em log: p_n / p_0 = prod λ / (min(k, c) μ + max(0, k - c) θ), k = 1..n
+    log_weights = [0.0]
+    log_lambda = math.log(Lambda)
+    log_tolerance = math.log(tolerance)
+    log_max = 0.0  # máximo corrente dos pesos (a moda da distribuição)
+    n = 0
+    while (K is None or n < K) and n < max_states:
+        n += 1
+        death_rate = min(n, c) * Mu + max(0, n - c) * theta
+        log_weights.append(log_weights[-1] + log_lambda - math.log(death_rate))
+        log_max = max(log_max, log_weights[-1])
+        # Sem limite K a cauda é cortada quando fica desprezível e decrescente
+        if K is None and Lambda < death_rate and log_weights[-1] - log_max < log_tolerance:
+            break
+
+    weights = [math.exp(w - log_max) for w in log_weights]
+    total = sum(weights)
+    return [w / total for w in weights]
+
+
+def birth_death_metrics(Lambda, Mu, c, K=None, theta=0.0):
+    """Métricas do modelo M/M/c/K+M: capacidade K (None = ilimitada) e abandono θ (0 = sem)"""
+    if c <= 0 or Mu <= 0:
+        return None
+    if K is not None:
+        K = max(1, int(K))
+        c = min(c, K)  # Não há mais servidores ocupados do que lugares no sistema
+    if K is None and theta <= 0 and Lambda >= Mu * c:
+        return None  # Sem bloqueio nem abandono a fila cresce sem limite
+    if Lambda <= 0:
+        return {'P0': 1.0, 'P_block': 0.0, 'P_wait': 0.0, 'P_abandon': 0.0, 'lambda_eff': 0.0,
+                'throughput': 0.0, 'L': 0.0, 'Lq': 0.0, 'W': 1 / Mu, 'Wq': 0.0, 'rho': 0.0}
+
+    probabilities = _birth_death_probabilities(Lambda, Mu, c, K, theta)
+    last = len(probabilities) - 1
+    p_block = probabilities[last] if K is not None else 0.0
+
+    L = sum(n * p for n, p in enumerate(probabilities))
+    Lq = sum((n - c) * p for n, p in enumerate(probabilities) if n > c)
+    busy_servers = sum(min(n, c) * p for n, p in enumerate(probabilities))
+
+    lambda_eff = Lambda * (1 - p_block)  # chegadas admitidas
+    # Um admitido espera se encontra todos os servidores ocupados (e há lugar)
+    waiting_states = sum(p for n, p in enumerate(probabilities) if n >= c and (K is None or n < last))
+    p_wait = waiting_states / (1 - p_block) if p_block < 1 else 1.0
+    abandon_rate = theta * Lq
+
+    return {
+        'P0': probabilities[0],
+        'P_block': p_block,
+        'P_wait': p_wait,
+        'P_abandon': abandon_rate / lambda_eff if lambda_eff > 0 else 0.0,  # fração dos admitidos
+        'lambda_eff': lambda_eff,
+        'throughput': busy_servers * Mu,
+        'L': L,
+        'Lq': Lq,
+        'W': L / lambda_eff if lambda_eff > 0 else 0.0,
+        'Wq': Lq / lambda_eff if lambda_eff > 0 else 0.0,
+        'rho': busy_servers / c
+    }
+
+
+def mmck_metrics(Lambda, Mu, c, K):
+    """Métricas do M/M/c/K: probabilidade de bloqueio e taxa efetiva de chegadas"""
+    return birth_death_metrics(Lambda, Mu, c, K=K)
+
+
+def erlang_a_metrics(Lambda, Mu, c, theta, K=None):
+    """Métricas do Erlang-A (M/M/c+M): abandono com paciência exponencial de média 1/θ"""
+    return birth_death_metrics(Lambda, Mu, c, K=K, theta=theta)
@@ -0,0 +1,74 @@
+def _real_ticks():
+    """Relógio do pygame; importado só aqui para o modo headless (tempo virtual) não carregar o pygame"""
+    import pygame
+    return pygame.time.get_ticks()
+
+
+class SimulationClock:
+    """Relógio da simulação em ms: segue o pygame na interface ou avança em passos (modo headless)"""
+
+    def __init__(self):
+        self._virtual_ms = None  # None = tempo real do pygame
+        self._offset_ms = 0      # deslocamento do tempo real (snapshot restaurado na interface)
+
+    @property
+    def is_virtual(self) -> bool:
+        """Indica se o tempo é virtual (avançado pela própria simulação)"""
+        return self._virtual_ms is not None
+
+    def get_ticks(self):
+        """Instante atual em ms (mesma escala de pygame.time.get_ticks)"""
+        if self._virtual_ms is None:
+            return _real_ticks() + self._offset_ms
+        return self._virtual_ms
+
+    def use_virtual_time(self, start_ms=0):
+        """Passa a usar um relógio virtual, que só anda com advance()"""
+        self._virtual_ms = start_ms
+
+    def use_real_time(self):
+        """Volta a seguir o relógio do pygame"""
+        self._virtual_ms = None
+        self._offset_ms = 0
+
+    def set_time(self, ms):
+        """Faz o relógio marcar `ms` agora (restauração de snapshot), em qualquer um dos modos"""
+        if self._virtual_ms is None:
+            self._offset_ms = ms - _real_ticks()
+        else:
+            self._virtual_ms = ms
+
+    def advance(self, ms):
+        """Avança o relógio virtual em `ms` milissegundos"""
+        if self._virtual_ms is None:
+            raise RuntimeError("advance() só vale com o relógio virtual")
+        self._virtual_ms += ms
+
+
+class FixedTimestep:
+    """Acumulador de passo fixo: converte o tempo real de cada quadro em passos de `step_ms` da simulação"""
+
+    def __init__(self, step_ms, max_steps=8):
+        self.step_ms = step_ms
+        self.max_steps = max_steps
+        self.accumulator_ms = 0.0
+        self.dropped_ms = 0.0  # tempo real descartado pelo limite de passos (a simulação ficou para trás)
+
+    def steps(self, elapsed_ms) -> int:
+        """Quantos passos rodar neste quadro; a fração que sobra fica para o próximo"""
+        self.accumulator_ms += elapsed_ms
+        count = int(self.accumulator_ms // self.step_ms)
+        self.accumulator_ms -= count * self.step_ms
+        if count > self.max_steps:
+            # Quadro longo demais (janela arrastada, atualização lenta): descarta o excesso em vez de acumular atraso
+            self.dropped_ms += (count - self.max_steps) * self.step_ms
+            count = self.max_steps
+        return count
+
+    def reset(self):
+        """Zera o acumulado (nova simulação ou sessão restaurada)"""
+        self.accumulator_ms = 0.0
+
+
+# Relógio único compartilhado por processos, CPUs e simulador
+sim_clock = SimulationClock()
@@ -1,8 +1,9 @@
-import pygame
-from typing import List, Optional
-from config import Colors, MAX_CONNECTION_CAPACITY, TRANSPORT_SPEED
+from typing import List
+from config import FPS, MAX_CONNECTION_CAPACITY, TRANSPORT_SPEED, LOD_QUEUE_VISIBLE
 from entities.process import Process
 from entities.process_states import ProcessState
+from core.trace import event_trace, EVENT_CODES
+from core.profiler import frame_profiler
 
 class LoadBalancer:
     """Balanceador de carga para distribuir processos entre CPUs"""
@@ -10,17 +11,21 @@ class LoadBalancer:
     def __init__(self, computers):
         self.computers = computers
         self.current_index = 0
+        self.pool_indices = {}  # índice round-robin de cada pool de CPUs (por fonte)
         self.distribution_strategy = "round_robin"  # "round_robin", "least_loaded"
     
     def set_strategy(self, strategy):
         """Define a estratégia de distribuição"""
         self.distribution_strategy = strategy
     
-    def get_target_computer(self, process=None):
-        """Retorna a CPU alvo para o processo"""
+    def get_target_computer(self, process=None, pool=None, pool_key=None):
+        """Retorna a CPU alvo para o processo (opcionalmente restrita a um pool de CPUs)"""
         # CORREÇÃO: Verificar se há CPUs disponíveis
         if not self.computers:
             return None
+        
+        if pool is not None:
+            return self._pick_from_pool(pool, pool_key)
             
         if self.distribution_strategy == "round_robin":
             return self._round_robin()
@@ -29,6 +34,16 @@ class LoadBalancer:
         else:
             return self._round_robin()
     
+    def _pick_from_pool(self, pool, pool_key):
+        """Aplica a estratégia atual apenas às CPUs do pool"""
+        if not pool:
+            return None
+        if self.distribution_strategy == "least_loaded":
+            return min(pool, key=lambda cpu: cpu.queue_length + (0 if cpu.is_idle else 1))
+        index = self.pool_indices.get(pool_key, 0) % len(pool)
+        self.pool_indices[pool_key] = (index + 1) % len(pool)
+        return pool[index]
+    
     def _round_robin(self):
         """Distribuição round-robin entre CPUs"""
         # CORREÇÃO: Verificar se há CPUs disponíveis e resetar índice se necessário
@@ -64,10 +79,11 @@ class LoadBalancer:
         return load_info
 
 class ConnectionSystem:
-    def __init__(self, generator, computers):
-        self.generator = generator
+    def __init__(self, generators, computers, network=None):
+        self.generators = generators if isinstance(generators, list) else [generators]
         self.computers = computers if isinstance(computers, list) else [computers]
         self.load_balancer = LoadBalancer(self.computers)
+        self.network = network  # Rede de filas (estágios); None ou inativa = estágio único
         
         # Filas do sistema
         self.input_queue: List[Process] = []      # Fila de entrada
@@ -78,32 +94,75 @@ class ConnectionSystem:
         
         # Mapeamento de processos para CPUs alvo
         self.process_targets = {}  # process_id -> computer
+        self.hop_routes = {}  # process_id -> direção do trajeto entre estágios da rede
         
-        # Calcular direções para cada CPU
-        self.computer_directions = {}
+        # Calcular direções de cada gerador para cada CPU: (generator_id, computer) -> direção
+        self.route_directions = {}
+        self.generators_by_id = {}
+        self.generator_pools = {}  # generator_id -> lista de CPUs atendidas (None = todas)
         self._calculate_all_directions()
     
+    @property
+    def generator(self):
+        """Gerador principal (referência para indicadores e painéis)"""
+        return self.generators[0]
+    
+    @property
+    def total_created(self) -> int:
+        """Total de processos criados por todas as fontes"""
+        return sum(generator.created_count for generator in self.generators)
+    
     def _calculate_all_directions(self):
-        """Calcula direções para todas as CPUs"""
-        start_point = self.generator.get_center()
+        """Calcula direções de todos os geradores para todas as CPUs"""
+        self.route_directions = {}
+        self.generators_by_id = {generator.generator_id: generator for generator in self.generators}
+        self.generator_pools = {}
         
-        for computer in self.computers:
-            end_point = computer.get_center()
-            dx = end_point[0] - start_point[0]
-            dy = end_point[1] - start_point[1]
-            length = (dx**2 + dy**2)**0.5
-            
-            if length > 0:
-                self.computer_directions[computer] = {
-                    'dx': dx / length,
-                    'dy': dy / length,
-                    'length': length,
-                    'end_point': end_point
-                }
+        # Numa rede de filas as chegadas externas só vão para o estágio de entrada
+        entry_computers = self.network.entry_stage["computers"] if self.has_network else None
+        
+        for generator in self.generators:
+            start_point = generator.get_center()
+            if generator.pool is None:
+                self.generator_pools[generator.generator_id] = entry_computers
             else:
-                self.computer_directions[computer] = {
-                    'dx': 0, 'dy': 0, 'length': 0, 'end_point': end_point
-                }
+                self.generator_pools[generator.generator_id] = [
+                    computer for computer in (entry_computers or self.computers)
+                    if computer.computer_id in generator.pool
+                ]
+            
+            for computer in self.computers:
+                self.route_directions[(generator.generator_id, computer)] = self.direction(start_point, computer.get_center())
+    
+    @staticmethod
+    def direction(start_point, end_point) -> dict:
+        """Direção unitária, comprimento e destino de um trajeto em linha reta"""
+        dx = end_point[0] - start_point[0]
+        dy = end_point[1] - start_point[1]
+        length = (dx**2 + dy**2)**0.5
+        
+        if length > 0:
+            return {
+                'dx': dx / length,
+                'dy': dy / length,
+                'length': length,
+                'end_point': end_point
+            }
+        return {'dx': 0, 'dy': 0, 'length': 0, 'end_point': end_point}
+    
+    @property
+    def has_network(self) -> bool:
+        """Indica se os processos percorrem uma rede de estágios"""
+        return self.network is not None and self.network.is_active
+    
+    def update_generators_list(self, new_generators):
+        """Atualiza a lista de geradores (fontes de chegada)"""
+        self.generators = new_generators
+        self._calculate_all_directions()
+    
+    def source_generator(self, process):
+        """Gerador de origem do processo (o principal se a fonte não existir mais)"""
+        return self.generators_by_id.get(process.source_id, self.generator)
     
     def update_computers_list(self, new_computers):
         """CORREÇÃO: Atualiza a lista de computadores no load balancer"""
@@ -119,8 +178,12 @@ class ConnectionSystem:
             return False
             
         if self.total_processes < self.max_capacity:
-            # Escolhe a CPU alvo usando o balanceador de carga
-            target_computer = self.load_balancer.get_target_computer(process)
+            # Escolhe a CPU alvo usando o balanceador de carga (no pool da fonte, se houver)
+            source = self.source_generator(process)
+            balancer = self.network.entry_stage["load_balancer"] if self.has_network else self.load_balancer
+            target_computer = balancer.get_target_computer(
+                process, self.generator_pools.get(source.generator_id), source.generator_id
+            )
             
             # CORREÇÃO: Verificar se encontrou uma CPU válida
             if target_computer is None:
@@ -128,12 +191,32 @@ class ConnectionSystem:
                 
             self.process_targets[process.id] = target_computer
             
-            process.x, process.y = self.generator.get_center()
+            process.x, process.y = source.get_center()
             process.state = ProcessState.IN_QUEUE
             self.input_queue.append(process)
             return True
         return False
     
+    def retarget_process(self, process: Process, target_computer) -> None:
+        """Troca a CPU alvo de um processo que ainda está na fila de entrada ou em trânsito"""
+        self.process_targets[process.id] = target_computer
+        if process.id in self.hop_routes:
+            # Trajeto entre estágios: segue em linha reta da posição atual
+            self.hop_routes[process.id] = self.direction((process.x, process.y), target_computer.get_center())
+        else:
+            # O trajeto é uma reta a partir do gerador: recomeça dele
+            process.x, process.y = self.source_generator(process).get_center()
+    
+    def forward_process(self, process: Process, from_computer, target_computer) -> None:
+        """Envia um processo atendido para a CPU do próximo estágio da rede"""
+        start_point = from_computer.get_center()
+        self.process_targets[process.id] = target_computer
+        self.hop_routes[process.id] = self.direction(start_point, target_computer.get_center())
+        process.x, process.y = start_point
+        process.state = ProcessState.IN_TRANSIT
+        self.transit_processes.append(process)
+        event_trace.record(EVENT_CODES['transit'], process.id, target_computer.computer_id, from_computer.computer_id)
+    
     @property
     def total_processes(self) -> int:
         """Total de processos em todas as filas"""
@@ -150,24 +233,58 @@ class ConnectionSystem:
         # CORREÇÃO: Também verificar se há CPUs disponíveis
         return len(self.computers) > 0 and self.total_processes < self.max_capacity
     
-    def update(self) -> None:
-        """Atualiza todo o fluxo do sistema"""
+    def can_admit(self, generator) -> bool:
+        """Indica se uma chegada da fonte seria aceita: há capacidade e uma CPU no seu pool"""
+        if not self.has_capacity:
+            return False
+        pool = self.generator_pools.get(generator.generator_id)
+        return bool(pool) if pool is not None else bool(self.load_balancer.computers)
+    
+    def update(self, dt_seconds=1.0 / FPS) -> None:
+        """Atualiza todo o fluxo do sistema (dt_seconds: duração simulada do passo)"""
+        started = frame_profiler.start()
         self._move_from_input_to_transit()
-        self._update_transit_processes()
+        frame_profiler.stop('conexao.entrada', started)
+
+        started = frame_profiler.start()
+        self._update_transit_processes(dt_seconds)
+        frame_profiler.stop('conexao.transito', started)
+
+        started = frame_profiler.start()
         self._process_cpu_queues()
+        frame_profiler.stop('conexao.filas_cpu', started)
+
+        started = frame_profiler.start()
         self._update_visual_positions()
+        frame_profiler.stop('conexao.posicoes', started)
     
     def _move_from_input_to_transit(self) -> None:
-        """Move processos da fila de entrada para trânsito"""
+        """Move processos da fila de entrada para trânsito (um por fonte a cada quadro)"""
         # CORREÇÃO: Verificar se há CPUs disponíveis
-        if self.input_queue and len(self.transit_processes) < 8 and self.computers:
-            process = self.input_queue.pop(0)
+        if not self.input_queue or not self.computers:
+            return
+        
+        max_transit = 8 * len(self.generators)
+        served_sources = set()
+        for process in self.input_queue[:]:
+            if len(self.transit_processes) >= max_transit or len(served_sources) == len(self.generators):
+                break
+            if process.source_id in served_sources:
+                continue
+            served_sources.add(process.source_id)
+            self.input_queue.remove(process)
+            # O trajeto é uma reta a partir do centro do gerador: sair do lugar na fila de
+            # entrada deixaria o processo paralelo à reta, sem nunca chegar à CPU
+            process.x, process.y = self.source_generator(process).get_center()
             process.state = ProcessState.IN_TRANSIT
             self.transit_processes.append(process)
+            event_trace.record(EVENT_CODES['transit'], process.id, self.process_targets[process.id].computer_id)
     
-    def _update_transit_processes(self) -> None:
+    def _update_transit_processes(self, dt_seconds=1.0 / FPS) -> None:
         """Atualiza processos em trânsito"""
         arrived_processes = []
+        # transport_speed é dado em pixels por passo de 1/FPS: o deslocamento segue o tempo simulado
+        step = self.transport_speed * dt_seconds * FPS
         
         for process in self.transit_processes[:]:
             if process.state != ProcessState.PROCESSING:
@@ -176,19 +293,21 @@ class ConnectionSystem:
                 if not target_computer:
                     continue
                     
-                direction_info = self.computer_directions.get(target_computer)
+                direction_info = (self.hop_routes.get(process.id)
+                                  or self.route_directions.get((process.source_id, target_computer)))
                 if not direction_info:
                     continue
                 
                 # Movimento em direção à CPU alvo
-                process.x += direction_info['dx'] * self.transport_speed
-                process.y += direction_info['dy'] * self.transport_speed
+                process.x += direction_info['dx'] * step
+                process.y += direction_info['dy'] * step
                 
                 # Verificar chegada
-                if self._distance_to_computer(process, target_computer) <= self.transport_speed:
+                if self._distance_to_point(process, direction_info['end_point']) <= step:
                     process.x, process.y = direction_info['end_point']
                     arrived_processes.append((process, target_computer))
                     self.transit_processes.remove(process)
+                    self.hop_routes.pop(process.id, None)
         
         # Processar chegadas
         for process, target_computer in arrived_processes:
@@ -212,117 +331,22 @@ class ConnectionSystem:
             computer.update_queue_positions()
     
     def _update_input_queue_positions(self) -> None:
-        """Posiciona processos na fila de entrada"""
-        for i, process in enumerate(self.input_queue):
+        """Posiciona processos na fila de entrada, ao lado do gerador de origem"""
+        positions_by_source = {}
+        for process in self.input_queue:
             if process.state == ProcessState.IN_QUEUE:
+                i = positions_by_source.get(process.source_id, 0)
+                positions_by_source[process.source_id] = i + 1
+                if i >= LOD_QUEUE_VISIBLE:
+                    continue  # além dos visíveis a fila é só uma contagem: posição não importa
+                center_x, center_y = self.source_generator(process).get_center()
                 offset_x = -30 - (i * 25)
                 offset_y = -20 + (i % 3) * 15
-                process.x = self.generator.get_center()[0] + offset_x
-                process.y = self.generator.get_center()[1] + offset_y
+                process.x = center_x + offset_x
+                process.y = center_y + offset_y
     
-    def _distance_to_computer(self, process: Process, computer) -> float:
-        """Calcula distância do processo até a CPU alvo"""
-        end_point = self.computer_directions[computer]['end_point']
+    def _distance_to_point(self, process: Process, end_point) -> float:
+        """Calcula distância do processo até o destino do trajeto"""
         dx = end_point[0] - process.x
         dy = end_point[1] - process.y
         return (dx**2 + dy**2)**0.5
-    
-    def draw(self, screen: pygame.Surface) -> None:
-        """Desenha todo o sistema de conexão"""
-        self._draw_connection_lines(screen)
-        self._draw_arrows(screen)
-        self._draw_capacity_indicator(screen)
-        self._draw_all_processes(screen)
-    
-    def _draw_connection_lines(self, screen: pygame.Surface) -> None:
-        """Desenha as linhas de conexão para todas as CPUs"""
-        start_point = self.generator.get_center()
-        
-        for computer in self.computers:
-            end_point = computer.get_center()
-            # Usar a cor da CPU para a linha de conexão
-            line_color = computer.base_color
-            pygame.draw.line(screen, line_color, start_point, end_point, 3)
-    
-    def _draw_arrows(self, screen: pygame.Surface) -> None:
-        """Desenha setas indicando direção para cada CPU"""
-        arrow_size = 8
-        start_point = self.generator.get_center()
-        
-        for computer in self.computers:
-            direction_info = self.computer_directions.get(computer)
-            if not direction_info:
-                continue
-                
-            # Ponto no meio do caminho
-            mid_x = start_point[0] + direction_info['dx'] * direction_info['length'] * 0.5
-            mid_y = start_point[1] + direction_info['dy'] * direction_info['length'] * 0.5
-            
-            tip = (mid_x + direction_info['dx'] * arrow_size, 
-                   mid_y + direction_info['dy'] * arrow_size)
-            
-            perp_x = -direction_info['dy']
-            perp_y = direction_info['dx']
-            
-            left = (mid_x + perp_x * arrow_size/2, mid_y + perp_y * arrow_size/2)
-            right = (mid_x - perp_x * arrow_size/2, mid_y - perp_y * arrow_size/2)
-            
-            pygame.draw.polygon(screen, computer.base_color, [tip, left, right])
-    
-    def _draw_capacity_indicator(self, screen: pygame.Surface) -> None:
-        """Desenha indicador de capacidade"""
-        font = pygame.font.SysFont(None, 20)
-        
-        # CORREÇÃO: Mensagem diferente quando não há CPUs
-        if not self.computers:
-            capacity_text = font.render("SISTEMA SEM CPUS!", True, Colors.RED)
-            screen.blit(capacity_text, (self.generator.get_center()[0] - 50, self.generator.get_center()[1] - 40))
-            
-            # Mostrar instrução para comprar CPUs
-            instruction_text = font.render("Compre CPUs na loja!", True, Colors.YELLOW)
-            screen.blit(instruction_text, (self.generator.get_center()[0] - 50, self.generator.get_center()[1] - 20))
-            return
-        
-        capacity_text = font.render(f"Capacidade: {self.total_processes}/{self.max_capacity}", True, Colors.WHITE)
-        screen.blit(capacity_text, (self.generator.get_center()[0] - 50, self.generator.get_center()[1] - 60))
-        
-        # Barra de progresso
-        bar_width = 100
-        bar_height = 8
-        bar_x = self.generator.get_center()[0] - 50
-        bar_y = self.generator.get_center()[1] - 40
-        
-        pygame.draw.rect(screen, Colors.DARK_GRAY, (bar_x, bar_y, bar_width, bar_height))
-        
-        percentage = self.total_processes / self.max_capacity
-        bar_color = (Colors.LIGHT_GREEN if percentage < 0.7 
-                    else Colors.YELLOW if percentage < 0.9 
-                    else Colors.RED)
-        
-        pygame.draw.rect(screen, bar_color, (bar_x, bar_y, bar_width * percentage, bar_height))
-        
-        # Informações de carga das CPUs
-        load_info = self.load_balancer.get_system_load()
-        load_y = bar_y + 100
-        for computer_name, info in load_info.items():
-            status = "PARADA" if info['is_stopped'] else "ATIVA"
-            status_color = Colors.RED if info['is_stopped'] else Colors.GREEN
-            load_text = font.render(f"{computer_name}: {info['queue_length']} na fila", True, Colors.WHITE)
-            status_text = font.render(f"({status})", True, status_color)
-            
-            screen.blit(load_text, (bar_x, load_y))
-            screen.blit(status_text, (bar_x + 120, load_y))
-            load_y += 15
-    
-    def _draw_all_processes(self, screen: pygame.Surface) -> None:
-        """Desenha todos os processos visíveis"""
-        # Processos na fila de entrada e em trânsito
-        for process in self.input_queue + self.transit_processes:
-            if process.state != ProcessState.PROCESSING:
-                process.draw(screen)
-        
-        # Processos nas filas das CPUs
-        for computer in self.computers:
-            for process in computer.queue:
-                if process.state != ProcessState.PROCESSING:
-                    process.draw(screen)
\ No newline at end of file
@@ -0,0 +1,214 @@
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from config import FPS
+from core.clock import sim_clock
+from core.profiler import RollingHistogram
+from core.log import get_logger
+
+logger = get_logger("exportador")
+
+PREFIX = "queue_sim"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class PrometheusText:
+    """Montador do formato de texto do Prometheus (HELP/TYPE uma vez por métrica)"""
+
+    def __init__(self):
+        self.lines = []
+
+    def metric(self, name, kind, help_text, samples):
+        """Acrescenta uma métrica: `samples` é uma lista de (sufixo, rótulos, valor)"""
+        full_name = f"{PREFIX}_{name}"
+        self.lines.append(f"# HELP {full_name} {help_text}")
+        self.lines.append(f"# TYPE {full_name} {kind}")
+        for suffix, labels, value in samples:
+            if value is None:
+                continue
+            label_text = ",".join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+            label_text = f"{{{label_text}}}" if label_text else ""
+            self.lines.append(f"{full_name}{suffix}{label_text} {float(value):.6g}")
+
+    def text(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_metrics(simulator, frame_stats=None) -> str:
+    """Métricas do simulador em texto do Prometheus (chamar na thread da simulação)"""
+    out = PrometheusText()
+    now = sim_clock.get_ticks()
+    cpus = [{'cpu': computer.name} for computer in simulator.computers]
+
+    out.metric("simulated_seconds", "gauge", "Tempo simulado desde o inicio",
+               [("", {}, now / 1000)])
+    out.metric("cpu_queue_length", "gauge", "Processos na fila de cada CPU",
+               [("", labels, len(computer.queue)) for labels, computer in zip(cpus, simulator.computers)])
+    out.metric("cpu_busy", "gauge", "CPU atendendo um processo (1) ou ociosa (0)",
+               [("", labels, 0 if computer.is_idle else 1) for labels, computer in zip(cpus, simulator.computers)])
+    out.metric("cpu_stopped", "gauge", "CPU parada (1) ou ativa (0)",
+               [("", labels, 1 if computer.is_stopped else 0) for labels, computer in zip(cpus, simulator.computers)])
+    out.metric("cpu_utilization", "gauge", "Fracao do tempo em que a CPU esteve ocupada",
+               [("", labels, computer.utilization()) for labels, computer in zip(cpus, simulator.computers)])
+    out.metric("cpu_visits_total", "counter", "Visitas concluidas por CPU",
+               [("", labels, computer.sojourn_stats.count) for labels, computer in zip(cpus, simulator.computers)])
+
+    occupancy = simulator.measured_occupancy()
+    out.metric("processes_in_system", "gauge", "Processos no sistema (fila de entrada, transito, filas e CPUs)",
+               [("", {}, simulator.connection.total_processes)])
+    out.metric("capacity", "gauge", "Capacidade K do sistema",
+               [("", {}, simulator.connection.max_capacity)])
+    out.metric("mean_in_system", "gauge", "L medido (media no tempo)", [("", {}, occupancy['L'])])
+    out.metric("mean_queue_length", "gauge", "Lq medido (media no tempo)", [("", {}, occupancy['Lq'])])
+    out.metric("utilization", "gauge", "rho medido (tempo ocupado / tempo disponivel)", [("", {}, occupancy['rho'])])
+    out.metric("arrival_rate", "gauge", "Taxa de chegada configurada (processos/s)", [("", {}, simulator.arrival_rate)])
+
+    out.metric("created_total", "counter", "Processos admitidos", [("", {}, simulator.connection.total_created)])
+    out.metric("completed_total", "counter", "Processos concluidos", [("", {}, simulator.completed_processes)])
+    out.metric("timed_out_total", "counter", "Processos expirados na fila", [("", {}, simulator.timed_out_processes)])
+    out.metric("blocked_total", "counter", "Chegadas perdidas com o sistema cheio", [("", {}, simulator.blocked_arrivals)])
+
+    latency_samples = []
+    for kind, stats in simulator.latency_stats.items():
+        labels = {'kind': kind}
+        for p in stats.QUANTILES:
+            value = stats.quantile(p)
+            latency_samples.append(("", {**labels, 'quantile': str(p)}, value / 1000 if value is not None else None))
+        latency_samples.append(("_sum", labels, stats.mean * stats.count / 1000))
+        latency_samples.append(("_count", labels, stats.count))
+    out.metric("latency_seconds", "summary", "Tempos de resposta, retorno e servico (quantis P2)", latency_samples)
+
+    if frame_stats:
+        out.metric("frame_seconds", "summary", "Duracao de cada quadro/passo do loop (janela movel)",
+                   [("", {'quantile': str(p)}, value / 1000) for p, value in frame_stats['quantiles']]
+                   + [("_sum", {}, frame_stats['sum_ms'] / 1000), ("_count", {}, frame_stats['count'])])
+        out.metric("event_loop_lag_seconds", "gauge", "Atraso do ultimo quadro alem do orcamento de 1/FPS",
+                   [("", {}, frame_stats['lag_ms'] / 1000)])
+        out.metric("throughput_per_second", "gauge", "Conclusoes por segundo simulado desde a ultima publicacao",
+                   [("", {}, frame_stats.get('throughput'))])
+    return out.text()
+
+
+class MetricsExporter:
+    """Publica as métricas periodicamente num arquivo e/ou num endpoint HTTP local, fora do loop da simulação"""
+
+    # O texto é montado na thread da simulação (leitura consistente do estado) só a cada `interval_seconds`;
+    # a escrita do arquivo e o atendimento HTTP ficam numa thread de fundo que só lê o último texto pronto.
+    # Os quadros podem ser medidos noutra thread (record_frame na interface, com a simulação na sua)
+    FRAME_QUANTILES = (0.5, 0.95, 0.99)
+
+    def __init__(self, path=None, port=None, host="127.0.0.1", interval_seconds=5.0):
+        self.path = path
+        self.port = port
+        self.host = host
+        self.interval_seconds = interval_seconds
+        self.frame_histogram = RollingHistogram(600)
+        self.frame_count = 0
+        self.frame_sum_ms = 0.0
+        self.last_lag_ms = 0.0
+        self._frame_lock = threading.Lock()
+        self._latest = b""
+        self._last_frame = None
+        self._last_publish = None
+        self._last_completed = None
+        self._wake = threading.Event()
+        self._stopping = False
+        self._writer = None
+        self._server = None
+
+    def start(self):
+        """Sobe a thread de escrita do arquivo e/ou o servidor HTTP"""
+        if self.path:
+            self._writer = threading.Thread(target=self._write_loop, name="exportador-arquivo", daemon=True)
+            self._writer.start()
+        if self.port is not None:
+            exporter = self
+
+            class Handler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    if self.path.split("?")[0] not in ("/", "/metrics"):
+                        self.send_error(404)
+                        return
+                    body = exporter._latest
+                    self.send_response(200)
+                    self.send_header("Content-Type", CONTENT_TYPE)
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, format, *args):
+                    logger.debug("HTTP %s", format % args)
+
+            self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+            self._server.daemon_threads = True
+            threading.Thread(target=self._server.serve_forever, name="exportador-http", daemon=True).start()
+            logger.info("Metricas em http://%s:%s/metrics", self.host, self._server.server_address[1])
+        return self
+
+    def stop(self):
+        """Grava o último texto publicado e encerra as threads"""
+        self._stopping = True
+        self._wake.set()
+        if self._writer is not None:
+            self._writer.join(timeout=2)
+            self._writer = None
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def record_frame(self):
+        """Mede a duração do quadro desde a chamada anterior (uma vez por quadro desenhado)"""
+        now = time.perf_counter()
+        with self._frame_lock:
+            if self._last_frame is not None:
+                frame_ms = (now - self._last_frame) * 1000
+                self.frame_histogram.add(frame_ms)
+                self.frame_count += 1
+                self.frame_sum_ms += frame_ms
+                self.last_lag_ms = max(0.0, frame_ms - 1000 / FPS)
+            self._last_frame = now
+
+    def publish(self, simulator, force=False, frame=True):
+        """Chamado a cada quadro/passo: mede o quadro (frame=True) e, vencido o intervalo, monta um novo texto"""
+        if frame:
+            self.record_frame()
+        now = time.perf_counter()
+        if not force and self._last_publish is not None and now - self._last_publish[0] < self.interval_seconds:
+            return
+        throughput = None
+        sim_now = sim_clock.get_ticks()
+        if self._last_publish is not None and sim_now > self._last_publish[1]:
+            throughput = (simulator.completed_processes - self._last_completed) / ((sim_now - self._last_publish[1]) / 1000)
+        self._last_publish = (now, sim_now)
+        self._last_completed = simulator.completed_processes
+
+        with self._frame_lock:
+            frame_stats = {'quantiles': [(p, self.frame_histogram.quantile(p)) for p in self.FRAME_QUANTILES],
+                           'count': self.frame_count, 'sum_ms': self.frame_sum_ms,
+                           'lag_ms': self.last_lag_ms, 'throughput': throughput}
+        # Troca de referência: as threads de fundo sempre veem um texto completo
+        self._latest = render_metrics(simulator, frame_stats).encode()
+        self._wake.set()
+
+    def _write_loop(self):
+        """Grava o último texto publicado (arquivo temporário + rename, para o coletor nunca ler pela metade)"""
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            body = self._latest
+            if body:
+                temp_path = f"{self.path}.tmp"
+                try:
+                    with open(temp_path, "wb") as metrics_file:
+                        metrics_file.write(body)
+                    os.replace(temp_path, self.path)
+                except OSError as error:
+                    logger.warning("Falha ao gravar metricas em %s: %s", self.path, error)
+            if self._stopping:
+                return
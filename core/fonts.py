@@ -0,0 +1,55 @@
+import json
+import os
+import sys
+from config import FONT_CACHE_FILE
+from core.log import get_logger
+
+logger = get_logger("fontes")
+
+CACHE_VERSION = 1
+
+
+def _cache_key() -> dict:
+    """Identifica a máquina/versão para a qual a descoberta de fontes foi feita"""
+    import pygame
+    return {'version': CACHE_VERSION, 'pygame': pygame.version.ver, 'platform': sys.platform}
+
+
+def install_font_cache(path=FONT_CACHE_FILE) -> bool:
+    """Prepara o pygame.sysfont antes do primeiro SysFont: lê a descoberta de fontes do disco ou faz e grava"""
+    # A primeira chamada de SysFont varre as fontes do sistema (fc-list, registro do Windows...), o que
+    # demora em máquinas com muitas fontes; o resultado é o mesmo entre execuções, então fica em disco.
+    # Retorna True se o cache foi usado.
+    from pygame import sysfont
+    if sysfont.is_init or not path:
+        return False
+    key = _cache_key()
+    try:
+        with open(path, "r", encoding="utf-8") as cache_file:
+            data = json.load(cache_file)
+        if data.get('key') == key:
+            fonts = {}
+            for name, styles in data['fonts'].items():
+                # (negrito, itálico) -> arquivo; entradas de fontes removidas do sistema são descartadas
+                entries = {(bool(bold), bool(italic)): file for bold, italic, file in styles if os.path.exists(file)}
+                if entries:
+                    fonts[name] = entries
+            sysfont.Sysfonts.update(fonts)
+            sysfont.create_aliases()
+            sysfont.is_init = True
+            return True
+    except (OSError, ValueError, KeyError, TypeError) as error:
+        logger.debug("Cache de fontes ignorado (%s): %s", path, error)
+
+    sysfont.initsysfonts()
+    data = {'key': key, 'fonts': {name: [[bold, italic, file] for (bold, italic), file in styles.items()]
+                                  for name, styles in sysfont.Sysfonts.items()}}
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as cache_file:
+            json.dump(data, cache_file)
+        os.replace(temp_path, path)
+    except OSError as error:
+        logger.warning("Falha ao gravar o cache de fontes em %s: %s", path, error)
+    return False
@@ -0,0 +1,336 @@
+import argparse
+import random
+from config import SIM_STEP_MS, NETWORK_PRESETS
+from core.clock import sim_clock
+from core.output_analysis import confidence_interval, min_observations, mser_truncation, steady_state_ci
+from core.queue_simulator import QueueSimulator
+from core.trace import event_trace
+from core.replay import open_arrival_trace
+from core.log import configure_logging
+from core.profiler import frame_profiler
+from core.exporter import MetricsExporter
+from core.snapshot import restore, save_snapshot
+from core.scenario import load_scenario
+from entities.generator import ARRIVAL_DISTRIBUTIONS
+
+# Mesmo passo fixo da interface: headless e janela avançam a simulação em passos idênticos
+STEP_MS = SIM_STEP_MS
+
+METRIC_LABELS = {
+    'throughput': ("Vazao", "/s"),
+    'W': ("W (retorno)", "s"),
+    'Wq': ("Wq (espera)", "s"),
+    'timeout_rate': ("Expiracao", "")
+}
+
+
+def build_simulator(cpus=None, interval=None, distribution=None, service=None, network=None,
+                    max_queue_time=None, capacity=None, strategy=None, arrival_trace=None, base_scenario=None):
+    """Cria um simulador (modo sandbox) com o cenário pedido; None mantém o padrão do cenário base"""
+    # base_scenario: cenário compilado (core.scenario) de partida; os demais argumentos o sobrepõem
+    return configure_simulator(QueueSimulator(base_scenario), cpus, interval, distribution, service, network,
+                               max_queue_time, capacity, strategy, arrival_trace)
+
+
+def configure_simulator(simulator, cpus=None, interval=None, distribution=None, service=None, network=None,
+                        max_queue_time=None, capacity=None, strategy=None, arrival_trace=None):
+    """Aplica o cenário a um simulador existente (também a um restaurado de snapshot: ramo what-if)"""
+    # interval e distribution valem para todas as fontes; o trace de chegadas só tem uma fonte a quem ir
+    if arrival_trace and len(simulator.generators) > 1:
+        raise ValueError(f"--arrival-trace exige um cenário com uma fonte (este tem {len(simulator.generators)}); "
+                         "com várias, use sources[].trace no cenário")
+    if strategy:
+        simulator.connection.load_balancer.set_strategy(strategy)
+    if network:
+        simulator.set_network(NETWORK_PRESETS[network])
+    if cpus:
+        simulator.set_computer_count(cpus)
+    for generator in simulator.generators:
+        if distribution:
+            generator.distribution = distribution
+            generator.schedule_next_arrival()
+        if interval:
+            generator.set_interval(interval)
+    if service:
+        for computer in simulator.computers:
+            computer.set_processing_time(service)
+    if max_queue_time:
+        simulator.max_queue_time_seconds = max_queue_time
+    if capacity:
+        simulator.connection.max_capacity = capacity
+    if arrival_trace:
+        simulator.generator.set_arrival_trace(open_arrival_trace(arrival_trace))
+    return simulator
+
+
+class OutputSeries:
+    """Séries por janela de tempo (vazão, W, Wq e fração expirada) para a análise de saída"""
+
+    METRICS = ('throughput', 'W', 'Wq', 'timeout_rate')
+
+    def __init__(self, simulator, bin_seconds=10.0):
+        self.simulator = simulator
+        self.bin_seconds = bin_seconds
+        self.series = {name: [] for name in self.METRICS}
+        self._last = self._counters()
+        self._next_bin_ms = sim_clock.get_ticks() + bin_seconds * 1000
+
+    def _counters(self):
+        """Contadores acumulados do simulador (concluídos, retorno, resposta, expirados)"""
+        simulator = self.simulator
+        return (simulator.completed_processes, simulator.total_turnaround_time_ms,
+                simulator.total_response_time_ms, simulator.timed_out_processes)
+
+    def update(self):
+        """Fecha a janela atual quando o relógio passa do seu fim"""
+        if sim_clock.get_ticks() < self._next_bin_ms:
+            return
+        self._next_bin_ms += self.bin_seconds * 1000
+
+        current = self._counters()
+        completed, turnaround_ms, response_ms, timed_out = (now - before for now, before in zip(current, self._last))
+        self._last = current
+
+        self.series['throughput'].append(completed / self.bin_seconds)
+        # Janelas sem conclusões não dizem nada sobre os tempos (ficam de fora)
+        self.series['W'].append(turnaround_ms / completed / 1000 if completed else None)
+        self.series['Wq'].append(response_ms / completed / 1000 if completed else None)
+        finished = completed + timed_out
+        self.series['timeout_rate'].append(timed_out / finished if finished else None)
+
+    def values(self, name):
+        """Observações válidas de uma métrica, em ordem"""
+        return [value for value in self.series[name] if value is not None]
+
+    def analyze(self, num_batches=20, confidence=0.95):
+        """IC de estado estacionário de cada métrica (aquecimento truncado por MSER-5)"""
+        return {name: steady_state_ci(self.values(name), num_batches, confidence) for name in self.METRICS}
+
+
+class HeadlessRunner:
+    """Roda o simulador sem janela, num relógio virtual, tão rápido quanto a CPU permitir"""
+
+    def __init__(self, scenario=None, seed=None, bin_seconds=10.0, exporter=None, snapshot=None, recorder=None):
+        if seed is not None:
+            random.seed(seed)
+        sim_clock.use_virtual_time(0)
+        if snapshot is not None:
+            # Parte de um estado salvo (checkpoint ou aquecimento): com semente, o ramo tem sua própria
+            # sequência aleatória; sem ela, continua exatamente a do snapshot
+            options = dict(scenario or {})
+            if options.pop("base_scenario", None) is not None:
+                raise ValueError("Um snapshot já traz o seu cenário: não combine --scenario com --snapshot-in")
+            self.simulator = configure_simulator(restore(snapshot, restore_random=seed is None), **options)
+        else:
+            self.simulator = build_simulator(**(scenario or {}))
+        self.series = OutputSeries(self.simulator, bin_seconds)
+        self.exporter = exporter  # MetricsExporter opcional, alimentado a cada passo
+        self.recorder = recorder  # FrameRecorder opcional (quadros em tempo simulado fixo)
+        self.checkpoint_path = None
+        self._checkpoint_every_ms = None
+        self._next_checkpoint_ms = None
+
+    def enable_checkpoints(self, path, every_seconds):
+        """Grava um snapshot em `path` a cada `every_seconds` de tempo simulado"""
+        self.checkpoint_path = path
+        self._checkpoint_every_ms = every_seconds * 1000
+        self._next_checkpoint_ms = sim_clock.get_ticks() + self._checkpoint_every_ms
+
+    def checkpoint(self, path=None):
+        """Grava o estado atual do simulador (retomável com HeadlessRunner(snapshot=...))"""
+        save_snapshot(self.simulator, path or self.checkpoint_path)
+
+    @property
+    def simulated_seconds(self) -> float:
+        return sim_clock.get_ticks() / 1000
+
+    def step(self):
+        """Avança um passo fixo (STEP_MS) e alimenta séries, exportador, gravador e checkpoints"""
+        sim_clock.advance(STEP_MS)
+        self.simulator.update(STEP_MS / 1000)
+        self.series.update()
+        if self.exporter:
+            self.exporter.publish(self.simulator)
+        if self.recorder:
+            self.recorder.capture(self.simulator)
+        if self._next_checkpoint_ms is not None and sim_clock.get_ticks() >= self._next_checkpoint_ms:
+            self._next_checkpoint_ms += self._checkpoint_every_ms
+            self.checkpoint()
+
+    def run_for(self, seconds):
+        """Avança a simulação `seconds` segundos de tempo simulado"""
+        for _ in range(int(round(seconds * 1000 / STEP_MS))):
+            self.step()
+
+    def run_until_precision(self, target=0.05, metric='W', min_seconds=600, max_seconds=36000,
+                            check_every_seconds=60, num_batches=20, confidence=0.95):
+        """Roda até a meia-largura relativa do IC da métrica cair abaixo de `target` (ou até max_seconds)"""
+        self.run_for(min_seconds)
+        while True:
+            result = self.series.analyze(num_batches, confidence)
+            ci = result[metric]
+            converged = ci is not None and ci['relative_half_width'] <= target
+            if converged or self.simulated_seconds >= max_seconds:
+                return {'converged': converged, 'simulated_seconds': self.simulated_seconds, 'metrics': result}
+            self.run_for(min(check_every_seconds, max_seconds - self.simulated_seconds))
+
+
+def run_replications(scenario, replications=10, seconds=3600, seed=1, bin_seconds=10.0,
+                     target=None, metric='W', confidence=0.95, exporter=None, snapshot=None):
+    """Replicações independentes: média pós-aquecimento de cada uma e IC entre elas"""
+    # Com `target`, para assim que a meia-largura relativa da métrica fica abaixo dele (mínimo 3);
+    # com `snapshot`, todas partem do mesmo estado aquecido, cada uma com sua semente
+    means = {name: [] for name in OutputSeries.METRICS}
+    result = None
+    for replication in range(replications):
+        runner = HeadlessRunner(scenario, seed=seed + replication, bin_seconds=bin_seconds, exporter=exporter,
+                                snapshot=snapshot)
+        runner.run_for(seconds)
+        for name in OutputSeries.METRICS:
+            values = runner.series.values(name)
+            values = values[mser_truncation(values):]
+            if values:
+                means[name].append(sum(values) / len(values))
+
+        result = {name: confidence_interval(means[name], confidence) for name in OutputSeries.METRICS}
+        ci = result[metric]
+        if target is not None and replication >= 2 and ci is not None and ci['relative_half_width'] <= target:
+            break
+    return {'replications': replication + 1, 'metrics': result}
+
+
+def format_report(metrics, bin_seconds, min_seconds=None):
+    """Linhas de texto com média ± meia-largura e aquecimento descartado de cada métrica"""
+    # `min_seconds`: duração mínima da corrida para haver IC, sugerida quando faltam amostras
+    lines = []
+    for name, ci in metrics.items():
+        label, unit = METRIC_LABELS[name]
+        if ci is None:
+            hint = f" (rode pelo menos {min_seconds:.0f}s)" if min_seconds else ""
+            lines.append(f"{label}: amostras insuficientes{hint}")
+            continue
+        if name == 'timeout_rate':
+            text = f"{ci['mean'] * 100:.2f}% ± {ci['half_width'] * 100:.2f}"
+        else:
+            text = f"{ci['mean']:.3f}{unit} ± {ci['half_width']:.3f}"
+        text += f" ({ci['confidence'] * 100:.0f}%, n={ci['n']}"
+        if 'warmup' in ci:
+            text += f", aquecimento {ci['warmup'] * bin_seconds:.0f}s"
+        lines.append(f"{label}: {text})")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulação sem interface com intervalos de confiança")
+    parser.add_argument("--scenario", help="arquivo de cenário (.toml/.json) usado como base; as opções abaixo o sobrepõem "
+                                             "(não combina com --snapshot-in)")
+    parser.add_argument("--seconds", type=float, default=3600, help="tempo simulado (ou mínimo com --precision)")
+    parser.add_argument("--precision", type=float, help="meia-largura relativa alvo (ex.: 0.05)")
+    parser.add_argument("--max-seconds", type=float, default=36000, help="limite de tempo simulado com --precision")
+    parser.add_argument("--metric", choices=OutputSeries.METRICS, default="W", help="métrica que define a precisão")
+    parser.add_argument("--replications", type=int, help="replicações independentes em vez de médias de lotes")
+    parser.add_argument("--batches", type=int, default=20)
+    parser.add_argument("--bin-seconds", type=float, default=10.0, help="janela de cada observação")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--seed", type=int, help="semente (padrão 1; ao retomar um snapshot, a dele)")
+    parser.add_argument("--cpus", type=int)
+    parser.add_argument("--interval", type=float, help="intervalo médio entre chegadas de cada fonte (s)")
+    parser.add_argument("--distribution", choices=ARRIVAL_DISTRIBUTIONS, help="distribuição das chegadas de todas as fontes")
+    parser.add_argument("--service", type=float, help="tempo de processamento das CPUs (s)")
+    parser.add_argument("--network", choices=list(NETWORK_PRESETS))
+    parser.add_argument("--max-queue-time", type=float)
+    parser.add_argument("--capacity", type=int)
+    parser.add_argument("--strategy", choices=("round_robin", "least_loaded"))
+    parser.add_argument("--trace", help="grava o trace de eventos em colunas neste arquivo")
+    parser.add_argument("--arrival-trace", help="reproduz as chegadas deste trace num cenário de uma fonte (CSV ou binário; do binário "
+                                                   "só os instantes, o serviço e a classe são sorteados de novo)")
+    parser.add_argument("--log-level", default="WARNING", help="nível do log do simulador (padrão: silencioso)")
+    parser.add_argument("--profile", action="store_true", help="mede as fases do update e mostra a tabela no fim")
+    parser.add_argument("--metrics-file", help="grava as métricas (texto do Prometheus) neste arquivo")
+    parser.add_argument("--metrics-port", type=int, help="serve as métricas em http://127.0.0.1:PORTA/metrics")
+    parser.add_argument("--metrics-interval", type=float, default=5.0, help="segundos (reais) entre publicações")
+    parser.add_argument("--record", help="grava a simulação: diretório de PNGs ou arquivo de vídeo bruto (--record-format raw)")
+    parser.add_argument("--record-format", choices=("png", "raw"), default="png")
+    parser.add_argument("--record-fps", type=float, default=30, help="quadros por segundo do vídeo")
+    parser.add_argument("--record-speed", type=float, default=1.0, help="segundos simulados por segundo de vídeo")
+    parser.add_argument("--snapshot-in", help="parte do estado salvo neste snapshot (as opções de cenário são aplicadas por cima)")
+    parser.add_argument("--snapshot-out", help="grava o estado final (e os checkpoints) neste arquivo")
+    parser.add_argument("--checkpoint-every", type=float, help="segundos simulados entre checkpoints em --snapshot-out")
+    args = parser.parse_args(argv)
+    if args.scenario and args.snapshot_in:
+        parser.error("--scenario não combina com --snapshot-in: o snapshot já traz o seu cenário")
+    configure_logging(args.log_level)
+    if args.trace:
+        event_trace.start(args.trace)
+    if args.profile and not frame_profiler.enabled:
+        frame_profiler.toggle()
+    exporter = None
+    if args.metrics_file or args.metrics_port is not None:
+        exporter = MetricsExporter(args.metrics_file, args.metrics_port,
+                                   interval_seconds=args.metrics_interval).start()
+
+    scenario = {key: getattr(args, key) for key in
+                ("cpus", "interval", "distribution", "service", "network", "max_queue_time", "capacity", "strategy",
+                 "arrival_trace")}
+    # O arquivo de cenário é validado uma única vez; replicações e ramos partem do mesmo objeto
+    scenario["base_scenario"] = load_scenario(args.scenario) if args.scenario else None
+    snapshot = None
+    if args.snapshot_in:
+        with open(args.snapshot_in, "rb") as snapshot_file:
+            snapshot = snapshot_file.read()
+
+    if args.replications:
+        result = run_replications(scenario, args.replications, args.seconds,
+                                  args.seed if args.seed is not None else 1, args.bin_seconds,
+                                  args.precision, args.metric, args.confidence, exporter, snapshot)
+        print(f"=== {result['replications']} REPLICACOES de {args.seconds:.0f}s ===")
+        metrics = result['metrics']
+        min_seconds = None  # o IC entre replicações não depende da duração de cada uma
+    else:
+        # Retomando um snapshot sem --seed explícito, a sequência aleatória continua a do snapshot
+        seed = args.seed if args.seed is not None or snapshot is not None else 1
+        recorder = None
+        if args.record:
+            # Importado só aqui: define o driver de vídeo dummy antes do pygame.init()
+            from core.recorder import FrameRecorder
+            recorder = FrameRecorder(args.record, args.record_format, args.record_fps, args.record_speed)
+        runner = HeadlessRunner(scenario, seed=seed, bin_seconds=args.bin_seconds, exporter=exporter,
+                                snapshot=snapshot, recorder=recorder)
+        if recorder:
+            recorder.start()
+        if args.snapshot_out and args.checkpoint_every:
+            runner.enable_checkpoints(args.snapshot_out, args.checkpoint_every)
+        if args.precision:
+            result = runner.run_until_precision(args.precision, args.metric, args.seconds, args.max_seconds,
+                                                num_batches=args.batches, confidence=args.confidence)
+            status = "atingida" if result['converged'] else "NAO atingida"
+            print(f"=== PRECISAO {args.precision * 100:.1f}% em {args.metric} {status} "
+                  f"apos {result['simulated_seconds']:.0f}s simulados ===")
+            metrics = result['metrics']
+        else:
+            runner.run_for(args.seconds)
+            print(f"=== {runner.simulated_seconds:.0f}s SIMULADOS (medias de ate {args.batches} lotes) ===")
+            metrics = runner.series.analyze(args.batches, args.confidence)
+        min_seconds = min_observations(args.batches) * args.bin_seconds
+    for line in format_report(metrics, args.bin_seconds, min_seconds):
+        print(line)
+    if args.record and not args.replications:
+        runner.recorder.stop()
+        print(f"Gravacao: {runner.recorder.frames_written} quadros em {args.record}")
+    if args.snapshot_out and not args.replications:
+        runner.checkpoint(args.snapshot_out)
+        print(f"Snapshot: {args.snapshot_out} ({runner.simulated_seconds:.0f}s simulados)")
+    if args.trace:
+        event_trace.stop()
+        print(f"Trace: {event_trace.events_written} eventos em {args.trace}")
+    if exporter:
+        if not args.replications:
+            exporter.publish(runner.simulator, force=True)
+        exporter.stop()
+    if args.profile:
+        print(f"=== PERFIL DOS ULTIMOS {frame_profiler.window} QUADROS (ms) ===")
+        print(frame_profiler.report(STEP_MS))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import logging
+import sys
+import time
+
+ROOT_LOGGER = "simulador"
+LOG_FORMAT = "[%(levelname)s] %(name)s: %(message)s"
+
+
+def get_logger(name):
+    """Logger de um componente do simulador (ex.: 'cpu' -> simulador.cpu)"""
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+class LazyText:
+    """Texto montado só quando o registro de log é de fato formatado (passou pelo nível e filtros)"""
+
+    __slots__ = ("build",)
+
+    def __init__(self, build):
+        self.build = build
+
+    def __str__(self):
+        return self.build()
+
+
+class SamplingFilter(logging.Filter):
+    """Deixa passar 1 de cada N registros DEBUG de cada tipo (os eventos por processo)"""
+
+    def __init__(self, every=1):
+        super().__init__()
+        self.every = max(1, int(every))
+        self._counts = {}
+
+    def filter(self, record):
+        if self.every == 1 or record.levelno > logging.DEBUG:
+            return True
+        key = (record.name, record.msg)
+        count = self._counts.get(key, 0)
+        self._counts[key] = count + 1
+        return count % self.every == 0
+
+
+class RateLimitFilter(logging.Filter):
+    """Limita as mensagens por segundo de cada tipo (balde de fichas) e conta as descartadas"""
+
+    def __init__(self, max_per_second=None, overrides=None):
+        super().__init__()
+        self.max_per_second = max_per_second
+        self.overrides = dict(overrides or {})  # nome do logger -> mensagens por segundo
+        self._buckets = {}  # (logger, modelo da mensagem) -> [fichas, último instante, descartadas]
+
+    def filter(self, record):
+        rate = self.overrides.get(record.name, self.max_per_second)
+        if not rate or record.levelno >= logging.WARNING:
+            return True
+        key = (record.name, record.msg)
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [max(1.0, rate), now, 0]
+        capacity = max(1.0, rate)
+        bucket[0] = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+        bucket[1] = now
+        if bucket[0] < 1.0:
+            bucket[2] += 1
+            return False
+        bucket[0] -= 1.0
+        if bucket[2]:
+            record.msg = f"{record.msg} [+{bucket[2]} suprimidas]"
+            bucket[2] = 0
+        return True
+
+
+_handler = None
+
+
+def configure_logging(level="INFO", sample_every=1, max_per_second=None, overrides=None, stream=None):
+    """Configura o logger raiz do simulador (pode ser chamado de novo para trocar o nível)"""
+    global _handler
+    logger = logging.getLogger(ROOT_LOGGER)
+    if _handler is not None:
+        logger.removeHandler(_handler)
+    _handler = logging.StreamHandler(stream or sys.stdout)
+    _handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    _handler.addFilter(SamplingFilter(sample_every))
+    _handler.addFilter(RateLimitFilter(max_per_second, overrides))
+    logger.addHandler(_handler)
+    logger.setLevel(level)
+    logger.propagate = False
+    return logger
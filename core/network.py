@@ -0,0 +1,253 @@
+import random
+from config import PROCESSING_TIME_MS
+from core.analytics import mmc_metrics, solve_traffic_equations
+from core.clock import sim_clock
+from core.connection_system import LoadBalancer
+from entities.generator import ProcessGenerator
+
+class QueueNetwork:
+    """Rede de filas: estágios de CPUs, cada um com seu balanceador, e roteamento entre eles"""
+
+    def __init__(self, stages=None):
+        self.stages = []  # dicts do config + 'computers' e 'load_balancer'
+        self.stage_stats = {}  # nome do estágio -> contadores medidos
+        self.exit_stats = {}  # processos que saíram da rede: tempo nas estações e fora delas
+        self.started_at = sim_clock.get_ticks()
+        self.configure(stages or [])
+
+    @property
+    def is_active(self) -> bool:
+        """Indica se há uma rede configurada (senão todas as CPUs formam um único estágio)"""
+        return bool(self.stages)
+
+    @property
+    def configured_cpus(self) -> int:
+        """Total de CPUs pedido pela configuração dos estágios"""
+        return sum(max(1, stage.get("cpus", 1)) for stage in self.stages)
+
+    @property
+    def entry_stage(self):
+        """Estágio que recebe as chegadas externas"""
+        return self.stages[0] if self.stages else None
+
+    def configure(self, stages):
+        """Define os estágios da rede e zera as estatísticas medidas"""
+        self.stages = []
+        for stage in stages:
+            stage = dict(stage)
+            stage["routing"] = dict(stage.get("routing") or {})
+            stage["computers"] = []
+            stage["load_balancer"] = LoadBalancer(stage["computers"])
+            self.stages.append(stage)
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Zera os contadores medidos de cada estágio"""
+        self.started_at = sim_clock.get_ticks()
+        self.stage_stats = {
+            stage["name"]: {'visits': 0, 'completed': 0, 'timed_out': 0,
+                            'total_service_ms': 0, 'total_sojourn_ms': 0, 'total_transit_ms': 0}
+            for stage in self.stages
+        }
+        self.exit_stats = {'exits': 0, 'total_network_ms': 0, 'total_outside_ms': 0}
+
+    def get_stage(self, name):
+        """Retorna o estágio pelo nome (ou None)"""
+        for stage in self.stages:
+            if stage["name"] == name:
+                return stage
+        return None
+
+    def assign_computers(self, computers, strategy="round_robin"):
+        """Distribui as CPUs entre os estágios (as novas vão para o gargalo)"""
+        for stage in self.stages:
+            stage["computers"].clear()
+        if not self.stages:
+            for computer in computers:
+                computer.stage = None
+            return
+
+        unassigned = []
+        for computer in computers:
+            stage = self.get_stage(computer.stage)
+            if stage is not None:
+                stage["computers"].append(computer)
+            else:
+                unassigned.append(computer)
+
+        # Primeiro completa a quantidade configurada de cada estágio, em ordem
+        for stage in self.stages:
+            while unassigned and len(stage["computers"]) < max(1, stage.get("cpus", 1)):
+                self._place(unassigned.pop(0), stage)
+        # CPUs excedentes (compradas na loja) reforçam o estágio mais carregado
+        while unassigned:
+            self._place(unassigned.pop(0), self.bottleneck_stage() or self.stages[0])
+
+        for stage in self.stages:
+            stage["load_balancer"].set_strategy(strategy)
+            stage["load_balancer"].current_index = 0
+
+    def _place(self, computer, stage):
+        """Coloca a CPU em um estágio"""
+        computer.stage = stage["name"]
+        stage["computers"].append(computer)
+
+    def ordered_computers(self):
+        """CPUs em ordem de estágio (usado pelo layout)"""
+        return [computer for stage in self.stages for computer in stage["computers"]]
+
+    def can_remove(self, computer) -> bool:
+        """Uma CPU só pode sair se o estágio dela continuar com alguma CPU"""
+        stage = self.get_stage(computer.stage)
+        return stage is None or len(stage["computers"]) > 1
+
+    def remove_computer(self, computer):
+        """Tira a CPU do seu estágio"""
+        stage = self.get_stage(computer.stage)
+        if stage is not None and computer in stage["computers"]:
+            stage["computers"].remove(computer)
+
+    def balancer_for(self, process):
+        """Balanceador do estágio atual do processo (None fora de uma rede)"""
+        stage = self.get_stage(process.stage)
+        return stage["load_balancer"] if stage is not None else None
+
+    def enter_stage(self, process, stage):
+        """Inicia a visita do processo a um estágio (sorteando a demanda, se configurada)"""
+        service_demand_ms = None
+        if stage.get("service_ms"):
+            service_demand_ms = ProcessGenerator.sample_service_ms(stage)
+        process.start_new_visit(stage["name"], service_demand_ms)
+        self.stage_stats[stage["name"]]['visits'] += 1
+
+    def complete_visit(self, process):
+        """Contabiliza o fim do atendimento do processo no estágio atual"""
+        stats = self.stage_stats.get(process.stage)
+        if stats is None:
+            return
+        now = sim_clock.get_ticks()
+        # O relógio do estágio parte da chegada à CPU: a fila de entrada e o trajeto até ela não
+        # fazem parte da estação M/M/c de Jackson e ficam num termo à parte
+        dispatched = process.dispatch_time if process.dispatch_time is not None else process.stage_entry_time
+        stats['completed'] += 1
+        stats['total_service_ms'] += process.processing_time_ms
+        stats['total_sojourn_ms'] += max(0, now - dispatched)
+        stats['total_transit_ms'] += max(0, dispatched - process.stage_entry_time)
+        process.network_time_ms += max(0, now - dispatched)
+
+    def record_exit(self, process):
+        """Contabiliza um processo que saiu da rede depois do último atendimento"""
+        turnaround_ms = max(0, sim_clock.get_ticks() - process.creation_time)
+        self.exit_stats['exits'] += 1
+        self.exit_stats['total_network_ms'] += process.network_time_ms
+        self.exit_stats['total_outside_ms'] += max(0, turnaround_ms - process.network_time_ms)
+
+    def measured_network_time(self):
+        """Tempo médio (s) por processo nas estações da rede e fora delas (filas de entrada e trajetos)"""
+        exits = self.exit_stats['exits']
+        if not exits:
+            return None
+        return {
+            'W': self.exit_stats['total_network_ms'] / exits / 1000,
+            'outside': self.exit_stats['total_outside_ms'] / exits / 1000
+        }
+
+    def record_timeout(self, process):
+        """Contabiliza um processo que expirou na fila de um estágio"""
+        stats = self.stage_stats.get(process.stage)
+        if stats is not None:
+            stats['timed_out'] += 1
+
+    def route(self, stage_name):
+        """Sorteia o próximo estágio depois de um atendimento (None = sai do sistema)"""
+        stage = self.get_stage(stage_name)
+        if stage is None:
+            return None
+        roll = random.random()
+        cumulative = 0.0
+        for next_name, probability in stage["routing"].items():
+            cumulative += probability
+            if roll < cumulative:
+                return self.get_stage(next_name)
+        return None
+
+    def visit_ratios(self):
+        """Visitas médias de cada processo a cada estágio (equações de tráfego)"""
+        names = [stage["name"] for stage in self.stages]
+        routing = [[stage["routing"].get(name, 0.0) for name in names] for stage in self.stages]
+        entry = [1.0 if i == 0 else 0.0 for i in range(len(names))]
+        return solve_traffic_equations(routing, entry)
+
+    def is_product_form(self, generators, computers) -> bool:
+        """A forma-produto de Jackson é exata com chegadas Poisson, serviço exponencial e FIFO"""
+        return (all(generator.distribution == "exponential" for generator in generators)
+                and all(stage.get("distribution") == "exponential" and stage.get("service_ms") for stage in self.stages)
+                and not any(computer.is_preemptive for computer in computers))
+
+    def product_form_metrics(self, arrival_rate):
+        """Métricas teóricas de cada estágio (M/M/c isolado) e da rede inteira"""
+        visits = self.visit_ratios()
+        if visits is None:
+            return None
+
+        stages = []
+        for stage, visit_ratio in zip(self.stages, visits):
+            active = [computer for computer in stage["computers"] if not computer.is_stopped]
+            lambda_rate = arrival_rate * visit_ratio
+            if active:
+                mean_service_ms = sum(self._mean_service_ms(stage, computer) for computer in active) / len(active)
+                mu_rate = 1000 / mean_service_ms
+            else:
+                mu_rate = 0.0
+            metrics = mmc_metrics(lambda_rate, mu_rate, len(active)) if lambda_rate > 0 else None
+            stages.append({
+                'name': stage["name"],
+                'visits': visit_ratio,
+                'lambda': lambda_rate,
+                'mu': mu_rate,
+                'c': len(active),
+                'rho': lambda_rate / (len(active) * mu_rate) if active and mu_rate > 0 else float('inf'),
+                'metrics': metrics
+            })
+
+        stable = all(stage['metrics'] is not None for stage in stages)
+        total_L = sum(stage['metrics']['L'] for stage in stages) if stable else None
+        return {
+            'stages': stages,
+            'stable': stable,
+            'L': total_L,
+            # Lei de Little na rede inteira: W = L / λ externo
+            'W': total_L / arrival_rate if stable and arrival_rate > 0 else None,
+            'bottleneck': max(stages, key=lambda stage: stage['rho'])['name'] if stages else None
+        }
+
+    def _mean_service_ms(self, stage, computer) -> float:
+        """Tempo médio de serviço de uma visita ao estágio nesta CPU"""
+        if stage.get("service_ms"):
+            return stage["service_ms"] * computer.processing_time_ms / PROCESSING_TIME_MS
+        return computer.processing_time_ms
+
+    def bottleneck_stage(self):
+        """Estágio com maior carga por CPU (visitas x serviço / CPUs)"""
+        visits = self.visit_ratios()
+        if not self.stages or visits is None:
+            return None
+
+        def load(item):
+            stage, visit_ratio = item
+            service_ms = stage.get("service_ms") or PROCESSING_TIME_MS
+            return visit_ratio * service_ms / max(1, len(stage["computers"]))
+        return max(zip(self.stages, visits), key=load)[0]
+
+    def measured_metrics(self, stage):
+        """Taxa de visitas, utilização e permanência (desde a chegada à CPU) medidas em um estágio"""
+        stats = self.stage_stats[stage["name"]]
+        elapsed_ms = max(1, sim_clock.get_ticks() - self.started_at)
+        servers = max(1, len(stage["computers"]))
+        completed = stats['completed']
+        return {
+            'lambda': stats['visits'] * 1000 / elapsed_ms,
+            'rho': stats['total_service_ms'] / (elapsed_ms * servers),
+            'W': stats['total_sojourn_ms'] / completed / 1000 if completed else None,
+            'transit': stats['total_transit_ms'] / completed / 1000 if completed else None
+        }
@@ -0,0 +1,101 @@
+import math
+from statistics import NormalDist
+
+# Menos lotes que isso deixa a t de Student larga demais; lotes menores que isso não são médias
+MIN_BATCHES = 5
+MIN_BATCH_SIZE = 2
+
+
+def t_critical(df, confidence=0.95):
+    """Quantil bilateral da t de Student (expansão de Cornish-Fisher a partir da normal)"""
+    q = 0.5 + confidence / 2
+    if df <= 0:
+        return float('inf')
+    # Formas fechadas para 1 e 2 graus de liberdade, onde a expansão é imprecisa
+    if df == 1:
+        return math.tan(math.pi * (q - 0.5))
+    if df == 2:
+        return (2 * q - 1) / math.sqrt(2 * q * (1 - q))
+    z = NormalDist().inv_cdf(q)
+    # Termos de Fisher (1925): erro menor que 0,5% já a partir de 3 graus de liberdade
+    g1 = (z ** 3 + z) / 4
+    g2 = (5 * z ** 5 + 16 * z ** 3 + 3 * z) / 96
+    g3 = (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / 384
+    g4 = (79 * z ** 9 + 776 * z ** 7 + 1482 * z ** 5 - 1920 * z ** 3 - 945 * z) / 92160
+    return z + g1 / df + g2 / df ** 2 + g3 / df ** 3 + g4 / df ** 4
+
+
+def confidence_interval(values, confidence=0.95):
+    """Média e meia-largura do intervalo de confiança de amostras independentes (None com menos de 2)"""
+    n = len(values)
+    if n < 2:
+        return None
+    mean = sum(values) / n
+    variance = sum((value - mean) ** 2 for value in values) / (n - 1)
+    half_width = t_critical(n - 1, confidence) * math.sqrt(variance / n)
+    return {
+        'mean': mean,
+        'half_width': half_width,
+        'relative_half_width': half_width / abs(mean) if mean else float('inf'),
+        'n': n,
+        'confidence': confidence
+    }
+
+
+def mser_truncation(series, batch_size=5):
+    """Ponto de truncagem do aquecimento pela regra MSER-m (MSER-5 por padrão), em observações"""
+    # Médias de lotes de `batch_size` observações; a sobra do fim é descartada
+    batches = [sum(series[i:i + batch_size]) / batch_size
+               for i in range(0, len(series) - batch_size + 1, batch_size)]
+    k = len(batches)
+    if k < 4:
+        return 0
+
+    # Somas de sufixo para avaliar MSER(d) = Σ (Y_i - Ȳ_d)² / (k - d)² em O(k)
+    suffix_sum = [0.0] * (k + 1)
+    suffix_sq = [0.0] * (k + 1)
+    for i in range(k - 1, -1, -1):
+        suffix_sum[i] = suffix_sum[i + 1] + batches[i]
+        suffix_sq[i] = suffix_sq[i + 1] + batches[i] ** 2
+
+    best_d, best_value = 0, None
+    # Só a primeira metade é candidata: truncar mais que isso indica corrida curta demais
+    for d in range(k // 2 + 1):
+        remaining = k - d
+        mean = suffix_sum[d] / remaining
+        value = (suffix_sq[d] - remaining * mean ** 2) / remaining ** 2
+        if best_value is None or value < best_value:
+            best_d, best_value = d, value
+    return best_d * batch_size
+
+
+def batch_means_ci(series, num_batches=20, confidence=0.95):
+    """Intervalo de confiança pelo método das médias de lotes (lotes contíguos de mesmo tamanho)"""
+    # `num_batches` é o máximo: uma série curta usa menos lotes (de MIN_BATCH_SIZE observações),
+    # até o mínimo de MIN_BATCHES (ou o pedido, se for menor)
+    floor = max(2, min(num_batches, MIN_BATCHES))
+    num_batches = min(num_batches, len(series) // MIN_BATCH_SIZE)
+    if num_batches < floor:
+        return None
+    batch_size = len(series) // num_batches
+    # Lotes alinhados ao fim da série (a sobra descartada fica do lado do aquecimento)
+    start = len(series) - batch_size * num_batches
+    means = [sum(series[start + i * batch_size:start + (i + 1) * batch_size]) / batch_size
+             for i in range(num_batches)]
+    result = confidence_interval(means, confidence)
+    result['batch_size'] = batch_size
+    return result
+
+
+def min_observations(num_batches=20):
+    """Observações que garantem um IC de estado estacionário (o MSER-5 descarta até a metade)"""
+    return 2 * MIN_BATCH_SIZE * max(2, min(num_batches, MIN_BATCHES))
+
+
+def steady_state_ci(series, num_batches=20, confidence=0.95):
+    """Trunca o aquecimento (MSER-5) e calcula o IC por médias de lotes do restante"""
+    warmup = mser_truncation(series)
+    result = batch_means_ci(series[warmup:], num_batches, confidence)
+    if result is not None:
+        result['warmup'] = warmup
+    return result
@@ -0,0 +1,127 @@
+import math
+import time
+from collections import deque
+
+
+class RollingHistogram:
+    """Histograma das últimas N amostras (ms) em baldes logarítmicos; inserção e remoção em O(1)"""
+
+    MIN_MS = 0.001         # 1 µs
+    BUCKETS_PER_DECADE = 10
+    DECADES = 6            # até 1000 ms
+
+    def __init__(self, window=300):
+        self.window = window
+        self.samples = deque()  # (valor, balde) na ordem de chegada
+        self.counts = [0] * (self.DECADES * self.BUCKETS_PER_DECADE + 1)
+        self.total = 0.0
+        # Máximo da janela: candidatos (nº da amostra, valor) em ordem decrescente de valor
+        self._peaks = deque()
+        self._added = 0
+
+    def _bucket(self, ms) -> int:
+        """Índice do balde de um valor (0 = abaixo de MIN_MS)"""
+        if ms <= self.MIN_MS:
+            return 0
+        return min(len(self.counts) - 1, int(math.log10(ms / self.MIN_MS) * self.BUCKETS_PER_DECADE) + 1)
+
+    def _upper_edge(self, bucket) -> float:
+        """Limite superior do balde, em ms"""
+        return self.MIN_MS * 10 ** (bucket / self.BUCKETS_PER_DECADE)
+
+    def add(self, ms):
+        """Acrescenta uma amostra, descartando a mais antiga se a janela estiver cheia"""
+        if len(self.samples) == self.window:
+            old_ms, old_bucket = self.samples.popleft()
+            self.counts[old_bucket] -= 1
+            self.total -= old_ms
+            if self._peaks[0][0] == self._added - self.window:
+                self._peaks.popleft()
+        bucket = self._bucket(ms)
+        self.samples.append((ms, bucket))
+        self.counts[bucket] += 1
+        self.total += ms
+        # Uma amostra nova tira da disputa as anteriores menores ou iguais (nunca mais serão o máximo)
+        while self._peaks and self._peaks[-1][1] <= ms:
+            self._peaks.pop()
+        self._peaks.append((self._added, ms))
+        self._added += 1
+
+    @property
+    def count(self) -> int:
+        return len(self.samples)
+
+    @property
+    def mean(self) -> float:
+        return max(0.0, self.total) / len(self.samples) if self.samples else 0.0
+
+    @property
+    def max(self) -> float:
+        # Lido pela interface enquanto a simulação acrescenta: a fila pode estar vazia por um instante
+        try:
+            return self._peaks[0][1]
+        except IndexError:
+            return 0.0
+
+    def quantile(self, p) -> float:
+        """Quantil aproximado pelo limite superior do balde (erro de até ~26% com 10 baldes/década)"""
+        if not self.samples:
+            return 0.0
+        target = p * len(self.samples)
+        cumulative = 0
+        for bucket, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= target and count:
+                return self._upper_edge(bucket)
+        return self.max
+
+
+class FrameProfiler:
+    """Tempos de cada fase do quadro (update e draw) em histogramas móveis; desligado custa um teste"""
+
+    def __init__(self, window=300):
+        self.window = window
+        self.enabled = False
+        self.phases = {}  # nome da fase -> RollingHistogram, na ordem em que aparecem
+
+    def toggle(self):
+        """Liga/desliga a medição (ao ligar, recomeça os histogramas)"""
+        self.enabled = not self.enabled
+        if self.enabled:
+            self.phases = {}
+
+    def start(self):
+        """Marca o início de uma fase (None com a medição desligada)"""
+        return time.perf_counter() if self.enabled else None
+
+    def stop(self, phase, started):
+        """Fecha a fase iniciada em `started` e registra a duração"""
+        # started None: a fase começou com a medição desligada (F3 no meio dela, possivelmente pela
+        # outra thread: a simulação e a interface compartilham este perfilador) e não é medida
+        if not self.enabled or started is None:
+            return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        histogram = self.phases.get(phase)
+        if histogram is None:
+            histogram = self.phases[phase] = RollingHistogram(self.window)
+        histogram.add(elapsed_ms)
+
+    def summary(self) -> list:
+        """(fase, média, p95, máximo) em ms de cada fase medida"""
+        # Cópia: a thread da simulação pode acrescentar fases enquanto a interface lê
+        return [(phase, histogram.mean, histogram.quantile(0.95), histogram.max)
+                for phase, histogram in list(self.phases.items())]
+
+    def report(self, budget_ms=None) -> str:
+        """Tabela em texto das fases (com a fração do orçamento do quadro, se dado)"""
+        lines = [f"{'fase':<22}{'media':>9}{'p95':>9}{'max':>9}" + ("  orcamento" if budget_ms else "")]
+        for phase, mean, p95, peak in self.summary():
+            line = f"{phase:<22}{mean:>8.3f} {p95:>8.3f} {peak:>8.3f}"
+            if budget_ms:
+                line += f"  {mean / budget_ms * 100:>6.1f}%"
+            lines.append(line)
+        return "\n".join(lines)
+
+
+# Perfilador único do quadro (ligado pela tecla F3 ou por --profile no modo headless)
+frame_profiler = FrameProfiler()
@@ -1,38 +1,102 @@
-import pygame
 import random
-from typing import Dict, Any
-from config import Colors, GridPositions, GENERATION_FREQUENCIES, FPS, CPU_COLORS, MAX_HEALTH_POINTS, SCREEN_WIDTH, SCREEN_HEIGHT
-from entities.generator import ProcessGenerator
+from config import Colors, GridPositions, FPS, TIME_SLICE_PRESETS, JOB_CLASS_PRESETS, EXTRA_GENERATOR_SOURCE, NETWORK_PRESETS, COMPACT_CPU_THRESHOLD, TRACE_FILE
+from entities.generator import ProcessGenerator, IdCounter
 from entities.computer import Computer
-from entities.infoPanel import InfoPanel
-from entities.shopPanel import ShopPanel
+from entities.shop import Shop
 from entities.process_states import ProcessState
 from core.connection_system import ConnectionSystem
+from core.network import QueueNetwork
+from core.analytics import erlang_a_metrics, mmc_metrics
+from core.streaming_stats import StreamingStats, TimeWeightedAverage
+from core.clock import sim_clock
+from core.trace import event_trace, EVENT_CODES
+from core.replay import open_arrival_trace
+from core.log import get_logger, LazyText
+from core.profiler import frame_profiler
+from core.scenario import DEFAULT_SCENARIO, thaw
 from utils.grid_helper import GridHelper
 
+logger = get_logger("simulador")
+metrics_logger = get_logger("metricas")  # relatório completo a cada conclusão (limitado por taxa)
+
 class QueueSimulator:
-    def __init__(self):
-        # Componentes do sistema - COMEÇA APENAS COM CPU 1
-        self.generator = ProcessGenerator()
-        
-        # Criar apenas a CPU 1 inicialmente
-        self.computers = [
-            Computer(1, GridPositions.COMPUTER_1, CPU_COLORS[0])
+    def __init__(self, scenario=None):
+        # Trace de eventos opcional (config TRACE_FILE)
+        if TRACE_FILE and not event_trace.enabled:
+            event_trace.start(TRACE_FILE)
+        
+        # Cenário compilado (core.scenario): CPUs, fontes, capacidade, modos e economia da loja
+        self.scenario = scenario if scenario is not None else DEFAULT_SCENARIO
+        cpus, system = self.scenario["cpus"], self.scenario["system"]
+        self.max_cpus = cpus["max"]
+        
+        # Componentes do sistema - por padrão COMEÇA APENAS COM CPU 1
+        # Fontes de chegada: todas compartilham o contador de ids de processo
+        self._process_ids = IdCounter(1)
+        self.generators = [
+            self._create_generator(generator_id, source)
+            for generator_id, source in enumerate(self.scenario["sources"], start=1)
         ]
-        
-        # Adicionar ShopPanel
-        self.shop_panel = ShopPanel()
-        self.info_panel = InfoPanel()
-        self.connection = ConnectionSystem(self.generator, self.computers)
+        self.generator = self.generators[0]  # Gerador principal
+        for generator in self.generators:
+            generator.set_job_classes(self.scenario["job_classes"])
+        
+        # Rede de filas: estágios de CPUs com roteamento entre eles (vazia = estágio único)
+        self.network = QueueNetwork(thaw(self.scenario["network"]))
+        
+        # Integrais no tempo de todo o sistema: processos nas filas das CPUs (Lq), CPUs ocupadas
+        # e CPUs existentes (o número de servidores muda com a loja e os eventos)
+        start_time = sim_clock.get_ticks()
+        self.occupancy = {
+            'Lq': TimeWeightedAverage(start_time),
+            'busy': TimeWeightedAverage(start_time),
+            'servers': TimeWeightedAverage(start_time, cpus["count"])
+        }
+        
+        # CPUs criadas a partir de uma faixa de ids e posicionadas pelo layout automático
+        self.computers = [Computer(computer_id) for computer_id in range(1, cpus["count"] + 1)]
+        for computer in self.computers:
+            computer.attach_occupancy(self.occupancy['Lq'], self.occupancy['busy'])
+            computer.processing_time_ms = cpus["processing_time_ms"]
+        self._layout_computers()
+        
+        # Loja (economia do cenário); o painel que a desenha fica na view
+        self.shop = Shop(self.scenario["shop"], self.max_cpus)
+        self.shop.update_cpu_item(self.computers)
+        self.connection = ConnectionSystem(self.generators, self.computers, self.network)
+        self.connection.max_capacity = system["capacity"]
+        self.connection.transport_speed = system["transport_speed"]
+        self.connection.load_balancer.set_strategy(system["strategy"])
         
         # Estado do simulador
         self.processes = []
-        self.time_since_last_process = 0.0
-        self.current_interval_seconds = 1.0
-        self.max_queue_time_seconds = 10.0
+        self.max_queue_time_seconds = system["max_queue_time_seconds"]
         self.is_auto_generation_enabled = True
         self.is_generator_blocked = False
         self.timed_out_processes = 0
+        self.blocked_arrivals = 0  # Chegadas perdidas com o sistema cheio (capacidade K) ou sem CPU no pool
+        self._loss_model_cache = (None, None)  # (parâmetros, métricas M/M/c/K+M)
+        
+        # Escalonamento das CPUs (round-robin preemptivo opcional)
+        self.time_slice_ms = None
+        self.context_switch_ms = system["context_switch_ms"]
+        self.set_time_slice(system["time_slice_ms"], system["context_switch_ms"])
+        
+        # Tempos de resposta (até o 1º despacho) e de retorno (até a conclusão)
+        self.completed_processes = 0
+        self.total_response_time_ms = 0
+        self.total_turnaround_time_ms = 0
+        
+        # Distribuições em fluxo (Welford + P²) de todo o sistema, em ms
+        self.latency_stats = {
+            'resposta': StreamingStats(),  # chegada -> primeiro atendimento
+            'retorno': StreamingStats(),   # chegada -> conclusão
+            'servico': StreamingStats()    # tempo de CPU da última visita
+        }
+        
+        # Estatísticas por classe de processo e por fonte de chegada: nome -> contadores
+        self.class_stats = {}
+        self.source_stats = {}
 
         # Sistema de pontuação
         self.score = 0
@@ -41,298 +105,217 @@ class QueueSimulator:
         self._game_mode = "sandbox"  # padrão: sandbox
         
         # Timer para modo jogo
-        self.game_start_time = pygame.time.get_ticks()
+        self.game_start_time = sim_clock.get_ticks()
         self.game_time_elapsed = 0.0
         self.last_event_time = 0.0  # Tempo do último evento
         self.event_messages = []  # Mensagens de eventos para display
         self.event_message_timer = 0.0  # Timer para mostrar mensagens
         
         # NOVO: Sistema de vida para modo jogo
-        self.health_points = MAX_HEALTH_POINTS
+        self.max_health_points = self.scenario["modes"]["game"]["health_points"]
+        self.health_points = self.max_health_points
         self.game_over = False
         
-        # Passar referências dos componentes para o InfoPanel
-        self.info_panel.set_component_references(self.computers, self.generator, self)
+        # Muda sempre que CPUs ou geradores mudam: as views (views.simulator_view) refazem suas referências
+        self.topology_version = 0
+        
+        # Com uma rede configurada, as CPUs são criadas de acordo com os estágios
+        if self.network.is_active:
+            self.set_computer_count(self.network.configured_cpus)
+    
+    @property
+    def current_interval_seconds(self):
+        """Intervalo entre chegadas do gerador principal"""
+        return self.generator.interval_seconds
+    
+    @current_interval_seconds.setter
+    def current_interval_seconds(self, interval_seconds):
+        self.generator.set_interval(interval_seconds)
+    
+    @property
+    def arrival_rate(self):
+        """Taxa total de chegadas (superposição de todas as fontes ativas)"""
+        return sum(generator.arrival_rate for generator in self.generators)
+    
+    def _create_generator(self, generator_id, source):
+        """Cria um gerador a partir da descrição de uma fonte de chegadas"""
+        generator = ProcessGenerator(
+            generator_id,
+            name=source.get("name"),
+            interval_seconds=source.get("interval_seconds", 1.0),
+            distribution=source.get("distribution", "deterministic"),
+            pool=source.get("pool"),
+            id_counter=self._process_ids
+        )
+        if source.get("trace"):
+            generator.set_arrival_trace(open_arrival_trace(source["trace"], source.get("trace_source")))
+        return generator
+    
+    def add_generator(self, source=None):
+        """Adiciona uma nova fonte de chegadas alimentando as CPUs"""
+        if len(self.generators) >= len(GridPositions.GENERATORS):
+            logger.warning("Limite de %s geradores atingido", len(GridPositions.GENERATORS))
+            return None
+        generator = self._create_generator(len(self.generators) + 1, source or EXTRA_GENERATOR_SOURCE)
+        generator.set_job_classes(self.generator.job_classes)
+        self.generators.append(generator)
+        self.connection.update_generators_list(self.generators)
+        self.topology_version += 1
+        logger.info("%s adicionado: intervalo %.2fs (%s)", generator.name, generator.interval_seconds, generator.distribution)
+        return generator
     
     def set_game_mode(self, mode):
         """Define o modo de operação (sandbox ou game)"""
         self._game_mode = mode
-        print(f"Modo definido para: {mode}")
+        logger.info("Modo definido para: %s", mode)
     
     def is_game_mode(self):
         """Verifica se está no modo jogo"""
         return self._game_mode == "game"
     
-    def handle_click(self, pos):
-        """Lida com cliques do mouse nos componentes"""
-        # Se o jogo acabou, apenas permitir voltar ao menu
-        if self.game_over:
-            return
-        
-        # **CORREÇÃO: Primeiro verificar se o botão de fechar do InfoPanel foi clicado**
-        # **ISSO DEVE FUNCIONAR EM AMBOS OS MODOS**
-        if self.info_panel.is_close_button_clicked(pos):
-            self.info_panel.close_detailed_view()
-            print("Visualização detalhada fechada")
-            return
-        
-        # Depois verificar se a loja foi clicada (permitido em ambos os modos)
-        shop_item = self.shop_panel.is_clicked(pos)
-        if shop_item:
-            # Para upgrades infinitos, sempre permitir compra se tiver pontos suficientes
-            # Para CPUs, verificar se não foi comprado
-            if (shop_item["id"] in ["upgrade_processing_speed", "upgrade_capacity", "upgrade_speed"] or 
-                not shop_item.get("purchased", False)):
-                
-                success, cost = self.shop_panel.purchase_item(shop_item["id"], self.score)
-                if success:
-                    self.score -= cost
-                    self._apply_shop_purchase(shop_item["id"])
-                    print(f"Item {shop_item['name']} comprado por {cost} pontos!")
-            return
-        
-        # **NO MODO JOGO: Restringir controles avançados**
-        if self.is_game_mode():
-            # No modo jogo, apenas permitir visualização de informações
-            # mas não permitir interação com controles
-            computer_clicked = False
-            for i, computer in enumerate(self.computers):
-                if computer.is_clicked(pos):
-                    self.info_panel.select_component(f"computer_{i+1}")
-                    self.info_panel.deactivate_all_inputs()
-                    print(f"CPU {i+1} clicada - modo visualização apenas")
-                    computer_clicked = True
-                    break
-            
-            if not computer_clicked and self.generator.is_clicked(pos):
-                self.info_panel.select_component("generator")
-                print("Gerador clicado - modo visualização apenas")
-            elif not computer_clicked:
-                self.info_panel.deactivate_all_inputs()
-            return
-        
-        # **MODO SANDBOX: Controles completos**
-        # Verifica se o botão de parar/iniciar foi clicado
-        if self.info_panel.is_stop_button_clicked(pos):
-            self._handle_stop_button_click()
-            return
-        
-        # Verifica se o campo de intervalo foi clicado (apenas para gerador)
-        if (self.info_panel.selected_component == "generator" and 
-            self.info_panel.is_interval_input_clicked(pos)):
-            self.info_panel.activate_interval_input()
-            return
-        
-        # Verifica se o campo de tempo de processamento foi clicado (apenas para computador específico)
-        if self.info_panel.selected_component and self.info_panel.selected_component.startswith("computer_"):
-            if self.info_panel.is_processing_time_input_clicked(pos):
-                self.info_panel.activate_processing_time_input()
-                return
-            elif self.info_panel.is_max_queue_time_input_clicked(pos):
-                self.info_panel.activate_max_queue_time_input()
-                return
-        
-        # Verifica se alguma CPU foi clicada
-        computer_clicked = False
-        for i, computer in enumerate(self.computers):
-            if computer.is_clicked(pos):
-                self.info_panel.select_component(f"computer_{i+1}")
-                self.info_panel.deactivate_all_inputs()
-                print(f"CPU {i+1} clicada - mostrando informações")
-                computer_clicked = True
+    def set_time_slice(self, time_slice_ms, context_switch_ms=None):
+        """Aplica o quantum do round-robin a todas as CPUs (None = sem preempção)"""
+        self.time_slice_ms = time_slice_ms
+        if context_switch_ms is not None:
+            self.context_switch_ms = context_switch_ms
+        for computer in self.computers:
+            computer.set_time_slice(self.time_slice_ms, self.context_switch_ms)
+    
+    def cycle_time_slice(self):
+        """Alterna para o próximo quantum pré-definido"""
+        if self.time_slice_ms in TIME_SLICE_PRESETS:
+            index = TIME_SLICE_PRESETS.index(self.time_slice_ms)
+        else:
+            index = -1
+        self.set_time_slice(TIME_SLICE_PRESETS[(index + 1) % len(TIME_SLICE_PRESETS)])
+    
+    def cycle_job_class_preset(self):
+        """Alterna a mistura de classes de processos do gerador"""
+        preset_names = list(JOB_CLASS_PRESETS)
+        current_names = [job_class["name"] for job_class in self.generator.job_classes]
+        index = -1
+        for i, preset_name in enumerate(preset_names):
+            if [job_class["name"] for job_class in JOB_CLASS_PRESETS[preset_name]] == current_names:
+                index = i
                 break
-        
-        # Verifica se o gerador foi clicado
-        if not computer_clicked and self.generator.is_clicked(pos):
-            self.info_panel.select_component("generator")
-            print("Gerador clicado - mostrando informações do gerador")
-        elif not computer_clicked:
-            # Se clicar em qualquer outro lugar, desativa todos os campos de entrada
-            self.info_panel.deactivate_all_inputs()
-    
-    def handle_key_event(self, event):
-        """Lida com eventos de teclado para entrada de texto"""
-        # Se o jogo acabou, ignorar todas as entradas
-        if self.game_over:
-            return
-            
-        # **NO MODO JOGO: Ignorar todas as entradas de teclado para controles**
-        if self.is_game_mode():
-            return
-        
-        # **MODO SANDBOX: Controles completos de teclado**
-        # Handle generator interval input
-        if (self.info_panel.selected_component == "generator" and 
-            self.info_panel.is_interval_input_active):
-            
-            if event.key == pygame.K_RETURN:
-                new_interval = self.info_panel.get_interval_input_value()
-                if new_interval > 0:
-                    self.current_interval_seconds = new_interval
-                    print(f"Intervalo alterado para: {new_interval:.2f} segundos")
-                    self.time_since_last_process = 0.0
-                self.info_panel.deactivate_all_inputs()
-            
-            elif event.key == pygame.K_ESCAPE:
-                self.info_panel.deactivate_all_inputs()
-                self.info_panel.interval_input_text = f"{self.current_interval_seconds:.2f}"
-            
-            elif event.key == pygame.K_BACKSPACE:
-                self.info_panel.remove_character_from_interval_input()
-            
-            elif event.key == pygame.K_DELETE:
-                self.info_panel.clear_interval_input()
-            
-            else:
-                if event.unicode.isdigit() or event.unicode == '.':
-                    self.info_panel.add_character_to_interval_input(event.unicode)
-        
-        # Handle computer processing time input
-        elif (self.info_panel.selected_component and 
-              self.info_panel.selected_component.startswith("computer_") and 
-              self.info_panel.is_processing_time_input_active):
-            
-            computer_index = int(self.info_panel.selected_component.split('_')[1]) - 1
-            computer = self.computers[computer_index]
-            
-            if event.key == pygame.K_RETURN:
-                new_processing_time = self.info_panel.get_processing_time_input_value()
-                if new_processing_time > 0:
-                    computer.set_processing_time(new_processing_time)
-                self.info_panel.deactivate_all_inputs()
-            
-            elif event.key == pygame.K_ESCAPE:
-                self.info_panel.deactivate_all_inputs()
-                self.info_panel.processing_time_input_text = f"{computer.processing_time_ms/1000:.2f}"
-            
-            elif event.key == pygame.K_BACKSPACE:
-                self.info_panel.remove_character_from_processing_time_input()
-            
-            elif event.key == pygame.K_DELETE:
-                self.info_panel.clear_processing_time_input()
-            
-            else:
-                if event.unicode.isdigit() or event.unicode == '.':
-                    self.info_panel.add_character_to_processing_time_input(event.unicode)
-        
-        # Handle max queue time input
-        elif (self.info_panel.selected_component and 
-              self.info_panel.selected_component.startswith("computer_") and 
-              self.info_panel.is_max_queue_time_input_active):
-            
-            if event.key == pygame.K_RETURN:
-                new_max_queue_time = self.info_panel.get_max_queue_time_input_value()
-                if new_max_queue_time > 0:
-                    self.max_queue_time_seconds = new_max_queue_time
-                    print(f"Tempo máximo de fila alterado para: {new_max_queue_time:.2f} segundos")
-                self.info_panel.deactivate_all_inputs()
-            
-            elif event.key == pygame.K_ESCAPE:
-                self.info_panel.deactivate_all_inputs()
-                self.info_panel.max_queue_time_input_text = f"{self.max_queue_time_seconds:.2f}"
-            
-            elif event.key == pygame.K_BACKSPACE:
-                self.info_panel.remove_character_from_max_queue_time_input()
-            
-            elif event.key == pygame.K_DELETE:
-                self.info_panel.clear_max_queue_time_input()
-            
-            else:
-                if event.unicode.isdigit() or event.unicode == '.':
-                    self.info_panel.add_character_to_max_queue_time_input(event.unicode)
+        preset_name = preset_names[(index + 1) % len(preset_names)]
+        for generator in self.generators:
+            generator.set_job_classes(JOB_CLASS_PRESETS[preset_name])
+        logger.info("Mistura de carga alterada para: %s", preset_name)
     
-    def _handle_stop_button_click(self):
-        """Lida com o clique no botão de parar/iniciar"""
-        # **NO MODO JOGO: Este método não deve ser chamado**
-        if self.is_game_mode():
-            return
-        
-        # **MODO SANDBOX: Controles completos**
-        selected_component = self.info_panel.selected_component
-        
-        if selected_component == "generator":
-            self.generator.toggle_stop()
-            action = "parado" if self.generator.is_stopped else "retomado"
-            print(f"Gerador {action}")
-        
-        elif selected_component and selected_component.startswith("computer_"):
-            computer_index = int(selected_component.split('_')[1]) - 1
-            computer = self.computers[computer_index]
-            computer.toggle_stop()
-            action = "parada" if computer.is_stopped else "retomada"
-            print(f"CPU {computer_index + 1} {action}")
+    def set_network(self, stages):
+        """Configura a rede de filas (lista vazia = todas as CPUs em um único estágio)"""
+        for computer in self.computers:
+            computer.stage = None
+        self.network.configure(stages)
+        if self.network.is_active:
+            self.set_computer_count(self.network.configured_cpus)
+        else:
+            self._on_computers_changed()
     
-    def handle_mouse_motion(self, pos):
-        """Lida com movimento do mouse para efeitos visuais"""
-        # **NO MODO JOGO: Atualizar hover apenas para elementos visíveis**
-        if self.is_game_mode():
-            # No modo jogo, apenas atualizar hover do botão de fechar se estiver visível
-            if self.info_panel.selected_component is not None:
-                self.info_panel.update_button_hover(pos)
-            return
-        
-        # **MODO SANDBOX: Atualizar todos os hovers**
-        self.info_panel.update_button_hover(pos)
+    def cycle_network_preset(self):
+        """Alterna entre as topologias de rede pré-definidas"""
+        preset_names = list(NETWORK_PRESETS)
+        current_names = [stage["name"] for stage in self.network.stages]
+        index = -1
+        for i, preset_name in enumerate(preset_names):
+            if [stage["name"] for stage in NETWORK_PRESETS[preset_name]] == current_names:
+                index = i
+                break
+        preset_name = preset_names[(index + 1) % len(preset_names)]
+        self.set_network(NETWORK_PRESETS[preset_name])
+        logger.info("Topologia da rede alterada para: %s", preset_name)
+    
+    def set_strategy(self, strategy):
+        """Troca a estratégia de distribuição do balanceador e dos estágios da rede"""
+        self.connection.load_balancer.set_strategy(strategy)
+        for stage in self.network.stages:
+            stage["load_balancer"].set_strategy(strategy)
+        logger.info("Estratégia de distribuição alterada para: %s", strategy)
     
-    def update(self) -> None:
-        """Atualiza o estado do simulador"""
+    def update(self, dt_seconds=1.0 / FPS) -> None:
+        """Atualiza o estado do simulador por um passo de `dt_seconds` segundos simulados"""
         # Se o jogo acabou, não atualizar mais nada
         if self.game_over:
             return
-            
+
+        # Cada fase do quadro é medida pelo perfilador (F3); desligado, start/stop só testam a flag
+        frame_started = frame_profiler.start()
+
         # Geração automática
-        self._handle_auto_generation()
+        started = frame_profiler.start()
+        self._handle_auto_generation(dt_seconds)
+        frame_profiler.stop('geracao', started)
         
         # Atualizar bloqueio do gerador
         self.is_generator_blocked = not self.connection.has_capacity
         
-        # Atualizar sistema de conexão
-        self.connection.update()
-        # filtra só processos em fila e converte a chave para proc.id
-        in_queue_map = {
-            pid: target
-            for pid, target in self.connection.process_targets.items()
-            for proc in self.processes
-            if proc.id == pid and proc.state in (ProcessState.PROCESSING, ProcessState.WAITING_CPU)
-            }
-        self.info_panel.set_process_targets(in_queue_map)
-
+        # Atualizar sistema de conexão (sub-etapas medidas dentro de connection.update)
+        self.connection.update(dt_seconds)
         
         # Verificar timeouts em todas as filas de CPU
+        started = frame_profiler.start()
         self._check_queue_timeouts()
+        frame_profiler.stop('timeouts', started)
         
         # Atualizar timer no modo jogo
         if self.is_game_mode():
-            self.game_time_elapsed = (pygame.time.get_ticks() - self.game_start_time) / 1000.0
+            self.game_time_elapsed = (sim_clock.get_ticks() - self.game_start_time) / 1000.0
             
-            # Verificar se é hora de um evento aleatório (a cada 10 segundos)
-            if self.game_time_elapsed - self.last_event_time >= 10.0:
+            # Verificar se é hora de um evento aleatório (a cada random_event_seconds do cenário)
+            if self.game_time_elapsed - self.last_event_time >= self.scenario["modes"]["game"]["random_event_seconds"]:
                 self._trigger_random_event()
                 self.last_event_time = self.game_time_elapsed
         
         # Atualizar timer das mensagens de evento
         if self.event_messages:
-            self.event_message_timer += 1.0 / FPS
+            self.event_message_timer += dt_seconds
             if self.event_message_timer >= 5.0:  # Mostrar mensagem por 5 segundos
                 self.event_messages.pop(0)
                 self.event_message_timer = 0.0
         
-        # Atualizar InfoPanel com informações atualizadas
-        self.info_panel.update_info(self.computers, self.connection, self.processes, 
-                                  self.current_interval_seconds, self.max_queue_time_seconds, 
-                                  self.timed_out_processes)
-        
         # Verificar conclusão de processamento em todas as CPUs
+        started = frame_profiler.start()
         for computer in self.computers:
             if not computer.is_idle and not computer.is_stopped:
+                finished_process = computer.current_process
                 if computer.check_processing_complete():
-                    print(f"CPU {computer.computer_id} liberada - processo finalizado")
+                    logger.debug("CPU %s liberada - processo finalizado", computer.computer_id)
+                    # Numa rede o processo pode seguir para outro estágio em vez de sair
+                    if self._route_to_next_stage(finished_process, computer):
+                        continue
+                    event_trace.record(EVENT_CODES['exit'], finished_process.id, computer.computer_id)
+                    self._record_completion(finished_process)
                     self._add_score()
                     self.show_metrics()
+                else:
+                    # Round-robin: devolve o processo à fila se o quantum acabou
+                    computer.check_time_slice()
+        frame_profiler.stop('conclusoes', started)
         
         # Limpar processos finalizados
+        started = frame_profiler.start()
         self._cleanup_completed_processes()
+        frame_profiler.stop('limpeza', started)
+        frame_profiler.stop('update (total)', frame_started)
 
+    def _route_to_next_stage(self, process, computer) -> bool:
+        """Encaminha o processo atendido ao próximo estágio sorteado; False se ele sai da rede"""
+        if not self.network.is_active:
+            return False
+        self.network.complete_visit(process)
+        
+        next_stage = self.network.route(process.stage)
+        target_computer = next_stage["load_balancer"].get_target_computer(process) if next_stage else None
+        if target_computer is None:
+            self.network.record_exit(process)
+            return False
+        
+        self.network.enter_stage(process, next_stage)
+        self.connection.forward_process(process, computer, target_computer)
+        logger.debug("Processo %s roteado de %s para %s -> %s", process.id, computer.stage, next_stage['name'], target_computer.name)
+        return True
+    
     def _trigger_random_event(self):
         """Dispara um evento aleatório no modo jogo"""
         if not self.is_game_mode():
@@ -350,17 +333,17 @@ class QueueSimulator:
     
     def _trigger_increased_load_event(self):
         """Evento: Aumento da carga (diminui intervalo de geração)"""
-        # Reduzir o intervalo em 10-30%
+        # Reduzir o intervalo de todas as fontes em 10-30%
         reduction = random.uniform(0.1, 0.3)
-        new_interval = max(0.3, self.current_interval_seconds * (1 - reduction))
-        old_interval = self.current_interval_seconds
-        self.current_interval_seconds = new_interval
+        for generator in self.generators:
+            generator.set_interval(max(0.3, generator.interval_seconds * (1 - reduction)))
         
         # Mensagem de debuff
         reduction_percent = int(reduction * 100)
         message = f"CARGA AUMENTADA! -{reduction_percent}% intervalo"
         self.event_messages.append((message, Colors.ORANGE))
-        print(f"[EVENTO] {message}")
+        event_trace.record(EVENT_CODES['random_event'], value=event_trace.text_code("carga_aumentada"))
+        logger.info("[EVENTO] %s", message)
     
     def _trigger_upgrade_loss_event(self):
         """Evento: Perda de um upgrade comprado"""
@@ -369,21 +352,21 @@ class QueueSimulator:
         upgrade_items = ["upgrade_processing_speed", "upgrade_capacity", "upgrade_speed"]
         
         for item_id in upgrade_items:
-            level = self.shop_panel.get_upgrade_level(item_id)
+            level = self.shop.get_upgrade_level(item_id)
             if level > 1:  # Só pode remover se tiver pelo menos nível 2
                 available_upgrades.append(item_id)
         
         if available_upgrades:
             # Escolher um upgrade aleatório para remover
             upgrade_to_remove = random.choice(available_upgrades)
-            current_level = self.shop_panel.get_upgrade_level(upgrade_to_remove)
+            current_level = self.shop.get_upgrade_level(upgrade_to_remove)
             
             # Reduzir o nível do upgrade
-            for item in self.shop_panel.shop_items:
+            for item in self.shop.shop_items:
                 if item["id"] == upgrade_to_remove:
                     item["upgrade_level"] = max(1, current_level - 1)
                     # Recalcular preço baseado no novo nível
-                    new_price = self.shop_panel._calculate_upgrade_price(
+                    new_price = self.shop._calculate_upgrade_price(
                         item["base_price"], item["upgrade_level"], item["price_increase"]
                     )
                     item["price"] = new_price
@@ -400,7 +383,8 @@ class QueueSimulator:
                     # Mensagem de debuff
                     message = f"UPGRADE PERDIDO! {upgrade_names[upgrade_to_remove]} Nv.{current_level}→{current_level-1}"
                     self.event_messages.append((message, Colors.YELLOW))
-                    print(f"[EVENTO] {message}")
+                    event_trace.record(EVENT_CODES['random_event'], value=event_trace.text_code(f"perda_{upgrade_to_remove}"))
+                    logger.info("[EVENTO] %s", message)
                     break
         else:
             # Se não há upgrades para remover, disparar outro evento
@@ -409,136 +393,306 @@ class QueueSimulator:
     def _trigger_cpu_break_event(self):
         """Evento: Quebra de uma CPU comprada"""
         # Verificar quais CPUs estão disponíveis para quebrar (excluindo a CPU 1 inicial)
-        available_cpus = [cpu for cpu in self.computers if cpu.computer_id > 1]
+        available_cpus = [cpu for cpu in self.computers if cpu.computer_id > 1 and self.network.can_remove(cpu)]
 
         if available_cpus:
             # Escolher uma CPU aleatória para quebrar
             cpu_to_break = random.choice(available_cpus)
             cpu_id = cpu_to_break.computer_id
 
-            # Remover a CPU do sistema
-            self.computers.remove(cpu_to_break)
-
-            # CORREÇÃO: Atualizar o connection system com a nova lista
-            self.connection.update_computers_list(self.computers)
-
-            # Marcar como não comprada na loja
-            for item in self.shop_panel.shop_items:
-                if item["id"] == f"cpu_{cpu_id}":
-                    item["purchased"] = False
-                    break
+            # Remover a CPU do sistema (a loja volta a oferecê-la)
+            self._remove_computer(cpu_to_break)
+            self._on_computers_changed()
                 
             # Mensagem de debuff
             message = f"CPU {cpu_id} QUEBROU! Perdeu processamento"
             self.event_messages.append((message, Colors.RED))
-            print(f"[EVENTO] {message}")
+            event_trace.record(EVENT_CODES['random_event'], computer=cpu_id, value=event_trace.text_code("cpu_quebrou"))
+            logger.info("[EVENTO] %s", message)
         else:
             # Se não há CPUs para quebrar, disparar aumento de carga
             self._trigger_increased_load_event()
     
+    def _upgraded_value(self, upgrade_id, level):
+        """Valor do atributo melhorado no nível dado, pela economia da loja do cenário"""
+        shop, system = self.scenario["shop"], self.scenario["system"]
+        if upgrade_id == "upgrade_speed":
+            return system["transport_speed"] * (shop["upgrade_speed"]["factor"] ** (level - 1))
+        if upgrade_id == "upgrade_capacity":
+            return system["capacity"] + shop["upgrade_capacity"]["step"] * (level - 1)
+        upgrade = shop["upgrade_processing_speed"]
+        processing_time = self.scenario["cpus"]["processing_time_ms"] * (upgrade["factor"] ** (level - 1))
+        return max(upgrade["min_processing_time_ms"], processing_time)
+
     def _apply_upgrade_loss(self, upgrade_id, new_level):
         """Aplica as consequências da perda de um upgrade"""
         if upgrade_id == "upgrade_speed":
             # Reverter velocidade de transporte
-            self.connection.transport_speed = 3.0 * (1.25 ** (new_level - 1))
+            self.connection.transport_speed = self._upgraded_value(upgrade_id, new_level)
         elif upgrade_id == "upgrade_capacity":
             # Reverter capacidade
-            self.connection.max_capacity = 15 + (8 * (new_level - 1))
+            self.connection.max_capacity = self._upgraded_value(upgrade_id, new_level)
         elif upgrade_id == "upgrade_processing_speed":
             # Reverter velocidade de processamento
-            reduction_factor = 0.85 ** (new_level - 1)
-            base_processing_time = 2000
-            new_processing_time = base_processing_time * reduction_factor
-            
             for computer in self.computers:
-                computer.processing_time_ms = max(300, new_processing_time)
+                computer.processing_time_ms = self._upgraded_value(upgrade_id, new_level)
 
+    def purchase(self, item_id) -> bool:
+        """Compra um item da loja com a pontuação atual e aplica o efeito (False = sem pontos ou esgotado)"""
+        success, cost = self.shop.purchase_item(item_id, self.score)
+        if success:
+            self.score -= cost
+            self._apply_shop_purchase(item_id)
+            logger.info("Item %s comprado por %s pontos!", item_id, cost)
+        return success
+    
     def _apply_shop_purchase(self, item_id):
         """Aplica os efeitos da compra na loja"""
-        if item_id == "cpu_2":
-            self._add_new_computer(2, Colors.CYAN, GridPositions.COMPUTER_2)
-        elif item_id == "cpu_3":
-            self._add_new_computer(3, Colors.PINK, GridPositions.COMPUTER_3)
-        elif item_id == "cpu_4":
-            self._add_new_computer(4, Colors.GREEN, GridPositions.COMPUTER_4)
-        elif item_id == "cpu_5":
-            self._add_new_computer(5, Colors.YELLOW, GridPositions.COMPUTER_5)
-        elif item_id == "cpu_6":
-            self._add_new_computer(6, Colors.PURPLE, GridPositions.COMPUTER_6)
+        event_trace.record(EVENT_CODES['purchase'], value=event_trace.text_code(item_id))
+        if item_id == "cpu":
+            self._add_new_computer(self._next_computer_id())
         elif item_id == "upgrade_speed":
             # Aumento gradual da velocidade de transporte
-            speed_level = self.shop_panel.get_upgrade_level("upgrade_speed")
-            # Cada nível aumenta a velocidade em 25%
-            self.connection.transport_speed = 3.0 * (1.25 ** (speed_level - 1))
-            print(f"Velocidade de transporte aumentada para nível {speed_level}! ({self.connection.transport_speed:.1f}x)")
+            speed_level = self.shop.get_upgrade_level("upgrade_speed")
+            # Cada nível multiplica a velocidade pelo fator do cenário (padrão +25%)
+            self.connection.transport_speed = self._upgraded_value(item_id, speed_level)
+            logger.info("Velocidade de transporte aumentada para nível %s! (%.1fx)", speed_level, self.connection.transport_speed)
         elif item_id == "upgrade_capacity":
             # Aumento gradual da capacidade
-            capacity_level = self.shop_panel.get_upgrade_level("upgrade_capacity")
-            # Cada nível aumenta a capacidade em 8
-            self.connection.max_capacity = 15 + (8 * (capacity_level - 1))
-            print(f"Capacidade do sistema aumentada para nível {capacity_level}! ({self.connection.max_capacity})")
+            capacity_level = self.shop.get_upgrade_level("upgrade_capacity")
+            # Cada nível soma o passo do cenário à capacidade (padrão 8)
+            self.connection.max_capacity = self._upgraded_value(item_id, capacity_level)
+            logger.info("Capacidade do sistema aumentada para nível %s! (%s)", capacity_level, self.connection.max_capacity)
         elif item_id == "upgrade_processing_speed":
             # Aplicar redução no tempo de processing de todas as CPUs
-            processing_speed_level = self.shop_panel.get_processing_speed_level()
-            # Cada nível reduz o tempo em 15% (mínimo de 0.3 segundos)
-            reduction_factor = 0.85 ** (processing_speed_level - 1)
+            processing_speed_level = self.shop.get_processing_speed_level()
+            # Cada nível multiplica o tempo base pelo fator do cenário (padrão -15%, mínimo 0.3 s)
+            reduction_factor = self.scenario["shop"]["upgrade_processing_speed"]["factor"] ** (processing_speed_level - 1)
             
             for computer in self.computers:
-                # Reduzir o tempo base (2000ms) pelo fator de redução
-                base_processing_time = 2000  # 2 segundos base
-                new_processing_time = base_processing_time * reduction_factor
-                computer.processing_time_ms = max(300, new_processing_time)  # Mínimo de 0.3 segundos
+                computer.processing_time_ms = self._upgraded_value(item_id, processing_speed_level)
             
-            print(f"Velocidade de processamento aumentada para nível {processing_speed_level}!")
-            print(f"Tempo de processamento reduzido para {reduction_factor*100:.1f}% do original")
+            logger.info("Velocidade de processamento aumentada para nível %s!", processing_speed_level)
+            logger.info("Tempo de processamento reduzido para %.1f%% do original", reduction_factor*100)
+    
+    def _next_computer_id(self):
+        """Menor id de CPU ainda não usado"""
+        used_ids = {computer.computer_id for computer in self.computers}
+        computer_id = 1
+        while computer_id in used_ids:
+            computer_id += 1
+        return computer_id
     
-    def _add_new_computer(self, computer_id, color, grid_position):
+    def _create_computer(self, computer_id, color=None):
+        """Cria uma CPU já configurada com o escalonamento e a velocidade atuais"""
+        new_computer = Computer(computer_id, color=color)
+        new_computer.set_time_slice(self.time_slice_ms, self.context_switch_ms)
+        new_computer.attach_occupancy(self.occupancy['Lq'], self.occupancy['busy'])
+        # Mesma velocidade das CPUs existentes (com os upgrades da loja); sem nenhuma, a do cenário
+        if self.computers:
+            new_computer.processing_time_ms = self.computers[0].processing_time_ms
+        else:
+            new_computer.processing_time_ms = self.scenario["cpus"]["processing_time_ms"]
+        return new_computer
+    
+    def _add_new_computer(self, computer_id, color=None):
         """Adiciona uma nova CPU ao sistema"""
-        new_computer = Computer(computer_id, grid_position, color)
-        self.computers.append(new_computer)
-
+        if len(self.computers) >= self.max_cpus:
+            logger.warning("Limite de %s CPUs atingido", self.max_cpus)
+            return
+        self.computers.append(self._create_computer(computer_id, color))
+        self._on_computers_changed()
+        logger.info("Nova CPU %s adicionada ao sistema!", computer_id)
+    
+    def add_computer(self):
+        """Adiciona a CPU com o menor id livre (respeitando o limite do cenário)"""
+        self._add_new_computer(self._next_computer_id())
+    
+    def _remove_computer(self, computer):
+        """Remove uma CPU redistribuindo seus processos entre as restantes"""
+        self.computers.remove(computer)
+        self.network.remove_computer(computer)
+        
+        orphans = computer.release_processes()
+        # Os pools das fontes só são refeitos em _on_computers_changed: filtrados pelas CPUs que restam
+        remaining = set(self.computers)
+        
+        # Processos a caminho da CPU removida também precisam de novo destino
+        for process in self.connection.input_queue + self.connection.transit_processes:
+            if self.connection.process_targets.get(process.id) is computer:
+                target_computer = self._replacement_target(process, remaining)
+                if target_computer is not None:
+                    self.connection.retarget_process(process, target_computer)
+        
+        # A lista do balanceador é a mesma de self.computers, já sem a CPU removida
+        for process in orphans:
+            target_computer = self._replacement_target(process, remaining)
+            if target_computer is None:
+                process.is_active = False
+                process.state = ProcessState.COMPLETED
+                continue
+            self.connection.process_targets[process.id] = target_computer
+            # Quem já esperava numa fila mantém o relógio do tempo máximo de espera ao trocar de CPU
+            waiting_since = process.queue_entry_time if process.state == ProcessState.WAITING_CPU else None
+            target_computer.add_to_queue(process)
+            if waiting_since is not None:
+                process.queue_entry_time = waiting_since
+    
+    def _replacement_target(self, process, remaining):
+        """Nova CPU para um processo cuja CPU saiu: no pool da sua fonte e no mesmo estágio, se houver rede"""
+        balancer = self.network.balancer_for(process) or self.connection.load_balancer
+        # O pool da fonte vale para a primeira visita; depois dela o processo segue o roteamento da rede
+        first_visit = not self.network.is_active or process.visits <= 1
+        pool = self.connection.generator_pools.get(process.source_id) if first_visit else None
+        if pool is not None:
+            pool = [computer for computer in pool if computer in remaining]
+            # Pool sem CPUs restantes: cai no balanceador geral
+            if pool:
+                return balancer.get_target_computer(process, pool, process.source_id)
+        return balancer.get_target_computer(process)
+    
+    def set_computer_count(self, count):
+        """Ajusta o número de CPUs de uma vez (útil para simular muitos servidores)"""
+        count = max(1, min(self.max_cpus, int(count)))
+        while len(self.computers) < count:
+            self.computers.append(self._create_computer(self._next_computer_id()))
+        while len(self.computers) > count:
+            # Numa rede, nenhum estágio pode ficar sem CPU
+            removable = [computer for computer in reversed(self.computers) if self.network.can_remove(computer)]
+            if not removable:
+                break
+            self._remove_computer(removable[0])
+        self._on_computers_changed()
+        logger.info("Sistema com %s CPUs", len(self.computers))
+    
+    def _on_computers_changed(self):
+        """Refaz layout e referências depois que a lista de CPUs muda"""
+        self.occupancy['servers'].set(len(self.computers), sim_clock.get_ticks())
+        self.network.assign_computers(self.computers, self.connection.load_balancer.distribution_strategy)
+        self._layout_computers()
+        
         # CORREÇÃO: Atualizar o connection system com a nova lista
         self.connection.update_computers_list(self.computers)
+        
+        # Atualizar oferta da loja e avisar as views
+        self.shop.update_cpu_item(self.computers)
+        self.topology_version += 1
+    
+    def _layout_computers(self):
+        """Posiciona as CPUs: posições fixas para poucas, blocos escalados para muitas"""
+        if self.network.is_active:
+            # Rede de filas: uma coluna por estágio, na ordem do fluxo
+            computers = self.network.ordered_computers()
+            rects = GridHelper.layout_stages([len(stage["computers"]) for stage in self.network.stages])
+        else:
+            computers = self.computers
+            rects = GridHelper.layout_computers(len(self.computers))
+        for computer, rect in zip(computers, rects):
+            computer.set_bounds(*rect)
 
-        # Atualizar referências no info panel
-        self.info_panel.set_component_references(self.computers, self.generator, self)
-
-        print(f"Nova CPU {computer_id} adicionada ao sistema!")
-
+    @staticmethod
+    def _get_group_stats(table, key):
+        """Retorna (criando se preciso) os contadores de um grupo de processos"""
+        if key not in table:
+            table[key] = {
+                'created': 0,
+                'completed': 0,
+                'timed_out': 0,
+                'blocked': 0,
+                'total_service_ms': 0,
+                'total_response_ms': 0,
+                'total_turnaround_ms': 0
+            }
+        return table[key]
+    
+    def _get_class_stats(self, job_class):
+        """Contadores de uma classe de processo"""
+        return self._get_group_stats(self.class_stats, job_class)
+    
+    def _get_source_stats(self, process):
+        """Contadores da fonte de chegada (gerador) do processo"""
+        return self._get_group_stats(self.source_stats, self.connection.source_generator(process).name)
+    
+    def _record_completion(self, process):
+        """Acumula tempos de resposta e de retorno do processo concluído"""
+        if process is None or process.first_start_time is None:
+            return
+        now = sim_clock.get_ticks()
+        response_ms = max(0, process.first_start_time - process.creation_time)
+        turnaround_ms = max(0, now - process.creation_time)
+        self.completed_processes += 1
+        self.total_response_time_ms += response_ms
+        self.total_turnaround_time_ms += turnaround_ms
+        self.latency_stats['resposta'].add(response_ms)
+        self.latency_stats['retorno'].add(turnaround_ms)
+        self.latency_stats['servico'].add(process.processing_time_ms)
+        
+        for stats in (self._get_class_stats(process.job_class), self._get_source_stats(process)):
+            stats['completed'] += 1
+            stats['total_service_ms'] += process.processing_time_ms
+            stats['total_response_ms'] += response_ms
+            stats['total_turnaround_ms'] += turnaround_ms
+    
     def _add_score(self):
         """Adiciona pontos quando um processo é completado com sucesso"""
         self.score += 1
-        print(f"[SUCESSO] Processo completado! Pontuacao: {self.score}")
+        logger.debug("[SUCESSO] Processo completado! Pontuacao: %s", self.score)
 
-    def _handle_auto_generation(self) -> None:
-        """Gerencia a geração automática de processos"""
-        if self.connection.has_capacity and not self.generator.is_stopped:
-            self.time_since_last_process += 1.0 / FPS
+    def _handle_auto_generation(self, dt_seconds=1.0 / FPS) -> None:
+        """Gerencia a geração automática de processos (cada fonte com seu próprio relógio)"""
+        for generator in self.generators:
+            if generator.is_stopped:
+                continue
             
-            if self.time_since_last_process >= self.current_interval_seconds:
-                process = self.generator.create_process()
-                if process:
+            # Mais de uma chegada pode vencer no mesmo passo (rajadas de um trace)
+            elapsed = dt_seconds
+            while not generator.is_stopped and generator.update_timer(elapsed):
+                elapsed = 0.0
+                if not self.connection.can_admit(generator):
+                    # Sistema cheio (capacidade K) ou pool da fonte sem CPU: a chegada é bloqueada e perdida,
+                    # antes de criar o processo (senão ele contaria como criado sem nunca entrar)
+                    self.blocked_arrivals += 1
+                    event_trace.record(EVENT_CODES['blocked'], value=generator.generator_id)
+                    self._get_group_stats(self.source_stats, generator.name)['blocked'] += 1
+                    if self.connection.has_capacity:
+                        logger.debug("Chegada de %s bloqueada: nenhuma CPU no pool da fonte", generator.name)
+                    else:
+                        logger.debug("Chegada de %s bloqueada: sistema cheio (%s)", generator.name, self.connection.max_capacity)
+                    generator.schedule_next_arrival()
+                    continue
+                process = generator.create_process()
+                if process and self.connection.add_process(process):
                     self.processes.append(process)
-                    if self.connection.add_process(process):
-                        target_computer = self.connection.process_targets[process.id]
-                        print(f"Processo {process.id} criado automaticamente -> {target_computer.name}")
-                    self.time_since_last_process = 0.0
+                    if self.network.is_active:
+                        self.network.enter_stage(process, self.network.entry_stage)
+                    self._get_class_stats(process.job_class)['created'] += 1
+                    self._get_source_stats(process)['created'] += 1
+                    target_computer = self.connection.process_targets[process.id]
+                    event_trace.record(EVENT_CODES['create'], process.id, target_computer.computer_id, generator.generator_id)
+                    logger.debug("Processo %s criado automaticamente (%s) -> %s", process.id, generator.name, target_computer.name)
+                generator.schedule_next_arrival()
     
     def _check_queue_timeouts(self):
         """Verifica processos em todas as filas de CPU que excederam o tempo máximo"""
-        current_time = pygame.time.get_ticks()
+        # O tempo máximo vale até o primeiro atendimento: um processo preemptado já foi aceito e
+        # volta à fila com trabalho parcial, que não pode ser contado como chegada perdida
+        current_time = sim_clock.get_ticks()
         
         for computer in self.computers:
             for process in computer.queue[:]:
-                if process.state == ProcessState.WAITING_CPU:
+                if process.state == ProcessState.WAITING_CPU and not process.in_service:
                     time_in_queue = (current_time - process.queue_entry_time) / 1000.0
                     
                     if time_in_queue >= self.max_queue_time_seconds:
-                        print(f"Processo {process.id} excedeu o tempo máximo de fila ({time_in_queue:.2f}s) e foi removido de {computer.name}")
-                        computer.queue.remove(process)
+                        logger.debug("Processo %s excedeu o tempo máximo de fila (%.2fs) e foi removido de %s", process.id, time_in_queue, computer.name)
+                        computer.remove_from_queue(process)
                         process.is_active = False
                         process.state = ProcessState.COMPLETED
                         self.timed_out_processes += 1
+                        event_trace.record(EVENT_CODES['timeout'], process.id, computer.computer_id)
+                        self._get_class_stats(process.job_class)['timed_out'] += 1
+                        self._get_source_stats(process)['timed_out'] += 1
+                        self.network.record_timeout(process)
                         
                         # NOVO: Remover ponto de vida no modo jogo
                         if self.is_game_mode() and not self.game_over:
@@ -548,7 +702,7 @@ class QueueSimulator:
         """Remove um ponto de vida no modo jogo"""
         if self.health_points > 0:
             self.health_points -= 1
-            print(f"💔 Perdeu 1 ponto de vida! Vida restante: {self.health_points}/{MAX_HEALTH_POINTS}")
+            logger.info("💔 Perdeu 1 ponto de vida! Vida restante: %s/%s", self.health_points, self.max_health_points)
             
             # Verificar se o jogo acabou
             if self.health_points <= 0:
@@ -557,10 +711,11 @@ class QueueSimulator:
     def _end_game(self):
         """Finaliza o jogo quando a vida chega a zero"""
         self.game_over = True
-        print("🎮 FIM DE JOGO! Sua pontuação final foi:", self.score)
+        logger.info("🎮 FIM DE JOGO! Sua pontuação final foi: %s", self.score)
         
         # Parar todos os componentes
-        self.generator.stop()
+        for generator in self.generators:
+            generator.stop()
         for computer in self.computers:
             computer.stop()
         
@@ -573,228 +728,22 @@ class QueueSimulator:
         for process in self.processes[:]:
             if not process.is_active and process.state != ProcessState.PROCESSING:
                 self.processes.remove(process)
-                print(f"Processo {process.id} removido do sistema")
-    
-    def draw(self, screen: pygame.Surface) -> None:
-        """Desenha todo o simulador"""
-        # Fundo
-        screen.fill(Colors.BLACK)
-        
-        # Grid (para debug)
-        GridHelper.draw_grid(screen)
-        
-        # Sistema de conexão (desenha linhas e processos)
-        self.connection.draw(screen)
-        
-        # Componentes principais
-        self.generator.draw(screen)
-        for computer in self.computers:
-            computer.draw(screen)
-        
-        # **ATUALIZAÇÃO: Passar informação do modo para o InfoPanel**
-        if hasattr(self.info_panel, '_simulator_ref'):
-            self.info_panel._simulator_ref = self
-        
-        self.info_panel.draw(screen)
-        
-        # Shop Panel (novo)
-        self.shop_panel.draw(screen, self.score)
-
-        # Processos sendo processados (dentro das CPUs)
-        for computer in self.computers:
-            self._draw_processing_process(screen, computer)
-
-        self._draw_score_display(screen)
-        
-        # Desenhar timer no modo jogo
-        if self.is_game_mode():
-            self._draw_timer_display(screen)
-            self._draw_event_messages(screen)
-            self._draw_health_bar(screen)  # NOVO: Desenhar barra de vida
-        
-        # Desenhar tela de game over se aplicável
-        if self.game_over:
-            self._draw_game_over_screen(screen)
-    
-    def _draw_health_bar(self, screen: pygame.Surface) -> None:
-        """Desenha a barra de vida no grid 6,0 até 8,0"""
-        health_x, health_y, health_width, health_height = GridHelper.grid_to_pixels(
-            GridPositions.HEALTH_BAR[0], 
-            GridPositions.HEALTH_BAR[1], 
-            3, 1  # 3 células de largura, 1 de altura
-        )
-        
-        # Fundo da barra de vida
-        pygame.draw.rect(screen, Colors.DARK_GRAY, (health_x, health_y, health_width, health_height))
-        pygame.draw.rect(screen, Colors.WHITE, (health_x, health_y, health_width, health_height), 2)
-        
-        # Calcular largura da vida atual
-        health_percentage = self.health_points / MAX_HEALTH_POINTS
-        current_health_width = int((health_width - 4) * health_percentage)
-        
-        # Determinar cor baseada na vida restante
-        if health_percentage > 0.6:
-            health_color = Colors.GREEN
-        elif health_percentage > 0.3:
-            health_color = Colors.YELLOW
-        else:
-            health_color = Colors.RED
-        
-        # Desenhar barra de vida atual
-        if current_health_width > 0:
-            pygame.draw.rect(screen, health_color, 
-                           (health_x + 2, health_y + 2, current_health_width, health_height - 4))
-        
-        # Texto da barra de vida
-        font = pygame.font.SysFont(None, 24)
-        health_text = font.render(f"VIDA: {self.health_points}/{MAX_HEALTH_POINTS}", True, Colors.WHITE)
-        screen.blit(health_text, (health_x + health_width//2 - health_text.get_width()//2, 
-                                health_y + health_height//2 - health_text.get_height()//2))
-    
-    def _draw_game_over_screen(self, screen: pygame.Surface) -> None:
-        """Desenha a tela de fim de jogo"""
-        # Criar uma superfície semi-transparente para o fundo
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))  # Preto semi-transparente
-        screen.blit(overlay, (0, 0))
-        
-        # Texto de Game Over
-        font_large = pygame.font.SysFont(None, 72)
-        font_medium = pygame.font.SysFont(None, 36)
-        font_small = pygame.font.SysFont(None, 24)
-        
-        game_over_text = font_large.render("FIM DE JOGO", True, Colors.RED)
-        time_text = font_medium.render(f"Tempo: {int(self.game_time_elapsed)} segundos", True, Colors.WHITE)
-        
-        # Centralizar textos
-        screen.blit(game_over_text, (SCREEN_WIDTH//2 - game_over_text.get_width()//2, SCREEN_HEIGHT//2 - 100))
-        screen.blit(time_text, (SCREEN_WIDTH//2 - time_text.get_width()//2, SCREEN_HEIGHT//2))
-    
-    def _draw_score_display(self, screen: pygame.Surface) -> None:
-        """Desenha a pontuação no grid (0,0)"""
-        score_x, score_y, score_width, score_height = GridHelper.grid_to_pixels(
-            GridPositions.SCORE_DISPLAY[0], 
-            GridPositions.SCORE_DISPLAY[1], 
-            1, 1
-        )
-        
-        # Fundo do display
-        pygame.draw.rect(screen, Colors.DARK_GRAY, (score_x, score_y, score_width, score_height))
-        pygame.draw.rect(screen, Colors.WHITE, (score_x, score_y, score_width, score_height), 2)
-        
-        # Texto da pontuação
-        font_large = pygame.font.SysFont(None, 34)
-        font_small = pygame.font.SysFont(None, 18)
-        
-        # Título
-        title_text = font_small.render("PONTUACAO", True, Colors.WHITE)
-        screen.blit(title_text, (score_x + score_width//2 - title_text.get_width()//2, score_y + 10))
-        
-        # Valor da pontuação
-        score_text = font_large.render(str(self.score), True, Colors.GREEN)
-        screen.blit(score_text, (score_x + score_width//2 - score_text.get_width()//2, score_y + 30))
-        
-        # **ADICIONADO: Indicador de modo atual**
-        mode_text = font_small.render(f"Modo: {self._game_mode.upper()}", True, 
-                                    Colors.YELLOW if self.is_game_mode() else Colors.CYAN)
-        screen.blit(mode_text, (score_x + score_width//2 - mode_text.get_width()//2, score_y + 55))
-    
-    def _draw_timer_display(self, screen: pygame.Surface) -> None:
-        """Desenha o timer no grid (1,0) - APENAS NO MODO JOGO"""
-        timer_x, timer_y, timer_width, timer_height = GridHelper.grid_to_pixels(
-            GridPositions.TIMER_DISPLAY[0], 
-            GridPositions.TIMER_DISPLAY[1], 
-            1, 1
-        )
-        
-        # Fundo mais escuro para melhor contraste
-        pygame.draw.rect(screen, (40, 40, 50), (timer_x, timer_y, timer_width, timer_height), border_radius=6)
-        pygame.draw.rect(screen, Colors.CYAN, (timer_x, timer_y, timer_width, timer_height), 2, border_radius=6)
-        
-        # Texto do timer
-        font_large = pygame.font.SysFont("Arial", 28, bold=True)
-        font_small = pygame.font.SysFont("Arial", 16)
-        
-        # Título
-        title_text = font_small.render("TEMPO", True, Colors.WHITE)
-        screen.blit(title_text, (timer_x + timer_width//2 - title_text.get_width()//2, timer_y + 10))
-        
-        # Valor do tempo (formato MM:SS)
-        minutes = int(self.game_time_elapsed) // 60
-        seconds = int(self.game_time_elapsed) % 60
-        time_text = f"{minutes:02d}:{seconds:02d}"
-        
-        time_display = font_large.render(time_text, True, Colors.CYAN)
-        screen.blit(time_display, (timer_x + timer_width//2 - time_display.get_width()//2, timer_y + 30))
-        
-        # Indicador de próximo evento
-        if not self.event_messages:
-            next_event = 10 - (int(self.game_time_elapsed) % 10)
-            event_text = font_small.render(f"Próx: {next_event}s", True, Colors.ORANGE)
-            screen.blit(event_text, (timer_x + timer_width//2 - event_text.get_width()//2, timer_y + 55))
-        else:
-            # Mostrar "EVENTO!" quando há mensagem ativa
-            event_text = font_small.render("EVENTO!", True, Colors.RED)
-            screen.blit(event_text, (timer_x + timer_width//2 - event_text.get_width()//2, timer_y + 55))
+                logger.debug("Processo %s removido do sistema", process.id)
     
-    def _draw_event_messages(self, screen: pygame.Surface) -> None:
-        """Desenha mensagens de eventos nos grids (2,0) até (4,0)"""
-        if not self.event_messages:
-            return
-        
-        # Mostrar apenas a mensagem mais recente
-        message, color = self.event_messages[0]
-        
-        # Usar grids (2,0) até (4,0) - 3 células de largura, 1 de altura (fixa)
-        message_x, message_y, message_width, message_height = GridHelper.grid_to_pixels(
-            GridPositions.EVENT_DISPLAY[0],  # Grid 2,0
-            GridPositions.EVENT_DISPLAY[1],  # Linha 0
-            3, 1  # 3 células de largura, 1 de altura FIXA
-        )
-        
-        # Fonte para mensagens
-        font = pygame.font.SysFont("Arial", 20, bold=True)
-        
-        # **ALTURA FIXA** - Não ajustar baseado no conteúdo
-        total_height = message_height
-        
-        # Fundo semi-transparente com borda colorida
-        bg_rect = pygame.Rect(message_x, message_y, message_width, total_height)
-        s = pygame.Surface((bg_rect.width, bg_rect.height), pygame.SRCALPHA)
-        s.fill((30, 30, 40, 230))  # Azul escuro semi-transparente
-        screen.blit(s, bg_rect)
-        
-        # Borda colorida ao redor
-        pygame.draw.rect(screen, color, bg_rect, 3, border_radius=8)
-        
-        # **SEM ÍCONES** - Apenas texto centralizado
-        text_surface = font.render(message, True, color)
-        text_x = message_x + (message_width - text_surface.get_width()) // 2
-        text_y = message_y + (total_height - text_surface.get_height()) // 2
-        screen.blit(text_surface, (text_x, text_y))
-    
-    def _draw_processing_process(self, screen: pygame.Surface, computer: Computer) -> None:
-        """Desenha o processo atualmente em processamento na CPU"""
-        # CORREÇÃO: Usar computer.is_idle em vez de computer.is_processing
-        if (computer.current_process and 
-            computer.current_process.state == ProcessState.PROCESSING and 
-            not computer.is_stopped and not computer.is_idle):
-            process = computer.current_process
-            cpu_x, cpu_y = computer.get_center()
-            process.x, process.y = cpu_x, cpu_y
-            process.draw(screen)
-
     def show_metrics(self):
-        """Calcula e exibe métricas do sistema de filas M/M/c"""
+        """Registra o relatório de métricas (montado só se o log do relatório estiver ativo)"""
+        metrics_logger.info("%s", LazyText(self.metrics_report))
+    
+    def metrics_report(self) -> str:
+        """Calcula as métricas do sistema de filas M/M/c e monta o relatório em texto"""
+        lines = []
         # Parâmetros do sistema
-        process_generation_interval_seconds = self.current_interval_seconds
-        lambda_rate = 1 / process_generation_interval_seconds  # taxa de chegada
+        lambda_rate = self.arrival_rate  # taxa de chegada (soma de todas as fontes)
         
         # Calcular taxa de serviço média entre todas as CPUs ativas
         active_cpus = [cpu for cpu in self.computers if not cpu.is_stopped]
         if not active_cpus:
-            print("Nenhuma CPU ativa no sistema")
-            return
+            return "Nenhuma CPU ativa no sistema"
             
         avg_processing_time = sum(cpu.processing_time_ms for cpu in active_cpus) / len(active_cpus)
         mu_rate = 1 / (avg_processing_time / 1000)  # taxa de serviço média
@@ -802,22 +751,167 @@ class QueueSimulator:
         c = len(active_cpus)  # número de servidores
         rho = lambda_rate / (c * mu_rate)  # utilização do sistema
         
-        print(f"=== SISTEMA M/M/{c} ===")
-        print(f"Numero de CPUs ativas: {c}")
-        print(f"Taxa de chegada (lambda): {lambda_rate:.3f} processos/segundo")
-        print(f"Taxa de servico media (mu): {mu_rate:.3f} processos/segundo")
-        print(f"Utilizacao do sistema (rho): {rho:.3f}")
+        if self.network.is_active:
+            # Cada estágio é uma fila própria: a teoria é a de Jackson (_report_network), não um M/M/c com todas as CPUs
+            lines.append(f"=== SISTEMA ({len(self.network.stages)} estagios) ===")
+            lines.append(f"Numero de CPUs ativas: {c}")
+            lines.append(f"Taxa de chegada externa (lambda): {lambda_rate:.3f} processos/segundo ({len(self.generators)} fonte(s))")
+        else:
+            lines.append(f"=== SISTEMA M/M/{c} ===")
+            lines.append(f"Numero de CPUs ativas: {c}")
+            lines.append(f"Taxa de chegada (lambda): {lambda_rate:.3f} processos/segundo ({len(self.generators)} fonte(s))")
+            lines.append(f"Taxa de servico media (mu): {mu_rate:.3f} processos/segundo")
+            lines.append(f"Utilizacao do sistema (rho): {rho:.3f}")
         
         # Informações individuais de cada CPU
         for i, computer in enumerate(self.computers):
             status = "ATIVA" if not computer.is_stopped else "PARADA"
-            print(f"CPU {i+1}: {status}, Fila: {len(computer.queue)}, Tempo processamento: {computer.processing_time_ms/1000:.2f}s")
-        
-        print(f"Processos expirados na fila: {self.timed_out_processes}")
-        print(f"Pontuacao: {self.score}")
-        
-        if rho < 1:
+            lines.append(f"CPU {i+1}: {status}, Fila: {len(computer.queue)}, Tempo processamento: {computer.processing_time_ms/1000:.2f}s")
+            if computer.sojourn_stats.count:
+                lines.append(f"  espera: {computer.wait_stats.format_seconds()}")
+                lines.append(f"  permanencia: {computer.sojourn_stats.format_seconds()}")
+        
+        lines.append(f"Processos expirados na fila: {self.timed_out_processes}")
+        self._report_occupancy(lines, lambda_rate, mu_rate, c)
+        self._report_losses(lines)
+        
+        # Escalonamento: compara resposta e retorno entre FIFO e round-robin
+        if self.time_slice_ms:
+            switches = sum(cpu.context_switches for cpu in self.computers)
+            switch_seconds = sum(cpu.switch_time_ms for cpu in self.computers) / 1000
+            preemptions = sum(cpu.preemptions for cpu in self.computers)
+            lines.append(f"Escalonamento: round-robin (quantum {self.time_slice_ms}ms, troca {self.context_switch_ms}ms)")
+            lines.append(f"Trocas de contexto: {switches} ({switch_seconds:.2f}s de CPU), Preempcoes: {preemptions}")
+        else:
+            lines.append("Escalonamento: FIFO (sem preempcao)")
+        if self.completed_processes > 0:
+            lines.append(f"Tempo medio de resposta: {self.total_response_time_ms / self.completed_processes / 1000:.2f}s")
+            lines.append(f"Tempo medio de retorno: {self.total_turnaround_time_ms / self.completed_processes / 1000:.2f}s")
+            for name, stats in self.latency_stats.items():
+                lines.append(f"Distribuicao de {name}: {stats.format_seconds()}")
+        
+        # Relatórios por classe de processo e por fonte de chegada
+        if len(self.class_stats) > 1:
+            self._report_group_stats(lines, "Por classe", self.class_stats)
+        if len(self.source_stats) > 1:
+            self._report_group_stats(lines, "Por fonte", self.source_stats)
+        lines.append(f"Pontuacao: {self.score}")
+        
+        if self.network.is_active:
+            self._report_network(lines, lambda_rate)
+        elif rho < 1:
             # Cálculos simplificados para M/M/c
-            print("Sistema estavel")
+            lines.append("Sistema estavel")
+        else:
+            lines.append("Sistema instavel: a taxa de chegada e maior que a capacidade total de servico")
+            lines.append("A fila so fica limitada pelas perdas (bloqueio na capacidade K e abandono por tempo de fila)")
+        return "\n".join(lines)
+    
+    def measured_occupancy(self):
+        """L, Lq e ocupação médios no tempo (comparáveis ao M/M/c)"""
+        now = sim_clock.get_ticks()
+        Lq = self.occupancy['Lq'].mean(now)
+        busy = self.occupancy['busy'].mean(now)
+        servers = self.occupancy['servers'].mean(now)
+        return {
+            'L': Lq + busy,  # na fila ou em atendimento
+            'Lq': Lq,
+            'busy_servers': busy,
+            'rho': busy / servers if servers > 0 else 0.0  # tempo ocupado / tempo disponível
+        }
+    
+    def _report_occupancy(self, lines, lambda_rate, mu_rate, c):
+        """Compara L, Lq e ρ medidos (médias no tempo) com o M/M/c (numa rede, só o medido)"""
+        measured = self.measured_occupancy()
+        theory = None if self.network.is_active else mmc_metrics(lambda_rate, mu_rate, c)
+        if theory:
+            lines.append(f"L medido {measured['L']:.2f} (teorico {theory['L']:.2f}), "
+                  f"Lq medido {measured['Lq']:.2f} (teorico {theory['Lq']:.2f}), "
+                  f"rho medido {measured['rho']:.3f} (teorico {theory['rho']:.3f})")
         else:
-            print("Sistema instavel: a taxa de chegada e maior que a capacidade total de servico")
\ No newline at end of file
+            lines.append(f"L medido {measured['L']:.2f}, Lq medido {measured['Lq']:.2f}, rho medido {measured['rho']:.3f}")
+        lines.append("rho por CPU: " + ", ".join(f"{cpu.name} {cpu.utilization():.2f}" for cpu in self.computers[:COMPACT_CPU_THRESHOLD]))
+    
+    def loss_report(self):
+        """Perdas medidas (bloqueio e abandono) e previstas pelo modelo M/M/c/K+M"""
+        admitted = self.connection.total_created
+        arrivals = admitted + self.blocked_arrivals
+        report = {
+            'capacity': self.connection.max_capacity,
+            'patience_seconds': self.max_queue_time_seconds,
+            'blocked': self.blocked_arrivals,
+            'timed_out': self.timed_out_processes,
+            'blocked_fraction': self.blocked_arrivals / arrivals if arrivals else 0.0,
+            'abandon_fraction': self.timed_out_processes / admitted if admitted else 0.0,
+            'model': None
+        }
+        
+        # O modelo é de uma estação única: numa rede cada estágio tem sua própria fila
+        active_cpus = [cpu for cpu in self.computers if not cpu.is_stopped]
+        if active_cpus and not self.network.is_active:
+            avg_processing_time = sum(cpu.processing_time_ms for cpu in active_cpus) / len(active_cpus)
+            # Paciência determinística (tempo máximo de fila) aproximada por exponencial de mesma média
+            theta = 1 / self.max_queue_time_seconds if self.max_queue_time_seconds > 0 else 0.0
+            # O modelo só é recalculado quando algum parâmetro muda (o painel pede a cada quadro)
+            params = (self.arrival_rate, 1000 / avg_processing_time, len(active_cpus), theta, self.connection.max_capacity)
+            if self._loss_model_cache[0] != params:
+                self._loss_model_cache = (params, erlang_a_metrics(*params))
+            report['model'] = self._loss_model_cache[1]
+        return report
+    
+    def _report_losses(self, lines):
+        """Compara bloqueio e abandono medidos com o previsto pelo M/M/c/K+M (Erlang-A)"""
+        report = self.loss_report()
+        model = report['model']
+        lines.append(f"=== PERDAS (K={report['capacity']}, paciencia {report['patience_seconds']:.1f}s) ===")
+        if model is None:
+            lines.append(f"Bloqueio: medido {report['blocked_fraction']*100:.2f}%")
+            lines.append(f"Abandono: medido {report['abandon_fraction']*100:.2f}%")
+            return
+        lines.append(f"Bloqueio: medido {report['blocked_fraction']*100:.2f}%, teorico {model['P_block']*100:.2f}%")
+        lines.append(f"Abandono: medido {report['abandon_fraction']*100:.2f}%, teorico {model['P_abandon']*100:.2f}%")
+        lines.append(f"Lambda efetivo teorico: {model['lambda_eff']:.3f}/s, vazao {model['throughput']:.3f}/s")
+    
+    def _report_network(self, lines, arrival_rate):
+        """Compara a teoria de forma-produto (Jackson) com o medido em cada estágio da rede"""
+        exact = self.network.is_product_form(self.generators, self.computers)
+        lines.append(f"=== REDE DE FILAS ({len(self.network.stages)} estagios, forma-produto {'exata' if exact else 'aproximada'}) ===")
+        theory = self.network.product_form_metrics(arrival_rate)
+        if theory is None:
+            lines.append("Roteamento sem saida: todo processo volta para a rede")
+            return
+        
+        for stage, predicted in zip(self.network.stages, theory['stages']):
+            measured = self.network.measured_metrics(stage)
+            predicted_w = f"{predicted['metrics']['W']:.2f}s" if predicted['metrics'] else "instavel"
+            measured_w = f"{measured['W']:.2f}s" if measured['W'] is not None else "-"
+            transit = f", +{measured['transit']:.2f}s de entrada/trajeto" if measured['transit'] is not None else ""
+            lines.append(f"{stage['name']}: c={predicted['c']}, visitas {predicted['visits']:.2f}, "
+                  f"lambda {predicted['lambda']:.3f}/s (medido {measured['lambda']:.3f}), "
+                  f"rho {predicted['rho']:.3f} (medido {measured['rho']:.3f}), W {predicted_w} (medido {measured_w}{transit})")
+        if any(predicted['c'] > 1 for predicted in theory['stages']):
+            lines.append("Estagios com varias CPUs tem uma fila por CPU, escolhida no roteamento: o W do M/M/c e um limite inferior")
+        lines.append(f"Gargalo: {theory['bottleneck']}")
+        
+        if theory['stable']:
+            measured = self.network.measured_network_time()
+            if theory['W'] is not None and measured is not None:
+                # O medido conta só as estações; filas de entrada e trajetos entre CPUs vêm à parte
+                lines.append(f"Tempo na rede: teorico {theory['W']:.2f}s, medido {measured['W']:.2f}s "
+                             f"(+{measured['outside']:.2f}s em filas de entrada e trajetos)")
+            lines.append("Rede estavel")
+        else:
+            lines.append(f"Rede instavel: o estagio {theory['bottleneck']} nao da conta das visitas que recebe")
+    
+    def _report_group_stats(self, lines, title, table):
+        """Acrescenta ao relatório os contadores de cada grupo de processos"""
+        lines.append(f"--- {title} ---")
+        for group, stats in table.items():
+            completed = stats['completed']
+            if completed > 0:
+                mean_service = stats['total_service_ms'] / completed / 1000
+                mean_turnaround = stats['total_turnaround_ms'] / completed / 1000
+            else:
+                mean_service = mean_turnaround = 0.0
+            lines.append(f"{group}: criados {stats['created']}, concluidos {completed}, "
+                  f"expirados {stats['timed_out']}, bloqueados {stats['blocked']}, servico medio {mean_service:.2f}s, retorno medio {mean_turnaround:.2f}s")
\ No newline at end of file
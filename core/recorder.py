@@ -0,0 +1,74 @@
+import os
+
+# Gravação sem janela: o driver de vídeo dummy do SDL basta para desenhar numa Surface
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from config import SCREEN_WIDTH, SCREEN_HEIGHT
+from core.clock import sim_clock
+from core.log import get_logger
+from core.fonts import install_font_cache
+from views.simulator_view import SimulatorView
+
+logger = get_logger("gravador")
+
+FORMATS = ("png", "raw")
+
+
+class FrameRecorder:
+    """Desenha a simulação numa Surface fora da tela em intervalos fixos de tempo simulado e grava os quadros"""
+
+    # png: sequência frame_000000.png... no diretório `output`
+    # raw: quadros RGB24 concatenados num arquivo (ou FIFO) para o ffmpeg montar o vídeo
+    def __init__(self, output, fmt="png", fps=30, speed=1.0):
+        if fmt not in FORMATS:
+            raise ValueError(f"Formato de gravação inválido: {fmt} (use {', '.join(FORMATS)})")
+        self.output = output
+        self.format = fmt
+        self.fps = fps
+        self.speed = speed
+        # Um quadro do vídeo a cada `speed / fps` segundos simulados (speed 60 = 1 min simulado por segundo de vídeo)
+        self.frame_interval_ms = 1000 * speed / fps
+        self.frames_written = 0
+        self.surface = None
+        self.view = None  # views.simulator_view, criada no primeiro quadro (o modelo não desenha)
+        self._next_frame_ms = None
+        self._stream = None
+
+    def start(self):
+        """Prepara a Surface e o destino (diretório dos PNGs ou arquivo de vídeo bruto)"""
+        pygame.init()
+        install_font_cache()
+        self.surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        if self.format == "png":
+            os.makedirs(self.output, exist_ok=True)
+        else:
+            self._stream = open(self.output, "wb")
+            logger.info("Video bruto em %s; para codificar: ffmpeg -f rawvideo -pix_fmt rgb24 -s %sx%s -r %s -i %s video.mp4",
+                        self.output, SCREEN_WIDTH, SCREEN_HEIGHT, self.fps, self.output)
+        self._next_frame_ms = sim_clock.get_ticks()
+        return self
+
+    def stop(self):
+        """Fecha o vídeo bruto"""
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+    def capture(self, simulator):
+        """Chamado a cada passo: desenha e grava só quando o relógio simulado passa do próximo quadro"""
+        now = sim_clock.get_ticks()
+        if now < self._next_frame_ms:
+            return
+        if self.view is None or self.view.simulator is not simulator:
+            self.view = SimulatorView(simulator)
+        self.view.draw(self.surface)
+        if self.format == "png":
+            pygame.image.save(self.surface, os.path.join(self.output, f"frame_{self.frames_written:06d}.png"))
+        else:
+            to_bytes = getattr(pygame.image, "tobytes", None) or pygame.image.tostring
+            self._stream.write(to_bytes(self.surface, "RGB"))
+        self.frames_written += 1
+        # Quadros perdidos (passo maior que o intervalo) não são repetidos: o vídeo segue o tempo simulado
+        while self._next_frame_ms <= now:
+            self._next_frame_ms += self.frame_interval_ms
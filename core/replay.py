@@ -0,0 +1,127 @@
+import json
+import mmap
+import struct
+from core.log import get_logger
+from core.trace import MAGIC, EVENT_CODES
+
+logger = get_logger("replay")
+
+
+class ArrivalTrace:
+    """Leitor de um trace de chegadas mapeado em memória: itera (tempo_ms, servico_ms, classe) sem carregá-lo"""
+
+    # Formatos aceitos:
+    # - texto/CSV, uma chegada por linha: tempo_s[,servico_ms[,classe]] (cabeçalho e '#' ignorados;
+    #   linhas malformadas são puladas com um aviso que dá o número da linha)
+    # - trace binário do simulador (core.trace): eventos 'create' e 'blocked' (chegadas perdidas com o
+    #   sistema cheio também são carga oferecida), opcionalmente de uma só fonte. O trace binário não
+    #   guarda demanda nem classe: a reprodução repete só os instantes de chegada, e o serviço e a
+    #   classe são sorteados de novo pela fonte (servico_ms e classe vêm como None)
+    def __init__(self, path, source=None, cursor=None):
+        self.path = path
+        self.source = source
+        self.position = 0  # registros já entregues
+        # Onde retomar depois do último registro entregue (snapshot): (deslocamento em bytes da próxima
+        # linha, número dela) (texto) ou (início do bloco, linha dentro dele) (binário)
+        self._cursor = cursor
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Trace de chegadas vazio: {path}")
+        is_binary = self._map[:len(MAGIC)] == MAGIC
+        self._records = self._binary_records(cursor) if is_binary else self._text_records(cursor)
+        self.format = "binario" if is_binary else "texto"
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        record = next(self._records)
+        self.position += 1
+        return record
+
+    def __getstate__(self):
+        # O mapeamento não é serializável: um snapshot guarda só o arquivo e onde retomar
+        return {'path': self.path, 'source': self.source, 'position': self.position, 'cursor': self._cursor}
+
+    def __setstate__(self, state):
+        # Retoma direto no deslocamento salvo, sem reler o trace desde o começo
+        self.__init__(state['path'], state['source'], state['cursor'])
+        self.position = state['position']
+
+    def close(self):
+        """Libera o mapeamento e o arquivo"""
+        self._records.close()
+        self._map.close()
+        self._file.close()
+
+    def _text_records(self, start=None):
+        """Registros de um trace em texto, linha a linha direto do mapeamento"""
+        offset, line_number = start or (0, 1)
+        header_allowed = start is None  # só antes do primeiro registro
+        self._map.seek(offset)
+        for line_number, line in enumerate(iter(self._map.readline, b""), line_number):
+            fields = line.split(b"#", 1)[0].replace(b",", b" ").split()
+            if not fields:
+                continue
+            try:
+                time_ms = float(fields[0]) * 1000
+                service_ms = float(fields[1]) if len(fields) > 1 else None
+                job_class = fields[2].decode() if len(fields) > 2 else None
+            except ValueError:
+                if not header_allowed:
+                    logger.warning("%s:%d: linha ignorada (esperado tempo_s[,servico_ms[,classe]]): %r",
+                                   self.path, line_number, line.strip().decode(errors="replace"))
+                header_allowed = False
+                continue
+            header_allowed = False
+            self._cursor = (self._map.tell(), line_number + 1)
+            yield time_ms, service_ms, job_class
+
+    def _binary_records(self, start=None):
+        """Chegadas (eventos 'create' e 'blocked') de um trace binário, bloco a bloco"""
+        data = self._map
+        offset = len(MAGIC)
+        (header_size,) = struct.unpack_from("<I", data, offset)
+        offset += 4
+        header = json.loads(data[offset:offset + header_size])
+        offset += header_size
+        prefix = "<" if header['byteorder'] == "little" else ">"
+        events = header.get('events', EVENT_CODES)
+        arrivals = {events['create'], events['blocked']}
+        columns = [(name, typecode, struct.calcsize(prefix + typecode)) for name, typecode in header['columns']]
+        first_row = 0
+        if start is not None:
+            offset, first_row = start
+
+        while offset < len(data):
+            block = offset
+            (n,) = struct.unpack_from("<I", data, offset)
+            offset += 4
+            spans = {}
+            for name, typecode, size in columns:
+                spans[name] = (typecode, offset, offset + n * size)
+                offset += n * size
+            (strings_size,) = struct.unpack_from("<I", data, offset)
+            offset += 4 + strings_size
+
+            def column(name, first):
+                # Só um bloco de uma coluna é copiado por vez: memória limitada pelo tamanho do bloco
+                typecode, begin, end = spans[name]
+                begin += first * struct.calcsize(prefix + typecode)
+                return (value for (value,) in struct.iter_unpack(prefix + typecode, data[begin:end]))
+
+            rows = zip(column('time_ms', first_row), column('event', first_row), column('value', first_row))
+            for row, (time_ms, event, value) in enumerate(rows, first_row):
+                # 'create' e 'blocked' guardam o id do gerador em 'value'
+                if event in arrivals and (self.source is None or value == self.source):
+                    self._cursor = (block, row + 1)
+                    yield time_ms, None, None
+            first_row = 0
+
+
+def open_arrival_trace(path, source=None):
+    """Abre um trace de chegadas (texto ou binário); `source` filtra a fonte num trace binário"""
+    return ArrivalTrace(path, source)
@@ -0,0 +1,314 @@
+import json
+import os
+from config import (PROCESSING_TIME_MS, MAX_CONNECTION_CAPACITY, TRANSPORT_SPEED, INITIAL_CPU_COUNT, MAX_CPUS,
+                    CPU_BASE_PRICE, MAX_HEALTH_POINTS, TIME_SLICE_MS, CONTEXT_SWITCH_MS, GENERATOR_SOURCES,
+                    JOB_CLASSES, JOB_CLASS_PRESETS, NETWORK_STAGES, NETWORK_PRESETS)
+from entities.generator import ARRIVAL_DISTRIBUTIONS
+
+try:
+    import tomllib  # Python 3.11+
+except ImportError:
+    tomllib = None
+
+# Demanda de serviço das classes e estágios; as fontes aceitam o que o gerador implementa (ARRIVAL_DISTRIBUTIONS)
+DISTRIBUTIONS = ("deterministic", "exponential", "uniform")
+STRATEGIES = ("round_robin", "least_loaded")
+MODES = ("sandbox", "game")
+# Chaves opcionais de modes.<modo>: intervalo da primeira fonte e tempo máximo em fila só naquele modo
+MODE_OVERRIDES = ("interval_seconds", "max_queue_time_seconds")
+
+
+class FrozenDict(dict):
+    """dict somente leitura (serializável em snapshots, ao contrário de MappingProxyType)"""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Cenário compilado é imutável")
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+def default_scenario_data() -> dict:
+    """Cenário padrão montado a partir das constantes do config (o mesmo comportamento de antes)"""
+    return {
+        "name": "padrao",
+        "cpus": {"count": INITIAL_CPU_COUNT, "max": MAX_CPUS, "processing_time_ms": PROCESSING_TIME_MS},
+        "system": {
+            "capacity": MAX_CONNECTION_CAPACITY,
+            "transport_speed": TRANSPORT_SPEED,
+            "strategy": "round_robin",
+            "max_queue_time_seconds": 10.0,
+            "time_slice_ms": TIME_SLICE_MS,
+            "context_switch_ms": CONTEXT_SWITCH_MS,
+        },
+        "sources": GENERATOR_SOURCES,
+        "job_classes": JOB_CLASSES,
+        "network": NETWORK_STAGES,
+        # Cada modo pode sobrepor MODE_OVERRIDES; sem a chave, vale o que o cenário define em sources/system
+        "modes": {
+            "sandbox": {},
+            "game": {"health_points": MAX_HEALTH_POINTS, "random_event_seconds": 10.0},
+        },
+        # Economia da loja: preço base, fator de aumento por nível e efeito de cada nível
+        "shop": {
+            "cpu_base_price": CPU_BASE_PRICE,
+            "upgrade_processing_speed": {"base_price": 10, "price_increase": 1.4,
+                                         "factor": 0.85, "min_processing_time_ms": 300},
+            "upgrade_capacity": {"base_price": 8, "price_increase": 1.35, "step": 8},
+            "upgrade_speed": {"base_price": 6, "price_increase": 1.3, "factor": 1.25},
+        },
+    }
+
+
+def _merge(base, override):
+    """Sobrepõe `override` a `base`: dicts são mesclados por chave, o resto é substituído"""
+    if isinstance(base, dict) and isinstance(override, dict):
+        merged = dict(base)
+        for key, value in override.items():
+            merged[key] = _merge(base[key], value) if key in base else value
+        return merged
+    return override
+
+
+def _resolve_presets(data):
+    """job_classes e network aceitam o nome de um preset do config no lugar da lista"""
+    for key, presets in (("job_classes", JOB_CLASS_PRESETS), ("network", NETWORK_PRESETS)):
+        if isinstance(data.get(key), str) and data[key] in presets:
+            data[key] = presets[data[key]]
+    return data
+
+
+def _stages_without_exit(stages) -> list:
+    """Estágios alcançáveis a partir da entrada dos quais nenhum processo consegue sair da rede"""
+    edges = {stage["name"]: [target for target, probability in (stage.get("routing") or {}).items()
+                             if probability > 0]
+             for stage in stages}
+    # Um estágio é saída quando suas probabilidades de roteamento somam menos de 1
+    can_exit = {stage["name"] for stage in stages
+                if sum((stage.get("routing") or {}).values()) < 1.0 - 1e-9}
+    changed = True
+    while changed:
+        changed = False
+        for name, targets in edges.items():
+            if name not in can_exit and any(target in can_exit for target in targets):
+                can_exit.add(name)
+                changed = True
+    reachable, pending = set(), [stages[0]["name"]]
+    while pending:
+        name = pending.pop()
+        if name not in reachable:
+            reachable.add(name)
+            pending.extend(edges.get(name, []))
+    return [stage["name"] for stage in stages if stage["name"] in reachable and stage["name"] not in can_exit]
+
+
+def validate_scenario(data) -> list:
+    """Lista de problemas do cenário (vazia = válido)"""
+    errors = []
+    defaults = default_scenario_data()
+
+    def check_keys(section, allowed, where):
+        for key in section:
+            if key not in allowed:
+                errors.append(f"{where}: chave desconhecida '{key}'")
+
+    def check_number(value, where, minimum=0, allow_none=False, integer=False, strict=True):
+        if value is None and allow_none:
+            return
+        kinds = (int,) if integer else (int, float)
+        if isinstance(value, bool) or not isinstance(value, kinds):
+            errors.append(f"{where}: esperado {'inteiro' if integer else 'número'}, veio {value!r}")
+        elif value < minimum or (strict and value == minimum):
+            errors.append(f"{where}: deve ser {'>' if strict else '>='} {minimum}, veio {value!r}")
+
+    def check_distribution(value, where, choices=DISTRIBUTIONS):
+        if value not in choices:
+            errors.append(f"{where}: distribuição '{value}' inválida (use {', '.join(choices)})")
+
+    check_keys(data, defaults, "cenário")
+    for section in ("cpus", "system", "modes", "shop"):
+        if not isinstance(data.get(section), dict):
+            errors.append(f"{section}: esperado uma tabela")
+            return errors
+
+    cpus = data["cpus"]
+    check_keys(cpus, defaults["cpus"], "cpus")
+    check_number(cpus["count"], "cpus.count", integer=True)
+    check_number(cpus["max"], "cpus.max", integer=True)
+    check_number(cpus["processing_time_ms"], "cpus.processing_time_ms")
+    if not errors and cpus["count"] > cpus["max"]:
+        errors.append(f"cpus.count ({cpus['count']}) maior que cpus.max ({cpus['max']})")
+
+    system = data["system"]
+    check_keys(system, defaults["system"], "system")
+    check_number(system["capacity"], "system.capacity", integer=True)
+    check_number(system["transport_speed"], "system.transport_speed")
+    check_number(system["max_queue_time_seconds"], "system.max_queue_time_seconds")
+    check_number(system["time_slice_ms"], "system.time_slice_ms", allow_none=True)
+    check_number(system["context_switch_ms"], "system.context_switch_ms", strict=False)
+    if system["strategy"] not in STRATEGIES:
+        errors.append(f"system.strategy: '{system['strategy']}' inválida (use {', '.join(STRATEGIES)})")
+
+    # Ids das CPUs que recebem chegadas externas: as do estágio de entrada numa rede, senão todas
+    entry_cpu_ids = range(1, cpus["count"] + 1) if isinstance(cpus["count"], int) and cpus["count"] > 0 else range(1, 2)
+    network = data["network"]
+    if isinstance(network, list) and network and isinstance(network[0], dict):
+        entry_cpus = network[0].get("cpus", 1)
+        entry_cpu_ids = range(1, max(1, entry_cpus if isinstance(entry_cpus, int) else 1) + 1)
+
+    if not isinstance(data["sources"], list) or not data["sources"]:
+        errors.append("sources: esperado uma lista com pelo menos uma fonte")
+    else:
+        for i, source in enumerate(data["sources"]):
+            where = f"sources[{i}]"
+            if not isinstance(source, dict):
+                errors.append(f"{where}: esperado uma tabela, veio {source!r}")
+                continue
+            check_keys(source, ("name", "interval_seconds", "distribution", "pool", "trace", "trace_source"), where)
+            check_number(source.get("interval_seconds", 1.0), f"{where}.interval_seconds")
+            check_distribution(source.get("distribution", "deterministic"), f"{where}.distribution",
+                               ARRIVAL_DISTRIBUTIONS)
+            pool = source.get("pool")
+            if pool is not None and (not isinstance(pool, list) or not all(isinstance(cpu, int) for cpu in pool)):
+                errors.append(f"{where}.pool: esperado lista de ids de CPU ou nada")
+            elif pool is not None:
+                for cpu in pool:
+                    if cpu not in entry_cpu_ids:
+                        errors.append(f"{where}.pool: CPU {cpu} não existe (CPUs de entrada: "
+                                      f"{min(entry_cpu_ids)}..{max(entry_cpu_ids)})")
+            if source.get("trace") and not os.path.exists(source["trace"]):
+                errors.append(f"{where}.trace: arquivo '{source['trace']}' não encontrado")
+
+    if not isinstance(data["job_classes"], list) or not data["job_classes"]:
+        errors.append(f"job_classes: esperado uma lista ou um preset ({', '.join(JOB_CLASS_PRESETS)})")
+    else:
+        for i, job_class in enumerate(data["job_classes"]):
+            where = f"job_classes[{i}]"
+            if not isinstance(job_class, dict):
+                errors.append(f"{where}: esperado uma tabela, veio {job_class!r}")
+                continue
+            check_keys(job_class, ("name", "weight", "service_ms", "distribution"), where)
+            if not job_class.get("name"):
+                errors.append(f"{where}.name: obrigatório")
+            check_number(job_class.get("weight", 1.0), f"{where}.weight")
+            check_number(job_class.get("service_ms", PROCESSING_TIME_MS), f"{where}.service_ms")
+            check_distribution(job_class.get("distribution", "deterministic"), f"{where}.distribution")
+
+    if not isinstance(data["network"], list):
+        errors.append(f"network: esperado uma lista de estágios ou um preset ({', '.join(NETWORK_PRESETS)})")
+    else:
+        names = {stage.get("name") for stage in data["network"] if isinstance(stage, dict)}
+        stages_ok = True
+        for i, stage in enumerate(data["network"]):
+            where = f"network[{i}]"
+            if not isinstance(stage, dict):
+                errors.append(f"{where}: esperado uma tabela, veio {stage!r}")
+                stages_ok = False
+                continue
+            check_keys(stage, ("name", "cpus", "service_ms", "distribution", "routing"), where)
+            if not stage.get("name"):
+                errors.append(f"{where}.name: obrigatório")
+                stages_ok = False
+            check_number(stage.get("cpus", 1), f"{where}.cpus", integer=True)
+            check_number(stage.get("service_ms"), f"{where}.service_ms", allow_none=True)
+            if stage.get("distribution") is not None:
+                check_distribution(stage["distribution"], f"{where}.distribution")
+            routing = stage.get("routing") or {}
+            if not isinstance(routing, dict):
+                errors.append(f"{where}.routing: esperado uma tabela destino -> probabilidade, veio {routing!r}")
+                stages_ok = False
+                continue
+            before = len(errors)
+            for target, probability in routing.items():
+                if target not in names:
+                    errors.append(f"{where}.routing: estágio '{target}' não existe")
+                check_number(probability, f"{where}.routing.{target}", strict=False)
+            if len(errors) > before:
+                stages_ok = False
+            elif sum(routing.values()) > 1.0 + 1e-9:
+                errors.append(f"{where}.routing: probabilidades somam mais de 1")
+        if stages_ok and data["network"]:
+            for name in _stages_without_exit(data["network"]):
+                errors.append(f"network: o estágio '{name}' não tem caminho para a saída (rede fechada)")
+        # Numa rede, o total de CPUs dos estágios substitui cpus.count e também não passa de cpus.max
+        stage_cpus = [stage.get("cpus", 1) for stage in data["network"] if isinstance(stage, dict)]
+        if all(isinstance(count, int) for count in stage_cpus) and isinstance(cpus["max"], int):
+            total = sum(max(1, count) for count in stage_cpus)
+            if total > cpus["max"]:
+                errors.append(f"network: os estágios pedem {total} CPUs, mais que cpus.max ({cpus['max']})")
+
+    modes = data["modes"]
+    check_keys(modes, MODES, "modes")
+    for mode in MODES:
+        if not isinstance(modes[mode], dict):
+            errors.append(f"modes.{mode}: esperado uma tabela")
+            return errors
+        check_keys(modes[mode], (*defaults["modes"][mode], *MODE_OVERRIDES), f"modes.{mode}")
+        for key in MODE_OVERRIDES:
+            check_number(modes[mode].get(key), f"modes.{mode}.{key}", allow_none=True)
+    check_number(modes["game"]["health_points"], "modes.game.health_points", integer=True)
+    check_number(modes["game"]["random_event_seconds"], "modes.game.random_event_seconds")
+
+    shop = data["shop"]
+    check_keys(shop, defaults["shop"], "shop")
+    check_number(shop["cpu_base_price"], "shop.cpu_base_price", strict=False)
+    for item_id, item_defaults in defaults["shop"].items():
+        if not isinstance(item_defaults, dict):
+            continue
+        if not isinstance(shop[item_id], dict):
+            errors.append(f"shop.{item_id}: esperado uma tabela")
+            continue
+        check_keys(shop[item_id], item_defaults, f"shop.{item_id}")
+        for key, value in shop[item_id].items():
+            check_number(value, f"shop.{item_id}.{key}", strict=key != "min_processing_time_ms")
+    return errors
+
+
+def freeze(value):
+    """Cópia profunda imutável: dicts viram FrozenDict e listas viram tuplas"""
+    if isinstance(value, dict):
+        return FrozenDict({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value):
+    """Cópia profunda mutável de um valor congelado (para componentes que guardam estado nos dicts)"""
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+def compile_scenario(data=None, source="cenário"):
+    """Mescla sobre o padrão, valida uma única vez e congela o cenário"""
+    merged = _resolve_presets(_merge(default_scenario_data(), data or {}))
+    errors = validate_scenario(merged)
+    if errors:
+        raise ValueError(f"{source} inválido:\n  - " + "\n  - ".join(errors))
+    return freeze(merged)
+
+
+def load_scenario(path):
+    """Lê um arquivo de cenário (.toml ou .json) e devolve o cenário compilado"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".toml":
+        if tomllib is None:
+            raise ValueError("Cenários TOML exigem Python 3.11+ (use .json)")
+        with open(path, "rb") as scenario_file:
+            data = tomllib.load(scenario_file)
+    elif extension == ".json":
+        with open(path, "r", encoding="utf-8") as scenario_file:
+            data = json.load(scenario_file)
+    else:
+        raise ValueError(f"Formato de cenário não suportado: {path} (use .toml ou .json)")
+    data.setdefault("name", os.path.splitext(os.path.basename(path))[0])
+    return compile_scenario(data, f"Cenário {path}")
+
+
+# Cenário usado quando nenhum arquivo é dado
+DEFAULT_SCENARIO = compile_scenario()
@@ -0,0 +1,379 @@
+import argparse
+import asyncio
+import json
+import math
+import time
+from config import MAX_STEPS_PER_FRAME, SERVICE_HOST, SERVICE_PORT, SERVICE_PUBLISH_INTERVAL, SERVICE_MAX_SPEED
+from core.clock import sim_clock, FixedTimestep
+from core.headless import HeadlessRunner, STEP_MS
+from core.scenario import STRATEGIES, load_scenario
+from core.log import configure_logging, get_logger
+
+logger = get_logger("servico")
+
+# Assinante que não lê: passado este tanto de bytes pendentes no buffer, a conexão é derrubada
+MAX_PENDING_BYTES = 1 << 20
+# Passos por fatia do loop (entre elas o loop atende os clientes), no modo "o mais rápido possível" e
+# dentro de um tique com speed alto
+FAST_BATCH_STEPS = 64
+
+
+def metrics_snapshot(simulator) -> dict:
+    """Métricas do simulador num dict serializável em JSON (tempos em segundos)"""
+    occupancy = simulator.measured_occupancy()
+    latency = {}
+    for kind, stats in simulator.latency_stats.items():
+        quantiles = {str(p): (value / 1000 if value is not None else None)
+                     for p, value in ((p, stats.quantile(p)) for p in stats.QUANTILES)}
+        latency[kind] = {'count': stats.count, 'mean': stats.mean / 1000 if stats.count else None,
+                         'quantiles': quantiles}
+    return {
+        'simulated_seconds': sim_clock.get_ticks() / 1000,
+        'arrival_rate': simulator.arrival_rate,
+        'interval_seconds': [generator.interval_seconds for generator in simulator.generators],
+        'strategy': simulator.connection.load_balancer.distribution_strategy,
+        'in_system': simulator.connection.total_processes,
+        'capacity': simulator.connection.max_capacity,
+        'created': simulator.connection.total_created,
+        'completed': simulator.completed_processes,
+        'timed_out': simulator.timed_out_processes,
+        'blocked': simulator.blocked_arrivals,
+        'occupancy': occupancy,
+        'latency': latency,
+        'cpus': [{'id': computer.computer_id, 'queue': len(computer.queue), 'busy': not computer.is_idle,
+                  'stopped': computer.is_stopped, 'utilization': computer.utilization()}
+                 for computer in simulator.computers],
+    }
+
+
+class ServiceError(Exception):
+    """Comando inválido: vira {"ok": false, "error": ...} na resposta"""
+
+
+class SimulationService:
+    """Simulação headless num loop asyncio, controlada por um socket local e transmitindo métricas"""
+
+    # Protocolo: uma mensagem JSON por linha. Pedido {"cmd": "...", ...}; resposta {"ok": true, ...} ou
+    # {"ok": false, "error": "..."}. Depois de "subscribe", a conexão recebe {"event": "metrics", ...} a cada
+    # publish_interval segundos reais. Os comandos rodam no mesmo loop que avança a simulação, entre dois
+    # passos: o simulador só é tocado por esta thread e não precisa de travas.
+    def __init__(self, runner, speed=1.0, publish_interval=SERVICE_PUBLISH_INTERVAL):
+        self.runner = runner
+        self.publish_interval = publish_interval
+        self.paused = False
+        self.steps_run = 0
+        self.subscribers = set()
+        self.clients = {}  # writer -> tarefa que atende a conexão
+        self.timestep = None
+        self.speed = None
+        self.set_speed(speed)
+        self._stopped = None
+        self.error = None  # exceção que parou a tarefa da simulação (o serviço segue respondendo)
+        self._last_publish = (sim_clock.get_ticks(), runner.simulator.completed_processes)
+        self.commands = {
+            'status': self._cmd_status,
+            'metrics': self._cmd_metrics,
+            'set_interval': self._cmd_set_interval,
+            'add_cpu': self._cmd_add_cpu,
+            'set_cpus': self._cmd_set_cpus,
+            'stop_cpu': self._cmd_stop_cpu,
+            'resume_cpu': self._cmd_resume_cpu,
+            'set_strategy': self._cmd_set_strategy,
+            'set_speed': self._cmd_set_speed,
+            'pause': self._cmd_pause,
+            'resume': self._cmd_resume,
+            'subscribe': self._cmd_subscribe,
+            'unsubscribe': self._cmd_unsubscribe,
+            'shutdown': self._cmd_shutdown,
+        }
+
+    @property
+    def simulator(self):
+        return self.runner.simulator
+
+    @property
+    def halted(self):
+        """Motivo da parada da simulação (None enquanto ela roda)"""
+        return None if self.error is None else f"{type(self.error).__name__}: {self.error}"
+
+    def set_speed(self, speed):
+        """Segundos simulados por segundo real; None = o mais rápido possível"""
+        if speed is not None and not 0 < speed <= SERVICE_MAX_SPEED:
+            raise ServiceError(f"speed deve estar em (0, {SERVICE_MAX_SPEED:g}] (ou null para o mais rápido possível)")
+        self.speed = speed
+        # Com speed alto um tique do loop cobre vários passos: o limite cresce junto para não descartar tempo,
+        # mas fica preso a SERVICE_MAX_SPEED (e _simulate devolve o loop a cada FAST_BATCH_STEPS passos)
+        max_steps = MAX_STEPS_PER_FRAME * max(1, math.ceil(speed or 1))
+        self.timestep = FixedTimestep(STEP_MS, max_steps)
+
+    def execute(self, request, client=None) -> dict:
+        """Executa um comando (dict já decodificado) e devolve a resposta; `client` é o writer da conexão"""
+        try:
+            if not isinstance(request, dict):
+                raise ServiceError("esperado um objeto JSON")
+            handler = self.commands.get(request.get('cmd'))
+            if handler is None:
+                raise ServiceError(f"comando desconhecido: {request.get('cmd')!r} (use {', '.join(self.commands)})")
+            return {'ok': True, **(handler(request, client) or {})}
+        except ServiceError as error:
+            return {'ok': False, 'error': str(error)}
+        except Exception as error:
+            # Falha inesperada num comando: o cliente recebe a resposta e a conexão continua
+            logger.exception("Falha no comando %r", request.get('cmd') if isinstance(request, dict) else request)
+            return {'ok': False, 'error': f"erro interno: {type(error).__name__}: {error}"}
+
+    # --- Comandos ---
+
+    def _cmd_status(self, request, client):
+        return {'paused': self.paused, 'speed': self.speed, 'steps': self.steps_run, 'halted': self.halted,
+                'simulated_seconds': sim_clock.get_ticks() / 1000, 'subscribers': len(self.subscribers)}
+
+    def _cmd_metrics(self, request, client):
+        return {'metrics': metrics_snapshot(self.simulator), 'halted': self.halted}
+
+    def _cmd_set_interval(self, request, client):
+        seconds = _number(request, 'seconds')
+        generator = self._generator(request.get('generator', 1))
+        if generator.arrival_trace is not None:
+            raise ServiceError(f"{generator.name} segue um trace de chegadas")
+        generator.set_interval(seconds)
+        logger.info("Intervalo de %s alterado para %.3fs", generator.name, seconds)
+        return {'generator': generator.generator_id, 'interval_seconds': generator.interval_seconds}
+
+    def _cmd_add_cpu(self, request, client):
+        count = len(self.simulator.computers)
+        self.simulator.add_computer()
+        if len(self.simulator.computers) == count:
+            raise ServiceError(f"limite de {self.simulator.max_cpus} CPUs atingido")
+        return {'cpu': self.simulator.computers[-1].computer_id, 'cpus': len(self.simulator.computers)}
+
+    def _cmd_set_cpus(self, request, client):
+        self.simulator.set_computer_count(int(_number(request, 'count')))
+        return {'cpus': len(self.simulator.computers)}
+
+    def _cmd_stop_cpu(self, request, client):
+        computer = self._computer(request)
+        computer.stop()
+        return {'cpu': computer.computer_id, 'stopped': computer.is_stopped}
+
+    def _cmd_resume_cpu(self, request, client):
+        computer = self._computer(request)
+        computer.resume()
+        return {'cpu': computer.computer_id, 'stopped': computer.is_stopped}
+
+    def _cmd_set_strategy(self, request, client):
+        strategy = request.get('strategy')
+        if strategy not in STRATEGIES:
+            raise ServiceError(f"estratégia inválida: {strategy!r} (use {', '.join(STRATEGIES)})")
+        self.simulator.set_strategy(strategy)
+        return {'strategy': strategy}
+
+    def _cmd_set_speed(self, request, client):
+        speed = request.get('speed')
+        self.set_speed(None if speed is None else _number(request, 'speed'))
+        return {'speed': self.speed}
+
+    def _cmd_pause(self, request, client):
+        self.paused = True
+        return {'paused': True}
+
+    def _cmd_resume(self, request, client):
+        # O tempo real parado não vira uma rajada de passos
+        self.timestep.reset()
+        self.paused = False
+        return {'paused': False}
+
+    def _cmd_subscribe(self, request, client):
+        if client is None:
+            raise ServiceError("subscribe só vale numa conexão")
+        self.subscribers.add(client)
+        return {'publish_interval': self.publish_interval}
+
+    def _cmd_unsubscribe(self, request, client):
+        self.subscribers.discard(client)
+        return {}
+
+    def _cmd_shutdown(self, request, client):
+        if self._stopped is not None:
+            self._stopped.set()
+        return {}
+
+    def _generator(self, generator_id):
+        for generator in self.simulator.generators:
+            if generator.generator_id == generator_id:
+                return generator
+        raise ServiceError(f"gerador {generator_id!r} não existe")
+
+    def _computer(self, request):
+        computer_id = request.get('cpu')
+        for computer in self.simulator.computers:
+            if computer.computer_id == computer_id:
+                return computer
+        raise ServiceError(f"CPU {computer_id!r} não existe")
+
+    # --- Loop ---
+
+    async def _simulate(self):
+        """Avança a simulação no ritmo de `speed`, devolvendo o loop aos clientes entre as fatias"""
+        last = time.perf_counter()
+        while True:
+            now = time.perf_counter()
+            elapsed_ms = (now - last) * 1000
+            last = now
+            if self.paused:
+                steps = 0
+            elif self.speed is None:
+                steps = FAST_BATCH_STEPS
+            else:
+                steps = self.timestep.steps(elapsed_ms * self.speed)
+            for done in range(1, steps + 1):
+                self.runner.step()
+                self.steps_run += 1
+                if done % FAST_BATCH_STEPS == 0 and done < steps:
+                    # Um tique longo não segura os clientes; pause e set_speed valem no meio dele
+                    await asyncio.sleep(0)
+                    if self.paused or self.speed is None:
+                        break
+            if self.speed is None and not self.paused:
+                await asyncio.sleep(0)
+            else:
+                await asyncio.sleep(STEP_MS / 1000)
+
+    def _on_simulation_done(self, task):
+        """Registra a falha da tarefa da simulação: status e os assinantes passam a mostrar a parada"""
+        if task.cancelled() or task.exception() is None:
+            return
+        self.error = task.exception()
+        logger.error("Falha na simulação; o serviço segue com o estado parado", exc_info=self.error)
+        self._broadcast({'event': 'halted', 'error': self.halted})
+
+    async def _publish(self):
+        """Manda as métricas para os assinantes a cada publish_interval segundos reais"""
+        while True:
+            await asyncio.sleep(self.publish_interval)
+            if not self.subscribers:
+                continue
+            self._broadcast({'event': 'metrics', **self._metrics_with_throughput()})
+
+    def _metrics_with_throughput(self) -> dict:
+        """Métricas atuais e as conclusões por segundo simulado desde a última publicação"""
+        metrics = metrics_snapshot(self.simulator)
+        now_ms, completed = sim_clock.get_ticks(), self.simulator.completed_processes
+        last_ms, last_completed = self._last_publish
+        elapsed = (now_ms - last_ms) / 1000
+        metrics['throughput'] = (completed - last_completed) / elapsed if elapsed > 0 else None
+        self._last_publish = (now_ms, completed)
+        return metrics
+
+    def _broadcast(self, message):
+        """Escreve sem esperar: um assinante lento não segura o loop nem os outros"""
+        data = _encode(message)
+        for writer in list(self.subscribers):
+            if writer.is_closing():
+                self.subscribers.discard(writer)
+                continue
+            writer.write(data)
+            if writer.transport.get_write_buffer_size() > MAX_PENDING_BYTES:
+                logger.warning("Assinante sem ler as métricas desconectado")
+                self.subscribers.discard(writer)
+                writer.close()
+
+    async def _handle_client(self, reader, writer):
+        self.clients[writer] = asyncio.current_task()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError as error:
+                    response = {'ok': False, 'error': f"JSON inválido: {error}"}
+                else:
+                    response = self.execute(request, writer)
+                writer.write(_encode(response))
+                await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError) as error:
+            logger.debug("Conexão encerrada: %s", error)
+        finally:
+            self.clients.pop(writer, None)
+            self.subscribers.discard(writer)
+            writer.close()
+
+    async def serve(self, host=SERVICE_HOST, port=SERVICE_PORT, path=None, ready=None):
+        """Roda o serviço até um "shutdown"; `path` usa um socket Unix em vez de TCP local"""
+        self._stopped = asyncio.Event()
+        if path:
+            server = await asyncio.start_unix_server(self._handle_client, path)
+            address = path
+        else:
+            server = await asyncio.start_server(self._handle_client, host, port)
+            address = "%s:%s" % server.sockets[0].getsockname()[:2]
+        simulation = asyncio.create_task(self._simulate())
+        simulation.add_done_callback(self._on_simulation_done)
+        tasks = [simulation, asyncio.create_task(self._publish())]
+        logger.info("Servico da simulacao em %s", address)
+        if ready is not None:
+            ready(address)
+        try:
+            async with server:
+                await self._stopped.wait()
+        finally:
+            for task in tasks:
+                task.cancel()
+            # Fechar o transporte entrega EOF ao readline: cada conexão termina pelo caminho normal
+            handlers = list(self.clients.values())
+            for writer in list(self.clients):
+                writer.close()
+            await asyncio.gather(*tasks, *handlers, return_exceptions=True)
+            self.subscribers.clear()
+
+
+def _number(request, key) -> float:
+    """Campo numérico positivo e finito do pedido (o JSON aceita Infinity e NaN)"""
+    value = request.get(key)
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value) or value <= 0:
+        raise ServiceError(f"{key}: esperado número finito > 0, veio {value!r}")
+    return value
+
+
+def _encode(message) -> bytes:
+    return (json.dumps(message) + "\n").encode("utf-8")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulação headless como serviço local (comandos e métricas em JSON por linha)")
+    parser.add_argument("--scenario", help="arquivo de cenário (.toml/.json; não combina com --snapshot-in)")
+    parser.add_argument("--snapshot-in", help="parte do estado salvo neste snapshot")
+    parser.add_argument("--seed", type=int, help="semente (padrão 1; ao retomar um snapshot, a dele)")
+    parser.add_argument("--speed", type=float, default=1.0, help="segundos simulados por segundo real")
+    parser.add_argument("--max-speed", action="store_true", help="simula o mais rápido possível")
+    parser.add_argument("--host", default=SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    parser.add_argument("--socket", help="socket Unix neste caminho em vez de TCP")
+    parser.add_argument("--publish-interval", type=float, default=SERVICE_PUBLISH_INTERVAL,
+                        help="segundos (reais) entre envios de métricas aos assinantes")
+    parser.add_argument("--log-level", default="INFO")
+    args = parser.parse_args(argv)
+    if args.scenario and args.snapshot_in:
+        parser.error("--scenario não combina com --snapshot-in: o snapshot já traz o seu cenário")
+    configure_logging(args.log_level)
+
+    snapshot = None
+    if args.snapshot_in:
+        with open(args.snapshot_in, "rb") as snapshot_file:
+            snapshot = snapshot_file.read()
+    scenario = {"base_scenario": load_scenario(args.scenario) if args.scenario else None}
+    seed = args.seed if args.seed is not None or snapshot is not None else 1
+    runner = HeadlessRunner(scenario, seed=seed, snapshot=snapshot)
+    service = SimulationService(runner, None if args.max_speed else args.speed, args.publish_interval)
+    try:
+        asyncio.run(service.serve(args.host, args.port, args.socket,
+                                  ready=lambda address: print(f"Servico em {address} (Ctrl+C para sair)", flush=True)))
+    except KeyboardInterrupt:
+        pass
+    print(f"{runner.simulated_seconds:.0f}s simulados")
+
+
+if __name__ == "__main__":
+    main()
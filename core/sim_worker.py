@@ -0,0 +1,102 @@
+import collections
+import threading
+import time
+from config import FPS, SIM_STEP_MS, MAX_STEPS_PER_FRAME
+from core.clock import sim_clock, FixedTimestep
+from core.log import get_logger
+
+logger = get_logger("simulacao")
+
+
+class SimulationWorker:
+    """Roda a simulação numa thread própria e publica modelos de desenho num buffer duplo"""
+
+    # A thread da simulação é dona do simulador e da view (views.simulator_view): só ela os altera,
+    # inclusive com os comandos vindos da interface. A cada 1/publish_hz segundos ela monta um
+    # render_model() novo (só posições, estados e números, sem referências ao simulador) e troca a
+    # referência da frente; a interface desenha o mais recente com uma FrameView própria.
+    def __init__(self, view, speed=1.0, publish_hz=FPS, step_ms=SIM_STEP_MS, max_steps=MAX_STEPS_PER_FRAME,
+                 exporter=None):
+        self.view = view
+        self.simulator = view.simulator
+        self.exporter = exporter  # core.exporter: as métricas são lidas aqui, entre dois passos
+        self.speed = speed  # segundos simulados por segundo real; None = o mais rápido possível
+        self.publish_interval = 1.0 / publish_hz
+        self.step_ms = step_ms
+        self.timestep = FixedTimestep(step_ms, max_steps)
+        self.steps_run = 0
+        self.error = None
+        self._commands = collections.deque()
+        self._front = None  # último render_model() publicado
+        self._stopping = False
+        self._thread = None
+
+    def start(self):
+        """Publica o estado inicial e sobe a thread da simulação"""
+        self._publish()
+        self._thread = threading.Thread(target=self._run, name="simulacao", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Para a thread (o simulador fica no estado do último passo)"""
+        self._stopping = True
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def submit(self, command, redraw=True):
+        """Agenda `command(view)` para rodar na thread da simulação, entre dois passos
+
+        redraw=False (hover) não antecipa a publicação: o efeito aparece no próximo quadro regular.
+        """
+        self._commands.append((command, redraw))
+
+    def frame(self):
+        """Último modelo de desenho publicado (views.simulator_view.FrameView.draw)
+
+        Se a thread da simulação falhou (o erro já foi para o log), o último modelo volta com
+        'halted' = mensagem do erro: a interface segue de pé e mostra a simulação parada.
+        """
+        if self.error is not None and 'halted' not in self._front:
+            # A thread já terminou: a interface é a única a mexer na referência daqui em diante
+            self._front = dict(self._front, halted=f"{type(self.error).__name__}: {self.error}")
+        return self._front
+
+    def _publish(self):
+        """Monta o modelo do quadro e troca a referência da frente (a interface nunca vê meio quadro)"""
+        self._front = self.view.render_model()
+
+    def _run(self):
+        next_publish = time.perf_counter() + self.publish_interval
+        last = time.perf_counter()
+        try:
+            while not self._stopping:
+                redraw = False
+                while self._commands:
+                    command, command_redraw = self._commands.popleft()
+                    command(self.view)
+                    redraw = redraw or command_redraw
+                now = time.perf_counter()
+                if self.speed is None:
+                    steps = self.timestep.max_steps
+                else:
+                    steps = self.timestep.steps((now - last) * 1000 * self.speed)
+                last = now
+                for _ in range(steps):
+                    sim_clock.advance(self.step_ms)
+                    self.simulator.update(self.step_ms / 1000)
+                self.steps_run += steps
+                if steps and self.exporter:
+                    self.exporter.publish(self.simulator, frame=False)
+                now = time.perf_counter()
+                # Comandos da interface (clique, tecla) aparecem já no próximo quadro desenhado
+                if redraw or now >= next_publish:
+                    self._publish()
+                    next_publish = now + self.publish_interval
+                if steps == 0:
+                    # Adiantada em relação ao tempo real: dorme até o próximo passo vencer
+                    time.sleep(max(0.0, (self.step_ms - self.timestep.accumulator_ms) / 1000 / self.speed))
+        except Exception as error:
+            logger.exception("Falha na thread da simulação")
+            self.error = error
@@ -0,0 +1,53 @@
+import os
+import pickle
+import random
+from core.clock import sim_clock
+
+MAGIC = b"QSSNAP02"
+
+
+def snapshot(simulator, include_random=True) -> bytes:
+    """Estado completo do simulador (CPUs, filas, processos em voo, loja, pontuação, vida, timers) em bytes"""
+    # O grafo inteiro vai num único pickle (referências compartilhadas preservadas), junto com o
+    # instante do relógio da simulação e, opcionalmente, o estado do gerador aleatório
+    state = {
+        'clock_ms': sim_clock.get_ticks(),
+        'random': random.getstate() if include_random else None,
+        'simulator': simulator,
+    }
+    return MAGIC + pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def decode(data) -> dict:
+    """Lê um snapshot sem efeitos colaterais: dict com clock_ms, random e simulator"""
+    if not data.startswith(MAGIC):
+        raise ValueError("Dados não são um snapshot do simulador")
+    return pickle.loads(memoryview(data)[len(MAGIC):])
+
+
+def restore(data, restore_random=True):
+    """Recria um simulador a partir de snapshot(); o relógio volta ao instante salvo"""
+    state = decode(data)
+    sim_clock.set_time(state['clock_ms'])
+    if restore_random and state['random'] is not None:
+        random.setstate(state['random'])
+    return state['simulator']
+
+
+def fork(simulator, include_random=True):
+    """Cópia independente do simulador no estado atual (ramos what-if sem refazer o aquecimento)"""
+    return restore(snapshot(simulator, include_random), include_random)
+
+
+def save_snapshot(simulator, path):
+    """Grava o snapshot em `path` (arquivo temporário + rename: um checkpoint nunca fica pela metade)"""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as snapshot_file:
+        snapshot_file.write(snapshot(simulator))
+    os.replace(temp_path, path)
+
+
+def load_snapshot(path, restore_random=True):
+    """Lê um snapshot gravado por save_snapshot()"""
+    with open(path, "rb") as snapshot_file:
+        return restore(snapshot_file.read(), restore_random)
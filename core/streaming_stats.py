@@ -0,0 +1,182 @@
+import bisect
+import math
+
+
+class WelfordAccumulator:
+    """Média e variância incrementais (algoritmo de Welford), com memória O(1)"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        """Acrescenta uma amostra"""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    @property
+    def variance(self) -> float:
+        """Variância amostral"""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        """Desvio padrão amostral"""
+        return math.sqrt(self.variance)
+
+
+class P2Quantile:
+    """Estimador P² (Jain & Chlamtac) de um quantil: cinco marcadores, memória O(1)"""
+
+    def __init__(self, p):
+        self.p = p
+        self.count = 0
+        self.heights = []  # alturas dos marcadores (as 5 primeiras amostras, ordenadas)
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, value):
+        """Acrescenta uma amostra ajustando os marcadores"""
+        self.count += 1
+        if self.count <= 5:
+            bisect.insort(self.heights, value)
+            return
+
+        q, n = self.heights, self.positions
+        if value < q[0]:
+            q[0] = value
+            cell = 0
+        elif value >= q[4]:
+            q[4] = value
+            cell = 3
+        else:
+            cell = bisect.bisect_right(q, value) - 1
+
+        for i in range(cell + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        # Ajusta os marcadores internos que se afastaram da posição desejada
+        for i in range(1, 4):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                step = 1 if d > 0 else -1
+                candidate = self._parabolic(i, step)
+                if q[i - 1] < candidate < q[i + 1]:
+                    q[i] = candidate
+                else:
+                    q[i] = q[i] + step * (q[i + step] - q[i]) / (n[i + step] - n[i])
+                n[i] += step
+
+    def _parabolic(self, i, step):
+        """Predição parabólica (P²) da nova altura do marcador i"""
+        q, n = self.heights, self.positions
+        return q[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    @property
+    def value(self):
+        """Estimativa atual do quantil (None sem amostras)"""
+        if self.count == 0:
+            return None
+        if self.count <= 5:
+            # Poucas amostras: quantil exato das que existem
+            return self.heights[min(len(self.heights) - 1, int(round(self.p * (len(self.heights) - 1))))]
+        return self.heights[2]
+
+
+class StreamingStats:
+    """Média/variância (Welford) e quantis p50/p95/p99 (P²) de uma série de tempos em ms"""
+
+    QUANTILES = (0.5, 0.95, 0.99)
+
+    def __init__(self):
+        self.moments = WelfordAccumulator()
+        self.quantiles = {p: P2Quantile(p) for p in self.QUANTILES}
+
+    def add(self, value):
+        """Acrescenta uma amostra em O(1)"""
+        self.moments.add(value)
+        for estimator in self.quantiles.values():
+            estimator.add(value)
+
+    @property
+    def count(self) -> int:
+        return self.moments.count
+
+    @property
+    def mean(self) -> float:
+        return self.moments.mean
+
+    @property
+    def std(self) -> float:
+        return self.moments.std
+
+    def quantile(self, p):
+        """Estimativa do quantil p (um dos QUANTILES)"""
+        return self.quantiles[p].value
+
+    def summary(self) -> dict:
+        """Resumo em ms: contagem, média, desvio, mínimo, máximo e quantis"""
+        result = {
+            'count': self.count,
+            'mean': self.mean,
+            'std': self.std,
+            'min': self.moments.min,
+            'max': self.moments.max,
+        }
+        for p in self.QUANTILES:
+            result[f"p{int(p * 100)}"] = self.quantile(p)
+        return result
+
+    def format_seconds(self) -> str:
+        """Texto curto em segundos: média ± desvio e p50/p95/p99"""
+        if self.count == 0:
+            return "sem amostras"
+        p50, p95, p99 = (self.quantile(p) / 1000 for p in self.QUANTILES)
+        return (f"media {self.mean / 1000:.2f}s ± {self.std / 1000:.2f}, "
+                f"p50 {p50:.2f}s, p95 {p95:.2f}s, p99 {p99:.2f}s")
+
+
+class TimeWeightedAverage:
+    """Média no tempo de um valor em degraus (ex.: tamanho de fila), atualizada só nas transições"""
+
+    def __init__(self, start_time=0, value=0):
+        self.start_time = start_time
+        self.last_time = start_time
+        self.value = value
+        self.area = 0.0  # integral do valor até last_time
+
+    def set(self, value, now):
+        """Registra que o valor passou a ser `value` no instante `now` (O(1))"""
+        if now > self.last_time:
+            self.area += self.value * (now - self.last_time)
+            self.last_time = now
+        self.value = value
+
+    def add(self, delta, now):
+        """Soma `delta` ao valor atual no instante `now`"""
+        self.set(self.value + delta, now)
+
+    def reset(self, now):
+        """Recomeça a média a partir de `now`, mantendo o valor atual"""
+        self.start_time = self.last_time = now
+        self.area = 0.0
+
+    def mean(self, now):
+        """Média ponderada pelo tempo entre o início e `now`"""
+        elapsed = now - self.start_time
+        if elapsed <= 0:
+            return float(self.value)
+        return (self.area + self.value * max(0, now - self.last_time)) / elapsed
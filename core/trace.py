@@ -0,0 +1,148 @@
+import atexit
+import json
+import struct
+import sys
+from array import array
+from core.clock import sim_clock
+
+# Códigos dos eventos do ciclo de vida (coluna 'event'); 'value' depende do evento
+EVENT_CODES = {
+    'create': 1,        # process, computer = CPU alvo, value = id do gerador
+    'blocked': 2,       # value = id do gerador (chegada perdida com o sistema cheio)
+    'transit': 3,       # process, computer = CPU alvo, value = CPU de origem (-1 = gerador)
+    'enqueue': 4,       # process, computer, value = tamanho da fila depois da entrada
+    'start': 5,         # process, computer
+    'preempt': 6,       # process, computer
+    'complete': 7,      # process, computer (fim de uma visita)
+    'exit': 8,          # process (saída do sistema após o último atendimento)
+    'timeout': 9,       # process, computer
+    'cpu_stop': 10,     # computer
+    'cpu_resume': 11,   # computer
+    'purchase': 12,     # value = texto do item (tabela de textos)
+    'random_event': 13, # computer = CPU afetada (-1 = nenhuma), value = texto do evento
+}
+EVENT_NAMES = {code: name for name, code in EVENT_CODES.items()}
+
+# Colunas do arquivo: nome -> typecode do array
+COLUMNS = (
+    ('time_ms', 'd'),
+    ('event', 'B'),
+    ('process', 'i'),
+    ('computer', 'i'),
+    ('value', 'i'),
+)
+MAGIC = b"QSTRACE1"
+
+
+class EventTrace:
+    """Gravador opcional de eventos em colunas: buffers pré-alocados gravados em blocos num arquivo binário"""
+
+    def __init__(self, chunk_size=65536):
+        self.chunk_size = chunk_size
+        self.enabled = False
+        self.path = None
+        self.events_written = 0
+        self._file = None
+        self._count = 0
+        self._columns = [array(typecode, bytes(array(typecode).itemsize * chunk_size)) for _, typecode in COLUMNS]
+        self._strings = {}       # texto -> código
+        self._new_strings = []   # textos ainda não gravados
+
+    def start(self, path):
+        """Liga a gravação no arquivo `path` (sobrescreve)"""
+        self.stop()
+        self.path = path
+        self._file = open(path, "wb")
+        header = json.dumps({'byteorder': sys.byteorder, 'columns': COLUMNS, 'events': EVENT_CODES}).encode()
+        self._file.write(MAGIC + struct.pack("<I", len(header)) + header)
+        self._count = 0
+        self.events_written = 0
+        self._strings = {}
+        self._new_strings = []
+        self.enabled = True
+        atexit.register(self.stop)
+
+    def stop(self):
+        """Grava o que falta e fecha o arquivo"""
+        if not self.enabled:
+            return
+        self.flush()
+        self._file.close()
+        self._file = None
+        self.enabled = False
+        atexit.unregister(self.stop)
+
+    def record(self, event, process=-1, computer=-1, value=-1):
+        """Acrescenta um evento (código de EVENT_CODES) nos buffers; O(1) e sem alocação"""
+        if not self.enabled:
+            return
+        i = self._count
+        time_col, event_col, process_col, computer_col, value_col = self._columns
+        time_col[i] = sim_clock.get_ticks()
+        event_col[i] = event
+        process_col[i] = process
+        computer_col[i] = computer
+        value_col[i] = value
+        self._count = i + 1
+        if self._count == self.chunk_size:
+            self.flush()
+
+    def text_code(self, text) -> int:
+        """Código inteiro de um texto (itens da loja, eventos aleatórios) para a coluna 'value'"""
+        code = self._strings.get(text)
+        if code is None:
+            code = self._strings[text] = len(self._strings)
+            self._new_strings.append(text)
+        return code
+
+    def flush(self):
+        """Grava o bloco atual: quantidade, cada coluna contígua e os textos novos"""
+        if self._file is None or (self._count == 0 and not self._new_strings):
+            return
+        n = self._count
+        self._file.write(struct.pack("<I", n))
+        for column in self._columns:
+            self._file.write(memoryview(column)[:n])
+        strings = json.dumps(self._new_strings).encode()
+        self._file.write(struct.pack("<I", len(strings)) + strings)
+        self._file.flush()
+        self.events_written += n
+        self._count = 0
+        self._new_strings = []
+
+
+def read_trace(path):
+    """Lê um arquivo de trace: dict coluna -> array, mais 'strings' (tabela de textos)"""
+    with open(path, "rb") as trace_file:
+        data = trace_file.read()
+    if not data.startswith(MAGIC):
+        raise ValueError(f"{path} não é um trace do simulador")
+    offset = len(MAGIC)
+    (header_size,) = struct.unpack_from("<I", data, offset)
+    offset += 4
+    header = json.loads(data[offset:offset + header_size])
+    offset += header_size
+
+    columns = {name: array(typecode) for name, typecode in header['columns']}
+    strings = []
+    while offset < len(data):
+        (n,) = struct.unpack_from("<I", data, offset)
+        offset += 4
+        for name, typecode in header['columns']:
+            size = n * columns[name].itemsize
+            columns[name].frombytes(data[offset:offset + size])
+            offset += size
+        (strings_size,) = struct.unpack_from("<I", data, offset)
+        offset += 4
+        strings.extend(json.loads(data[offset:offset + strings_size]))
+        offset += strings_size
+
+    if header['byteorder'] != sys.byteorder:
+        for column in columns.values():
+            column.byteswap()
+    columns['strings'] = strings
+    return columns
+
+
+# Gravador único compartilhado (desligado até start())
+event_trace = EventTrace()
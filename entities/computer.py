@@ -1,20 +1,19 @@
-import pygame
-from config import Colors, ElementSizes
+from config import Colors, ElementSizes, GridPositions, CPU_COLORS, TIME_SLICE_MS, CONTEXT_SWITCH_MS, PROCESSING_TIME_MS
 from utils.grid_helper import GridHelper
 from entities.process import Process
 from entities.process_states import ProcessState
+from core.streaming_stats import StreamingStats, TimeWeightedAverage
+from core.clock import sim_clock
+from core.trace import event_trace, EVENT_CODES
+from core.log import get_logger
+
+logger = get_logger("cpu")
 
 class Computer:
     def __init__(self, computer_id=1, grid_position=None, color=None):
-        # Usar posição específica ou padrão
+        # Usar posição específica ou padrão (o simulador redistribui se houver muitas CPUs)
         if grid_position is None:
-            from config import GridPositions
-            if computer_id == 1:
-                grid_position = GridPositions.COMPUTER_1
-            elif computer_id == 2:
-                grid_position = GridPositions.COMPUTER_2
-            else:
-                grid_position = GridPositions.COMPUTER_3
+            grid_position = GridPositions.COMPUTERS[(computer_id - 1) % len(GridPositions.COMPUTERS)]
         
         col, row = grid_position
         width_cells, height_cells = ElementSizes.COMPUTER
@@ -29,11 +28,31 @@ class Computer:
         self.current_process = None
         self.is_stopped = False
         self.pre_stop_state = None
-        self.processing_time_ms = 2000  # Default: 2 seconds
+        self.processing_time_ms = PROCESSING_TIME_MS  # o simulador aplica o valor do cenário
+        
+        # Escalonamento preemptivo (round-robin)
+        self.time_slice_ms = TIME_SLICE_MS  # None = sem preempção
+        self.context_switch_ms = CONTEXT_SWITCH_MS
+        self.context_switches = 0
+        self.switch_time_ms = 0  # CPU ocupada em trocas de contexto, fora da espera dos processos
+        self.preemptions = 0
+        
+        # Tempos de cada visita atendida aqui (ms), a partir da chegada à CPU: espera na fila e permanência total
+        self.wait_stats = StreamingStats()
+        self.sojourn_stats = StreamingStats()
+        
+        # Integrais no tempo do tamanho da fila e da ocupação (ρ medido desta CPU);
+        # os acumuladores do sistema são compartilhados entre as CPUs (attach_occupancy)
+        now = sim_clock.get_ticks()
+        self.queue_length_avg = TimeWeightedAverage(now)
+        self.busy_avg = TimeWeightedAverage(now)
+        self.system_queue_avg = None
+        self.system_busy_avg = None
         
         # Cor específica para esta CPU
-        self.base_color = color if color else Colors.RED
+        self.base_color = color if color else CPU_COLORS[(computer_id - 1) % len(CPU_COLORS)]
         self.queue = []  # Fila própria para esta CPU
+        self.stage = None  # Estágio da rede de filas ao qual a CPU pertence (None = único)
     
     @property
     def color(self) -> tuple:
@@ -60,19 +79,44 @@ class Computer:
         if not self.is_stopped:
             self.is_stopped = True
             self.pre_stop_state = self.is_idle
-            print(f"{self.name} parada")
+            event_trace.record(EVENT_CODES['cpu_stop'], computer=self.computer_id)
+            logger.info("%s parada", self.name)
     
     def resume(self):
         """Retoma a CPU"""
         if self.is_stopped:
             self.is_stopped = False
-            print(f"{self.name} retomada")
+            event_trace.record(EVENT_CODES['cpu_resume'], computer=self.computer_id)
+            logger.info("%s retomada", self.name)
     
     def set_processing_time(self, seconds):
         """Define o tempo de processamento em segundos"""
         if seconds > 0:
             self.processing_time_ms = int(seconds * 1000)
-            print(f"Tempo de processamento de {self.name} alterado para: {seconds:.2f} segundos")
+            logger.info("Tempo de processamento de %s alterado para: %.2f segundos", self.name, seconds)
+    
+    def set_time_slice(self, time_slice_ms, context_switch_ms=None):
+        """Define o quantum do round-robin (None desativa a preempção)"""
+        self.time_slice_ms = time_slice_ms if time_slice_ms and time_slice_ms > 0 else None
+        if context_switch_ms is not None and context_switch_ms >= 0:
+            self.context_switch_ms = int(context_switch_ms)
+        if self.is_preemptive:
+            logger.debug("%s em round-robin: quantum %sms, troca de contexto %sms", self.name, self.time_slice_ms, self.context_switch_ms)
+        else:
+            logger.debug("%s sem preempção (executa até o fim)", self.name)
+    
+    @property
+    def is_preemptive(self):
+        """Indica se a CPU está em modo round-robin preemptivo"""
+        return self.time_slice_ms is not None
+    
+    def service_time_for(self, process) -> int:
+        """Tempo de serviço do processo nesta CPU, escalado pela velocidade dela"""
+        if process.service_demand_ms is None:
+            return self.processing_time_ms
+        # processing_time_ms é o tempo da CPU para um processo de demanda base
+        speed_factor = self.processing_time_ms / PROCESSING_TIME_MS
+        return max(1, int(process.service_demand_ms * speed_factor))
     
     @property
     def queue_length(self):
@@ -83,64 +127,130 @@ class Computer:
         """Adiciona processo à fila desta CPU"""
         process.enter_cpu_queue()
         self.queue.append(process)
+        self._track_occupancy(queue_delta=1)
+        event_trace.record(EVENT_CODES['enqueue'], process.id, self.computer_id, len(self.queue))
         return True
     
     def get_next_process(self):
         """Remove e retorna o próximo processo da fila"""
         if self.queue:
+            self._track_occupancy(queue_delta=-1)
             return self.queue.pop(0)
         return None
     
-    def draw(self, screen: pygame.Surface) -> None:
-        """Desenha a CPU na tela"""
-        # Retângulo principal
-        pygame.draw.rect(screen, self.color, (self.x, self.y, self.width, self.height))
-        pygame.draw.rect(screen, Colors.WHITE, (self.x, self.y, self.width, self.height), 2)
-        
-        # Informações de texto
-        font = pygame.font.SysFont(None, 24)
-        title_font = pygame.font.SysFont(None, 28)
-        
-        # Nome da CPU
-        title_text = title_font.render(self.name, True, Colors.WHITE)
-        screen.blit(title_text, (self.x + self.width // 2 - 25, self.y + 10))
-        
-        # Status
-        if self.is_stopped:
-            status = "PARADA"
-        else:
-            status = "PROCESSANDO" if not self.is_idle else "OCIOSA"
-        status_text = font.render(status, True, Colors.WHITE)
-        screen.blit(status_text, (self.x + self.width // 2 - 40, self.y + self.height // 2 - 10))
-        
-        # Processo atual
-        if not self.is_idle and self.current_process and not self.is_stopped:
-            process_text = font.render(f"P{self.current_process.id}", True, Colors.WHITE)
-            screen.blit(process_text, (self.x + self.width // 2 - 10, self.y + self.height // 2 + 20))
-        
-        # Tamanho da fila
-        queue_text = font.render(f"Fila: {len(self.queue)}", True, Colors.WHITE)
-        screen.blit(queue_text, (self.x + self.width // 2 - 20, self.y + self.height - 30))
+    def remove_from_queue(self, process):
+        """Tira um processo da fila (ex.: tempo máximo de espera excedido)"""
+        self.queue.remove(process)
+        self._track_occupancy(queue_delta=-1)
+    
+    def release_processes(self) -> list:
+        """Esvazia a CPU (processo atual e fila) e devolve os processos para redistribuição"""
+        orphans = list(self.queue)
+        if self.current_process and self.current_process.state == ProcessState.PROCESSING:
+            self.current_process.preempt()
+            orphans.insert(0, self.current_process)
+        self._track_occupancy(queue_delta=-len(self.queue), busy_delta=0 if self.is_idle else -1)
+        self.queue.clear()
+        self.current_process = None
+        self.is_idle = True
+        return orphans
+    
+    def attach_occupancy(self, system_queue_avg, system_busy_avg):
+        """Liga a CPU aos acumuladores de fila e ocupação de todo o sistema"""
+        self.system_queue_avg = system_queue_avg
+        self.system_busy_avg = system_busy_avg
+        now = sim_clock.get_ticks()
+        system_queue_avg.add(len(self.queue), now)
+        system_busy_avg.add(0 if self.is_idle else 1, now)
+    
+    def _track_occupancy(self, queue_delta=0, busy_delta=0):
+        """Atualiza as integrais de fila e ocupação numa transição de estado (O(1))"""
+        now = sim_clock.get_ticks()
+        if queue_delta:
+            self.queue_length_avg.add(queue_delta, now)
+            if self.system_queue_avg is not None:
+                self.system_queue_avg.add(queue_delta, now)
+        if busy_delta:
+            self.busy_avg.add(busy_delta, now)
+            if self.system_busy_avg is not None:
+                self.system_busy_avg.add(busy_delta, now)
+    
+    def utilization(self) -> float:
+        """Fração do tempo em que a CPU esteve ocupada (ρ medido)"""
+        return self.busy_avg.mean(sim_clock.get_ticks())
+    
+    def mean_queue_length(self) -> float:
+        """Tamanho médio da fila ponderado pelo tempo"""
+        return self.queue_length_avg.mean(sim_clock.get_ticks())
+    
+    def set_bounds(self, x, y, width, height):
+        """Reposiciona a CPU (usado pelo layout automático)"""
+        self.x, self.y, self.width, self.height = x, y, width, height
     
     def start_processing(self, process: Process) -> None:
         """Inicia o processamento de um processo"""
         if not self.is_stopped:
+            if self.is_idle:
+                self._track_occupancy(busy_delta=1)
             self.current_process = process
             self.is_idle = False
-            # Set the processing time for the process
-            process.processing_time_ms = self.processing_time_ms
-            process.start_processing()
-            print(f"{self.name} iniciou processamento do Processo {process.id}")
+            # Processos novos recebem o tempo da CPU; preemptados mantêm o restante
+            if process.remaining_time_ms is None:
+                process.processing_time_ms = self.service_time_for(process)
+            
+            # No modo preemptivo cada despacho paga a troca de contexto
+            switch_delay = 0
+            if self.is_preemptive:
+                switch_delay = self.context_switch_ms
+                self.context_switches += 1
+                self.switch_time_ms += switch_delay
+            process.start_processing(switch_delay)
+            event_trace.record(EVENT_CODES['start'], process.id, self.computer_id)
+            logger.debug("%s iniciou processamento do Processo %s", self.name, process.id)
     
     def check_processing_complete(self) -> bool:
         """Verifica se o processamento atual foi concluído"""
         if not self.is_stopped and self.current_process and self.current_process.is_processing_complete():
-            print(f"{self.name} completou processamento do Processo {self.current_process.id}")
+            logger.debug("%s completou processamento do Processo %s", self.name, self.current_process.id)
+            event_trace.record(EVENT_CODES['complete'], self.current_process.id, self.computer_id)
+            self._record_visit(self.current_process)
             self.current_process = None
             self.is_idle = True
+            self._track_occupancy(busy_delta=-1)
             return True
         return False
     
+    def _record_visit(self, process) -> None:
+        """Acumula espera (da chegada à CPU até o primeiro início) e permanência da visita concluída"""
+        if process.visit_start_time is None or process.dispatch_time is None:
+            return
+        self.wait_stats.add(max(0, process.visit_start_time - process.dispatch_time))
+        self.sojourn_stats.add(max(0, process.end_time - process.dispatch_time))
+    
+    def check_time_slice(self) -> bool:
+        """Preempta o processo atual se o quantum esgotou; retorna True se houve preempção"""
+        if self.is_stopped or not self.is_preemptive or not self.current_process:
+            return False
+        
+        process = self.current_process
+        if process.state != ProcessState.PROCESSING or process.elapsed_in_slice() < self.time_slice_ms:
+            return False
+        
+        # Sem concorrentes na fila, o processo continua sem trocar de contexto
+        if not self.queue:
+            process.renew_time_slice()
+            return False
+        
+        process.preempt()
+        self.preemptions += 1
+        event_trace.record(EVENT_CODES['preempt'], process.id, self.computer_id)
+        self.current_process = None
+        self.is_idle = True
+        self._track_occupancy(busy_delta=-1)
+        self.add_to_queue(process)
+        logger.debug("%s preemptou o Processo %s (restam %.2fs)", self.name, process.id, process.remaining_time_ms/1000)
+        return True
+    
     def get_center(self) -> tuple:
         return self.x + self.width // 2, self.y + self.height // 2
     
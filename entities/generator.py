@@ -1,11 +1,34 @@
-import pygame
-from config import Colors, GridPositions, ElementSizes
+import random
+from config import Colors, GridPositions, ElementSizes, JOB_CLASSES
 from utils.grid_helper import GridHelper
 from entities.process import Process
+from core.log import get_logger
+
+logger = get_logger("gerador")
+
+# Processos de chegada implementados em schedule_next_arrival
+ARRIVAL_DISTRIBUTIONS = ("deterministic", "exponential", "uniform")
+
+class IdCounter:
+    """Sequência de ids compartilhada entre geradores (como itertools.count, mas serializável em snapshots)"""
+
+    def __init__(self, start=1):
+        self.next_id = start
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        value = self.next_id
+        self.next_id += 1
+        return value
 
 class ProcessGenerator:
-    def __init__(self):
-        col, row = GridPositions.GENERATOR
+    def __init__(self, generator_id=1, grid_position=None, name=None, interval_seconds=1.0,
+                 distribution="deterministic", pool=None, id_counter=None):
+        if grid_position is None:
+            grid_position = GridPositions.GENERATORS[(generator_id - 1) % len(GridPositions.GENERATORS)]
+        col, row = grid_position
         width_cells, height_cells = ElementSizes.GENERATOR
         
         self.x, self.y, self.width, self.height = GridHelper.grid_to_pixels(
@@ -14,8 +37,135 @@ class ProcessGenerator:
         
         self.triangle_size = min(self.width, self.height) * 0.8
         self.color = Colors.GREEN
-        self.next_process_id = 1
+        self.generator_id = generator_id
+        self.name = name if name else f"Gerador {generator_id}"
         self.is_stopped = False  # New flag to control if generator is stopped
+        
+        # Ids de processo compartilhados entre geradores (evita colisões)
+        self._id_counter = id_counter if id_counter is not None else IdCounter(1)
+        self.created_count = 0
+        
+        # Processo de chegadas desta fonte
+        self.interval_seconds = interval_seconds
+        self.distribution = distribution
+        self.pool = list(pool) if pool else None  # ids de CPU atendidos (None = todas)
+        self.time_since_last_process = 0.0
+        self.next_arrival_seconds = interval_seconds
+        
+        # Reprodução de um trace de chegadas (None = processo sintético acima)
+        self.arrival_trace = None
+        self._trace_record = None  # (tempo_ms, servico_ms, classe) da próxima chegada
+        self._trace_first_ms = None
+        self._trace_count = 0
+        
+        # Mistura de classes de processos gerados
+        self.job_classes = []
+        self.set_job_classes(JOB_CLASSES)
+    
+    def set_job_classes(self, job_classes):
+        """Define as classes de processos e seus pesos na mistura de chegadas"""
+        if not job_classes:
+            return
+        self.job_classes = [dict(job_class) for job_class in job_classes]
+        self._class_weights = [job_class.get("weight", 1.0) for job_class in self.job_classes]
+        names = ", ".join(job_class["name"] for job_class in self.job_classes)
+        logger.debug("Classes de processos: %s", names)
+    
+    def set_interval(self, interval_seconds):
+        """Altera o intervalo médio entre chegadas e reinicia o relógio"""
+        if self.arrival_trace is not None:
+            logger.warning("%s segue o trace de chegadas: intervalo não alterado", self.name)
+            return
+        if interval_seconds > 0:
+            self.interval_seconds = interval_seconds
+            self.schedule_next_arrival()
+    
+    def schedule_next_arrival(self):
+        """Sorteia o tempo até a próxima chegada segundo a distribuição da fonte"""
+        if self.arrival_trace is not None:
+            self._schedule_from_trace()
+            return
+        self.time_since_last_process = 0.0
+        if self.distribution == "exponential":
+            self.next_arrival_seconds = random.expovariate(1.0 / self.interval_seconds)
+        elif self.distribution == "uniform":
+            # Uniforme em [0.5, 1.5] x intervalo, como a demanda de serviço uniforme
+            self.next_arrival_seconds = random.uniform(0.5 * self.interval_seconds, 1.5 * self.interval_seconds)
+        else:
+            self.next_arrival_seconds = self.interval_seconds
+    
+    def set_arrival_trace(self, trace):
+        """Gera as chegadas a partir de um trace (iterador de (tempo_ms, servico_ms, classe))"""
+        if self.arrival_trace is not None:
+            self.arrival_trace.close()
+        self.arrival_trace = trace
+        self._trace_record = None
+        self._trace_first_ms = None
+        self._trace_count = 0
+        self.time_since_last_process = 0.0
+        self.next_arrival_seconds = 0.0
+        if trace is not None:
+            logger.info("%s reproduzindo trace de chegadas %s", self.name, getattr(trace, 'path', ''))
+        self.schedule_next_arrival()
+    
+    def _schedule_from_trace(self):
+        """Agenda a próxima chegada do trace mantendo o atraso do quadro (o trace não desliza)"""
+        previous = self._trace_record
+        record = next(self.arrival_trace, None)
+        if record is None:
+            logger.info("%s: trace de chegadas terminado", self.name)
+            self.arrival_trace.close()
+            self.arrival_trace = None
+            self._trace_record = None
+            self.time_since_last_process = 0.0
+            self.next_arrival_seconds = self.interval_seconds
+            self.stop()
+            return
+        
+        time_ms = record[0]
+        if self._trace_first_ms is None:
+            self._trace_first_ms = time_ms
+        self._trace_count += 1
+        if self._trace_count > 1:
+            # Intervalo médio observado até aqui (taxa usada pelos painéis e pela teoria)
+            self.interval_seconds = max(1e-6, (time_ms - self._trace_first_ms) / (self._trace_count - 1) / 1000)
+        
+        # Chegadas simultâneas (rajadas) têm intervalo zero e saem no mesmo quadro. Os instantes do
+        # trace contam a partir de quando ele é ligado: a primeira chegada espera o próprio tempo_ms
+        gap_seconds = max(0.0, time_ms - (previous[0] if previous else 0.0)) / 1000
+        self.time_since_last_process = max(0.0, self.time_since_last_process - self.next_arrival_seconds)
+        self.next_arrival_seconds = gap_seconds
+        self._trace_record = record
+    
+    def update_timer(self, dt_seconds) -> bool:
+        """Avança o relógio de chegadas; retorna True quando é hora de gerar"""
+        self.time_since_last_process += dt_seconds
+        return self.time_since_last_process >= self.next_arrival_seconds
+    
+    @property
+    def arrival_rate(self) -> float:
+        """Taxa média de chegadas desta fonte (processos/segundo)"""
+        if self.is_stopped or self.interval_seconds <= 0:
+            return 0.0
+        return 1.0 / self.interval_seconds
+    
+    def _pick_job_class(self) -> dict:
+        """Sorteia a classe do próximo processo de acordo com os pesos"""
+        if len(self.job_classes) == 1:
+            return self.job_classes[0]
+        return random.choices(self.job_classes, weights=self._class_weights)[0]
+    
+    @staticmethod
+    def sample_service_ms(job_class: dict) -> float:
+        """Sorteia a demanda de serviço segundo a distribuição da classe (ou de um estágio da rede)"""
+        mean = job_class["service_ms"]
+        distribution = job_class.get("distribution", "deterministic")
+        if distribution == "exponential":
+            return random.expovariate(1.0 / mean)
+        elif distribution == "uniform":
+            # Uniforme em [0.5, 1.5] x média
+            return random.uniform(0.5 * mean, 1.5 * mean)
+        return mean
     
     def is_clicked(self, pos):
         """Verifica se o gerador foi clicado"""
@@ -34,46 +184,31 @@ class ProcessGenerator:
         """Para o gerador"""
         if not self.is_stopped:
             self.is_stopped = True
-            print("Gerador parado")
+            logger.info("%s parado", self.name)
     
     def resume(self):
         """Retoma o gerador"""
         if self.is_stopped:
             self.is_stopped = False
-            print("Gerador retomado")
+            logger.info("%s retomado", self.name)
     
     def create_process(self) -> Process:
         """Cria um novo processo"""
         if not self.is_stopped:
             center_x, center_y = self.get_center()
-            new_process = Process(self.next_process_id, center_x, center_y)
-            self.next_process_id += 1
+            job_class = self._pick_job_class()
+            class_name, service_ms = job_class["name"], None
+            if self._trace_record is not None:
+                # O trace pode trazer a demanda e a classe de cada chegada
+                _, service_ms, traced_class = self._trace_record
+                class_name = traced_class or class_name
+            if service_ms is None:
+                service_ms = self.sample_service_ms(job_class)
+            new_process = Process(next(self._id_counter), center_x, center_y,
+                                  class_name, service_ms, self.generator_id)
+            self.created_count += 1
             return new_process
         return None
     
-    def draw(self, screen: pygame.Surface) -> None:
-        """Desenha o gerador na tela"""
-        center_x = self.x + self.width // 2
-        center_y = self.y + self.height // 2
-        
-        # Cor baseada no estado
-        current_color = Colors.DARK_GRAY if self.is_stopped else self.color
-        
-        # Triângulo
-        points = [
-            (center_x, center_y - self.triangle_size // 2),  # Topo
-            (center_x - self.triangle_size // 2, center_y + self.triangle_size // 2),  # Esq
-            (center_x + self.triangle_size // 2, center_y + self.triangle_size // 2)   # Dir
-        ]
-        
-        pygame.draw.polygon(screen, current_color, points)
-        pygame.draw.polygon(screen, Colors.WHITE, points, 2)
-        
-        # Texto
-        font = pygame.font.SysFont(None, 24)
-        status = " (PARADO)" if self.is_stopped else ""
-        text = font.render(f"Gerador{status}", True, Colors.WHITE)
-        screen.blit(text, (center_x - 45, center_y + self.triangle_size // 2 + 10))
-    
     def get_center(self) -> tuple:
         return self.x + self.width // 2, self.y + self.height // 2
\ No newline at end of file
@@ -1,8 +1,12 @@
 import pygame
 from config import Colors, GridPositions, ElementSizes
 from utils.grid_helper import GridHelper
+from core.analytics import mmc_metrics
+from core.clock import sim_clock
 
 class InfoPanel:
+    OVERVIEW_MAX_IDS = 32  # ids por CPU copiados para o quadro da visão geral
+
     def __init__(self):
         col, row = GridPositions.INFO_PANEL
         width_cells, height_cells = ElementSizes.INFO_PANEL
@@ -15,6 +19,7 @@ class InfoPanel:
         self.middle_info_lines = []
         self.end_info_lines = []
         self.selected_component = None
+        self.selected_generator_index = 0  # qual gerador o componente "generator" representa
         
         # Modern color scheme
         self.background_color = (30, 30, 40)  # Dark blue-gray
@@ -89,25 +94,33 @@ class InfoPanel:
         )
         
         self.process_targets = {}
-        self.process_targets = {}
-        # nomes fixos para o overview do canto direito
-        self.cpu_names = ["CPU_1", "CPU_2", "CPU_3", "CPU_4", "CPU_5", "CPU_6"]
+        self.loss_report = None
+        self.latency_stats = {}
+        self.occupancy = None
+        self._computers_ref = []
         # Column widths
         self.column_width = self.width // 3
         self.column_padding = 10
 
-    def update_info(self, computers, connection, processes, current_interval_seconds=None, max_queue_time_seconds=None, timed_out_processes=0):
+    def update_info(self, computers, connection, processes, current_interval_seconds=None, max_queue_time_seconds=None, timed_out_processes=0, class_stats=None, arrival_rate=None, source_stats=None, loss_report=None, latency_stats=None, occupancy=None):
         """Atualiza as informações exibidas no painel"""
+        self.loss_report = loss_report
+        self.occupancy = occupancy
+        self.latency_stats = latency_stats or {}
+        if arrival_rate is None:
+            arrival_rate = 1 / current_interval_seconds if current_interval_seconds else 0
         if self.selected_component and self.selected_component.startswith("computer_"):
             computer_index = int(self.selected_component.split('_')[1]) - 1
             if computer_index < len(computers):
                 self._show_computer_info(computers[computer_index], connection, max_queue_time_seconds, timed_out_processes)
         elif self.selected_component == "generator":
-            self._show_generator_info(connection, computers, current_interval_seconds)
+            generator = self._generator_ref or connection.generator
+            self._show_generator_info(connection, computers, generator, class_stats,
+                                      (source_stats or {}).get(generator.name))
         else:
-            self._show_general_info(computers, connection, processes, current_interval_seconds, max_queue_time_seconds, timed_out_processes)
+            self._show_general_info(computers, connection, processes, current_interval_seconds, max_queue_time_seconds, timed_out_processes, arrival_rate)
 
-    def _show_general_info(self, computers, connection, processes, current_interval_seconds, max_queue_time_seconds, timed_out_processes):
+    def _show_general_info(self, computers, connection, processes, current_interval_seconds, max_queue_time_seconds, timed_out_processes, arrival_rate):
         """Mostra informações gerais do sistema multi-CPU"""
         active_cpus = sum(1 for cpu in computers if not cpu.is_stopped)
         total_queue = sum(len(cpu.queue) for cpu in computers)
@@ -119,11 +132,13 @@ class InfoPanel:
         current_usage = connection.total_processes
         usage_percentage = (current_usage / total_capacity) * 100 if total_capacity > 0 else 0
         
-        # Calculate average queue length
-        avg_queue_length = total_queue / len(computers) if computers else 0
-        
-        # Calculate system load
-        system_load = (processing_cpus / len(computers)) * 100 if computers else 0
+        # Fila média e carga: médias no tempo (sem oscilar a cada quadro) quando disponíveis
+        if self.occupancy and computers:
+            avg_queue_length = self.occupancy['Lq'] / len(computers)
+            system_load = self.occupancy['rho'] * 100
+        else:
+            avg_queue_length = total_queue / len(computers) if computers else 0
+            system_load = (processing_cpus / len(computers)) * 100 if computers else 0
 
         # Calculate success rate safely
         total_ended = concluidos + timed_out_processes
@@ -138,7 +153,7 @@ class InfoPanel:
             success_rate_color = self.text_color
 
         # Calculate efficiency safely
-        total_created = connection.generator.next_process_id - 1
+        total_created = connection.total_created
         if total_created > 0:
             efficiency = (concluidos / total_created) * 100
             efficiency_text = f"Eficiencia: {efficiency:.1f}%"
@@ -153,9 +168,9 @@ class InfoPanel:
             ("=== SISTEMA MULTI-CPU ===", self.accent_color),
             (f"CPUs Ativas: {active_cpus}/{len(computers)}", self.text_color),
             (f"CPUs Processando: {processing_cpus}", self.text_color),
-            (f"Gerador: {'PARADO' if getattr(connection.generator, 'is_stopped', False) else 'ATIVO'}", 
-             self.error_color if getattr(connection.generator, 'is_stopped', False) else self.success_color),
-            (f"Intervalo: {current_interval_seconds:.2f}s", self.text_color),
+            self._generators_status_line(connection.generators),
+            (f"Intervalo: {current_interval_seconds:.2f}s" if len(connection.generators) == 1
+             else f"Chegadas: {arrival_rate:.2f}/s ({len(connection.generators)} fontes)", self.text_color),
             (f"Tempo max. fila: {max_queue_time_seconds:.2f}s", self.text_color),
             (f"Total em filas: {total_queue}", self.text_color),
             (f"Concluidos: {concluidos}", self.success_color),
@@ -165,9 +180,13 @@ class InfoPanel:
 
         ]
 
+        # Rede de filas: teoria de forma-produto por estágio no lugar do M/M/c único
+        if connection.has_network:
+            self.info_lines.extend(self._network_lines(connection.network, arrival_rate))
+        
         # Calculate M/M/c metrics
-        if current_interval_seconds and current_interval_seconds > 0:
-            Lambda = 1 / current_interval_seconds  # Taxa de chegada
+        elif arrival_rate > 0:
+            Lambda = arrival_rate  # Taxa de chegada (superposição das fontes)
             avg_processing_time = sum(cpu.processing_time_ms for cpu in computers) / len(computers) if computers else 0
             if avg_processing_time > 0:
                 Mu = 1000 / avg_processing_time  # Taxa de serviço (convertendo ms para segundos)
@@ -182,12 +201,12 @@ class InfoPanel:
                             (f"Lambda (λ): {Lambda:.3f}/s", self.text_color),
                             (f"Mu (μ): {Mu:.3f}/s", self.text_color),
                             (f"Servidores (c): {c}", self.text_color),
-                            (f"Utilizacao (ρ): {mmc_metrics['rho']:.3f}", 
+                            (f"Utilizacao (ρ): {mmc_metrics['rho']:.3f}{self._measured_suffix('rho')}", 
                              self.error_color if mmc_metrics['rho'] > 0.9 else self.warning_color if mmc_metrics['rho'] > 0.7 else self.success_color),
                             ("", self.text_color),
                             ("=== METRICAS TEORICAS ===", self.accent_color),
-                            (f"L (sist.): {mmc_metrics['L']:.2f}", self.text_color),
-                            (f"Lq (fila): {mmc_metrics['Lq']:.2f}", self.text_color),
+                            (f"L (sist.): {mmc_metrics['L']:.2f}{self._measured_suffix('L')}", self.text_color),
+                            (f"Lq (fila): {mmc_metrics['Lq']:.2f}{self._measured_suffix('Lq')}", self.text_color),
                             (f"W (sist.): {mmc_metrics['W']:.2f}s", self.text_color),
                             (f"Wq (fila): {mmc_metrics['Wq']:.2f}s", self.text_color),
                             (f"P0 (vazio): {mmc_metrics['P0']*100:.3f}%", self.text_color),
@@ -210,18 +229,78 @@ class InfoPanel:
              self.success_color if system_load > 70 else self.warning_color if system_load > 30 else self.text_color),
             (f"Fila Media: {avg_queue_length:.1f}", 
              self.error_color if avg_queue_length > 5 else self.warning_color if avg_queue_length > 2 else self.success_color),
+            self._percentiles_line("Retorno p50/95/99", self.latency_stats.get('retorno')),
             ("", self.text_color),
+            *self._loss_lines(),
             ("=== DESEMPENHO ===", self.accent_color),
             (success_rate_text, success_rate_color),
-            (f"Processos/s: {1/current_interval_seconds:.2f}" if current_interval_seconds > 0 else "Processos/s: 0.00", self.text_color),
+            (f"Processos/s: {arrival_rate:.2f}", self.text_color),
             (efficiency_text, efficiency_color),
             ("", self.text_color),
             ("=== BALANCEAMENTO ===", self.accent_color),
             (f"Estrategia: {connection.load_balancer.distribution_strategy}", self.highlight_color),
-            (f"Criados: {connection.generator.next_process_id - 1}", self.text_color),
+            (self._scheduling_text(computers), self.highlight_color),
+            (f"Criados: {connection.total_created}", self.text_color),
             (f"Transito: {len(connection.transit_processes)}", self.text_color)
         ]
 
+    def _measured_suffix(self, key):
+        """Valor medido (média no tempo) para mostrar ao lado do teórico"""
+        if not self.occupancy:
+            return ""
+        return f" (med. {self.occupancy[key]:.2f})"
+
+    def _percentiles_line(self, label, stats):
+        """Linha com p50/p95/p99 (em segundos) de uma distribuição em fluxo"""
+        if stats is None or stats.count == 0:
+            return (f"{label}: sem amostras", self.text_color)
+        p50, p95, p99 = (stats.quantile(p) / 1000 for p in stats.QUANTILES)
+        return (f"{label}: {p50:.2f}/{p95:.2f}/{p99:.2f}s", self.text_color)
+
+    def _loss_lines(self):
+        """Bloqueio (capacidade K) e abandono (tempo máximo de fila): medido x M/M/c/K+M"""
+        report = self.loss_report
+        if not report:
+            return []
+        model = report['model']
+        
+        def line(label, measured, predicted):
+            text = f"{label}: {measured*100:.1f}%"
+            if predicted is not None:
+                text += f" (teo. {predicted*100:.1f}%)"
+            color = self.error_color if measured > 0.1 else self.warning_color if measured > 0.01 else self.success_color
+            return (text, color)
+        
+        lines = [
+            ("=== PERDAS (M/M/c/K+M) ===", self.accent_color),
+            line("Bloqueio", report['blocked_fraction'], model['P_block'] if model else None),
+            line("Abandono", report['abandon_fraction'], model['P_abandon'] if model else None),
+        ]
+        if model:
+            lines.append((f"λ efetivo (teo.): {model['lambda_eff']:.2f}/s", self.text_color))
+        lines.append(("", self.text_color))
+        return lines
+
+    def _network_lines(self, network, arrival_rate):
+        """Linhas da rede de filas: utilização teórica x medida de cada estágio e o gargalo"""
+        lines = [("=== REDE DE FILAS ===", self.accent_color)]
+        theory = network.product_form_metrics(arrival_rate)
+        if theory is None:
+            lines.append(("Roteamento sem saida!", self.error_color))
+            return lines
+        
+        for stage, predicted in zip(network.stages, theory['stages']):
+            measured = network.measured_metrics(stage)
+            rho = predicted['rho']
+            lines.append((f"{stage['name']} (c={predicted['c']}): ρ {rho:.2f} / med. {measured['rho']:.2f}",
+                          self.error_color if rho >= 1 else self.warning_color if rho > 0.7 else self.success_color))
+        lines.append((f"Gargalo: {theory['bottleneck']}", self.warning_color))
+        if theory['W'] is not None:
+            lines.append((f"W rede (teorico): {theory['W']:.2f}s", self.text_color))
+        else:
+            lines.append(("Rede instavel!", self.error_color))
+        return lines
+
     def _show_computer_info(self, computer, connection, max_queue_time_seconds, timed_out_processes):
         """Mostra informações detalhadas de uma CPU específica"""
         status = "PROCESSANDO" if not computer.is_idle else "OCIOSO"
@@ -235,7 +314,7 @@ class InfoPanel:
         
         # Left column - Computer info
         self.info_lines = [
-            (f"=== {computer.name} ===", self.accent_color),
+            (f"=== {computer.name} ===" if not computer.stage else f"=== {computer.name} ({computer.stage}) ===", self.accent_color),
             (f"Status: {status}{stopped_status}", 
              self.error_color if is_stopped else self.warning_color if not computer.is_idle else self.success_color),
             (f"Processo atual: {processo_atual}", self.text_color),
@@ -244,8 +323,14 @@ class InfoPanel:
             (f"Tempo: {computer.processing_time_ms/1000:.2f}s", self.text_color),
             (f"Eficiencia: {processing_efficiency}", 
              self.success_color if processing_efficiency == "ALTA" else self.warning_color if processing_efficiency == "MEDIA" else self.error_color),
+            (f"ρ medido: {computer.utilization():.2f} / Fila media: {computer.mean_queue_length():.2f}", self.text_color),
             (f"Tempo max.: {max_queue_time_seconds:.2f}s", self.text_color),
-            (f"Expirados: {timed_out_processes}", self.error_color)
+            (f"Expirados: {timed_out_processes}", self.error_color),
+            (f"Quantum: {computer.time_slice_ms}ms" if computer.is_preemptive else "Quantum: sem preempcao", self.highlight_color),
+            (f"Preempcoes: {computer.preemptions} / Trocas: {computer.context_switches} ({computer.switch_time_ms/1000:.1f}s)", self.text_color),
+            ("=== LATENCIA p50/p95/p99 ===", self.accent_color),
+            self._percentiles_line("Espera", computer.wait_stats),
+            self._percentiles_line("Permanencia", computer.sojourn_stats)
         ]
         
         # Middle column - Analysis and history
@@ -258,44 +343,67 @@ class InfoPanel:
             (f"Velocidade: {'RAPIDO' if computer.processing_time_ms <= 1500 else 'NORMAL' if computer.processing_time_ms <= 3000 else 'LENTO'}", 
              self.success_color if computer.processing_time_ms <= 1500 else self.warning_color if computer.processing_time_ms <= 3000 else self.error_color),
             ("", self.text_color),
+            *self._loss_lines(),
             ("=== HISTORICO ===", self.accent_color),
-            (f"Atendidos: {computer.computer_id * 10}", self.text_color),
-            (f"Uptime: {(pygame.time.get_ticks() / 1000 / 60):.1f} min", self.text_color),
+            (f"Atendidos: {computer.sojourn_stats.count}", self.text_color),
+            (f"Uptime: {(sim_clock.get_ticks() / 1000 / 60):.1f} min", self.text_color),
             (f"Reinicios: 0", self.text_color)
         ]
 
-    def _show_generator_info(self, connection, computers, current_interval_seconds):
-        """Mostra informações detalhadas do gerador"""
-        is_stopped = getattr(connection.generator, 'is_stopped', False)
+    def _generators_status_line(self, generators):
+        """Linha de status dos geradores (um ou vários)"""
+        stopped = sum(1 for generator in generators if generator.is_stopped)
+        if len(generators) == 1:
+            return (f"Gerador: {'PARADO' if stopped else 'ATIVO'}",
+                    self.error_color if stopped else self.success_color)
+        return (f"Geradores: {len(generators) - stopped}/{len(generators)} ativos",
+                self.warning_color if stopped else self.success_color)
+
+    def _show_generator_info(self, connection, computers, generator, class_stats=None, source_stats=None):
+        """Mostra informações detalhadas de um gerador (fonte de chegadas)"""
+        is_stopped = getattr(generator, 'is_stopped', False)
         stopped_status = " (PARADO)" if is_stopped else ""
         total_queue = sum(len(cpu.queue) for cpu in computers)
+        current_interval_seconds = generator.interval_seconds
         
         # Calculate generation metrics
         generation_rate = 1 / current_interval_seconds if current_interval_seconds > 0 else 0
         system_load = connection.total_processes / connection.max_capacity if connection.max_capacity > 0 else 0
         
         # Calculate efficiency safely
-        total_created = connection.generator.next_process_id - 1
+        total_created = generator.created_count
         if total_created > 0:
-            efficiency = (total_created / max(1, pygame.time.get_ticks()/1000)) * 60
+            efficiency = (total_created / max(1, sim_clock.get_ticks()/1000)) * 60
             efficiency_text = f"Eficiencia: {efficiency:.1f}/min"
         else:
             efficiency_text = "Eficiencia: 0.0/min"
 
         # Left column - Generator info
         self.info_lines = [
-            ("=== GERADOR ===", self.accent_color),
+            (f"=== {generator.name.upper()} ===", self.accent_color),
             (f"Status: {'PARADO' if is_stopped else 'ATIVO'}{stopped_status}", 
              self.error_color if is_stopped else self.success_color),
             (f"Intervalo: {current_interval_seconds:.2f}s", self.text_color),
-            (f"Taxa: {generation_rate:.2f}/s", self.text_color),
-            (f"Criados: {connection.generator.next_process_id - 1}", self.text_color),
+            (f"Taxa: {generation_rate:.2f}/s ({generator.distribution})", self.text_color),
+            (f"Criados: {generator.created_count}", self.text_color),
             (f"Fila entrada: {len(connection.input_queue)}", self.text_color),
             (f"Transito: {len(connection.transit_processes)}", self.text_color),
             (f"Total filas: {total_queue}", self.text_color),
             (f"Estrategia: {connection.load_balancer.distribution_strategy}", self.highlight_color)
         ]
         
+        # Resumo por classe de processo (mistura de carga)
+        if class_stats:
+            self.info_lines.append(("", self.text_color))
+            self.info_lines.append(("=== CLASSES ===", self.accent_color))
+            for job_class, stats in class_stats.items():
+                completed = stats['completed']
+                mean_turnaround = stats['total_turnaround_ms'] / completed / 1000 if completed else 0.0
+                self.info_lines.append((
+                    f"{job_class}: {completed} ok / {stats['timed_out']} exp / W {mean_turnaround:.1f}s",
+                    self.error_color if stats['timed_out'] > completed else self.text_color
+                ))
+        
         # Middle column - Analysis and statistics
         self.middle_info_lines = [
             ("=== ANALISE ===", self.accent_color),
@@ -306,23 +414,42 @@ class InfoPanel:
             (f"Distribuicao: {connection.load_balancer.distribution_strategy}", self.highlight_color),
             ("", self.text_color),
             ("=== ESTATISTICAS ===", self.accent_color),
-            (f"Operacao: {(pygame.time.get_ticks() / 1000 / 60):.1f} min", self.text_color),
+            (f"Operacao: {(sim_clock.get_ticks() / 1000 / 60):.1f} min", self.text_color),
             (f"Picos: {int(system_load * 10)}", self.text_color),
             (efficiency_text, self.text_color)
         ]
-
+        
+        # Métricas desta fonte de chegadas
+        if source_stats:
+            completed = source_stats['completed']
+            mean_turnaround = source_stats['total_turnaround_ms'] / completed / 1000 if completed else 0.0
+            self.middle_info_lines.extend([
+                ("", self.text_color),
+                ("=== ESTA FONTE ===", self.accent_color),
+                (f"{completed} ok / {source_stats['timed_out']} exp / W {mean_turnaround:.1f}s", self.text_color)
+            ])
+
+
+    def _scheduling_text(self, computers):
+        """Resume a política de escalonamento das CPUs (FIFO ou round-robin)"""
+        quanta = {cpu.time_slice_ms for cpu in computers if cpu.is_preemptive}
+        if not quanta:
+            return "Escalonamento: FIFO"
+        if len(quanta) == 1:
+            return f"Escalonamento: RR {quanta.pop()}ms"
+        return "Escalonamento: RR misto"
 
     def set_process_targets(self, process_targets: dict):
         """
         Define/atualiza o mapeamento {process_id: target_computer_obj}.
-        target_computer_obj precisa ter atributo .name (CPU_1..CPU_6).
+        target_computer_obj precisa ter atributo .name (CPU_1..CPU_N).
         """
         self.process_targets = process_targets or {}
 
     def _cpu_process_map(self):
         """
-        Retorna { 'CPU_1': [ids...], ..., 'CPU_6': [ids...] } a partir de self.process_targets.
-        Ignora destinos com name fora da lista esperada.
+        Retorna { 'CPU_1': [ids...], ..., 'CPU_N': [ids...] } a partir de self.process_targets.
+        Ignora destinos com name fora da lista de CPUs atuais.
         """
         cpu_map = {name: [] for name in self.cpu_names}
         for pid, target in self.process_targets.items():
@@ -335,6 +462,11 @@ class InfoPanel:
         return cpu_map
 
 
+    @property
+    def cpu_names(self):
+        """Nomes das CPUs atuais, na ordem da lista do simulador"""
+        return [computer.name for computer in self._computers_ref]
+
     def _get_color_name(self, color):
         """Retorna o nome da cor baseado na tupla RGB"""
         color_names = {
@@ -360,14 +492,30 @@ class InfoPanel:
     def select_component(self, component_type):
         """Seleciona qual componente mostrar informações"""
         self.selected_component = component_type
+        self._layout_controls(component_type)
         # Atualizar textos de input baseado no componente selecionado
         self._update_input_texts()
 
+    def _layout_controls(self, selected_component):
+        """Posiciona os campos e o botão de parar do componente selecionado (na coluna direita)"""
+        # Fora do draw: quem testa os cliques pode não ser quem desenha (thread da simulação)
+        right_column_x = self.x + 2 * self.column_width + 15
+        right_column_center_x = right_column_x + (self.column_width - self.input_width) // 2
+        controls_start_y = self.y + self.title_bar_height + (self.height - self.title_bar_height - 60) // 2 - 50
+        stop_button_x = right_column_center_x + (self.input_width - self.stop_button_width) // 2
+        if selected_component == "generator":
+            self.interval_input_rect.topleft = (right_column_center_x, controls_start_y)
+            self.stop_button_rect.topleft = (stop_button_x, controls_start_y + 60)  # Space between input and button
+        elif selected_component and selected_component.startswith("computer_"):
+            self.processing_time_input_rect.topleft = (right_column_center_x, controls_start_y)
+            self.max_queue_time_input_rect.topleft = (right_column_center_x, controls_start_y + 50)  # Space between inputs
+            self.stop_button_rect.topleft = (stop_button_x, controls_start_y + 120)  # Space after second input
+
     def _update_input_texts(self):
         """Atualiza os textos dos campos de input baseado no componente selecionado"""
         if hasattr(self, '_simulator_ref') and self._simulator_ref:
-            if self.selected_component == "generator":
-                self.interval_input_text = f"{self._simulator_ref.current_interval_seconds:.2f}"
+            if self.selected_component == "generator" and self._generator_ref:
+                self.interval_input_text = f"{self._generator_ref.interval_seconds:.2f}"
             elif (self.selected_component and 
                   self.selected_component.startswith("computer_") and
                   hasattr(self, '_computers_ref')):
@@ -499,8 +647,47 @@ class InfoPanel:
         self.is_close_button_hovered = self.close_button_rect.collidepoint(pos)
         self.is_stop_button_hovered = self.stop_button_rect.collidepoint(pos)
 
-    def draw(self, screen: pygame.Surface) -> None:
-        """Desenha o painel na tela com design moderno"""
+    def render_state(self) -> dict:
+        """Cópia do que o desenho usa: o painel pode ser desenhado por outra thread, sem ler o simulador"""
+        # As listas de linhas são recriadas a cada update_info: passá-las adiante não as expõe a mudanças
+        return {
+            'selected_component': self.selected_component,
+            'info_lines': self.info_lines,
+            'middle_info_lines': self.middle_info_lines,
+            'is_game_mode': getattr(getattr(self, '_simulator_ref', None), '_game_mode', None) == "game",
+            'is_component_stopped': self._is_selected_component_stopped(),
+            'interval_input_text': self.interval_input_text,
+            'processing_time_input_text': self.processing_time_input_text,
+            'max_queue_time_input_text': self.max_queue_time_input_text,
+            'is_interval_input_active': self.is_interval_input_active,
+            'is_processing_time_input_active': self.is_processing_time_input_active,
+            'is_max_queue_time_input_active': self.is_max_queue_time_input_active,
+            'is_close_button_hovered': self.is_close_button_hovered,
+            'is_stop_button_hovered': self.is_stop_button_hovered,
+            'cpu_overview': self._cpu_overview() if self.selected_component is None else [],
+        }
+
+    def _is_selected_component_stopped(self) -> bool:
+        """Estado do botão de parar/iniciar: o gerador ou a CPU selecionada está parada"""
+        if self.selected_component == "generator":
+            return bool(self._generator_ref and self._generator_ref.is_stopped)
+        if self.selected_component and self.selected_component.startswith("computer_"):
+            computer_index = int(self.selected_component.split('_')[1]) - 1
+            if computer_index < len(self._computers_ref):
+                return self._computers_ref[computer_index].is_stopped
+        return False
+
+    def _cpu_overview(self) -> list:
+        """(nome, primeiros ids, total) dos processos de cada CPU para o quadro da visão geral"""
+        # A linha de cada CPU é cortada na largura da coluna: OVERVIEW_MAX_IDS ids já passam dela
+        cpu_map = self._cpu_process_map()
+        return [(name, pids[:self.OVERVIEW_MAX_IDS], len(pids)) for name, pids in cpu_map.items()]
+
+    def draw(self, screen: pygame.Surface, state=None) -> None:
+        """Desenha o painel na tela com design moderno (a partir de render_state(), se dado)"""
+        if state is None:
+            state = self.render_state()
+        selected_component = state['selected_component']
         # Fundo principal com sombra
         pygame.draw.rect(screen, self.background_color, (self.x, self.y, self.width, self.height), border_radius=8)
         pygame.draw.rect(screen, self.accent_color, (self.x, self.y, self.width, self.height), 2, border_radius=8)
@@ -515,13 +702,12 @@ class InfoPanel:
         small_font = pygame.font.SysFont("Arial", 14)
 
         # Título baseado no componente selecionado
-        title = {
-            "computer_1": "INFORMACOES DA CPU 1",
-            "computer_2": "INFORMACOES DA CPU 2", 
-            "computer_3": "INFORMACOES DA CPU 3",
-            "generator": "INFORMACOES DO GERADOR",
-            None: "PAINEL DE INFORMACOES"
-        }.get(self.selected_component, "PAINEL DE INFORMACOES")
+        if selected_component and selected_component.startswith("computer_"):
+            title = f"INFORMACOES DA CPU {selected_component.split('_')[1]}"
+        elif selected_component == "generator":
+            title = "INFORMACOES DO GERADOR"
+        else:
+            title = "PAINEL DE INFORMACOES"
         
         title_text = title_font.render(title, True, self.text_color)
         screen.blit(title_text, (self.x + self.width // 2 - title_text.get_width() // 2, self.y + 12))
@@ -536,14 +722,14 @@ class InfoPanel:
         right_column_x = self.x + 2 * self.column_width + 15
         
         # Draw left column (main info)
-        for i, (line, color) in enumerate(self.info_lines):
+        for i, (line, color) in enumerate(state['info_lines']):
             text = font.render(line, True, color)
             # Check if text fits in the panel
             if start_y + i * line_height < self.y + self.height - 50:
                 screen.blit(text, (left_column_x, start_y + i * line_height))
         
         # Draw middle column (additional info) if available
-        if hasattr(self, 'middle_info_lines') and self.middle_info_lines:
+        if state['middle_info_lines']:
             # Draw vertical separator line
             separator1_x = self.x + self.column_width
             separator2_x = self.x + 2 * self.column_width
@@ -555,7 +741,7 @@ class InfoPanel:
                            (separator2_x, self.y + self.height - 60), 1)
             
             # Draw middle column content
-            for i, (line, color) in enumerate(self.middle_info_lines):
+            for i, (line, color) in enumerate(state['middle_info_lines']):
                 text = font.render(line, True, color)
                 # Check if text fits in the panel
                 if start_y + i * line_height < self.y + self.height - 70:
@@ -563,10 +749,7 @@ class InfoPanel:
         
 
         # Desenhar botão de fechar apenas quando estiver em visualização detalhada
-        if self.selected_component is not None:
-            # **NOVA FUNCIONALIDADE: Verificar se está no modo jogo**
-            is_game_mode = hasattr(self, '_simulator_ref') and hasattr(self._simulator_ref, '_game_mode') and self._simulator_ref._game_mode == "game"
-            
+        if selected_component is not None:
             # Calculate center position for controls in the right column
             right_column_center_x = right_column_x + (self.column_width - self.input_width) // 2
             
@@ -574,16 +757,17 @@ class InfoPanel:
             controls_start_y = self.y + self.title_bar_height + (self.height - self.title_bar_height - 60) // 2 - 50
             
             # **ALTERAÇÃO: Comportamento diferente para modo jogo vs sandbox**
-            if is_game_mode:
+            if state['is_game_mode']:
                 # **MODO JOGO: Mostrar apenas informações, sem controles**
-                self._draw_game_mode_restrictions(screen, right_column_center_x, controls_start_y)
+                self._draw_game_mode_restrictions(screen, state, right_column_center_x, controls_start_y)
             else:
                 # **MODO SANDBOX: Mostrar controles completos**
-                self._draw_sandbox_controls(screen, right_column_center_x, controls_start_y)
+                self._layout_controls(selected_component)
+                self._draw_sandbox_controls(screen, state)
 
 
                 # === OVERVIEW DE PROCESSOS POR CPU (somente na visão geral) ===
-        if self.selected_component is None:
+        if selected_component is None:
             # caixa do canto direito
             overview_padding_x = 10
             overview_padding_y = 10
@@ -601,16 +785,23 @@ class InfoPanel:
             header_surface = font.render(header, True, self.accent_color)
             screen.blit(header_surface, (box_x + overview_padding_x, box_y + overview_padding_y))
 
-            # lista CPU_1..CPU_6
+            # lista CPU_1..CPU_N (o que não couber vira uma linha de resumo)
             line_y = box_y + overview_padding_y + 24
             line_gap = 22  # altura entre linhas
+            max_lines = max(1, (box_h - overview_padding_y - 24) // line_gap)
 
-            cpu_map = self._cpu_process_map()
-            for name in self.cpu_names:
-                pids = cpu_map.get(name, [])
+            cpu_overview = state['cpu_overview']
+            if len(cpu_overview) > max_lines:
+                visible_rows = cpu_overview[:max_lines - 1]
+                hidden_rows = cpu_overview[max_lines - 1:]
+            else:
+                visible_rows, hidden_rows = cpu_overview, []
+            for name, pids, count in visible_rows:
                 # formata como "P1, P4, P23" (ou "—" se vazio)
                 if pids:
                     pid_list_text = ", ".join(f"P{pid}" for pid in pids)
+                    if count > len(pids):
+                        pid_list_text += ", ..."
                 else:
                     pid_list_text = "—"
 
@@ -635,7 +826,12 @@ class InfoPanel:
                 screen.blit(rendered, (box_x + overview_padding_x, line_y))
                 line_y += line_gap
 
-    def _draw_game_mode_restrictions(self, screen, right_column_center_x, controls_start_y):
+            if hidden_rows:
+                hidden_total = sum(count for _, _, count in hidden_rows)
+                summary = small_font.render(f"+{len(hidden_rows)} CPUs: {hidden_total} processos", True, self.highlight_color)
+                screen.blit(summary, (box_x + overview_padding_x, line_y))
+
+    def _draw_game_mode_restrictions(self, screen, state, right_column_center_x, controls_start_y):
         """Desenha informações de restrição para o modo jogo"""
         info_font = pygame.font.SysFont("Arial", 16)
         warning_font = pygame.font.SysFont("Arial", 14)
@@ -657,7 +853,7 @@ class InfoPanel:
         
         # **CORREÇÃO: Botão de fechar deve funcionar no modo jogo**
         # Desenhar botão de fechar normalmente
-        close_button_color = self.close_button_hover_color if self.is_close_button_hovered else self.close_button_color
+        close_button_color = self.close_button_hover_color if state['is_close_button_hovered'] else self.close_button_color
         pygame.draw.circle(screen, close_button_color, self.close_button_rect.center, self.close_button_size // 2)
         pygame.draw.circle(screen, self.text_color, self.close_button_rect.center, self.close_button_size // 2, 2)
         
@@ -666,50 +862,26 @@ class InfoPanel:
         text_rect = close_text.get_rect(center=self.close_button_rect.center)
         screen.blit(close_text, text_rect)
 
-    def _draw_sandbox_controls(self, screen, right_column_center_x, controls_start_y):
-        """Desenha controles completos para o modo sandbox"""
+    def _draw_sandbox_controls(self, screen, state):
+        """Desenha controles completos para o modo sandbox (posicionados por _layout_controls)"""
+        selected_component = state['selected_component']
         # Determinar texto e cor do botão de parar/iniciar
-        is_component_stopped = False
-        if self.selected_component == "generator":
-            is_component_stopped = getattr(self, '_generator_ref', None) and getattr(self._generator_ref, 'is_stopped', False)
-            
-            # Position generator controls
-            self.interval_input_rect.x = right_column_center_x
-            self.interval_input_rect.y = controls_start_y
-            
-            self.stop_button_rect.x = right_column_center_x + (self.input_width - self.stop_button_width) // 2
-            self.stop_button_rect.y = controls_start_y + 60  # Space between input and button
-            
+        is_component_stopped = state['is_component_stopped']
+        if selected_component == "generator":
             # Draw generator controls
-            self._draw_input_field(screen, self.interval_input_rect, self.interval_input_text, 
-                                 self.is_interval_input_active, "Intervalo (s):")
+            self._draw_input_field(screen, self.interval_input_rect, state['interval_input_text'],
+                                 state['is_interval_input_active'], "Intervalo (s):")
         
-        elif self.selected_component and self.selected_component.startswith("computer_"):
-            computer_index = int(self.selected_component.split('_')[1]) - 1
-            if (hasattr(self, '_computers_ref') and 
-                computer_index < len(self._computers_ref)):
-                computer = self._computers_ref[computer_index]
-                is_component_stopped = getattr(computer, 'is_stopped', False)
-            
-            # Position computer controls with vertical spacing
-            self.processing_time_input_rect.x = right_column_center_x
-            self.processing_time_input_rect.y = controls_start_y
-            
-            self.max_queue_time_input_rect.x = right_column_center_x
-            self.max_queue_time_input_rect.y = controls_start_y + 50  # Space between inputs
-            
-            self.stop_button_rect.x = right_column_center_x + (self.input_width - self.stop_button_width) // 2
-            self.stop_button_rect.y = controls_start_y + 120  # Space after second input
-            
+        elif selected_component and selected_component.startswith("computer_"):
             # Draw computer controls
-            self._draw_input_field(screen, self.processing_time_input_rect, self.processing_time_input_text,
-                                 self.is_processing_time_input_active, "Tempo proc. (s):")
+            self._draw_input_field(screen, self.processing_time_input_rect, state['processing_time_input_text'],
+                                 state['is_processing_time_input_active'], "Tempo proc. (s):")
             
-            self._draw_input_field(screen, self.max_queue_time_input_rect, self.max_queue_time_input_text,
-                                 self.is_max_queue_time_input_active, "Tempo max. fila (s):")
+            self._draw_input_field(screen, self.max_queue_time_input_rect, state['max_queue_time_input_text'],
+                                 state['is_max_queue_time_input_active'], "Tempo max. fila (s):")
         
         # Determinar cor do botão de fechar baseado no hover
-        close_button_color = self.close_button_hover_color if self.is_close_button_hovered else self.close_button_color
+        close_button_color = self.close_button_hover_color if state['is_close_button_hovered'] else self.close_button_color
         
         # Desenhar botão de fechar (círculo)
         pygame.draw.circle(screen, close_button_color, self.close_button_rect.center, self.close_button_size // 2)
@@ -727,7 +899,7 @@ class InfoPanel:
         stop_button_hover_color = self.stop_button_start_hover_color if is_component_stopped else self.stop_button_hover_color
         
         # Determinar cor do botão de parar/iniciar baseado no hover
-        current_stop_button_color = stop_button_hover_color if self.is_stop_button_hovered else stop_button_color
+        current_stop_button_color = stop_button_hover_color if state['is_stop_button_hovered'] else stop_button_color
         
         # Desenhar botão de parar/iniciar (com bordas arredondadas)
         pygame.draw.rect(screen, current_stop_button_color, self.stop_button_rect, border_radius=6)
@@ -772,10 +944,20 @@ class InfoPanel:
             pygame.draw.line(screen, self.text_color, (cursor_x, cursor_y), 
                            (cursor_x, cursor_y + cursor_height), 2)
     
-    def set_component_references(self, computers, generator, simulator=None):
+    @property
+    def _generator_ref(self):
+        """Gerador selecionado (o principal por padrão)"""
+        generators = getattr(self, '_generators_ref', None)
+        if not generators:
+            return None
+        if self.selected_generator_index < len(generators):
+            return generators[self.selected_generator_index]
+        return generators[0]
+
+    def set_component_references(self, computers, generators, simulator=None):
         """Define referências aos componentes para verificar estado"""
         self._computers_ref = computers
-        self._generator_ref = generator
+        self._generators_ref = generators if isinstance(generators, list) else [generators]
         self._simulator_ref = simulator
         
         # Set initial input text based on current values
@@ -819,31 +1001,4 @@ class InfoPanel:
 
     def calculate_mmc_metrics(self, Lambda, Mu, c):
         """Calcula métricas do modelo M/M/c"""
-        import math
-        
-        if Lambda >= Mu * c:
-            return None  # Sistema instável
-            
-        alfa = Lambda / Mu
-        rho = alfa / c 
-
-        p0 = (sum(alfa**r/math.factorial(r) for r in range(0, c)) + alfa**c/math.factorial(c)*(1 - alfa / c)**-1)**-1
-
-        L = (p0 * (alfa**c) * rho) / (math.factorial(c) * (1 - rho)**2) + alfa
-        Lq = L - alfa
-    
-        W = 1 / Mu + (alfa**c * p0) / (math.factorial(c) * c * Mu * (1 - rho)**2)
-        Wq = W - 1 / Mu
-        
-        K = (sum(alfa**r/math.factorial(c) for r in range(0, c)) + alfa**c/math.factorial(c)*(1 - alfa / c)**-1)**-1
-        customer_delay = alfa**c/math.factorial(c)*(1 - alfa / c)**-1 * K
-
-        return { 
-            'L': L,
-            'Lq': Lq,
-            'W': W,
-            'Wq': Wq,
-            'P0': p0,
-            'rho': rho,
-            'Customer_Delay': customer_delay
-        }
+        return mmc_metrics(Lambda, Mu, c)
@@ -1,103 +1,122 @@
-import pygame
-from config import Colors
 from entities.process_states import ProcessState
+from core.clock import sim_clock
+
 
 class Process:
-    def __init__(self, process_id: int, spawn_x: int, spawn_y: int):
+    def __init__(self, process_id: int, spawn_x: int, spawn_y: int, job_class: str = "padrao", service_demand_ms: float = None, source_id: int = 1):
         self.id = process_id
         self.x = spawn_x
         self.y = spawn_y
         self.radius = 15
-        self.speed = 3.0
         self.is_active = True
-        self.creation_time = pygame.time.get_ticks()
+        self.creation_time = sim_clock.get_ticks()
         
         # Estado do processo
         self.state = ProcessState.CREATED
         
+        # Fonte de chegada (gerador), classe de carga e demanda de serviço (em ms numa CPU base)
+        self.source_id = source_id
+        self.job_class = job_class
+        self.service_demand_ms = service_demand_ms
+        
         # Tempo de processamento
         self.processing_time_ms = 2000
         self.processing_start_time = None
         
-        # Tempo de entrada na fila da CPU (para controle de timeout)
-        self.queue_entry_time = None
-    
-    @property
-    def color(self) -> tuple:
-        """Retorna a cor baseada no estado atual"""
-        color_map = {
-            ProcessState.CREATED: Colors.BLUE,
-            ProcessState.IN_QUEUE: Colors.LIGHT_GREEN,
-            ProcessState.IN_TRANSIT: Colors.PURPLE,
-            ProcessState.WAITING_CPU: Colors.ORANGE,
-            ProcessState.PROCESSING: Colors.ORANGE,
-            ProcessState.COMPLETED: Colors.DARK_GRAY
-        }
-        return color_map.get(self.state, Colors.BLUE)
-    
-    def draw(self, screen: pygame.Surface) -> None:
-        """Desenha o processo na tela"""
-        # Círculo principal
-        if self.state in (ProcessState.PROCESSING, ProcessState.WAITING_CPU):
-            return
-
-        pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.radius)
-        pygame.draw.circle(screen, Colors.WHITE, (int(self.x), int(self.y)), self.radius, 2)
+        # Escalonamento preemptivo: trabalho restante e histórico de fatias
+        self.remaining_time_ms = None  # None = ainda não foi despachado
+        self.first_start_time = None  # Primeiro início (tempo de resposta)
+        self.preemption_count = 0
         
-        # ID do processo
-        font = pygame.font.SysFont(None, 20)
-        id_text = font.render(str(self.id), True, Colors.WHITE)
-        screen.blit(id_text, (self.x - 5, self.y - 8))
+        # Rede de filas: estágio atual, entrada nele e número de visitas a estágios
+        self.stage = None
+        self.stage_entry_time = self.creation_time
+        self.visits = 0
+        # Tempo somado nas estações da rede (da chegada à CPU ao fim de cada visita), sem filas de entrada e trajetos
+        self.network_time_ms = 0
         
-        # Tempo restante se estiver processando
-        if self.state == ProcessState.PROCESSING:
-            elapsed = pygame.time.get_ticks() - self.processing_start_time
-            remaining = max(0, self.processing_time_ms - elapsed)
-            seconds = remaining / 1000.0
-            
-            time_text = font.render(f"{seconds:.1f}s", True, Colors.WHITE)
-            screen.blit(time_text, (self.x - 15, self.y + 15))
+        # Tempo de entrada na fila da CPU (para controle de timeout)
+        self.queue_entry_time = None
         
-        # Tempo na fila se estiver esperando
-        elif self.state == ProcessState.WAITING_CPU and self.queue_entry_time:
-            time_in_queue = (pygame.time.get_ticks() - self.queue_entry_time) / 1000.0
-            queue_time_text = font.render(f"{time_in_queue:.1f}s", True, Colors.WHITE)
-            screen.blit(queue_time_text, (self.x - 15, self.y + 15))
+        # Marcos do ciclo de vida: chegada (creation_time), chegada à CPU (fila dela ou direto no
+        # atendimento), início do atendimento na visita atual e fim
+        self.dispatch_time = None
+        self.visit_start_time = None
+        self.end_time = None
+        # Trocas de contexto pagas na visita atual (ms): CPU ocupada sem progresso, não é espera
+        self.switch_time_ms = 0
     
-    def start_processing(self) -> None:
-        """Inicia o processamento na CPU"""
+    def start_processing(self, start_delay_ms: int = 0) -> None:
+        """Inicia (ou retoma) o processamento na CPU"""
         self.state = ProcessState.PROCESSING
-        self.processing_start_time = pygame.time.get_ticks()
+        now = sim_clock.get_ticks()
+        self._mark_dispatch(now)
+        # O atraso representa a troca de contexto: a CPU fica ocupada sem progresso
+        self.processing_start_time = now + start_delay_ms
+        self.switch_time_ms += start_delay_ms
+        if self.remaining_time_ms is None:
+            self.remaining_time_ms = self.processing_time_ms
+            self.visit_start_time = now
+        if self.first_start_time is None:
+            self.first_start_time = now
         self.queue_entry_time = None  # Reset queue time when processing starts
     
+    def elapsed_in_slice(self) -> int:
+        """Tempo de CPU efetivamente consumido na fatia atual (ms)"""
+        if self.processing_start_time is None:
+            return 0
+        return max(0, sim_clock.get_ticks() - self.processing_start_time)
+    
+    def preempt(self) -> None:
+        """Interrompe a fatia atual guardando o trabalho restante"""
+        self.remaining_time_ms = max(0, self.remaining_time_ms - self.elapsed_in_slice())
+        self.processing_start_time = None
+        self.preemption_count += 1
+    
+    def renew_time_slice(self) -> None:
+        """Contabiliza a fatia atual e inicia outra sem sair da CPU"""
+        self.remaining_time_ms = max(0, self.remaining_time_ms - self.elapsed_in_slice())
+        self.processing_start_time = sim_clock.get_ticks()
+    
+    def start_new_visit(self, stage_name, service_demand_ms=None) -> None:
+        """Prepara o processo para ser atendido em um (novo) estágio da rede"""
+        self.stage = stage_name
+        self.stage_entry_time = sim_clock.get_ticks()
+        self.visits += 1
+        if service_demand_ms is not None:
+            self.service_demand_ms = service_demand_ms
+        # Cada visita é um novo serviço: a CPU do estágio define o tempo no despacho
+        self.remaining_time_ms = None
+        self.processing_start_time = None
+        self.queue_entry_time = None
+        self.dispatch_time = None
+        self.visit_start_time = None
+        self.end_time = None
+        self.switch_time_ms = 0
+        self.is_active = True
+    
+    @property
+    def in_service(self) -> bool:
+        """Já recebeu CPU nesta visita (voltou à fila por preempção ou por CPU removida)"""
+        return self.remaining_time_ms is not None
+    
     def enter_cpu_queue(self):
         """Marca o tempo de entrada na fila da CPU"""
-        self.queue_entry_time = pygame.time.get_ticks()
+        self.queue_entry_time = sim_clock.get_ticks()
+        self._mark_dispatch(self.queue_entry_time)
         self.state = ProcessState.WAITING_CPU
     
+    def _mark_dispatch(self, now) -> None:
+        """Primeira chegada à CPU na visita atual (voltas à fila por preempção não contam)"""
+        if self.dispatch_time is None:
+            self.dispatch_time = now
+    
     def is_processing_complete(self) -> bool:
         """Verifica se o processamento foi concluído"""
         if self.state == ProcessState.PROCESSING:
-            elapsed = pygame.time.get_ticks() - self.processing_start_time
-            if elapsed >= self.processing_time_ms:
+            if self.elapsed_in_slice() >= self.remaining_time_ms:
                 self.state = ProcessState.COMPLETED
                 self.is_active = False
+                self.end_time = sim_clock.get_ticks()
                 return True
-        return False
-    
-    def update_position(self, target_x: float, target_y: float) -> bool:
-        """Move o processo em direção às coordenadas alvo"""
-        if self.state in [ProcessState.IN_TRANSIT, ProcessState.PROCESSING]:
-            return True
-            
-        dx = target_x - self.x
-        dy = target_y - self.y
-        distance = (dx**2 + dy**2)**0.5
-        
-        if distance > self.speed:
-            self.x += (dx / distance) * self.speed
-            self.y += (dy / distance) * self.speed
-            return False
-        else:
-            self.x, self.y = target_x, target_y
-            return True
\ No newline at end of file
+        return False
\ No newline at end of file
@@ -0,0 +1,135 @@
+from config import Colors, CPU_COLORS, CPU_COLOR_NAMES, CPU_BASE_PRICE, MAX_CPUS
+
+class Shop:
+    """Estado e regras da loja (itens, níveis, preços); o desenho fica no ShopPanel"""
+    def __init__(self, shop=None, max_cpus=MAX_CPUS):
+        # Economia da loja (seção "shop" do cenário; None = valores padrão abaixo)
+        self.cpu_base_price = shop["cpu_base_price"] if shop else CPU_BASE_PRICE
+        self.max_cpus = max_cpus
+        
+        # Itens da loja - AGORA COM UPGRADES INFINITOS
+        self.shop_items = [
+            {
+                "id": "upgrade_processing_speed",
+                "name": "Processar + Rápido",
+                "description": "Reduz tempo de processamento",
+                "base_price": 10,  # Preço base
+                "price": 10,       # Preço atual
+                "color": Colors.LIGHT_GREEN,
+                "upgrade_level": 1,  # Nível atual do upgrade
+                "price_increase": 1.4  # Fator de aumento de preço (40% por nível)
+            },
+            {
+                "id": "upgrade_capacity",
+                "name": "Capacidade +", 
+                "description": "Aumenta capacidade do sistema",
+                "base_price": 8,
+                "price": 8,
+                "color": Colors.ORANGE,
+                "upgrade_level": 1,
+                "price_increase": 1.35  # 35% por nível
+            },
+            {
+                "id": "upgrade_speed",
+                "name": "Velocidade +",
+                "description": "Aumenta velocidade transporte",
+                "base_price": 6,
+                "price": 6,
+                "color": Colors.CYAN,
+                "upgrade_level": 1,
+                "price_increase": 1.3  # 30% por nível
+            },
+            {
+                # Item único que sempre oferece a próxima CPU livre
+                "id": "cpu",
+                "name": "CPU 2",
+                "description": "Nova CPU Ciano",
+                "price": self.cpu_base_price,
+                "color": Colors.CYAN,
+                "purchased": False,
+                "computer_id": 2
+            }
+        ]
+        
+        # Preços dos upgrades definidos pelo cenário
+        if shop:
+            for item in self.shop_items:
+                if item["id"] in shop:
+                    item["base_price"] = item["price"] = shop[item["id"]]["base_price"]
+                    item["price_increase"] = shop[item["id"]]["price_increase"]
+    
+    def purchase_item(self, item_id, current_score):
+        """Tenta comprar um item"""
+        for item in self.shop_items:
+            if item["id"] == item_id:
+                # Para upgrades infinitos
+                if item["id"] in ["upgrade_processing_speed", "upgrade_capacity", "upgrade_speed"]:
+                    if current_score >= item["price"]:
+                        # Calcular novo preço para o próximo nível
+                        current_level = item["upgrade_level"]
+                        item["upgrade_level"] += 1
+                        
+                        # Calcular novo preço com aumento gradual
+                        new_price = self._calculate_upgrade_price(
+                            item["base_price"], 
+                            current_level + 1, 
+                            item["price_increase"]
+                        )
+                        item["price"] = new_price
+                        
+                        return True, item["price"]  # Retorna o preço pago (do nível atual)
+                
+                # Para CPUs (compra única)
+                elif not item.get("purchased", False) and current_score >= item["price"]:
+                    item["purchased"] = True
+                    return True, item["price"]
+        
+        return False, 0
+    
+    def update_cpu_item(self, computers):
+        """Atualiza o item de CPU para oferecer o menor número de CPU ainda não comprado"""
+        owned_ids = {computer.computer_id for computer in computers}
+        next_id = 1
+        while next_id in owned_ids:
+            next_id += 1
+        
+        for item in self.shop_items:
+            if item["id"] == "cpu":
+                palette_index = (next_id - 1) % len(CPU_COLORS)
+                item["computer_id"] = next_id
+                item["name"] = f"CPU {next_id}"
+                item["description"] = f"Nova CPU {CPU_COLOR_NAMES[palette_index]}"
+                item["color"] = CPU_COLORS[palette_index]
+                item["price"] = self.cpu_base_price * max(1, next_id - 1)
+                # "Comprado" aqui significa que o limite de CPUs foi atingido
+                item["purchased"] = len(owned_ids) >= self.max_cpus
+                break
+    
+    def _calculate_upgrade_price(self, base_price, level, increase_factor):
+        """Calcula o preço do upgrade baseado no nível"""
+        # Fórmula: base_price * (increase_factor)^(level-1)
+        return int(base_price * (increase_factor ** (level - 1)))
+    
+    def is_item_purchased(self, item_id):
+        """Verifica se um item já foi comprado (apenas para CPUs)"""
+        for item in self.shop_items:
+            if item["id"] == item_id:
+                if item["id"] in ["upgrade_processing_speed", "upgrade_capacity", "upgrade_speed"]:
+                    # Upgrades infinitos sempre estão "disponíveis"
+                    return False
+                return item.get("purchased", False)
+        return False
+    
+    def get_processing_speed_level(self):
+        """Retorna o nível atual do upgrade de velocidade de processamento"""
+        for item in self.shop_items:
+            if item["id"] == "upgrade_processing_speed":
+                return item.get("upgrade_level", 1)
+        return 1
+    
+    def get_upgrade_level(self, upgrade_id):
+        """Retorna o nível atual de qualquer upgrade"""
+        for item in self.shop_items:
+            if item["id"] == upgrade_id:
+                return item.get("upgrade_level", 1)
+        return 1
@@ -1,9 +1,9 @@
 import pygame
-from config import Colors, GridPositions, ElementSizes, CPU_COLORS
+from config import Colors
 from utils.grid_helper import GridHelper
 
 class ShopPanel:
-    def __init__(self):
+    def __init__(self, shop=None):
         # Posicionar na parte direita da tela (coluna 10, linha 0)
         col, row = 10, 0
         width_cells, height_cells = 2, 8  # 2 colunas de largura, altura total
@@ -17,91 +17,26 @@ class ShopPanel:
         self.text_color = Colors.WHITE
         self.highlight_color = Colors.GREEN
         
-        # Itens da loja - AGORA COM UPGRADES INFINITOS
-        self.shop_items = [
-            {
-                "id": "upgrade_processing_speed",
-                "name": "Processar + Rápido",
-                "description": "Reduz tempo de processamento",
-                "base_price": 10,  # Preço base
-                "price": 10,       # Preço atual
-                "color": Colors.LIGHT_GREEN,
-                "upgrade_level": 1,  # Nível atual do upgrade
-                "price_increase": 1.4  # Fator de aumento de preço (40% por nível)
-            },
-            {
-                "id": "upgrade_capacity",
-                "name": "Capacidade +", 
-                "description": "Aumenta capacidade do sistema",
-                "base_price": 8,
-                "price": 8,
-                "color": Colors.ORANGE,
-                "upgrade_level": 1,
-                "price_increase": 1.35  # 35% por nível
-            },
-            {
-                "id": "upgrade_speed",
-                "name": "Velocidade +",
-                "description": "Aumenta velocidade transporte",
-                "base_price": 6,
-                "price": 6,
-                "color": Colors.CYAN,
-                "upgrade_level": 1,
-                "price_increase": 1.3  # 30% por nível
-            },
-            {
-                "id": "cpu_2",
-                "name": "CPU 2",
-                "description": "Nova CPU Ciano",
-                "price": 5,
-                "color": Colors.CYAN,
-                "purchased": False
-            },
-            {
-                "id": "cpu_3", 
-                "name": "CPU 3",
-                "description": "Nova CPU Rosa",
-                "price": 10,
-                "color": Colors.PINK,
-                "purchased": False
-            },
-            {
-                "id": "cpu_4",
-                "name": "CPU 4", 
-                "description": "Nova CPU Verde",
-                "price": 15,
-                "color": Colors.GREEN,
-                "purchased": False
-            },
-            {
-                "id": "cpu_5",
-                "name": "CPU 5",
-                "description": "Nova CPU Amarela",
-                "price": 20,
-                "color": Colors.YELLOW,
-                "purchased": False
-            },
-            {
-                "id": "cpu_6",
-                "name": "CPU 6", 
-                "description": "Nova CPU Roxa",
-                "price": 25,
-                "color": Colors.PURPLE,
-                "purchased": False
-            }
-        ]
+        # Estado da loja (entities.shop): o painel só desenha e localiza cliques
+        # (sem loja, desenha as cópias dos itens recebidas em draw)
+        self.shop = shop
         
         # Calcular retângulos dos itens
         self.item_rects = []
-        self._calculate_item_rects()
+        self._calculate_item_rects(len(self.shop_items))
     
-    def _calculate_item_rects(self):
+    @property
+    def shop_items(self):
+        """Itens da loja desenhados pelo painel"""
+        return self.shop.shop_items if self.shop is not None else []
+    
+    def _calculate_item_rects(self, count):
         """Calcula os retângulos de cada item da loja"""
         self.item_rects = []
         item_height = 70  # Reduzido para caber mais itens
         padding = 8
         
-        for i, item in enumerate(self.shop_items):
+        for i in range(count):
             rect_y = self.y + padding + (i * (item_height + padding))
             rect = pygame.Rect(
                 self.x + padding,
@@ -118,65 +53,12 @@ class ShopPanel:
                 return self.shop_items[i]
         return None
     
-    def purchase_item(self, item_id, current_score):
-        """Tenta comprar um item"""
-        for item in self.shop_items:
-            if item["id"] == item_id:
-                # Para upgrades infinitos
-                if item["id"] in ["upgrade_processing_speed", "upgrade_capacity", "upgrade_speed"]:
-                    if current_score >= item["price"]:
-                        # Calcular novo preço para o próximo nível
-                        current_level = item["upgrade_level"]
-                        item["upgrade_level"] += 1
-                        
-                        # Calcular novo preço com aumento gradual
-                        new_price = self._calculate_upgrade_price(
-                            item["base_price"], 
-                            current_level + 1, 
-                            item["price_increase"]
-                        )
-                        item["price"] = new_price
-                        
-                        return True, item["price"]  # Retorna o preço pago (do nível atual)
-                
-                # Para CPUs (compra única)
-                elif not item.get("purchased", False) and current_score >= item["price"]:
-                    item["purchased"] = True
-                    return True, item["price"]
-        
-        return False, 0
-    
-    def _calculate_upgrade_price(self, base_price, level, increase_factor):
-        """Calcula o preço do upgrade baseado no nível"""
-        # Fórmula: base_price * (increase_factor)^(level-1)
-        return int(base_price * (increase_factor ** (level - 1)))
-    
-    def is_item_purchased(self, item_id):
-        """Verifica se um item já foi comprado (apenas para CPUs)"""
-        for item in self.shop_items:
-            if item["id"] == item_id:
-                if item["id"] in ["upgrade_processing_speed", "upgrade_capacity", "upgrade_speed"]:
-                    # Upgrades infinitos sempre estão "disponíveis"
-                    return False
-                return item.get("purchased", False)
-        return False
-    
-    def get_processing_speed_level(self):
-        """Retorna o nível atual do upgrade de velocidade de processamento"""
-        for item in self.shop_items:
-            if item["id"] == "upgrade_processing_speed":
-                return item.get("upgrade_level", 1)
-        return 1
-    
-    def get_upgrade_level(self, upgrade_id):
-        """Retorna o nível atual de qualquer upgrade"""
-        for item in self.shop_items:
-            if item["id"] == upgrade_id:
-                return item.get("upgrade_level", 1)
-        return 1
-    
-    def draw(self, screen: pygame.Surface, current_score: int) -> None:
-        """Desenha o painel da loja"""
+    def draw(self, screen: pygame.Surface, current_score: int, shop_items=None) -> None:
+        """Desenha o painel da loja (os itens da própria loja, se shop_items não for dado)"""
+        if shop_items is None:
+            shop_items = self.shop_items
+        if len(shop_items) != len(self.item_rects):
+            self._calculate_item_rects(len(shop_items))
         # Fundo
         pygame.draw.rect(screen, self.background_color, (self.x, self.y, self.width, self.height))
         pygame.draw.rect(screen, self.border_color, (self.x, self.y, self.width, self.height), 2)
@@ -194,7 +76,7 @@ class ShopPanel:
         screen.blit(score_text, (self.x + self.width//2 - score_text.get_width()//2, self.y + 40))
         
         # Itens da loja
-        for i, (item, rect) in enumerate(zip(self.shop_items, self.item_rects)):
+        for i, (item, rect) in enumerate(zip(shop_items, self.item_rects)):
             # Para upgrades infinitos
             if item["id"] in ["upgrade_processing_speed", "upgrade_capacity", "upgrade_speed"]:
                 can_afford = current_score >= item["price"]
@@ -234,7 +116,7 @@ class ShopPanel:
                 price_status = f"Preço: {item['price']} pts (Nv.{item['upgrade_level']})"
                 price_color = Colors.GREEN if can_afford else Colors.RED
             else:
-                price_status = "COMPRADO" if item.get("purchased", False) else f"Preço: {item['price']} pts"
+                price_status = "LIMITE" if item.get("purchased", False) else f"Preço: {item['price']} pts"
                 price_color = Colors.GREEN if (item.get("purchased", False) or current_score >= item["price"]) else Colors.RED
             
             price_text = font_small.render(price_status, True, price_color)
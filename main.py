@@ -1,21 +1,52 @@
+import os
 import pygame
 import sys
-from core.queue_simulator import QueueSimulator
 from core.main_menu import MainMenu
-from config import Colors, SCREEN_WIDTH, SCREEN_HEIGHT, FPS
+from config import Colors, SCREEN_WIDTH, SCREEN_HEIGHT, FPS, SIM_STEP_MS, MAX_STEPS_PER_FRAME, SIMULATION_THREAD, SIMULATION_SPEED, LOG_LEVEL, LOG_SAMPLE_EVERY, LOG_MAX_PER_SECOND, LOG_METRICS_PER_SECOND, METRICS_EXPORT_FILE, METRICS_EXPORT_PORT, METRICS_EXPORT_INTERVAL, SNAPSHOT_FILE, SCENARIO_FILE
 from utils.grid_helper import GridHelper
+from core.log import configure_logging, get_logger
+from core.clock import sim_clock, FixedTimestep
+from core.scenario import DEFAULT_SCENARIO, load_scenario
+from core.fonts import install_font_cache
+
+# Os módulos da simulação (simulador, views, thread, snapshot, exportador) só são importados
+# quando um modo é escolhido: o menu abre sem pagar por eles
+
+logger = get_logger("jogo")
 
 class GameManager:
-    def __init__(self):
+    def __init__(self, scenario_path=None):
         pygame.init()
+        install_font_cache()
+        configure_logging(LOG_LEVEL, LOG_SAMPLE_EVERY, LOG_MAX_PER_SECOND,
+                          {"simulador.metricas": LOG_METRICS_PER_SECOND})
+        # Cenário validado uma vez na partida; todas as simulações da sessão partem dele
+        scenario_path = scenario_path or SCENARIO_FILE
+        self.scenario = load_scenario(scenario_path) if scenario_path else DEFAULT_SCENARIO
+        logger.info("Cenario: %s", self.scenario["name"])
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Queue Simulator - Gerenciamento de Processos")
         
         self.clock = pygame.time.Clock()
+        # A simulação anda num relógio virtual, em passos fixos tirados do tempo real de cada quadro:
+        # se o desenho não acompanhar o FPS, rodam mais passos por quadro e a taxa de chegadas continua certa
+        sim_clock.use_virtual_time(0)
+        self.timestep = FixedTimestep(SIM_STEP_MS, MAX_STEPS_PER_FRAME)
+        self.frame_ms = 0
         self.current_state = "menu"  # menu, sandbox, game
         self.main_menu = MainMenu()
         self.simulator = None
+        self.view = None  # interface pygame do simulador (views.simulator_view): painéis, desenho e entrada
         self.game_mode = None
+        self.worker = None  # thread da simulação (SIMULATION_THREAD); sem ela, tudo roda neste loop
+        self.frame_view = None  # desenha os modelos publicados pela thread da simulação
+
+        # Exportador de métricas (Prometheus) opcional, com threads próprias
+        self.exporter = None
+        if METRICS_EXPORT_FILE or METRICS_EXPORT_PORT is not None:
+            from core.exporter import MetricsExporter
+            self.exporter = MetricsExporter(METRICS_EXPORT_FILE, METRICS_EXPORT_PORT,
+                                            interval_seconds=METRICS_EXPORT_INTERVAL).start()
 
     def run(self):
         """Loop principal do jogo"""
@@ -26,7 +57,7 @@ class GameManager:
                 self._handle_simulation_state()
             
             pygame.display.flip()
-            self.clock.tick(FPS)
+            self.frame_ms = self.clock.tick(FPS)
 
     def _handle_menu_state(self):
         """Gerencia o estado do menu"""
@@ -50,6 +81,8 @@ class GameManager:
                     self._start_simulation("sandbox")
                 elif event.key == pygame.K_2:
                     self._start_simulation("game")
+                elif event.key == pygame.K_F9:
+                    self._load_session()
 
         self.main_menu.draw(self.screen)
 
@@ -63,39 +96,96 @@ class GameManager:
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     self._return_to_menu()
+                elif event.key == pygame.K_F5:
+                    self._save_session()
+                elif event.key == pygame.K_F9:
+                    self._load_session()
                 else:
-                    self.simulator.handle_key_event(event)
+                    self._dispatch(lambda view, event=event: view.handle_key_event(event))
 
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:  # Botão esquerdo
-                    # --- NOVO: deixar o painel tratar o clique do "X" primeiro ---
-                    panel = getattr(self.simulator, 'info_panel', None)
-                    if panel:
-                        action = getattr(panel, 'handle_click', lambda *_: None)(event.pos)
-                        if action == "close":
-                            # Evita que o mesmo clique selecione outra coisa na UI
-                            continue
-                    # Depois, delega para a simulação normal
-                    self.simulator.handle_click(event.pos)
+                    self._dispatch(lambda view, pos=event.pos: self._handle_click(view, pos))
 
             elif event.type == pygame.MOUSEMOTION:
-                # --- NOVO: atualizar hover do painel sempre, independente do modo ---
-                panel = getattr(self.simulator, 'info_panel', None)
-                if panel and hasattr(panel, 'update_button_hover'):
-                    panel.update_button_hover(event.pos)
-                # Depois, delega para a simulação normal
-                self.simulator.handle_mouse_motion(event.pos)
-
-        self.simulator.update()
-        self.simulator.draw(self.screen)
+                # Hover só muda o destaque de botões: não antecipa a publicação de um quadro
+                self._dispatch(lambda view, pos=event.pos: self._handle_mouse_motion(view, pos), redraw=False)
+
+        if self.worker:
+            # A simulação anda sozinha na sua thread (e publica as métricas); aqui só se desenha
+            # o último modelo publicado
+            self.frame_view.draw(self.screen, self.worker.frame())
+            if self.exporter:
+                self.exporter.record_frame()
+        else:
+            dropped_ms = self.timestep.dropped_ms
+            for _ in range(self.timestep.steps(self.frame_ms)):
+                sim_clock.advance(SIM_STEP_MS)
+                self.simulator.update(SIM_STEP_MS / 1000)
+            if self.timestep.dropped_ms > dropped_ms:
+                logger.debug("Quadro de %s ms: simulacao atrasada em %.0f ms (limite de %s passos)",
+                             self.frame_ms, self.timestep.dropped_ms - dropped_ms, MAX_STEPS_PER_FRAME)
+            self.view.draw(self.screen)
+            if self.exporter:
+                self.exporter.publish(self.simulator)
         
         # Desenhar botão de voltar ao menu
         self._draw_back_button()
 
+    @staticmethod
+    def _handle_click(view, pos):
+        """Clique esquerdo na simulação"""
+        # --- NOVO: deixar o painel tratar o clique do "X" primeiro ---
+        panel = getattr(view, 'info_panel', None)
+        if panel:
+            action = getattr(panel, 'handle_click', lambda *_: None)(pos)
+            if action == "close":
+                # Evita que o mesmo clique selecione outra coisa na UI
+                return
+        # Depois, delega para a simulação normal
+        view.handle_click(pos)
+
+    @staticmethod
+    def _handle_mouse_motion(view, pos):
+        """Movimento do mouse na simulação"""
+        # --- NOVO: atualizar hover do painel sempre, independente do modo ---
+        panel = getattr(view, 'info_panel', None)
+        if panel and hasattr(panel, 'update_button_hover'):
+            panel.update_button_hover(pos)
+        # Depois, delega para a simulação normal
+        view.handle_mouse_motion(pos)
+
+    def _dispatch(self, command, redraw=True):
+        """Aplica `command(view)`: na thread da simulação, se houver, senão aqui mesmo"""
+        if self.worker:
+            self.worker.submit(command, redraw)
+        else:
+            command(self.view)
+
+    def _start_worker(self):
+        """Cria a view do simulador atual e sobe a thread da simulação (se SIMULATION_THREAD)"""
+        from views.process_view import preload_sprites
+        from views.simulator_view import SimulatorView, FrameView
+        preload_sprites()  # antes do primeiro quadro da simulação
+        self.view = SimulatorView(self.simulator)
+        self.timestep.reset()
+        if SIMULATION_THREAD:
+            from core.sim_worker import SimulationWorker
+            self.frame_view = FrameView()
+            self.worker = SimulationWorker(self.view, SIMULATION_SPEED, exporter=self.exporter).start()
+
+    def _stop_worker(self):
+        """Para a thread da simulação; o simulador fica no estado do último passo"""
+        if self.worker:
+            self.worker.stop()
+            self.worker = None
+            self.frame_view = None
+
     def _start_simulation(self, mode):
         """Inicia a simulação no modo selecionado"""
+        from core.queue_simulator import QueueSimulator
         self.game_mode = mode
-        self.simulator = QueueSimulator()
+        self.simulator = QueueSimulator(self.scenario)
         
         self.simulator.set_game_mode(mode)
 
@@ -106,7 +196,8 @@ class GameManager:
             self._setup_game_mode()
         
         self.current_state = mode
-        print(f"Iniciando modo: {mode}")
+        self._start_worker()
+        logger.info("Iniciando modo: %s", mode)
 
     def _setup_sandbox_mode(self):
         """Configura o modo sandbox"""
@@ -114,32 +205,60 @@ class GameManager:
         self.simulator.is_auto_generation_enabled = True
         
         # Todas as CPUs disponíveis desde o início (se implementadas)
-        # Configurações mais flexíveis para experimentação
-        self.simulator.current_interval_seconds = 1.0
-        self.simulator.max_queue_time_seconds = 15.0
+        self._apply_mode_overrides(self.scenario["modes"]["sandbox"])
         
-        print("Modo Sandbox: Controle total habilitado")
+        logger.info("Modo Sandbox: Controle total habilitado")
 
     def _setup_game_mode(self):
         """Configura o modo jogo"""
         # No modo jogo, começa com configurações básicas
         self.simulator.is_auto_generation_enabled = True
         
-        # Configurações balanceadas para desafio
-        self.simulator.current_interval_seconds = 1.0
-        self.simulator.max_queue_time_seconds = 8.0
+        self._apply_mode_overrides(self.scenario["modes"]["game"])
         
         # Resetar pontuação para começar do zero
         self.simulator.score = 0
         
-        print("Modo Jogo: Sistema de progressão ativado")
+        logger.info("Modo Jogo: Sistema de progressão ativado")
+
+    def _apply_mode_overrides(self, settings):
+        """Aplica as sobreposições explícitas do modo; sem elas o modo roda o cenário como o headless"""
+        if settings.get("interval_seconds") is not None:
+            self.simulator.current_interval_seconds = settings["interval_seconds"]
+        if settings.get("max_queue_time_seconds") is not None:
+            self.simulator.max_queue_time_seconds = settings["max_queue_time_seconds"]
+
+    def _save_session(self):
+        """Salva o estado completo da simulação em SNAPSHOT_FILE"""
+        from core.snapshot import save_snapshot
+
+        def save(view):
+            save_snapshot(view.simulator, SNAPSHOT_FILE)
+            logger.info("Sessao salva em %s", SNAPSHOT_FILE)
+        # Com a thread da simulação, o snapshot é tirado por ela, entre dois passos
+        self._dispatch(save)
+
+    def _load_session(self):
+        """Retoma a sessão salva (no modo em que foi gravada)"""
+        if not os.path.exists(SNAPSHOT_FILE):
+            logger.warning("Nenhuma sessao salva em %s", SNAPSHOT_FILE)
+            return
+        from core.snapshot import load_snapshot
+        self._stop_worker()
+        self.simulator = load_snapshot(SNAPSHOT_FILE)
+        self.game_mode = self.simulator._game_mode
+        self.current_state = self.game_mode
+        self._start_worker()
+        logger.info("Sessao retomada de %s (modo %s)", SNAPSHOT_FILE, self.game_mode)
 
     def _return_to_menu(self):
         """Volta para o menu principal"""
         self.current_state = "menu"
+        self._stop_worker()
         self.simulator = None
+        self.view = None
         self.game_mode = None
-        print("Retornando ao menu principal")
+        logger.info("Retornando ao menu principal")
 
     def _draw_back_button(self):
         """Desenha botão para voltar ao menu no grid (9,0)"""
@@ -169,7 +288,7 @@ class GameManager:
             self._return_to_menu()
 
 def main():
-    game_manager = GameManager()
+    game_manager = GameManager(sys.argv[1] if len(sys.argv) > 1 else None)
     game_manager.run()
 
 if __name__ == "__main__":
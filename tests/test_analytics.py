@@ -0,0 +1,79 @@
+import math
+
+import pytest
+
+from core.analytics import erlang_a_metrics, mmc_metrics, mmck_metrics, solve_traffic_equations
+
+
+def test_mm1_closed_form():
+    metrics = mmc_metrics(0.5, 1.0, 1)
+    assert metrics['rho'] == pytest.approx(0.5)
+    assert metrics['L'] == pytest.approx(1.0)
+    assert metrics['W'] == pytest.approx(2.0)
+    assert metrics['Wq'] == pytest.approx(1.0)
+    assert metrics['P0'] == pytest.approx(0.5)
+
+
+def test_mm2_erlang_c():
+    # λ = μ = 1 com 2 servidores: Erlang C = 1/3, P0 = 1/3 e Lq = 1/3
+    metrics = mmc_metrics(1.0, 1.0, 2)
+    assert metrics['Customer_Delay'] == pytest.approx(1 / 3)
+    assert metrics['P0'] == pytest.approx(1 / 3)
+    assert metrics['Lq'] == pytest.approx(1 / 3)
+    assert metrics['W'] == pytest.approx(1 / 3 + 1)
+
+
+@pytest.mark.parametrize("Lambda, c", [(1.0, 1), (2.5, 2)])
+def test_mmc_unstable_returns_none(Lambda, c):
+    assert mmc_metrics(Lambda, 1.0, c) is None
+
+
+def test_mm1k_blocking_probability():
+    rho, K = 0.8, 5
+    metrics = mmck_metrics(0.8, 1.0, 1, K)
+    expected = (1 - rho) * rho ** K / (1 - rho ** (K + 1))
+    assert metrics['P_block'] == pytest.approx(expected)
+    assert metrics['lambda_eff'] == pytest.approx(0.8 * (1 - expected))
+    # Little: L = λ_eff W
+    assert metrics['L'] == pytest.approx(metrics['lambda_eff'] * metrics['W'])
+
+
+def test_mm1k_at_full_load_is_uniform():
+    metrics = mmck_metrics(1.0, 1.0, 1, 4)
+    assert metrics['P_block'] == pytest.approx(1 / 5)
+    assert metrics['P0'] == pytest.approx(1 / 5)
+
+
+def test_mmck_with_large_k_approaches_mmc():
+    limited = mmck_metrics(1.5, 1.0, 2, 500)
+    unlimited = mmc_metrics(1.5, 1.0, 2)
+    assert limited['P_block'] < 1e-12
+    assert limited['W'] == pytest.approx(unlimited['W'], rel=1e-6)
+    assert limited['Lq'] == pytest.approx(unlimited['Lq'], rel=1e-6)
+
+
+def test_erlang_a_with_patience_equal_to_service_is_infinite_server():
+    # c = 1 e θ = μ: a taxa de saída em n é nμ, o número no sistema é Poisson(λ/μ)
+    a = 1.5
+    metrics = erlang_a_metrics(a, 1.0, 1, 1.0)
+    assert metrics['P0'] == pytest.approx(math.exp(-a))
+    assert metrics['L'] == pytest.approx(a, rel=1e-9)
+    assert metrics['Lq'] == pytest.approx(a - 1 + math.exp(-a), rel=1e-9)
+    assert metrics['P_abandon'] == pytest.approx(metrics['Lq'] / a)
+
+
+def test_erlang_a_is_stable_under_overload():
+    metrics = erlang_a_metrics(3.0, 1.0, 2, 0.5)
+    assert metrics is not None
+    # Quem não abandona é atendido: vazão = λ (1 - P_abandono)
+    assert metrics['throughput'] == pytest.approx(3.0 * (1 - metrics['P_abandon']), rel=1e-6)
+
+
+def test_traffic_equations_with_feedback():
+    # a -> b sempre; b volta para a com probabilidade 0,5
+    routing = [[0.0, 1.0], [0.5, 0.0]]
+    assert solve_traffic_equations(routing, [1.0, 0.0]) == pytest.approx([2.0, 2.0])
+
+
+def test_traffic_equations_without_exit():
+    assert solve_traffic_equations([[1.0]], [1.0]) is None
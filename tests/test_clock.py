@@ -0,0 +1,27 @@
+import pytest
+
+from core.clock import FixedTimestep
+
+
+def test_fractions_carry_over_to_the_next_frame():
+    timestep = FixedTimestep(10.0)
+    assert [timestep.steps(elapsed) for elapsed in (4, 4, 4, 25, 3)] == [0, 0, 1, 2, 1]
+    assert timestep.accumulator_ms == pytest.approx(0.0)
+    assert timestep.dropped_ms == 0.0
+
+
+def test_long_frame_is_capped_and_excess_dropped():
+    timestep = FixedTimestep(10.0, max_steps=8)
+    assert timestep.steps(125) == 8
+    assert timestep.dropped_ms == pytest.approx(40.0)
+    # A fração abaixo de um passo continua guardada; o excesso não volta
+    assert timestep.accumulator_ms == pytest.approx(5.0)
+    assert timestep.steps(5) == 1
+    assert timestep.steps(0) == 0
+
+
+def test_reset_clears_the_accumulator():
+    timestep = FixedTimestep(1000 / 60)
+    timestep.steps(10)
+    timestep.reset()
+    assert timestep.steps(10) == 0
@@ -0,0 +1,53 @@
+import re
+
+from core.exporter import PrometheusText, render_metrics
+from core.headless import HeadlessRunner
+
+SAMPLE = re.compile(r'^(queue_sim_[a-z_]+)(\{[a-z_]+="(?:[^"\\]|\\.)*"(?:,[a-z_]+="(?:[^"\\]|\\.)*")*\})? (\S+)$')
+
+
+def test_prometheus_text_escapes_labels_and_skips_missing_values():
+    out = PrometheusText()
+    out.metric("latency_seconds", "summary", "Tempos", [("", {'kind': 'a"b\\c\nd', 'quantile': "0.5"}, 1.5),
+                                                        ("", {'kind': "x"}, None),
+                                                        ("_count", {}, 3)])
+    assert out.text() == ("# HELP queue_sim_latency_seconds Tempos\n"
+                          "# TYPE queue_sim_latency_seconds summary\n"
+                          'queue_sim_latency_seconds{kind="a\\"b\\\\c\\nd",quantile="0.5"} 1.5\n'
+                          "queue_sim_latency_seconds_count 3\n")
+
+
+def test_render_metrics_is_valid_exposition_format():
+    runner = HeadlessRunner({'distribution': "exponential"}, seed=2)
+    runner.run_for(60)
+    frame_stats = {'quantiles': [(0.5, 1.0), (0.99, 4.0)], 'sum_ms': 100.0, 'count': 50, 'lag_ms': 0.0,
+                   'throughput': None}
+    text = render_metrics(runner.simulator, frame_stats)
+    assert text.endswith("\n")
+
+    declared = {}
+    for line in text.splitlines():
+        if line.startswith("# HELP "):
+            name = line.split()[2]
+            assert name not in declared, f"HELP repetido: {name}"
+            declared[name] = None
+        elif line.startswith("# TYPE "):
+            _, _, name, kind = line.split()
+            assert kind in ("gauge", "counter", "summary")
+            declared[name] = kind
+        else:
+            match = SAMPLE.match(line)
+            assert match, line
+            name = match.group(1)
+            base = name if name in declared else re.sub(r"_(sum|count)$", "", name)
+            # A amostra pertence a uma métrica já declarada (HELP/TYPE antes das amostras)
+            assert declared.get(base) is not None, line
+            float(match.group(3))
+            if declared[base] == "counter":
+                assert float(match.group(3)) >= 0
+
+    assert declared["queue_sim_completed_total"] == "counter"
+    assert declared["queue_sim_latency_seconds"] == "summary"
+    assert "queue_sim_throughput_per_second" in declared
+    assert "\nqueue_sim_throughput_per_second " not in text  # valor None não vira amostra
+    assert f'queue_sim_cpu_queue_length{{cpu="{runner.simulator.computers[0].name}"}}' in text
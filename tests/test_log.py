@@ -0,0 +1,42 @@
+import logging
+
+from core import log
+from core.log import RateLimitFilter, SamplingFilter
+
+
+def record(msg, level=logging.DEBUG, name="simulador.cpu", args=()):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+def test_sampling_filter_keeps_one_of_every_n_per_message():
+    sampler = SamplingFilter(every=3)
+    passed = [sampler.filter(record("inicio %s")) for _ in range(7)]
+    assert passed == [True, False, False, True, False, False, True]
+    # Cada modelo de mensagem tem sua própria contagem; INFO e acima sempre passam
+    assert sampler.filter(record("fim %s"))
+    assert all(sampler.filter(record("inicio %s", logging.INFO)) for _ in range(3))
+
+
+def test_rate_limit_counts_and_reports_suppressed(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(log.time, "monotonic", lambda: now[0])
+    limiter = RateLimitFilter(max_per_second=2)
+    passed = [limiter.filter(record("fila %s", args=(i,))) for i in range(5)]
+    assert passed == [True, True, False, False, False]
+
+    now[0] += 1.0
+    resumed = record("fila %s", args=(5,))
+    assert limiter.filter(resumed)
+    assert resumed.getMessage() == "fila 5 [+3 suprimidas]"
+    # A contagem recomeça depois de reportada
+    following = record("fila %s", args=(6,))
+    assert limiter.filter(following)
+    assert following.getMessage() == "fila 6"
+
+
+def test_rate_limit_overrides_and_warnings(monkeypatch):
+    monkeypatch.setattr(log.time, "monotonic", lambda: 0.0)
+    limiter = RateLimitFilter(overrides={"simulador.metricas": 1})
+    assert all(limiter.filter(record("evento")) for _ in range(10))
+    assert [limiter.filter(record("relatorio", name="simulador.metricas")) for _ in range(3)] == [True, False, False]
+    assert limiter.filter(record("relatorio", logging.WARNING, name="simulador.metricas"))
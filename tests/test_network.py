@@ -0,0 +1,37 @@
+import random
+
+import pytest
+
+from config import NETWORK_PRESETS
+from core.analytics import solve_traffic_equations
+from core.headless import HeadlessRunner
+from core.network import QueueNetwork
+
+
+def test_visit_ratios_solve_the_traffic_equations():
+    # jackson: parse -> compute (volta 0.2) -> write (volta ao parse 0.1)
+    visits = QueueNetwork(NETWORK_PRESETS["jackson"]).visit_ratios()
+    assert visits == pytest.approx([1 / 0.9, 1 / 0.72, 1 / 0.9])
+    routing = [[0, 1.0, 0], [0, 0.2, 0.8], [0.1, 0, 0]]
+    assert visits == pytest.approx(solve_traffic_equations(routing, [1.0, 0, 0]))
+
+
+def test_route_follows_the_routing_probabilities():
+    random.seed(7)
+    network = QueueNetwork(NETWORK_PRESETS["jackson"])
+    routes = [network.route("compute") for _ in range(20000)]
+    assert sum(stage["name"] == "compute" for stage in routes) / len(routes) == pytest.approx(0.2, abs=0.01)
+    assert sum(stage["name"] == "write" for stage in routes) / len(routes) == pytest.approx(0.8, abs=0.01)
+    exits = [network.route("write") for _ in range(20000)]
+    assert sum(stage is None for stage in exits) / len(exits) == pytest.approx(0.9, abs=0.01)
+
+
+def test_simulated_visits_match_the_visit_ratios():
+    runner = HeadlessRunner({'network': "jackson", 'interval': 2.0, 'distribution': "exponential",
+                             'max_queue_time': 600}, seed=3)
+    runner.run_for(1800)
+    network = runner.simulator.network
+    exits = network.exit_stats['exits']
+    assert exits > 500
+    measured = [network.stage_stats[stage["name"]]['completed'] / exits for stage in network.stages]
+    assert measured == pytest.approx(network.visit_ratios(), rel=0.05)
@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+from core.output_analysis import (batch_means_ci, confidence_interval, min_observations, mser_truncation,
+                                  steady_state_ci, t_critical)
+
+
+@pytest.mark.parametrize("df, expected", [(1, 12.706), (2, 4.303), (10, 2.228), (30, 2.042), (1000, 1.962)])
+def test_t_critical_matches_tables(df, expected):
+    assert t_critical(df) == pytest.approx(expected, rel=0.005)
+
+
+def test_confidence_interval_of_known_sample():
+    ci = confidence_interval([1, 2, 3, 4, 5])
+    assert ci['mean'] == 3
+    assert ci['half_width'] == pytest.approx(2.776 * (2.5 / 5) ** 0.5, rel=0.005)
+    assert ci['n'] == 5
+    assert confidence_interval([1]) is None
+
+
+def test_mser5_truncates_initial_transient():
+    rng = random.Random(3)
+    series = [10.0 + rng.gauss(0, 0.1) for _ in range(50)] + [rng.gauss(0, 0.1) for _ in range(450)]
+    warmup = mser_truncation(series)
+    assert warmup % 5 == 0
+    assert 50 <= warmup <= 60
+
+
+def test_mser5_needs_enough_batches():
+    assert mser_truncation([5.0, 1.0, 1.0] * 5) == 0
+
+
+def test_batch_means_align_to_end_of_series():
+    series = [100.0] * 3 + [float(i) for i in range(100)]
+    ci = batch_means_ci(series, num_batches=20)
+    assert ci['batch_size'] == 5
+    assert ci['n'] == 20
+    # A sobra (os 3 primeiros valores) é descartada
+    assert ci['mean'] == pytest.approx(49.5)
+
+
+def test_batch_means_without_enough_data():
+    assert batch_means_ci([1.0] * 9, num_batches=20) is None
+
+
+def test_batch_means_use_fewer_batches_on_short_series():
+    # 300 s em janelas de 10 s: 30 observações ainda dão IC, com 15 lotes de 2
+    ci = batch_means_ci([float(i % 3) for i in range(30)], num_batches=20)
+    assert ci['n'] == 15
+    assert ci['batch_size'] == 2
+    assert batch_means_ci([1.0, 2.0] * 5, num_batches=3)['n'] == 3
+    assert batch_means_ci([1.0, 2.0] * 2, num_batches=3) is None
+
+
+def test_min_observations_always_give_an_interval():
+    # Mesmo com o MSER-5 descartando o máximo possível
+    n = min_observations(20)
+    series = [10.0 * (i < n // 2) + i % 2 for i in range(n)]
+    assert steady_state_ci(series) is not None
+
+
+def test_steady_state_ci_reports_warmup():
+    rng = random.Random(5)
+    series = [5.0] * 40 + [1.0 + rng.gauss(0, 0.05) for _ in range(400)]
+    ci = steady_state_ci(series)
+    assert ci['warmup'] >= 40
+    assert ci['mean'] == pytest.approx(1.0, abs=0.02)
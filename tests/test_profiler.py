@@ -0,0 +1,16 @@
+import random
+
+from core.profiler import RollingHistogram
+
+
+def test_max_follows_the_window():
+    rng = random.Random(3)
+    histogram = RollingHistogram(window=50)
+    assert histogram.max == 0.0
+    values = []
+    for _ in range(1000):
+        value = rng.choice([rng.expovariate(1.0), 5.0])
+        values.append(value)
+        histogram.add(value)
+        assert histogram.max == max(values[-50:])
+    assert histogram.count == 50
@@ -0,0 +1,136 @@
+import logging
+import pickle
+import random
+
+import pytest
+
+from core.clock import sim_clock
+from core.headless import STEP_MS, build_simulator
+from core.replay import open_arrival_trace
+from core.trace import EVENT_CODES, EventTrace, event_trace, read_trace
+
+
+def run(simulator, seconds):
+    for _ in range(int(round(seconds * 1000 / STEP_MS))):
+        sim_clock.advance(STEP_MS)
+        simulator.update(STEP_MS / 1000)
+
+
+@pytest.fixture
+def binary_trace(tmp_path):
+    """Trace binário em blocos pequenos: chegadas de duas fontes misturadas com outros eventos"""
+    path = str(tmp_path / "chegadas.trace")
+    sim_clock.use_virtual_time(0)
+    trace = EventTrace(chunk_size=3)
+    trace.start(path)
+    for i in range(20):
+        sim_clock.set_time(i * 100)
+        source = 1 if i % 3 else 2
+        if i % 4 == 0:
+            trace.record(EVENT_CODES['blocked'], value=source)
+        else:
+            trace.record(EVENT_CODES['create'], i, 1, source)
+            trace.record(EVENT_CODES['enqueue'], i, 1, 1)
+    trace.stop()
+    return path
+
+
+@pytest.fixture
+def text_trace(tmp_path):
+    path = tmp_path / "chegadas.csv"
+    path.write_text("tempo_s,servico_ms,classe\n# comentario\n0.5,1200,cpu\n1.0\n\n1.5,800\n2.0,300,io\n")
+    return str(path)
+
+
+def test_text_trace_records(text_trace):
+    trace = open_arrival_trace(text_trace)
+    assert list(trace) == [(500.0, 1200.0, 'cpu'), (1000.0, None, None), (1500.0, 800.0, None),
+                           (2000.0, 300.0, 'io')]
+    assert trace.format == "texto"
+    assert trace.position == 4
+
+
+def test_binary_trace_replays_created_and_blocked_arrivals(binary_trace):
+    times = [time_ms for time_ms, _, _ in open_arrival_trace(binary_trace)]
+    assert times == [i * 100.0 for i in range(20)]
+    source_2 = [time_ms for time_ms, _, _ in open_arrival_trace(binary_trace, source=2)]
+    assert source_2 == [i * 100.0 for i in range(20) if i % 3 == 0]
+
+
+@pytest.mark.parametrize("fixture", ["binary_trace", "text_trace"])
+def test_pickled_trace_resumes_at_cursor(fixture, request):
+    path = request.getfixturevalue(fixture)
+    expected = list(open_arrival_trace(path))
+    for consumed in range(len(expected) + 1):
+        trace = open_arrival_trace(path)
+        for _ in range(consumed):
+            next(trace)
+        resumed = pickle.loads(pickle.dumps(trace))
+        assert resumed.position == consumed
+        assert list(resumed) == expected[consumed:]
+
+
+def test_simulation_trace_round_trip(tmp_path):
+    path = str(tmp_path / "simulacao.trace")
+    random.seed(2)
+    sim_clock.use_virtual_time(0)
+    # Capacidade pequena: parte das chegadas é bloqueada e também precisa voltar no replay
+    original = build_simulator(interval=0.3, distribution="exponential", capacity=3)
+    event_trace.start(path)
+    try:
+        run(original, 60)
+    finally:
+        event_trace.stop()
+    arrivals = original.connection.total_created + original.blocked_arrivals
+    assert original.blocked_arrivals > 0
+
+    columns = read_trace(path)
+    recorded = [time_ms for time_ms, event in zip(columns['time_ms'], columns['event'])
+                if event in (EVENT_CODES['create'], EVENT_CODES['blocked'])]
+    assert len(recorded) == arrivals
+    assert [time_ms for time_ms, _, _ in open_arrival_trace(path)] == recorded
+
+    sim_clock.use_virtual_time(0)
+    replay = build_simulator(capacity=3, arrival_trace=path)
+    replay_path = str(tmp_path / "replay.trace")
+    event_trace.start(replay_path)
+    try:
+        run(replay, 61)
+    finally:
+        event_trace.stop()
+    assert replay.connection.total_created + replay.blocked_arrivals == arrivals
+    # Mesmos instantes, a menos do quadro em que o acumulado do relógio cruza o intervalo
+    replayed = [time_ms for time_ms, _, _ in open_arrival_trace(replay_path)]
+    assert len(replayed) == arrivals
+    assert all(abs(a - b) <= STEP_MS + 1e-6 for a, b in zip(replayed, recorded))
+
+
+def test_malformed_text_lines_are_skipped_with_line_number(tmp_path):
+    path = tmp_path / "chegadas.csv"
+    path.write_text("tempo_s,servico_ms\n0.5,1200\n1.0,abc\nxyz,1\n2.0,300\n")
+    logged = []
+    handler = logging.Handler(logging.WARNING)
+    handler.emit = logged.append
+    logger = logging.getLogger("simulador.replay")
+    logger.addHandler(handler)
+    try:
+        records = list(open_arrival_trace(str(path)))
+    finally:
+        logger.removeHandler(handler)
+    assert records == [(500.0, 1200.0, None), (2000.0, 300.0, None)]
+    warnings = [record.getMessage() for record in logged]
+    assert len(warnings) == 2
+    assert f"{path}:3:" in warnings[0] and f"{path}:4:" in warnings[1]
+
+
+def test_first_trace_arrival_keeps_its_time(tmp_path):
+    path = tmp_path / "chegadas.csv"
+    path.write_text("5.0\n6.0\n")
+    sim_clock.use_virtual_time(0)
+    simulator = build_simulator(arrival_trace=str(path))
+    run(simulator, 4.9)
+    assert simulator.connection.total_created == 0
+    run(simulator, 0.2)
+    assert simulator.connection.total_created == 1
+    run(simulator, 1.0)
+    assert simulator.connection.total_created == 2
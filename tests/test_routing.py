@@ -0,0 +1,36 @@
+from core.headless import HeadlessRunner
+from core.scenario import compile_scenario
+
+
+def pooled_runner(strategy):
+    scenario = compile_scenario({
+        'cpus': {'count': 3},
+        'system': {'strategy': strategy, 'capacity': 50},
+        'sources': [{'name': "A", 'interval_seconds': 0.5, 'distribution': "exponential", 'pool': [1]},
+                    {'name': "B", 'interval_seconds': 0.5, 'distribution': "exponential", 'pool': [2, 3]}],
+    })
+    return HeadlessRunner({'base_scenario': scenario}, seed=4)
+
+
+def test_sources_only_reach_their_pool():
+    for strategy in ("round_robin", "least_loaded"):
+        runner = pooled_runner(strategy)
+        simulator = runner.simulator
+        used = {1: set(), 2: set()}
+        for _ in range(60 * 60):
+            runner.step()
+            for computer in simulator.computers:
+                for process in computer.queue + [computer.current_process]:
+                    if process is not None:
+                        used[process.source_id].add(computer.computer_id)
+        assert used == {1: {1}, 2: {2, 3}}, strategy
+
+
+def test_arrivals_without_a_cpu_in_the_pool_are_blocked():
+    runner = pooled_runner("round_robin")
+    simulator = runner.simulator
+    simulator.set_computer_count(1)  # o pool da fonte B (CPUs 2 e 3) fica vazio
+    runner.run_for(30)
+    assert simulator.source_stats['B']['blocked'] > 0
+    assert simulator.source_stats['A'].get('blocked', 0) == 0
+    assert all(process.source_id == 1 for process in simulator.computers[0].queue)
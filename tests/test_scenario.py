@@ -0,0 +1,69 @@
+import os
+
+import pytest
+
+from core.scenario import DEFAULT_SCENARIO, compile_scenario, load_scenario
+
+EXAMPLE = os.path.join(os.path.dirname(__file__), os.pardir, "scenarios", "exemplo.toml")
+
+
+@pytest.mark.parametrize("data, message", [
+    ({'sources': ['x']}, "sources[0]: esperado uma tabela"),
+    ({'sources': [{'pool': [99]}]}, "sources[0].pool: CPU 99 não existe"),
+    ({'sources': [{'interval_seconds': 0}]}, "sources[0].interval_seconds: deve ser > 0"),
+    ({'job_classes': [3]}, "job_classes[0]: esperado uma tabela"),
+    ({'network': ['x']}, "network[0]: esperado uma tabela"),
+    ({'network': [{'name': 'a', 'routing': [1]}]}, "network[0].routing: esperado uma tabela"),
+    ({'network': [{'name': 'a', 'routing': {'b': 1.0}}]}, "estágio 'b' não existe"),
+    ({'network': [{'name': 'a', 'routing': {'a': 1.0}}]}, "o estágio 'a' não tem caminho para a saída"),
+    ({'cpus': {'count': 4, 'max': 2}}, "cpus.count (4) maior que cpus.max (2)"),
+    ({'cpus': {'max': 4}, 'network': [{'name': 'a', 'cpus': 3, 'routing': {'b': 1.0}}, {'name': 'b', 'cpus': 2}]},
+     "os estágios pedem 5 CPUs, mais que cpus.max (4)"),
+    ({'system': {'strategy': 'random'}}, "system.strategy: 'random' inválida"),
+    ({'modes': {'sandbox': {'interval_seconds': -1}}}, "modes.sandbox.interval_seconds: deve ser > 0"),
+    ({'extra': 1}, "chave desconhecida 'extra'"),
+])
+def test_invalid_scenarios_raise_value_error(data, message):
+    with pytest.raises(ValueError) as error:
+        compile_scenario(data)
+    assert message in str(error.value)
+
+
+def test_network_with_feedback_and_exit_is_valid():
+    scenario = compile_scenario({'network': [{'name': 'a', 'routing': {'b': 1.0}},
+                                             {'name': 'b', 'routing': {'a': 0.5}}]})
+    assert [stage['name'] for stage in scenario['network']] == ['a', 'b']
+
+
+def test_stage_cpus_are_reported_with_other_errors():
+    with pytest.raises(ValueError) as error:
+        compile_scenario({'cpus': {'max': 2}, 'system': {'strategy': 'random'},
+                          'network': [{'name': 'a', 'cpus': 3}]})
+    assert "os estágios pedem 3 CPUs" in str(error.value)
+    assert "system.strategy" in str(error.value)
+
+
+def test_example_scenario_is_stable():
+    scenario = load_scenario(EXAMPLE)
+    classes = scenario['job_classes']
+    mean_service_s = sum(c['weight'] * c['service_ms'] for c in classes) / sum(c['weight'] for c in classes) / 1000
+    utilization = mean_service_s / scenario['sources'][0]['interval_seconds'] / scenario['cpus']['count']
+    assert utilization < 0.8
+
+
+def test_pool_of_entry_stage_cpus_is_valid():
+    scenario = compile_scenario({'cpus': {'count': 2}, 'sources': [{'pool': [2]}]})
+    assert scenario['sources'][0]['pool'] == (2,)
+
+
+def test_compiled_scenario_is_immutable():
+    with pytest.raises(TypeError):
+        DEFAULT_SCENARIO['cpus']['count'] = 3
+
+
+def test_modes_do_not_override_by_default():
+    scenario = load_scenario(EXAMPLE)
+    assert 'interval_seconds' not in scenario['modes']['sandbox']
+    assert scenario['sources'][0]['interval_seconds'] == 1.0
+    override = compile_scenario({'modes': {'sandbox': {'max_queue_time_seconds': 15.0}}})
+    assert override['modes']['sandbox']['max_queue_time_seconds'] == 15.0
@@ -0,0 +1,66 @@
+import pytest
+
+from core.clock import sim_clock
+from core.headless import build_simulator
+from entities.computer import Computer
+from entities.process import Process
+from entities.process_states import ProcessState
+
+
+@pytest.fixture
+def clock():
+    sim_clock.use_virtual_time(0)
+    return sim_clock
+
+
+def test_preemption_keeps_remaining_work_and_charges_context_switch(clock):
+    computer = Computer(1)
+    computer.set_processing_time(2.0)
+    computer.set_time_slice(500, 50)
+    first, second = Process(1, 0, 0), Process(2, 0, 0)
+    computer.start_processing(first)
+    computer.add_to_queue(second)
+
+    # A troca de contexto ocupa a CPU sem consumir o quantum
+    clock.advance(500)
+    assert not computer.check_time_slice()
+    clock.advance(50)
+    assert computer.check_time_slice()
+    assert first.remaining_time_ms == 1500
+    assert first.preemption_count == 1
+    assert computer.queue == [second, first]
+
+    computer.start_processing(computer.get_next_process())
+    assert computer.current_process is second
+    assert computer.context_switches == 2
+    assert computer.switch_time_ms == 100
+
+
+def test_lone_process_runs_without_switching(clock):
+    computer = Computer(1)
+    computer.set_time_slice(500, 50)
+    process = Process(1, 0, 0)
+    computer.start_processing(process)
+    clock.advance(600)
+    assert not computer.check_time_slice()
+    assert computer.preemptions == 0
+    assert computer.context_switches == 1
+
+
+def test_preempted_process_does_not_expire_in_queue(clock):
+    simulator = build_simulator(cpus=1, max_queue_time=1.0)
+    computer = simulator.computers[0]
+    computer.set_time_slice(500, 0)
+    served, waiting = Process(1, 0, 0), Process(2, 0, 0)
+    computer.start_processing(served)
+    computer.add_to_queue(waiting)
+    clock.advance(500)
+    assert computer.check_time_slice()
+
+    # Os dois esperam mais que o tempo máximo: só o que nunca foi atendido é perdido
+    clock.advance(2000)
+    simulator._check_queue_timeouts()
+    assert computer.queue == [served]
+    assert served.state == ProcessState.WAITING_CPU
+    assert waiting.state == ProcessState.COMPLETED
+    assert simulator.timed_out_processes == 1
@@ -0,0 +1,89 @@
+import asyncio
+import json
+
+import pytest
+
+from core.headless import HeadlessRunner
+from core.service import SimulationService
+
+
+@pytest.fixture
+def service():
+    return SimulationService(HeadlessRunner(seed=1), speed=1.0, publish_interval=60)
+
+
+def ask(service, path, *requests, timeout=5.0):
+    """Sobe o serviço num socket Unix, manda os pedidos por uma conexão e devolve as respostas (float = pausa)"""
+    async def session():
+        ready = asyncio.Event()
+        server = asyncio.create_task(service.serve(path=path, ready=lambda address: ready.set()))
+        await asyncio.wait_for(ready.wait(), timeout)
+        reader, writer = await asyncio.open_unix_connection(path)
+        responses = []
+        for request in requests:
+            if isinstance(request, float):
+                await asyncio.sleep(request)  # deixa a simulação andar entre dois pedidos
+                continue
+            writer.write(request.encode() + b"\n" if isinstance(request, str) else
+                         json.dumps(request).encode() + b"\n")
+            await writer.drain()
+            responses.append(json.loads(await asyncio.wait_for(reader.readline(), timeout)))
+        writer.write(b'{"cmd": "shutdown"}\n')
+        await writer.drain()
+        await asyncio.wait_for(server, timeout)
+        writer.close()
+        return responses
+    return asyncio.run(session())
+
+
+def test_speed_above_limit_is_rejected(service):
+    response = service.execute({'cmd': 'set_speed', 'speed': 1e12})
+    assert response['ok'] is False
+    assert 'speed' in response['error']
+    assert service.speed == 1.0
+
+
+def test_service_answers_while_running_at_max_finite_speed(service, tmp_path):
+    path = str(tmp_path / "servico.sock")
+    responses = ask(service, path, {'cmd': 'set_speed', 'speed': 1000}, {'cmd': 'status'}, {'cmd': 'status'})
+    assert [response['ok'] for response in responses] == [True, True, True]
+    assert responses[0]['speed'] == 1000
+
+
+@pytest.mark.parametrize("line", ['{"cmd": "set_speed", "speed": Infinity}', '{"cmd": "set_speed", "speed": NaN}',
+                                  '{"cmd": "set_interval", "seconds": -Infinity}'])
+def test_non_finite_numbers_are_rejected(service, line):
+    response = service.execute(json.loads(line))
+    assert response == {'ok': False, 'error': response['error']}
+    assert 'finito' in response['error']
+    assert service.speed == 1.0
+
+
+@pytest.mark.parametrize("request_", [[1, 2], {'cmd': 'voar'}, {'cmd': 'stop_cpu', 'cpu': 99},
+                                      {'cmd': 'set_strategy', 'strategy': 'aleatoria'}])
+def test_bad_requests_get_an_error_reply(service, request_):
+    response = service.execute(request_)
+    assert response['ok'] is False
+    assert response['error']
+
+
+def test_unexpected_failure_is_reported_and_connection_survives(service, tmp_path, monkeypatch):
+    def broken(request, client):
+        raise RuntimeError("quebrou")
+    monkeypatch.setitem(service.commands, 'metrics', broken)
+    path = str(tmp_path / "servico.sock")
+    responses = ask(service, path, {'cmd': 'metrics'}, 'isto nao e json', {'cmd': 'status'})
+    assert responses[0] == {'ok': False, 'error': "erro interno: RuntimeError: quebrou"}
+    assert responses[1]['ok'] is False and 'JSON' in responses[1]['error']
+    assert responses[2]['ok'] is True
+
+
+def test_simulation_failure_is_reported_as_halted(service, tmp_path, monkeypatch):
+    def broken():
+        raise RuntimeError("passo quebrado")
+    monkeypatch.setattr(service.runner, 'step', broken)
+    path = str(tmp_path / "servico.sock")
+    assert service.execute({'cmd': 'status'})['halted'] is None
+    responses = ask(service, path, 0.2, {'cmd': 'status'}, {'cmd': 'metrics'})
+    assert responses[0]['halted'] == "RuntimeError: passo quebrado"
+    assert responses[1]['ok'] is True and responses[1]['halted'] == responses[0]['halted']
@@ -0,0 +1,43 @@
+from core.clock import sim_clock
+from core.headless import HeadlessRunner
+from core.snapshot import fork, restore, snapshot
+
+
+def counters(simulator):
+    return (simulator.connection.total_created, simulator.completed_processes, simulator.timed_out_processes,
+            simulator.blocked_arrivals, simulator.total_turnaround_time_ms, sim_clock.get_ticks())
+
+
+def warmed_up_runner():
+    runner = HeadlessRunner({'distribution': "exponential", 'interval': 0.8}, seed=1)
+    runner.run_for(60)
+    return runner
+
+
+def test_restore_returns_state_and_clock_of_snapshot():
+    runner = warmed_up_runner()
+    saved = counters(runner.simulator)
+    data = snapshot(runner.simulator)
+    runner.run_for(10)
+    assert counters(restore(data)) == saved
+
+
+def test_runner_from_snapshot_continues_identically():
+    runner = warmed_up_runner()
+    data = snapshot(runner.simulator)
+    runner.run_for(60)
+    original = counters(runner.simulator)
+
+    branch = HeadlessRunner(snapshot=data)
+    branch.run_for(60)
+    assert counters(branch.simulator) == original
+
+
+def test_fork_is_independent_of_the_original():
+    runner = warmed_up_runner()
+    before = counters(runner.simulator)
+    branch = fork(runner.simulator)
+    runner.run_for(30)
+    assert branch is not runner.simulator
+    assert counters(branch)[:-1] == before[:-1]
+    assert runner.simulator.connection.total_created > before[0]
@@ -0,0 +1,73 @@
+import random
+import statistics
+
+import pytest
+
+from core.streaming_stats import P2Quantile, StreamingStats, TimeWeightedAverage, WelfordAccumulator
+
+
+def test_welford_matches_two_pass_statistics():
+    rng = random.Random(7)
+    values = [rng.expovariate(1 / 2000) for _ in range(5000)]
+    accumulator = WelfordAccumulator()
+    for value in values:
+        accumulator.add(value)
+    assert accumulator.count == len(values)
+    assert accumulator.mean == pytest.approx(statistics.fmean(values), rel=1e-12)
+    assert accumulator.variance == pytest.approx(statistics.variance(values), rel=1e-9)
+    assert (accumulator.min, accumulator.max) == (min(values), max(values))
+
+
+def test_welford_single_sample_has_zero_variance():
+    accumulator = WelfordAccumulator()
+    accumulator.add(5.0)
+    assert accumulator.variance == 0.0
+    assert accumulator.std == 0.0
+
+
+@pytest.mark.parametrize("p", [0.5, 0.95, 0.99])
+def test_p2_quantile_tracks_uniform_quantiles(p):
+    rng = random.Random(11)
+    estimator = P2Quantile(p)
+    for _ in range(20000):
+        estimator.add(rng.random())
+    assert estimator.value == pytest.approx(p, abs=0.01)
+
+
+def test_p2_quantile_is_exact_with_few_samples():
+    estimator = P2Quantile(0.5)
+    assert estimator.value is None
+    for value in (30, 10, 20):
+        estimator.add(value)
+    assert estimator.value == 20
+
+
+def test_streaming_stats_summary():
+    stats = StreamingStats()
+    assert stats.format_seconds() == "sem amostras"
+    for value in range(1, 1001):
+        stats.add(float(value))
+    summary = stats.summary()
+    assert summary['count'] == 1000
+    assert summary['mean'] == pytest.approx(500.5)
+    assert (summary['min'], summary['max']) == (1.0, 1000.0)
+    assert summary['p50'] == pytest.approx(500, rel=0.02)
+    assert summary['p95'] == pytest.approx(950, rel=0.02)
+
+
+def test_time_weighted_average_integrates_steps():
+    average = TimeWeightedAverage(start_time=0)
+    average.set(2, 10)
+    average.set(1, 30)
+    # 0 por 10 ms, 2 por 20 ms e 1 por 10 ms
+    assert average.mean(40) == pytest.approx(50 / 40)
+    average.add(3, 40)
+    assert average.value == 4
+
+
+def test_time_weighted_average_reset_keeps_value():
+    average = TimeWeightedAverage(start_time=0, value=5)
+    average.reset(100)
+    assert average.mean(100) == 5.0
+    average.set(1, 150)
+    assert average.mean(200) == pytest.approx((5 * 50 + 1 * 50) / 100)
@@ -1,5 +1,5 @@
-import pygame
-from config import GRID_COLUMNS, CELL_WIDTH, GRID_ROWS, CELL_HEIGHT, MARGIN, Colors
+import math
+from config import CELL_WIDTH, CELL_HEIGHT, MARGIN, GridPositions, ElementSizes
 
 class GridHelper:
     @staticmethod
@@ -18,23 +18,53 @@ class GridHelper:
         return x + width // 2, y + height // 2
     
     @staticmethod
-    def draw_grid(screen: pygame.Surface) -> None:
-        """Desenha o grid de fundo (para debug)"""
-        # Linhas verticais
-        for column in range(GRID_COLUMNS + 1):
-            x = column * CELL_WIDTH
-            pygame.draw.line(screen, Colors.DARK_GRAY, (x, 0), (x, CELL_HEIGHT * GRID_ROWS), 1)
+    def layout_computers(count: int) -> list:
+        """Retorna os retângulos (x, y, largura, altura) em pixels de `count` CPUs"""
+        # Poucas CPUs: mantém as posições fixas do layout clássico
+        if count <= len(GridPositions.COMPUTERS):
+            width_cells, height_cells = ElementSizes.COMPUTER
+            return [GridHelper.grid_to_pixels(col, row, width_cells, height_cells)
+                    for col, row in GridPositions.COMPUTERS[:count]]
         
-        # Linhas horizontais
-        for row in range(GRID_ROWS + 1):
-            y = row * CELL_HEIGHT
-            pygame.draw.line(screen, Colors.DARK_GRAY, (0, y), (CELL_WIDTH * GRID_COLUMNS, y), 1)
+        # Muitas CPUs: divide a área das CPUs em blocos iguais
+        col, row = GridPositions.COMPUTER_AREA
+        width_cells, height_cells = ElementSizes.COMPUTER_AREA
+        area_x, area_y, area_width, area_height = GridHelper.grid_to_pixels(col, row, width_cells, height_cells)
+        return GridHelper._tile_area(area_x, area_y, area_width, area_height, count)
+    
+    @staticmethod
+    def layout_stages(stage_sizes: list) -> list:
+        """Retângulos das CPUs de uma rede de filas: uma coluna da área de CPUs por estágio"""
+        col, row = GridPositions.COMPUTER_AREA
+        width_cells, height_cells = ElementSizes.COMPUTER_AREA
+        area_x, area_y, area_width, area_height = GridHelper.grid_to_pixels(col, row, width_cells, height_cells)
+        
+        stage_width = area_width / max(1, len(stage_sizes))
+        gap = MARGIN * 2
+        rects = []
+        for index, count in enumerate(stage_sizes):
+            stage_x = area_x + index * stage_width
+            rects.extend(GridHelper._tile_area(int(stage_x), area_y, max(1, int(stage_width) - gap), area_height, count))
+        return rects
+    
+    @staticmethod
+    def _tile_area(area_x, area_y, area_width, area_height, count) -> list:
+        """Divide um retângulo em `count` blocos de mesmo tamanho"""
+        if count <= 0:
+            return []
+        columns = max(1, math.ceil(math.sqrt(count * area_width / area_height)))
+        rows = math.ceil(count / columns)
+        tile_width = area_width / columns
+        tile_height = area_height / rows
+        gap = max(1, int(min(tile_width, tile_height) * 0.1))
         
-        # Coordenadas (debug)
-        font = pygame.font.SysFont(None, 16)
-        for column in range(GRID_COLUMNS):
-            for row in range(GRID_ROWS):
-                x = column * CELL_WIDTH + 5
-                y = row * CELL_HEIGHT + 5
-                text = font.render(f"{column},{row}", True, Colors.DARK_GRAY)
-                screen.blit(text, (x, y))
\ No newline at end of file
+        rects = []
+        for index in range(count):
+            tile_col, tile_row = index % columns, index // columns
+            rects.append((
+                int(area_x + tile_col * tile_width),
+                int(area_y + tile_row * tile_height),
+                max(1, int(tile_width) - gap),
+                max(1, int(tile_height) - gap)
+            ))
+        return rects
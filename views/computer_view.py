@@ -0,0 +1,79 @@
+import pygame
+from config import Colors
+
+
+def computer_record(computer) -> dict:
+    """O que o desenho usa da CPU, copiado do modelo (views.simulator_view.SimulatorView.render_model)"""
+    return {
+        'id': computer.computer_id,
+        'name': computer.name,
+        'stage': computer.stage,
+        'rect': (computer.x, computer.y, computer.width, computer.height),
+        'color': computer.color,
+        'is_stopped': computer.is_stopped,
+        'is_idle': computer.is_idle,
+        'current_id': computer.current_process.id if computer.current_process else None,
+        'queue_length': len(computer.queue),
+    }
+
+
+def draw_computer(screen: pygame.Surface, computer: dict) -> None:
+    """Desenha a CPU na tela"""
+    x, y, width, height = computer['rect']
+    # Blocos pequenos (muitas CPUs) usam a visão compacta
+    if width < 80:
+        _draw_compact(screen, computer)
+        return
+    
+    # Retângulo principal
+    pygame.draw.rect(screen, computer['color'], computer['rect'])
+    pygame.draw.rect(screen, Colors.WHITE, computer['rect'], 2)
+    
+    # Informações de texto
+    font = pygame.font.SysFont(None, 24)
+    title_font = pygame.font.SysFont(None, 28)
+    
+    # Nome da CPU
+    title_text = title_font.render(computer['name'], True, Colors.WHITE)
+    screen.blit(title_text, (x + width // 2 - 25, y + 10))
+    
+    # Estágio da rede de filas
+    if computer['stage']:
+        stage_font = pygame.font.SysFont(None, 18)
+        stage_text = stage_font.render(computer['stage'], True, Colors.WHITE)
+        screen.blit(stage_text, (x + width // 2 - stage_text.get_width() // 2, y + 32))
+    
+    # Status
+    if computer['is_stopped']:
+        status = "PARADA"
+    else:
+        status = "PROCESSANDO" if not computer['is_idle'] else "OCIOSA"
+    status_text = font.render(status, True, Colors.WHITE)
+    screen.blit(status_text, (x + width // 2 - 40, y + height // 2 - 10))
+    
+    # Processo atual
+    if not computer['is_idle'] and computer['current_id'] is not None and not computer['is_stopped']:
+        process_text = font.render(f"P{computer['current_id']}", True, Colors.WHITE)
+        screen.blit(process_text, (x + width // 2 - 10, y + height // 2 + 20))
+    
+    # Tamanho da fila
+    queue_text = font.render(f"Fila: {computer['queue_length']}", True, Colors.WHITE)
+    screen.blit(queue_text, (x + width // 2 - 20, y + height - 30))
+
+
+def _draw_compact(screen: pygame.Surface, computer: dict) -> None:
+    """Desenha a CPU como um bloco colorido com barra de fila"""
+    x, y, width, height = computer['rect']
+    pygame.draw.rect(screen, computer['color'], computer['rect'])
+    
+    # Barra de fila na base do bloco (cheia com 10 ou mais processos)
+    if computer['queue_length']:
+        bar_height = max(1, height * min(computer['queue_length'], 10) // 10)
+        pygame.draw.rect(screen, Colors.YELLOW, (x, y + height - bar_height, max(1, width // 4), bar_height))
+    
+    # Com espaço suficiente, mostra o número da CPU
+    if width >= 24 and height >= 16:
+        pygame.draw.rect(screen, Colors.WHITE, computer['rect'], 1)
+        font = pygame.font.SysFont(None, 16)
+        id_text = font.render(str(computer['id']), True, Colors.WHITE)
+        screen.blit(id_text, (x + 3, y + 2))
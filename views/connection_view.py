@@ -0,0 +1,215 @@
+import pygame
+from config import Colors, COMPACT_CPU_THRESHOLD, LOD_LABEL_THRESHOLD, LOD_QUEUE_VISIBLE
+from views.process_view import process_blit_items, process_record
+
+
+def connection_model(connection) -> dict:
+    """O que o desenho usa do sistema de conexão: trajetos, rede, capacidade e processos visíveis"""
+    computers = connection.computers
+    compact = len(computers) > COMPACT_CPU_THRESHOLD
+    # Trajetos gerador -> CPU: (início, fim, cor, direção da seta ou None)
+    routes = []
+    if computers:
+        for generator in connection.generators:
+            start_point = generator.get_center()
+            # Muitas CPUs: uma única linha até o centro do bloco de CPUs, sem setas
+            if compact:
+                routes.append((start_point, _bounding_center(computers), Colors.GRAY, None))
+                continue
+            for computer in connection.generator_pools.get(generator.generator_id) or computers:
+                # Usar a cor da CPU para a linha de conexão
+                routes.append((start_point, computer.get_center(), computer.base_color,
+                               connection.route_directions.get((generator.generator_id, computer))))
+
+    # Roteamento entre estágios: (início, fim ou None para retorno ao próprio estágio, probabilidade, direção, topo)
+    links = []
+    if connection.has_network:
+        for stage in connection.network.stages:
+            if not stage["computers"]:
+                continue
+            start_point = _bounding_center(stage["computers"])
+            for next_name, probability in stage["routing"].items():
+                next_stage = connection.network.get_stage(next_name)
+                if probability <= 0 or next_stage is None or not next_stage["computers"]:
+                    continue
+                if next_stage is stage:
+                    top_y = min(computer.y for computer in stage["computers"])
+                    links.append((start_point, None, probability, None, top_y))
+                    continue
+                end_point = _bounding_center(next_stage["computers"])
+                links.append((start_point, end_point, probability, connection.direction(start_point, end_point), None))
+
+    # Carga das CPUs listadas sob o indicador de capacidade; as que não cabem viram um resumo
+    load = [(computer.name, len(computer.queue), computer.is_stopped) for computer in computers[:COMPACT_CPU_THRESHOLD]]
+    hidden = computers[COMPACT_CPU_THRESHOLD:]
+
+    # Processos nas filas das CPUs (WAITING_CPU) não são desenhados um a um: a CPU mostra a fila.
+    # Cada fila de entrada mostra só os primeiros LOD_QUEUE_VISIBLE; o resto vira uma barra com a contagem
+    visible = []
+    queued_by_source = {}
+    for process in connection.input_queue:
+        queued = queued_by_source.get(process.source_id, 0)
+        queued_by_source[process.source_id] = queued + 1
+        if queued < LOD_QUEUE_VISIBLE:
+            visible.append(process_record(process))
+    visible.extend(process_record(process) for process in connection.transit_processes)
+    overflow = [(connection.generators_by_id.get(source_id, connection.generator).get_center(), queued - LOD_QUEUE_VISIBLE)
+                for source_id, queued in queued_by_source.items() if queued > LOD_QUEUE_VISIBLE]
+
+    return {
+        'routes': routes,
+        'links': links,
+        'anchor': connection.generator.get_center(),
+        'has_computers': bool(computers),
+        'total_processes': connection.total_processes,
+        'max_capacity': connection.max_capacity,
+        'load': load,
+        'hidden_cpus': len(hidden),
+        'hidden_waiting': sum(len(computer.queue) for computer in hidden),
+        'processes': visible,
+        'overflow': overflow,
+    }
+
+
+def draw_connection(screen: pygame.Surface, model: dict) -> None:
+    """Desenha todo o sistema de conexão"""
+    _draw_connection_lines(screen, model)
+    _draw_arrows(screen, model)
+    if model['links']:
+        _draw_network_links(screen, model)
+    _draw_capacity_indicator(screen, model)
+    _draw_all_processes(screen, model)
+
+
+def _draw_connection_lines(screen: pygame.Surface, model: dict) -> None:
+    """Desenha as linhas de conexão de cada gerador para as CPUs que ele atende"""
+    for start_point, end_point, color, _ in model['routes']:
+        pygame.draw.line(screen, color, start_point, end_point, 3)
+
+
+def _draw_arrows(screen: pygame.Surface, model: dict) -> None:
+    """Desenha setas indicando direção para cada CPU"""
+    arrow_size = 8
+    for start_point, _, color, direction_info in model['routes']:
+        if direction_info:
+            _draw_arrow(screen, start_point, direction_info, color, arrow_size)
+
+
+def _draw_arrow(screen, start_point, direction_info, color, arrow_size) -> None:
+    """Desenha uma seta no meio do caminho entre gerador e CPU"""
+    # Ponto no meio do caminho
+    mid_x = start_point[0] + direction_info['dx'] * direction_info['length'] * 0.5
+    mid_y = start_point[1] + direction_info['dy'] * direction_info['length'] * 0.5
+
+    tip = (mid_x + direction_info['dx'] * arrow_size,
+           mid_y + direction_info['dy'] * arrow_size)
+
+    perp_x = -direction_info['dy']
+    perp_y = direction_info['dx']
+
+    left = (mid_x + perp_x * arrow_size/2, mid_y + perp_y * arrow_size/2)
+    right = (mid_x - perp_x * arrow_size/2, mid_y - perp_y * arrow_size/2)
+
+    pygame.draw.polygon(screen, color, [tip, left, right])
+
+
+def _draw_network_links(screen: pygame.Surface, model: dict) -> None:
+    """Desenha o roteamento entre estágios com a probabilidade de cada ligação"""
+    font = pygame.font.SysFont(None, 18)
+    for start_point, end_point, probability, direction_info, top_y in model['links']:
+        # Retorno ao próprio estágio: apenas o rótulo acima dele
+        if end_point is None:
+            screen.blit(font.render(f"↺ {probability:.0%}", True, Colors.YELLOW),
+                        (start_point[0] - 15, top_y - 16))
+            continue
+
+        pygame.draw.line(screen, Colors.YELLOW, start_point, end_point, 2)
+        _draw_arrow(screen, start_point, direction_info, Colors.YELLOW, 8)
+        mid_x = (start_point[0] + end_point[0]) // 2
+        mid_y = (start_point[1] + end_point[1]) // 2
+        screen.blit(font.render(f"{probability:.0%}", True, Colors.YELLOW), (mid_x + 6, mid_y - 16))
+
+
+def _bounding_center(computers) -> tuple:
+    """Centro do retângulo que envolve um grupo de CPUs"""
+    min_x = min(computer.x for computer in computers)
+    min_y = min(computer.y for computer in computers)
+    max_x = max(computer.x + computer.width for computer in computers)
+    max_y = max(computer.y + computer.height for computer in computers)
+    return (min_x + max_x) // 2, (min_y + max_y) // 2
+
+
+def _draw_capacity_indicator(screen: pygame.Surface, model: dict) -> None:
+    """Desenha indicador de capacidade"""
+    font = pygame.font.SysFont(None, 20)
+    center_x, center_y = model['anchor']
+
+    # CORREÇÃO: Mensagem diferente quando não há CPUs
+    if not model['has_computers']:
+        capacity_text = font.render("SISTEMA SEM CPUS!", True, Colors.RED)
+        screen.blit(capacity_text, (center_x - 50, center_y - 40))
+
+        # Mostrar instrução para comprar CPUs
+        instruction_text = font.render("Compre CPUs na loja!", True, Colors.YELLOW)
+        screen.blit(instruction_text, (center_x - 50, center_y - 20))
+        return
+
+    capacity_text = font.render(f"Capacidade: {model['total_processes']}/{model['max_capacity']}", True, Colors.WHITE)
+    screen.blit(capacity_text, (center_x - 50, center_y - 60))
+
+    # Barra de progresso
+    bar_width = 100
+    bar_height = 8
+    bar_x = center_x - 50
+    bar_y = center_y - 40
+
+    pygame.draw.rect(screen, Colors.DARK_GRAY, (bar_x, bar_y, bar_width, bar_height))
+
+    percentage = model['total_processes'] / model['max_capacity']
+    bar_color = (Colors.LIGHT_GREEN if percentage < 0.7
+                else Colors.YELLOW if percentage < 0.9
+                else Colors.RED)
+
+    pygame.draw.rect(screen, bar_color, (bar_x, bar_y, bar_width * percentage, bar_height))
+
+    # Informações de carga das CPUs
+    load_y = bar_y + 100
+    for computer_name, queue_length, is_stopped in model['load']:
+        status = "PARADA" if is_stopped else "ATIVA"
+        status_color = Colors.RED if is_stopped else Colors.GREEN
+        load_text = font.render(f"{computer_name}: {queue_length} na fila", True, Colors.WHITE)
+        status_text = font.render(f"({status})", True, status_color)
+
+        screen.blit(load_text, (bar_x, load_y))
+        screen.blit(status_text, (bar_x + 120, load_y))
+        load_y += 15
+
+    # Resumo das CPUs que não cabem na lista
+    if model['hidden_cpus']:
+        summary_text = font.render(f"+{model['hidden_cpus']} CPUs: {model['hidden_waiting']} na fila", True, Colors.WHITE)
+        screen.blit(summary_text, (bar_x, load_y))
+
+
+def _draw_all_processes(screen: pygame.Surface, model: dict) -> None:
+    """Desenha os processos visíveis, com menos detalhe quando há muitos na tela"""
+    # Sprites pré-rasterizados num único blits; com muitos processos, sem o número
+    with_labels = len(model['processes']) <= LOD_LABEL_THRESHOLD
+    items = []
+    for record in model['processes']:
+        items.extend(process_blit_items(record, with_labels))
+    screen.blits(items, False)
+
+    for center, hidden in model['overflow']:
+        _draw_queue_overflow(screen, model, center, hidden)
+
+
+def _draw_queue_overflow(screen: pygame.Surface, model: dict, center, hidden: int) -> None:
+    """Barra sob a fila de entrada com os processos que não são desenhados"""
+    center_x, center_y = center
+    bar_width = 30 + (LOD_QUEUE_VISIBLE - 1) * 25
+    bar_x, bar_y = center_x - 15 - bar_width, center_y + 30
+    pygame.draw.rect(screen, Colors.DARK_GRAY, (bar_x, bar_y, bar_width, 6))
+    pygame.draw.rect(screen, Colors.LIGHT_GREEN,
+                     (bar_x, bar_y, bar_width * min(1.0, hidden / max(1, model['max_capacity'])), 6))
+    font = pygame.font.SysFont(None, 18)
+    screen.blit(font.render(f"+{hidden}", True, Colors.WHITE), (bar_x, bar_y + 8))
@@ -0,0 +1,38 @@
+import pygame
+from config import Colors
+
+
+def generator_record(generator) -> dict:
+    """O que o desenho usa do gerador, copiado do modelo"""
+    return {
+        'name': generator.name,
+        'center': generator.get_center(),
+        'triangle_size': generator.triangle_size,
+        'color': generator.color,
+        'is_stopped': generator.is_stopped,
+    }
+
+
+def draw_generator(screen: pygame.Surface, generator: dict) -> None:
+    """Desenha o gerador na tela"""
+    center_x, center_y = generator['center']
+    size = generator['triangle_size']
+    
+    # Cor baseada no estado
+    current_color = Colors.DARK_GRAY if generator['is_stopped'] else generator['color']
+    
+    # Triângulo
+    points = [
+        (center_x, center_y - size // 2),  # Topo
+        (center_x - size // 2, center_y + size // 2),  # Esq
+        (center_x + size // 2, center_y + size // 2)   # Dir
+    ]
+    
+    pygame.draw.polygon(screen, current_color, points)
+    pygame.draw.polygon(screen, Colors.WHITE, points, 2)
+    
+    # Texto
+    font = pygame.font.SysFont(None, 24)
+    status = " (PARADO)" if generator['is_stopped'] else ""
+    text = font.render(f"{generator['name']}{status}", True, Colors.WHITE)
+    screen.blit(text, (center_x - 45, center_y + size // 2 + 10))
@@ -0,0 +1,74 @@
+import pygame
+from config import Colors
+from entities.process_states import ProcessState
+
+# Cor de cada estado do processo
+STATE_COLORS = {
+    ProcessState.CREATED: Colors.BLUE,
+    ProcessState.IN_QUEUE: Colors.LIGHT_GREEN,
+    ProcessState.IN_TRANSIT: Colors.PURPLE,
+    ProcessState.WAITING_CPU: Colors.ORANGE,
+    ProcessState.PROCESSING: Colors.ORANGE,
+    ProcessState.COMPLETED: Colors.DARK_GRAY
+}
+
+# Círculos de processo já rasterizados (preenchimento + contorno), um por cor e raio
+_sprite_cache = {}
+# Algarismos 0-9 já rasterizados na fonte dos rótulos (o número do processo é montado com eles)
+_digit_glyphs = None
+
+
+def process_sprite(color, radius) -> pygame.Surface:
+    """Sprite do círculo do processo: desenhar vira um blit em vez de duas primitivas"""
+    sprite = _sprite_cache.get((color, radius))
+    if sprite is None:
+        sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, color, (radius, radius), radius)
+        pygame.draw.circle(sprite, Colors.WHITE, (radius, radius), radius, 2)
+        _sprite_cache[(color, radius)] = sprite
+    return sprite
+
+
+def preload_sprites(radius=15) -> None:
+    """Rasteriza de uma vez os sprites de todos os estados e os algarismos dos rótulos"""
+    global _digit_glyphs
+    for color in STATE_COLORS.values():
+        process_sprite(color, radius)
+    if _digit_glyphs is None:
+        font = pygame.font.SysFont(None, 20)
+        _digit_glyphs = [font.render(str(digit), True, Colors.WHITE) for digit in range(10)]
+
+
+def label_blits(text, center_x, y):
+    """Pares (glifo, posição) que escrevem os algarismos de `text` centralizados em center_x"""
+    if _digit_glyphs is None:
+        preload_sprites()
+    glyphs = [_digit_glyphs[ord(char) - 48] for char in text]
+    x = center_x - sum(glyph.get_width() for glyph in glyphs) // 2
+    items = []
+    for glyph in glyphs:
+        items.append((glyph, (x, y)))
+        x += glyph.get_width()
+    return items
+
+
+def process_record(process) -> tuple:
+    """O que o desenho usa do processo: (id, x, y, estado, raio)"""
+    return process.id, int(process.x), int(process.y), process.state, process.radius
+
+
+def process_color(state) -> tuple:
+    """Cor do processo no estado dado"""
+    return STATE_COLORS.get(state, Colors.BLUE)
+
+
+def process_blit_items(record, with_label=True) -> list:
+    """Pares (sprite, posição) que desenham o processo: o círculo do estado e, opcionalmente, o número"""
+    process_id, x, y, state, radius = record
+    # Processos na CPU ou na fila dela não são desenhados um a um (a CPU mostra o estado)
+    if state in (ProcessState.PROCESSING, ProcessState.WAITING_CPU):
+        return []
+    items = [(process_sprite(process_color(state), radius), (x - radius, y - radius))]
+    if with_label:
+        items.extend(label_blits(str(process_id), x, y - 8))
+    return items
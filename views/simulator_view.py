@@ -0,0 +1,644 @@
+import pygame
+from config import Colors, GridPositions, FPS, SCREEN_WIDTH, SCREEN_HEIGHT, GRID_COLUMNS, GRID_ROWS, CELL_WIDTH, CELL_HEIGHT
+from entities.infoPanel import InfoPanel
+from entities.shopPanel import ShopPanel
+from entities.process_states import ProcessState
+from core.profiler import frame_profiler
+from core.log import get_logger
+from utils.grid_helper import GridHelper
+from views.computer_view import computer_record, draw_computer
+from views.generator_view import generator_record, draw_generator
+from views.connection_view import connection_model, draw_connection
+
+logger = get_logger("simulador")
+
+
+def draw_grid(screen: pygame.Surface) -> None:
+    """Desenha o grid de fundo (para debug)"""
+    # Linhas verticais
+    for column in range(GRID_COLUMNS + 1):
+        x = column * CELL_WIDTH
+        pygame.draw.line(screen, Colors.DARK_GRAY, (x, 0), (x, CELL_HEIGHT * GRID_ROWS), 1)
+    
+    # Linhas horizontais
+    for row in range(GRID_ROWS + 1):
+        y = row * CELL_HEIGHT
+        pygame.draw.line(screen, Colors.DARK_GRAY, (0, y), (CELL_WIDTH * GRID_COLUMNS, y), 1)
+    
+    # Coordenadas (debug)
+    font = pygame.font.SysFont(None, 16)
+    for column in range(GRID_COLUMNS):
+        for row in range(GRID_ROWS):
+            x = column * CELL_WIDTH + 5
+            y = row * CELL_HEIGHT + 5
+            text = font.render(f"{column},{row}", True, Colors.DARK_GRAY)
+            screen.blit(text, (x, y))
+
+
+class SimulatorView:
+    """Interface pygame de um QueueSimulator: painéis, desenho e entrada (o modelo não importa pygame)"""
+
+    # A view guarda só estado de interface (componente selecionado, campos de texto, hover) e lê o
+    # simulador a cada quadro; a simulação roda igual sem ela (modo headless)
+    def __init__(self, simulator):
+        self.simulator = simulator
+        self.info_panel = InfoPanel()
+        self.shop_panel = ShopPanel(simulator.shop)
+        self.frame_view = FrameView(self.info_panel, self.shop_panel)
+        self._topology_version = None
+        self._sync_references()
+
+    def _sync_references(self):
+        """Refaz as referências do painel quando CPUs ou geradores do simulador mudaram"""
+        simulator = self.simulator
+        if self._topology_version != simulator.topology_version:
+            self._topology_version = simulator.topology_version
+            self.info_panel.set_component_references(simulator.computers, simulator.generators, simulator)
+
+    def _selected_generator(self):
+        """Gerador atualmente selecionado no painel"""
+        index = self.info_panel.selected_generator_index
+        return self.simulator.generators[index] if index < len(self.simulator.generators) else self.simulator.generator
+    
+    def _generator_at(self, pos):
+        """Índice do gerador na posição clicada (ou None)"""
+        for i, generator in enumerate(self.simulator.generators):
+            if generator.is_clicked(pos):
+                return i
+        return None
+    
+    def handle_click(self, pos):
+        """Lida com cliques do mouse nos componentes"""
+        self._sync_references()
+        # Se o jogo acabou, apenas permitir voltar ao menu
+        if self.simulator.game_over:
+            return
+        
+        # **CORREÇÃO: Primeiro verificar se o botão de fechar do InfoPanel foi clicado**
+        # **ISSO DEVE FUNCIONAR EM AMBOS OS MODOS**
+        if self.info_panel.is_close_button_clicked(pos):
+            self.info_panel.close_detailed_view()
+            logger.debug("Visualização detalhada fechada")
+            return
+        
+        # Depois verificar se a loja foi clicada (permitido em ambos os modos)
+        shop_item = self.shop_panel.is_clicked(pos)
+        if shop_item:
+            # Para upgrades infinitos, sempre permitir compra se tiver pontos suficientes
+            # Para CPUs, verificar se não foi comprado
+            if (shop_item["id"] in ["upgrade_processing_speed", "upgrade_capacity", "upgrade_speed"] or 
+                not shop_item.get("purchased", False)):
+                self.simulator.purchase(shop_item["id"])
+            return
+        
+        # **NO MODO JOGO: Restringir controles avançados**
+        if self.simulator.is_game_mode():
+            # No modo jogo, apenas permitir visualização de informações
+            # mas não permitir interação com controles
+            computer_clicked = False
+            for i, computer in enumerate(self.simulator.computers):
+                if computer.is_clicked(pos):
+                    self.info_panel.select_component(f"computer_{i+1}")
+                    self.info_panel.deactivate_all_inputs()
+                    logger.debug("CPU %s clicada - modo visualização apenas", i+1)
+                    computer_clicked = True
+                    break
+            
+            generator_index = None if computer_clicked else self._generator_at(pos)
+            if generator_index is not None:
+                self.info_panel.selected_generator_index = generator_index
+                self.info_panel.select_component("generator")
+                logger.debug("Gerador clicado - modo visualização apenas")
+            elif not computer_clicked:
+                self.info_panel.deactivate_all_inputs()
+            return
+        
+        # **MODO SANDBOX: Controles completos**
+        # Verifica se o botão de parar/iniciar foi clicado
+        if self.info_panel.is_stop_button_clicked(pos):
+            self._handle_stop_button_click()
+            return
+        
+        # Verifica se o campo de intervalo foi clicado (apenas para gerador)
+        if (self.info_panel.selected_component == "generator" and 
+            self.info_panel.is_interval_input_clicked(pos)):
+            self.info_panel.activate_interval_input()
+            return
+        
+        # Verifica se o campo de tempo de processamento foi clicado (apenas para computador específico)
+        if self.info_panel.selected_component and self.info_panel.selected_component.startswith("computer_"):
+            if self.info_panel.is_processing_time_input_clicked(pos):
+                self.info_panel.activate_processing_time_input()
+                return
+            elif self.info_panel.is_max_queue_time_input_clicked(pos):
+                self.info_panel.activate_max_queue_time_input()
+                return
+        
+        # Verifica se alguma CPU foi clicada
+        computer_clicked = False
+        for i, computer in enumerate(self.simulator.computers):
+            if computer.is_clicked(pos):
+                self.info_panel.select_component(f"computer_{i+1}")
+                self.info_panel.deactivate_all_inputs()
+                logger.debug("CPU %s clicada - mostrando informações", i+1)
+                computer_clicked = True
+                break
+        
+        # Verifica se algum gerador foi clicado
+        generator_index = None if computer_clicked else self._generator_at(pos)
+        if generator_index is not None:
+            self.info_panel.selected_generator_index = generator_index
+            self.info_panel.select_component("generator")
+            logger.debug("%s clicado - mostrando informações do gerador", self.simulator.generators[generator_index].name)
+        elif not computer_clicked:
+            # Se clicar em qualquer outro lugar, desativa todos os campos de entrada
+            self.info_panel.deactivate_all_inputs()
+    
+    def handle_key_event(self, event):
+        """Lida com eventos de teclado para entrada de texto"""
+        self._sync_references()
+        # Se o jogo acabou, ignorar todas as entradas
+        if self.simulator.game_over:
+            return
+
+        # F3 liga/desliga o perfilador de quadro em qualquer modo
+        if event.key == pygame.K_F3:
+            frame_profiler.toggle()
+            return
+            
+        # **NO MODO JOGO: Ignorar todas as entradas de teclado para controles**
+        if self.simulator.is_game_mode():
+            return
+        
+        # **MODO SANDBOX: Controles completos de teclado**
+        # Handle generator interval input
+        if (self.info_panel.selected_component == "generator" and 
+            self.info_panel.is_interval_input_active):
+            
+            if event.key == pygame.K_RETURN:
+                new_interval = self.info_panel.get_interval_input_value()
+                if new_interval > 0:
+                    generator = self._selected_generator()
+                    generator.set_interval(new_interval)
+                    logger.info("Intervalo de %s alterado para: %.2f segundos", generator.name, new_interval)
+                self.info_panel.deactivate_all_inputs()
+            
+            elif event.key == pygame.K_ESCAPE:
+                self.info_panel.deactivate_all_inputs()
+                self.info_panel.interval_input_text = f"{self._selected_generator().interval_seconds:.2f}"
+            
+            elif event.key == pygame.K_BACKSPACE:
+                self.info_panel.remove_character_from_interval_input()
+            
+            elif event.key == pygame.K_DELETE:
+                self.info_panel.clear_interval_input()
+            
+            else:
+                if event.unicode.isdigit() or event.unicode == '.':
+                    self.info_panel.add_character_to_interval_input(event.unicode)
+        
+        # Handle computer processing time input
+        elif (self.info_panel.selected_component and 
+              self.info_panel.selected_component.startswith("computer_") and 
+              self.info_panel.is_processing_time_input_active):
+            
+            computer_index = int(self.info_panel.selected_component.split('_')[1]) - 1
+            computer = self.simulator.computers[computer_index]
+            
+            if event.key == pygame.K_RETURN:
+                new_processing_time = self.info_panel.get_processing_time_input_value()
+                if new_processing_time > 0:
+                    computer.set_processing_time(new_processing_time)
+                self.info_panel.deactivate_all_inputs()
+            
+            elif event.key == pygame.K_ESCAPE:
+                self.info_panel.deactivate_all_inputs()
+                self.info_panel.processing_time_input_text = f"{computer.processing_time_ms/1000:.2f}"
+            
+            elif event.key == pygame.K_BACKSPACE:
+                self.info_panel.remove_character_from_processing_time_input()
+            
+            elif event.key == pygame.K_DELETE:
+                self.info_panel.clear_processing_time_input()
+            
+            else:
+                if event.unicode.isdigit() or event.unicode == '.':
+                    self.info_panel.add_character_to_processing_time_input(event.unicode)
+        
+        # Handle max queue time input
+        elif (self.info_panel.selected_component and 
+              self.info_panel.selected_component.startswith("computer_") and 
+              self.info_panel.is_max_queue_time_input_active):
+            
+            if event.key == pygame.K_RETURN:
+                new_max_queue_time = self.info_panel.get_max_queue_time_input_value()
+                if new_max_queue_time > 0:
+                    self.simulator.max_queue_time_seconds = new_max_queue_time
+                    logger.info("Tempo máximo de fila alterado para: %.2f segundos", new_max_queue_time)
+                self.info_panel.deactivate_all_inputs()
+            
+            elif event.key == pygame.K_ESCAPE:
+                self.info_panel.deactivate_all_inputs()
+                self.info_panel.max_queue_time_input_text = f"{self.simulator.max_queue_time_seconds:.2f}"
+            
+            elif event.key == pygame.K_BACKSPACE:
+                self.info_panel.remove_character_from_max_queue_time_input()
+            
+            elif event.key == pygame.K_DELETE:
+                self.info_panel.clear_max_queue_time_input()
+            
+            else:
+                if event.unicode.isdigit() or event.unicode == '.':
+                    self.info_panel.add_character_to_max_queue_time_input(event.unicode)
+        
+        # Atalho: alternar quantum do round-robin
+        elif event.key == pygame.K_t:
+            self.simulator.cycle_time_slice()
+        
+        # Atalho: alternar mistura de classes de processos
+        elif event.key == pygame.K_c:
+            self.simulator.cycle_job_class_preset()
+        
+        # Atalhos: adicionar/remover CPUs (+ e -) ou dobrar/reduzir à metade (* e /)
+        elif event.unicode in ('+', '='):
+            self.simulator.add_computer()
+        elif event.unicode == '-' and len(self.simulator.computers) > 1:
+            self.simulator.set_computer_count(len(self.simulator.computers) - 1)
+        elif event.unicode == '*':
+            self.simulator.set_computer_count(len(self.simulator.computers) * 2)
+        elif event.unicode == '/':
+            self.simulator.set_computer_count(len(self.simulator.computers) // 2)
+        
+        # Atalho: nova fonte de chegadas
+        elif event.key == pygame.K_g:
+            self.simulator.add_generator()
+        
+        # Atalho: alternar topologia da rede de filas (estágio único, tandem, Jackson)
+        elif event.key == pygame.K_n:
+            self.simulator.cycle_network_preset()
+    
+    def _handle_stop_button_click(self):
+        """Lida com o clique no botão de parar/iniciar"""
+        # **NO MODO JOGO: Este método não deve ser chamado**
+        if self.simulator.is_game_mode():
+            return
+        
+        # **MODO SANDBOX: Controles completos**
+        selected_component = self.info_panel.selected_component
+        
+        if selected_component == "generator":
+            generator = self._selected_generator()
+            generator.toggle_stop()
+            action = "parado" if generator.is_stopped else "retomado"
+            logger.info("%s %s", generator.name, action)
+        
+        elif selected_component and selected_component.startswith("computer_"):
+            computer_index = int(selected_component.split('_')[1]) - 1
+            computer = self.simulator.computers[computer_index]
+            computer.toggle_stop()
+            action = "parada" if computer.is_stopped else "retomada"
+            logger.info("CPU %s %s", computer_index + 1, action)
+    
+    def handle_mouse_motion(self, pos):
+        """Lida com movimento do mouse para efeitos visuais"""
+        self._sync_references()
+        # **NO MODO JOGO: Atualizar hover apenas para elementos visíveis**
+        if self.simulator.is_game_mode():
+            # No modo jogo, apenas atualizar hover do botão de fechar se estiver visível
+            if self.info_panel.selected_component is not None:
+                self.info_panel.update_button_hover(pos)
+            return
+        
+        # **MODO SANDBOX: Atualizar todos os hovers**
+        self.info_panel.update_button_hover(pos)
+    
+    def render_model(self) -> dict:
+        """Modelo de desenho do quadro: posições, estados e números copiados do simulador (lido por FrameView)"""
+        # Montado na thread da simulação; nada nele é alterado depois, então a interface pode
+        # desenhá-lo noutra thread sem cópia nem serialização
+        model_started = frame_profiler.start()
+        simulator = self.simulator
+        self._sync_references()
+
+        # Processos em fila por CPU para o painel
+        started = frame_profiler.start()
+        # filtra só processos em fila e converte a chave para proc.id
+        # (percorre os processos vivos: process_targets guarda também os já finalizados)
+        targets = simulator.connection.process_targets
+        in_queue_map = {
+            proc.id: targets[proc.id]
+            for proc in simulator.processes
+            if proc.id in targets and proc.state in (ProcessState.PROCESSING, ProcessState.WAITING_CPU)
+            }
+        self.info_panel.set_process_targets(in_queue_map)
+        frame_profiler.stop('modelo.mapa_filas', started)
+
+        # Painel de informações com o estado deste quadro
+        started = frame_profiler.start()
+        self.info_panel.update_info(simulator.computers, simulator.connection, simulator.processes,
+                                    simulator.current_interval_seconds, simulator.max_queue_time_seconds,
+                                    simulator.timed_out_processes, simulator.class_stats,
+                                    simulator.arrival_rate, simulator.source_stats, simulator.loss_report(),
+                                    simulator.latency_stats, simulator.measured_occupancy())
+        panel = self.info_panel.render_state()
+        frame_profiler.stop('modelo.painel_info', started)
+
+        started = frame_profiler.start()
+        model = {
+            'hud': {
+                'score': simulator.score,
+                'mode': simulator._game_mode,
+                'is_game_mode': simulator.is_game_mode(),
+                'game_over': simulator.game_over,
+                'game_time_elapsed': simulator.game_time_elapsed,
+                'event_message': simulator.event_messages[0] if simulator.event_messages else None,
+                'health_points': simulator.health_points,
+                'max_health_points': simulator.max_health_points,
+            },
+            'connection': connection_model(simulator.connection),
+            'generators': [generator_record(generator) for generator in simulator.generators],
+            'computers': [computer_record(computer) for computer in simulator.computers],
+            'panel': panel,
+            'shop_items': [dict(item) for item in simulator.shop.shop_items],
+        }
+        frame_profiler.stop('modelo.cena', started)
+        frame_profiler.stop('modelo (total)', model_started)
+        return model
+
+    def draw(self, screen: pygame.Surface) -> None:
+        """Desenha todo o simulador"""
+        self.frame_view.draw(screen, self.render_model())
+
+
+class FrameView:
+    """Desenha um render_model() de SimulatorView; não lê o simulador, então pode rodar noutra thread"""
+
+    # Os painéis guardam só a geometria e as fontes; sem eles, a view cria os seus (interface com a
+    # simulação numa thread própria, que não divide objetos com ela)
+    def __init__(self, info_panel=None, shop_panel=None):
+        self.info_panel = info_panel or InfoPanel()
+        self.shop_panel = shop_panel or ShopPanel()
+
+    def draw(self, screen: pygame.Surface, model: dict) -> None:
+        """Desenha um quadro do modelo"""
+        frame_started = frame_profiler.start()
+        hud = model['hud']
+
+        # Fundo
+        started = frame_profiler.start()
+        screen.fill(Colors.BLACK)
+        
+        # Grid (para debug)
+        draw_grid(screen)
+        frame_profiler.stop('draw.fundo', started)
+        
+        # Sistema de conexão (desenha linhas e processos)
+        started = frame_profiler.start()
+        draw_connection(screen, model['connection'])
+        frame_profiler.stop('draw.conexao', started)
+        
+        # Componentes principais
+        started = frame_profiler.start()
+        for generator in model['generators']:
+            draw_generator(screen, generator)
+        frame_profiler.stop('draw.geradores', started)
+        started = frame_profiler.start()
+        for computer in model['computers']:
+            draw_computer(screen, computer)
+        frame_profiler.stop('draw.cpus', started)
+        
+        started = frame_profiler.start()
+        self.info_panel.draw(screen, model['panel'])
+        frame_profiler.stop('draw.painel', started)
+        
+        # Shop Panel (novo)
+        started = frame_profiler.start()
+        self.shop_panel.draw(screen, hud['score'], model['shop_items'])
+        frame_profiler.stop('draw.loja', started)
+
+        started = frame_profiler.start()
+        self._draw_score_display(screen, hud)
+        
+        # Desenhar timer no modo jogo
+        if hud['is_game_mode']:
+            self._draw_timer_display(screen, hud)
+            self._draw_event_messages(screen, hud)
+            self._draw_health_bar(screen, hud)  # NOVO: Desenhar barra de vida
+        
+        # Desenhar tela de game over se aplicável
+        if hud['game_over']:
+            self._draw_game_over_screen(screen, hud)
+        
+        # Thread da simulação morta: o quadro fica congelado no último modelo, com o aviso por cima
+        if model.get('halted'):
+            self._draw_halted_screen(screen, model['halted'])
+        frame_profiler.stop('draw.hud', started)
+        frame_profiler.stop('draw (total)', frame_started)
+
+        # Sobreposição do perfilador (F3) por cima de tudo
+        if frame_profiler.enabled:
+            self._draw_profiler_overlay(screen)
+    
+    def _draw_profiler_overlay(self, screen: pygame.Surface) -> None:
+        """Desenha o tempo de cada fase do quadro (média, p95, máximo) contra o orçamento de 1/FPS"""
+        budget_ms = 1000.0 / FPS
+        summary = frame_profiler.summary()
+        line_height = 16
+        width, height = 420, 30 + line_height * (len(summary) + 1)
+        x, y = SCREEN_WIDTH - width - 10, 10
+
+        background = pygame.Surface((width, height), pygame.SRCALPHA)
+        background.fill((0, 0, 0, 200))
+        screen.blit(background, (x, y))
+        pygame.draw.rect(screen, Colors.GRAY, (x, y, width, height), 1)
+
+        font = pygame.font.SysFont("monospace", 14)
+        title = font.render(f"PERFIL DO QUADRO (ms) - orcamento {budget_ms:.1f} ms [F3]", True, Colors.YELLOW)
+        screen.blit(title, (x + 8, y + 6))
+        header = font.render(f"{'fase':<20} media    p95    max", True, Colors.GRAY)
+        screen.blit(header, (x + 8, y + 6 + line_height))
+
+        bar_x, bar_width = x + 300, width - 310
+        for i, (phase, mean, p95, peak) in enumerate(summary):
+            row_y = y + 6 + line_height * (i + 2)
+            color = Colors.RED if p95 > budget_ms else Colors.ORANGE if p95 > budget_ms / 2 else Colors.WHITE
+            text = font.render(f"{phase:<20} {mean:6.2f} {p95:6.2f} {peak:6.2f}", True, color)
+            screen.blit(text, (x + 8, row_y))
+            # Barra: fração do orçamento consumida em média (cheia = quadro inteiro)
+            fraction = min(1.0, mean / budget_ms)
+            pygame.draw.rect(screen, Colors.DARK_GRAY, (bar_x, row_y + 3, bar_width, 8))
+            pygame.draw.rect(screen, color, (bar_x, row_y + 3, int(bar_width * fraction), 8))
+
+    def _draw_health_bar(self, screen: pygame.Surface, hud: dict) -> None:
+        """Desenha a barra de vida no grid 6,0 até 8,0"""
+        health_x, health_y, health_width, health_height = GridHelper.grid_to_pixels(
+            GridPositions.HEALTH_BAR[0], 
+            GridPositions.HEALTH_BAR[1], 
+            3, 1  # 3 células de largura, 1 de altura
+        )
+        
+        # Fundo da barra de vida
+        pygame.draw.rect(screen, Colors.DARK_GRAY, (health_x, health_y, health_width, health_height))
+        pygame.draw.rect(screen, Colors.WHITE, (health_x, health_y, health_width, health_height), 2)
+        
+        # Calcular largura da vida atual
+        health_percentage = hud['health_points'] / hud['max_health_points']
+        current_health_width = int((health_width - 4) * health_percentage)
+        
+        # Determinar cor baseada na vida restante
+        if health_percentage > 0.6:
+            health_color = Colors.GREEN
+        elif health_percentage > 0.3:
+            health_color = Colors.YELLOW
+        else:
+            health_color = Colors.RED
+        
+        # Desenhar barra de vida atual
+        if current_health_width > 0:
+            pygame.draw.rect(screen, health_color, 
+                           (health_x + 2, health_y + 2, current_health_width, health_height - 4))
+        
+        # Texto da barra de vida
+        font = pygame.font.SysFont(None, 24)
+        health_text = font.render(f"VIDA: {hud['health_points']}/{hud['max_health_points']}", True, Colors.WHITE)
+        screen.blit(health_text, (health_x + health_width//2 - health_text.get_width()//2, 
+                                health_y + health_height//2 - health_text.get_height()//2))
+    
+    def _draw_game_over_screen(self, screen: pygame.Surface, hud: dict) -> None:
+        """Desenha a tela de fim de jogo"""
+        # Criar uma superfície semi-transparente para o fundo
+        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 180))  # Preto semi-transparente
+        screen.blit(overlay, (0, 0))
+        
+        # Texto de Game Over
+        font_large = pygame.font.SysFont(None, 72)
+        font_medium = pygame.font.SysFont(None, 36)
+        font_small = pygame.font.SysFont(None, 24)
+        
+        game_over_text = font_large.render("FIM DE JOGO", True, Colors.RED)
+        time_text = font_medium.render(f"Tempo: {int(hud['game_time_elapsed'])} segundos", True, Colors.WHITE)
+        
+        # Centralizar textos
+        screen.blit(game_over_text, (SCREEN_WIDTH//2 - game_over_text.get_width()//2, SCREEN_HEIGHT//2 - 100))
+        screen.blit(time_text, (SCREEN_WIDTH//2 - time_text.get_width()//2, SCREEN_HEIGHT//2))
+    
+    def _draw_halted_screen(self, screen: pygame.Surface, message: str) -> None:
+        """Desenha o aviso de simulação parada por erro"""
+        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 180))
+        screen.blit(overlay, (0, 0))
+        
+        font_large = pygame.font.SysFont(None, 56)
+        font_small = pygame.font.SysFont(None, 24)
+        
+        title_text = font_large.render("SIMULAÇÃO PARADA", True, Colors.RED)
+        error_text = font_small.render(message[:120], True, Colors.WHITE)
+        hint_text = font_small.render("Erro registrado no log. ESC volta ao menu.", True, Colors.YELLOW)
+        
+        screen.blit(title_text, (SCREEN_WIDTH//2 - title_text.get_width()//2, SCREEN_HEIGHT//2 - 80))
+        screen.blit(error_text, (SCREEN_WIDTH//2 - error_text.get_width()//2, SCREEN_HEIGHT//2))
+        screen.blit(hint_text, (SCREEN_WIDTH//2 - hint_text.get_width()//2, SCREEN_HEIGHT//2 + 30))
+    
+    def _draw_score_display(self, screen: pygame.Surface, hud: dict) -> None:
+        """Desenha a pontuação no grid (0,0)"""
+        score_x, score_y, score_width, score_height = GridHelper.grid_to_pixels(
+            GridPositions.SCORE_DISPLAY[0], 
+            GridPositions.SCORE_DISPLAY[1], 
+            1, 1
+        )
+        
+        # Fundo do display
+        pygame.draw.rect(screen, Colors.DARK_GRAY, (score_x, score_y, score_width, score_height))
+        pygame.draw.rect(screen, Colors.WHITE, (score_x, score_y, score_width, score_height), 2)
+        
+        # Texto da pontuação
+        font_large = pygame.font.SysFont(None, 34)
+        font_small = pygame.font.SysFont(None, 18)
+        
+        # Título
+        title_text = font_small.render("PONTUACAO", True, Colors.WHITE)
+        screen.blit(title_text, (score_x + score_width//2 - title_text.get_width()//2, score_y + 10))
+        
+        # Valor da pontuação
+        score_text = font_large.render(str(hud['score']), True, Colors.GREEN)
+        screen.blit(score_text, (score_x + score_width//2 - score_text.get_width()//2, score_y + 30))
+        
+        # **ADICIONADO: Indicador de modo atual**
+        mode_text = font_small.render(f"Modo: {hud['mode'].upper()}", True, 
+                                    Colors.YELLOW if hud['is_game_mode'] else Colors.CYAN)
+        screen.blit(mode_text, (score_x + score_width//2 - mode_text.get_width()//2, score_y + 55))
+    
+    def _draw_timer_display(self, screen: pygame.Surface, hud: dict) -> None:
+        """Desenha o timer no grid (1,0) - APENAS NO MODO JOGO"""
+        timer_x, timer_y, timer_width, timer_height = GridHelper.grid_to_pixels(
+            GridPositions.TIMER_DISPLAY[0], 
+            GridPositions.TIMER_DISPLAY[1], 
+            1, 1
+        )
+        
+        # Fundo mais escuro para melhor contraste
+        pygame.draw.rect(screen, (40, 40, 50), (timer_x, timer_y, timer_width, timer_height), border_radius=6)
+        pygame.draw.rect(screen, Colors.CYAN, (timer_x, timer_y, timer_width, timer_height), 2, border_radius=6)
+        
+        # Texto do timer
+        font_large = pygame.font.SysFont("Arial", 28, bold=True)
+        font_small = pygame.font.SysFont("Arial", 16)
+        
+        # Título
+        title_text = font_small.render("TEMPO", True, Colors.WHITE)
+        screen.blit(title_text, (timer_x + timer_width//2 - title_text.get_width()//2, timer_y + 10))
+        
+        # Valor do tempo (formato MM:SS)
+        minutes = int(hud['game_time_elapsed']) // 60
+        seconds = int(hud['game_time_elapsed']) % 60
+        time_text = f"{minutes:02d}:{seconds:02d}"
+        
+        time_display = font_large.render(time_text, True, Colors.CYAN)
+        screen.blit(time_display, (timer_x + timer_width//2 - time_display.get_width()//2, timer_y + 30))
+        
+        # Indicador de próximo evento
+        if hud['event_message'] is None:
+            next_event = 10 - (int(hud['game_time_elapsed']) % 10)
+            event_text = font_small.render(f"Próx: {next_event}s", True, Colors.ORANGE)
+            screen.blit(event_text, (timer_x + timer_width//2 - event_text.get_width()//2, timer_y + 55))
+        else:
+            # Mostrar "EVENTO!" quando há mensagem ativa
+            event_text = font_small.render("EVENTO!", True, Colors.RED)
+            screen.blit(event_text, (timer_x + timer_width//2 - event_text.get_width()//2, timer_y + 55))
+    
+    def _draw_event_messages(self, screen: pygame.Surface, hud: dict) -> None:
+        """Desenha mensagens de eventos nos grids (2,0) até (4,0)"""
+        if hud['event_message'] is None:
+            return
+        
+        # Mostrar apenas a mensagem mais recente
+        message, color = hud['event_message']
+        
+        # Usar grids (2,0) até (4,0) - 3 células de largura, 1 de altura (fixa)
+        message_x, message_y, message_width, message_height = GridHelper.grid_to_pixels(
+            GridPositions.EVENT_DISPLAY[0],  # Grid 2,0
+            GridPositions.EVENT_DISPLAY[1],  # Linha 0
+            3, 1  # 3 células de largura, 1 de altura FIXA
+        )
+        
+        # Fonte para mensagens
+        font = pygame.font.SysFont("Arial", 20, bold=True)
+        
+        # **ALTURA FIXA** - Não ajustar baseado no conteúdo
+        total_height = message_height
+        
+        # Fundo semi-transparente com borda colorida
+        bg_rect = pygame.Rect(message_x, message_y, message_width, total_height)
+        s = pygame.Surface((bg_rect.width, bg_rect.height), pygame.SRCALPHA)
+        s.fill((30, 30, 40, 230))  # Azul escuro semi-transparente
+        screen.blit(s, bg_rect)
+        
+        # Borda colorida ao redor
+        pygame.draw.rect(screen, color, bg_rect, 3, border_radius=8)
+        
+        # **SEM ÍCONES** - Apenas texto centralizado
+        text_surface = font.render(message, True, color)
+        text_x = message_x + (message_width - text_surface.get_width()) // 2
+        text_y = message_y + (total_height - text_surface.get_height()) // 2
+        screen.blit(text_surface, (text_x, text_y))